@@ -26,19 +26,35 @@ import streamlit as st
 
 from config.filename_config import COUNTRIES, COUNTRY_RETAILERS, STORE_FORMATS
 from config.schema import COLUMN_TYPES
-from processing.file_reader import read_excel_file
+from processing.file_pipeline import (
+    STATUS_FAILED,
+    STATUS_UNREADABLE,
+    FileJob,
+    apply_row_offsets,
+    process_files,
+)
 from processing.filename_parser import parse_filename
-from processing.column_mapper import map_columns
-from processing.normalizer import normalize, FlaggedItem
-from processing.numeric_converter import convert_numerics
-from processing.price_calculator import calculate_prices, COUNTRY_CURRENCY_MAP
-from processing.llm_cleaner import clean_with_llm
+from processing.layout_store import (
+    layout_hit_rate,
+    load_layout_store,
+    record_layout,
+    save_layout_store,
+)
+from processing.normalizer import FlaggedItem
+from processing.llm_cleaner import LLM_CHANGE_METHOD, clean_with_llm
 from processing.merger import merge_dataframes, apply_overlap_decisions
+from processing.provenance import (
+    ProvenanceLog,
+    changes_to_dataframe,
+    count_changes,
+    extend_log,
+)
 from processing.quality_checker import check_quality
-from processing.flavor_cleaner import apply_layer1_to_dataframe, harmonize_flavors_with_llm
+from processing.flavor_cleaner import apply_layer1_rules, harmonize_flavors_with_llm
 from processing.flavor_profiler import classify_flavor_profile
 from processing.vegetable_tagger import tag_contains_vegetables
 from utils.excel_formatter import format_and_save
+from utils.llm_client import summarize_call_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -158,7 +174,7 @@ def _init_session_state() -> None:
         "file_metadata": [],
         "processed_dataframes": [],
         "all_flagged_items": [],
-        "all_changes_log": [],
+        "all_changes_log": ProvenanceLog(),
         "all_errors": [],
         "merge_result": None,
         "overlap_decisions": {},
@@ -170,8 +186,12 @@ def _init_session_state() -> None:
         "llm_skipped": False,
         "llm_failed_batches": 0,
         "llm_total_batches": 0,
+        "llm_flagged_count": 0,
+        "llm_unique_count": 0,
+        "llm_cache_hits": 0,
         "total_llm_cost": 0.0,
         "total_input_tokens": 0,
+        "total_cached_input_tokens": 0,
         "total_output_tokens": 0,
         "vegetable_tagger_applied": False,
         "veg_tag_summary": {"layer1": 0, "layer2": 0, "layer3": 0},
@@ -451,149 +471,78 @@ if (
     processed_dataframes: list[pd.DataFrame] = []
     source_filenames: list[str] = []
     all_flagged_items: list[FlaggedItem] = []
-    all_changes_log: list[dict] = []
+    all_changes_log = ProvenanceLog()
     all_errors: list[str] = []
     source_files_info: list[dict] = []
     llm_resolved_count = 0
     llm_skipped = False
-    # Tracks the cumulative number of rows across all processed files so that
-    # each file's FlaggedItem.row_index values can be shifted into the
-    # coordinate space of the post-merge DataFrame (which uses ignore_index=True).
-    cumulative_row_offset = 0
 
     # Write uploaded files to a temp directory so file_reader can use Paths
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_dir_path = Path(temp_dir)
 
-        for file_idx, (uploaded_file, meta) in enumerate(
-            zip(raw_files, file_metadata)
-        ):
-            filename = meta["File"]
-            progress_fraction = (file_idx + 1) / total_files
+        file_jobs: list[FileJob] = []
+        for uploaded_file, meta in zip(raw_files, file_metadata):
+            file_path = temp_dir_path / meta["File"]
+            file_path.write_bytes(uploaded_file.getvalue())
+            file_jobs.append(FileJob(file_path=file_path, metadata=meta))
+
+        def _show_file_progress(done_count: int, total: int, filename: str) -> None:
+            """Advance the progress bar as each file finishes."""
             progress_bar.progress(
-                progress_fraction,
-                text=f"Processing {filename} ({file_idx + 1}/{total_files})...",
+                done_count / total,
+                text=f"Processed {filename} ({done_count}/{total})...",
             )
 
-            try:
-                # Save uploaded file to temp directory
-                file_path = temp_dir_path / filename
-                file_path.write_bytes(uploaded_file.getvalue())
-
-                # ── Step 1: Read Excel file ───────────────────────
-                with status_container.container():
-                    st.text(f"Reading {filename}...")
-                read_result = read_excel_file(file_path)
-
-                if read_result.errors:
-                    for error in read_result.errors:
-                        all_errors.append(f"{filename}: {error}")
-                    if read_result.raw_dataframe.empty:
-                        st.warning(f"Skipping {filename} — could not read data.")
-                        continue
-
-                dataframe = read_result.raw_dataframe
-
-                # ── Step 2: Map columns to master schema ──────────
-                with status_container.container():
-                    st.text(f"Mapping columns for {filename}...")
-                mapping_result = map_columns(dataframe.columns.tolist())
-                rename_map = {
-                    raw: master
-                    for raw, master in mapping_result.mapping.items()
-                    if master is not None
-                }
-                dataframe = dataframe.rename(columns=rename_map)
-
-                # Drop internal columns that start with "_"
-                internal_cols = [c for c in dataframe.columns if c.startswith("_")]
-                dataframe = dataframe.drop(columns=internal_cols, errors="ignore")
-
-                # ── Step 3: Inject per-file metadata ────────────────
-                file_country = meta["Country"]
-                file_currency = COUNTRY_CURRENCY_MAP.get(file_country, "EUR")
-
-                dataframe["Retailer"] = meta["Retailer"]
-                dataframe["City"] = meta["City"]
-                dataframe["Country"] = file_country
-                dataframe["Store Name"] = meta.get("Store Name") or None
-                dataframe["Store Format"] = meta.get("Store Format") or None
-
-                if "Product Name" not in dataframe.columns:
-                    dataframe["Product Name"] = None
-                if "Flavor" not in dataframe.columns:
-                    dataframe["Flavor"] = None
-                if "Juice Extraction Method" not in dataframe.columns:
-                    dataframe["Juice Extraction Method"] = None
-
-                # ── Step 4: Normalize categorical values ──────────
-                with status_container.container():
-                    st.text(f"Normalizing {filename}...")
-                norm_result = normalize(dataframe)
-                dataframe = norm_result.dataframe
-                # Shift each flagged item's row_index by the cumulative offset so
-                # it maps correctly into the merged DataFrame's global index space.
-                for item in norm_result.flagged_items:
-                    item.row_index += cumulative_row_offset
-                all_flagged_items.extend(norm_result.flagged_items)
-                all_changes_log.extend(norm_result.changes_log)
-
-                # ── Step 5: Convert numeric columns ───────────────
-                with status_container.container():
-                    st.text(f"Converting numerics for {filename}...")
-                numeric_result = convert_numerics(dataframe)
-                dataframe = numeric_result.dataframe
-                for err in numeric_result.errors:
-                    all_errors.append(
-                        f"{filename} row {err['row']}: {err['column']} — {err['error']}"
-                    )
-
-                # ── Step 6: Calculate prices ──────────────────────
-                with status_container.container():
-                    st.text(f"Calculating prices for {filename}...")
+        # ── Steps 1–7 per file: read → map → metadata → normalize →
+        #    numerics → prices → flavor Layer 1, spread across CPU cores ──
+        with status_container.container():
+            st.text(f"Reading and cleaning {total_files} file(s)...")
+        layout_store = load_layout_store()
+        file_results = process_files(
+            file_jobs,
+            exchange_rates={"EUR": 1.0, "GBP": exchange_rate_gbp_eur},
+            on_file_done=_show_file_progress,
+            known_layouts=dict(layout_store.layouts),
+        )
 
-                # Build the exchange rates dict for this file's currency
-                file_exchange_rates = {"EUR": 1.0, "GBP": exchange_rate_gbp_eur}
-                price_result = calculate_prices(
-                    dataframe,
-                    exchange_rates=file_exchange_rates,
-                    country=file_country,
+        # Remember each file's sheet layout so later uploads from the same
+        # template skip header detection, and report how many matched.
+        for file_result in file_results:
+            if file_result.layout is not None:
+                record_layout(
+                    layout_store, file_result.layout_fingerprint, file_result.layout
                 )
-                dataframe = price_result.dataframe
-                for err in price_result.errors:
-                    all_errors.append(
-                        f"{filename} row {err['row']}: {err['column']} — {err['error']}"
-                    )
+        save_layout_store(layout_store)
+        st.session_state["layout_reuse"] = {
+            "known": layout_store.session_hits,
+            "total": layout_store.session_hits + layout_store.session_misses,
+            "lifetime_hit_rate": layout_hit_rate(layout_store),
+            "distinct_layouts": len(layout_store.layouts),
+        }
 
-                # ── Step 7: Layer 1 flavor cleaning ──────────────
-                with status_container.container():
-                    st.text(f"Cleaning flavors for {filename}...")
-                dataframe = apply_layer1_to_dataframe(dataframe)
-
-                processed_dataframes.append(dataframe)
-                source_filenames.append(filename)
-                # Advance the offset so the next file's flagged items are shifted
-                # to the correct position in the merged DataFrame.
-                cumulative_row_offset += len(dataframe)
-
-                source_files_info.append({
-                    "filename": filename,
-                    "country": meta["Country"],
-                    "retailer": meta["Retailer"],
-                    "city": meta["City"],
-                    "store_name": meta.get("Store Name", ""),
-                    "store_format": meta.get("Store Format", ""),
-                    "row_count": len(dataframe),
-                    "date_processed": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                })
+        # Shift each file's FlaggedItem.row_index and changes log rows by
+        # the rows of all files before it, so they map into the merged DataFrame's global index
+        # space (merge uses ignore_index=True).  Results are in upload
+        # order, so the remapping is deterministic.
+        apply_row_offsets(file_results)
 
-            except Exception as exc:
-                error_msg = f"Error processing {filename}: {exc}"
-                logger.error(error_msg, exc_info=True)
-                all_errors.append(error_msg)
-                st.error(error_msg)
+        for file_result in file_results:
+            all_errors.extend(file_result.errors)
+
+            if file_result.status == STATUS_UNREADABLE:
+                st.warning(f"Skipping {file_result.filename} — could not read data.")
+                continue
+            if file_result.status == STATUS_FAILED:
+                st.error(file_result.errors[-1])
                 continue
 
+            processed_dataframes.append(file_result.dataframe)
+            source_filenames.append(file_result.filename)
+            all_flagged_items.extend(file_result.flagged_items)
+            extend_log(all_changes_log, file_result.changes_log)
+            source_files_info.append(file_result.source_file_info)
+
         # ── Merge all processed files ─────────────────────────
         if processed_dataframes:
             progress_bar.progress(1.0, text="Merging files...")
@@ -608,7 +557,7 @@ if (
 
             # ── Step 8: LLM cleaning — single call across all files ───────
             # All flagged items from every file have been accumulated with
-            # globally-unique row indices (shifted by cumulative_row_offset above),
+            # globally-unique row indices (shifted by apply_row_offsets above),
             # so one clean_with_llm() call resolves everything in one API round-trip.
             if all_flagged_items and api_key:
                 with st.spinner(
@@ -619,13 +568,18 @@ if (
                         merge_result.dataframe, all_flagged_items, api_key
                     )
                 merge_result.dataframe = llm_result.dataframe
+                extend_log(all_changes_log, llm_result.changes_log)
                 llm_resolved_count = len(llm_result.resolved_items)
                 llm_skipped = llm_result.skipped
                 st.session_state["total_llm_cost"] += llm_result.api_cost_estimate
                 st.session_state["total_input_tokens"] += llm_result.input_tokens
+                st.session_state["total_cached_input_tokens"] += llm_result.cached_input_tokens
                 st.session_state["total_output_tokens"] += llm_result.output_tokens
                 st.session_state["llm_failed_batches"] += llm_result.failed_batches
                 st.session_state["llm_total_batches"] += llm_result.total_batches
+                st.session_state["llm_flagged_count"] += llm_result.flagged_count
+                st.session_state["llm_unique_count"] += llm_result.unique_count
+                st.session_state["llm_cache_hits"] += llm_result.cache_hits
                 # Remove resolved items from the flagged list so they are not
                 # shown as unresolved in the quality report.
                 resolved_keys = {
@@ -760,9 +714,7 @@ if (
     if not st.session_state.get("flavor_layer2_applied"):
         if api_key:
             with st.spinner("Harmonizing flavor values with LLM..."):
-                final_df = harmonize_flavors_with_llm(
-                    final_df, api_key, "flavor_clean_cache.json"
-                )
+                final_df = harmonize_flavors_with_llm(final_df, api_key)
         else:
             # No API key — Layer 2 skipped; Flavor_Clean stays as Layer 1 output
             logger.info("Layer 2 flavor harmonization skipped — no API key")
@@ -836,7 +788,9 @@ if (
     st.header("📊 Step 2: Processing Summary")
 
     total_skus = quality_report.total_rows
-    deterministic_count = len(all_changes_log)
+    deterministic_count = len(all_changes_log) - count_changes(
+        all_changes_log, by="method"
+    ).get(LLM_CHANGE_METHOD, 0)
     flagged_count = len(all_flagged_items)
 
     # Compute percentages (guard against zero total)
@@ -869,6 +823,33 @@ if (
             delta=f"{total_in:,} in / {total_out:,} out tokens"
         )
 
+    llm_flagged = st.session_state.get("llm_flagged_count", 0)
+    llm_unique = st.session_state.get("llm_unique_count", 0)
+    if llm_unique and llm_unique < llm_flagged:
+        st.caption(
+            f"{llm_flagged:,} flagged items sent to the LLM as {llm_unique:,} "
+            f"unique items ({llm_flagged / llm_unique:.1f}x reduction)."
+        )
+    llm_cache_hits = st.session_state.get("llm_cache_hits", 0)
+    if llm_cache_hits:
+        st.caption(
+            f"{llm_cache_hits:,} of {llm_unique:,} unique items resolved from "
+            f"earlier runs' LLM decisions (no API call)."
+        )
+    total_cached_in = st.session_state.get("total_cached_input_tokens", 0)
+    if total_cached_in:
+        st.caption(
+            f"{total_cached_in:,} of {st.session_state.get('total_input_tokens', 0):,} "
+            f"LLM input tokens were read from the prompt cache (billed at ~10%)."
+        )
+    llm_calls = summarize_call_metrics().get("llm_cleaner")
+    if llm_calls:
+        st.caption(
+            f"LLM API (this server process): {llm_calls['calls']:,} calls, "
+            f"{llm_calls['retries']:,} retries, "
+            f"{llm_calls['mean_latency_seconds']:.1f}s mean latency."
+        )
+
     llm_failed = st.session_state.get("llm_failed_batches", 0)
     llm_total = st.session_state.get("llm_total_batches", 0)
     if llm_failed > 0:
@@ -892,6 +873,15 @@ if (
 
     # Expandable details
     with st.expander("View Details"):
+        layout_reuse = st.session_state.get("layout_reuse")
+        if layout_reuse and layout_reuse["total"]:
+            st.caption(
+                f"Sheet layouts: {layout_reuse['known']} of {layout_reuse['total']} "
+                f"file(s) matched a known template "
+                f"({layout_reuse['lifetime_hit_rate']:.0%} of all uploads so far, "
+                f"{layout_reuse['distinct_layouts']} distinct layouts)."
+            )
+
         st.subheader("Null Counts by Column")
         null_data = {
             "Column": list(quality_report.null_counts.keys()),
@@ -908,9 +898,8 @@ if (
 
         if all_changes_log:
             st.subheader("Normalization Log (first 50)")
-            log_preview = all_changes_log[:50]
             st.dataframe(
-                pd.DataFrame(log_preview),
+                changes_to_dataframe(all_changes_log, limit=50),
                 use_container_width=True,
                 hide_index=True,
             )
@@ -11,10 +11,20 @@ Usage:
     if result:
         brand_name, mapping, score = result
         # mapping = {"juice_extraction_method": "Squeezed", "processing_method": "Pasteurized"}
+
+Matching goes through a BrandIndex built once per country: brand names are
+lowercased and token-sorted up front, exact (case-insensitive) names are
+answered from a hash table, and the fuzzy tail is scored for a whole batch
+of inputs at once with utils.fuzzy_match.best_matches().  Results are memoized per distinct input,
+so a brand that appears on thousands of rows is matched once.  The memo
+lives as long as the process, so it is capped at _BEST_MATCHES_MAX_ENTRIES
+inputs per country; the oldest are dropped first.
 """
 
-from rapidfuzz import fuzz
 import logging
+from dataclasses import dataclass, field
+
+from utils.fuzzy_match import best_matches
 
 logger = logging.getLogger(__name__)
 
@@ -109,9 +119,65 @@ UK_BRAND_MAPPINGS = {
 DEFAULT_COUNTRY = "UK"
 BRAND_MATCHING_THRESHOLD = 85  # Minimum similarity score (0-100)
 
+# Brand mappings per country code.
 # Future expansion: Add other countries here
 # US_BRAND_MAPPINGS = {...}
 # FR_BRAND_MAPPINGS = {...}
+BRAND_MAPPINGS_BY_COUNTRY: dict[str, dict[str, dict]] = {
+    "UK": UK_BRAND_MAPPINGS,
+}
+
+
+# ---------------------------------------------------------------------------
+# Brand index
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BrandIndex:
+    """Precomputed match keys for one country's brand mappings."""
+
+    country: str
+    brand_mappings: dict[str, dict]
+    # Lowercased, token-sorted brand name → brand name (the first brand when
+    # several share a key) — the candidates inputs are scored against
+    match_candidates: dict[str, str]
+    # Lowercased brand name → the brand a full scan would pick for it
+    exact_matches: dict[str, str]
+    # Memo: stripped, lowercased input → (best brand, best score).
+    # Brand is None when nothing scored above 0.  Capped at
+    # _BEST_MATCHES_MAX_ENTRIES (see _remember_best_match).
+    best_matches: dict[str, tuple[str | None, float]] = field(default_factory=dict)
+
+
+# Built lazily, one per country code
+_BRAND_INDEXES: dict[str, BrandIndex] = {}
+
+# Cap on memoized inputs per brand index.  Every distinct spelling seen by
+# a long-running app adds an entry, so the oldest are dropped once full.
+_BEST_MATCHES_MAX_ENTRIES: int = 4_096
+
+
+def get_brand_index(country: str = DEFAULT_COUNTRY) -> BrandIndex:
+    """
+    Return the brand index for a country, building it on first use.
+
+    Countries without mappings fall back to the UK mappings (logged once).
+
+    Args:
+        country: Country code (default: "UK")
+
+    Returns:
+        The shared BrandIndex for *country*.
+    """
+    brand_index = _BRAND_INDEXES.get(country)
+    if brand_index is None:
+        brand_mappings = BRAND_MAPPINGS_BY_COUNTRY.get(country)
+        if brand_mappings is None:
+            logger.warning(f"Country '{country}' not supported yet. Defaulting to UK.")
+            brand_mappings = UK_BRAND_MAPPINGS
+        brand_index = _build_brand_index(country, brand_mappings)
+        _BRAND_INDEXES[country] = brand_index
+    return brand_index
 
 
 def match_brand(
@@ -146,47 +212,57 @@ def match_brand(
         >>> match_brand("Unknown Brand")
         None
     """
-    if not input_brand or not isinstance(input_brand, str):
-        return None
-    
-    input_brand = input_brand.strip()
-    if not input_brand:
-        return None
-    
-    # Get brand mappings for country
-    if country == "UK":
-        brand_mappings = UK_BRAND_MAPPINGS
-    else:
-        logger.warning(f"Country '{country}' not supported yet. Defaulting to UK.")
-        brand_mappings = UK_BRAND_MAPPINGS
-    
-    # Find best match using fuzzy matching
-    best_match = None
-    best_score = 0
-    best_brand = None
-    
-    for brand_name, mapping in brand_mappings.items():
-        # Use token_sort_ratio for better handling of word order variations
-        score = fuzz.token_sort_ratio(input_brand.lower(), brand_name.lower())
-        
-        if score > best_score:
-            best_score = score
-            best_match = mapping
-            best_brand = brand_name
-    
-    # Return match if above threshold
-    if best_score >= threshold:
-        logger.info(
-            f"Brand match: '{input_brand}' → '{best_brand}' "
-            f"(similarity: {best_score}%)"
-        )
-        return best_brand, best_match, best_score
-    
-    logger.debug(
-        f"No brand match for '{input_brand}' "
-        f"(best: '{best_brand}' at {best_score}%, threshold: {threshold}%)"
-    )
-    return None
+    return match_brands([input_brand], country, threshold)[0]
+
+
+def match_brands(
+    input_brands: list[str],
+    country: str = DEFAULT_COUNTRY,
+    threshold: int = BRAND_MATCHING_THRESHOLD
+) -> list[tuple[str, dict, int] | None]:
+    """
+    Match many input brands at once (see match_brand for the rules).
+
+    Inputs not seen before are scored together in one batch; repeated
+    inputs are answered from the index's memo.
+
+    Args:
+        input_brands: Brand names from data (may contain typos or blanks)
+        country: Country code for brand mapping (default: "UK")
+        threshold: Minimum similarity score 0-100 (default: 85)
+
+    Returns:
+        One match_brand() result per input, in the same order.
+    """
+    brand_index = get_brand_index(country)
+
+    queries = [
+        brand.strip().lower() if isinstance(brand, str) else ""
+        for brand in input_brands
+    ]
+    scores = _score_queries(brand_index, [query for query in queries if query])
+
+    results: list[tuple[str, dict, int] | None] = []
+    for input_brand, query in zip(input_brands, queries):
+        if not query:
+            results.append(None)
+            continue
+
+        best_brand, best_score = scores[query]
+        # Return match if above threshold
+        if best_score >= threshold:
+            results.append((
+                best_brand,
+                brand_index.brand_mappings.get(best_brand),
+                best_score,
+            ))
+        else:
+            logger.debug(
+                f"No brand match for '{input_brand.strip()}' "
+                f"(best: '{best_brand}' at {best_score}%, threshold: {threshold}%)"
+            )
+            results.append(None)
+    return results
 
 
 def get_all_brands(country: str = DEFAULT_COUNTRY) -> list[str]:
@@ -199,6 +275,79 @@ def get_all_brands(country: str = DEFAULT_COUNTRY) -> list[str]:
     Returns:
         List of brand names
     """
-    if country == "UK":
-        return list(UK_BRAND_MAPPINGS.keys())
-    return []
+    return list(BRAND_MAPPINGS_BY_COUNTRY.get(country, {}).keys())
+
+
+# ---------------------------------------------------------------------------
+# Internal helpers
+# ---------------------------------------------------------------------------
+
+def _build_brand_index(country: str, brand_mappings: dict[str, dict]) -> BrandIndex:
+    """Precompute the match candidates and exact-match table for one mapping table."""
+    match_candidates: dict[str, str] = {}
+    exact_matches: dict[str, str] = {}
+    for brand_name in brand_mappings:
+        match_key = " ".join(sorted(brand_name.lower().split()))
+        match_candidates.setdefault(match_key, brand_name)
+        exact_matches[brand_name.lower()] = match_candidates[match_key]
+
+    return BrandIndex(
+        country=country,
+        brand_mappings=brand_mappings,
+        match_candidates=match_candidates,
+        exact_matches=exact_matches,
+    )
+
+
+def _score_queries(
+    brand_index: BrandIndex,
+    queries: list[str],
+) -> dict[str, tuple[str | None, float]]:
+    """
+    Score queries, from the memo where possible, and memoize the new ones.
+
+    Exact names score 100 without fuzzy matching.  The rest are scored in
+    one best_matches() batch on the raw lowercased text (queries are
+    token-sorted by the scorer itself); the first brand with the best
+    score wins, as in a scan in mapping order.
+
+    Returns:
+        Query → (best brand, best score) for every distinct query.  Read
+        from this rather than the memo, which may already have dropped
+        some of a large batch.
+    """
+    scores: dict[str, tuple[str | None, float]] = {}
+    fuzzy_queries: list[str] = []
+    for query in dict.fromkeys(queries):
+        memoized = brand_index.best_matches.get(query)
+        exact_brand = brand_index.exact_matches.get(query)
+        if memoized is not None:
+            scores[query] = memoized
+        elif exact_brand is not None:
+            scores[query] = (exact_brand, 100.0)
+            _remember_best_match(brand_index, query, scores[query])
+        else:
+            fuzzy_queries.append(query)
+
+    fuzzy_results = best_matches(
+        fuzzy_queries, brand_index.match_candidates, threshold=0, full_process=False
+    )
+    for query, (best_brand, best_score) in zip(fuzzy_queries, fuzzy_results):
+        scores[query] = (best_brand, best_score)
+        _remember_best_match(brand_index, query, scores[query])
+        if best_brand is not None:
+            logger.debug(
+                f"Brand match: '{query}' → '{best_brand}' (similarity: {best_score}%)"
+            )
+    return scores
+
+
+def _remember_best_match(
+    brand_index: BrandIndex,
+    query: str,
+    best_match: tuple[str | None, float],
+) -> None:
+    """Add a score to the index's memo, dropping the oldest when full."""
+    if len(brand_index.best_matches) >= _BEST_MATCHES_MAX_ENTRIES:
+        del brand_index.best_matches[next(iter(brand_index.best_matches))]
+    brand_index.best_matches[query] = best_match
@@ -0,0 +1,30 @@
+"""
+LLM configuration shared by every module that calls Claude.
+
+Source of truth for: the model id, request timeout, retry policy, request
+rate cap and token pricing (including prompt-cache reads and writes).  The
+calls themselves go through utils/llm_client.py, which reads these values.
+"""
+
+# Claude model used for every LLM call in the project.
+MODEL_ID: str = "claude-sonnet-4-20250514"
+
+# Seconds before a single request is abandoned (counts as a failed attempt).
+REQUEST_TIMEOUT_SECONDS: float = 120.0
+
+# Attempts per call (first try + retries) and the jittered backoff range.
+MAX_ATTEMPTS: int = 3
+BACKOFF_BASE_SECONDS: float = 2.0
+BACKOFF_MAX_SECONDS: float = 30.0
+
+# Request rate cap shared by every call from one process: a burst of up to
+# BURST_REQUESTS, then REQUESTS_PER_SECOND on average.
+REQUESTS_PER_SECOND: float = 2.0
+BURST_REQUESTS: int = 8
+
+# Sonnet pricing in USD per million tokens (for cost estimates only).
+# Prompt-cache writes cost 1.25x the input price, cache reads 0.1x.
+INPUT_COST_PER_MTOK: float = 3.0
+CACHE_WRITE_COST_PER_MTOK: float = 3.75
+CACHE_READ_COST_PER_MTOK: float = 0.30
+OUTPUT_COST_PER_MTOK: float = 15.0
@@ -12,12 +12,14 @@ from typing import Any
 
 import pandas as pd
 
+from config.llm_config import MODEL_ID
 from config.storyline import STORYLINE, SlideConfig
+from utils.llm_client import complete
 
 logger = logging.getLogger(__name__)
 
 # Claude model for headline generation (same as used elsewhere in the project)
-HEADLINE_MODEL = "claude-sonnet-4-20250514"
+HEADLINE_MODEL = MODEL_ID
 MAX_HEADLINE_WORDS = 15
 
 
@@ -149,24 +151,16 @@ def generate_all_headlines(
         logger.info("No API key provided — using fallback title templates for headlines")
         return fallback_headlines
 
-    try:
-        import anthropic
-    except ImportError:
-        logger.warning("anthropic package not available — using fallback headlines")
-        return fallback_headlines
-
     prompt = _build_batch_prompt(slide_data)
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        response = client.messages.create(
+        response = complete(
+            prompt, api_key, max_tokens=1024, caller="headline_generator",
             model=HEADLINE_MODEL,
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
         )
 
         # Extract the text content from the response
-        response_text = response.content[0].text.strip()
+        response_text = response.text.strip()
 
         # Parse JSON response
         headlines_list = json.loads(response_text)
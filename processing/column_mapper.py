@@ -4,23 +4,36 @@ Column mapper — renames raw Excel column names to the master schema.
 Uses a three-step cascade:
   1. Exact match against known column names (case-insensitive)
   2. Known semantic renames (e.g. "Segment" → "Product Type")
-  3. Fuzzy match against master column names (thefuzz, threshold 80)
+  3. Fuzzy match against master column names (utils.fuzzy_match, threshold 80)
 
 Columns that cannot be mapped are flagged for LLM review in a later phase.
 Internal columns (prefixed with "_") are silently skipped.
 
+Store files share a handful of header layouts, so whole results are
+memoized by the full ordered header tuple: in a process-wide dict, and
+optionally on disk (one small JSON file per header layout, written
+atomically, so parallel workers can share it).  Disk entries are keyed by
+a hash of the mapping config as well, so editing config/column_mapping.py
+or config/schema.py invalidates them automatically.
+
 Public API:
-    map_columns(raw_columns) → ColumnMappingResult
+    map_columns(raw_columns, memo_dir) → ColumnMappingResult
 
 See docs/SCHEMA.md — Column Mapping table for the source of truth.
 """
 
+import dataclasses
+import hashlib
+import json
 import logging
+import os
+import tempfile
 from dataclasses import dataclass, field
+from pathlib import Path
 
 from config.column_mapping import EXACT_MATCHES, KNOWN_RENAMES
 from config.schema import MASTER_COLUMNS
-from utils.fuzzy_match import best_match
+from utils.fuzzy_match import best_matches
 
 logger = logging.getLogger(__name__)
 
@@ -43,18 +56,48 @@ class ColumnMappingResult:
     """raw_name → match confidence (100 = exact/known rename, 80-99 = fuzzy)."""
 
 
+# Version of the mapping cascade.  Bump whenever a change to this module
+# alters map_columns() output for the same headers, so cached parses
+# (processing/parse_cache.py) are invalidated.  Edits to the config tables
+# are picked up by the cache automatically.
+COLUMN_MAPPING_VERSION: int = 1
+
 # Build a fuzzy-match candidates dict: lowercase master name → proper master name.
 # Used by the fuzzy matching step.
 _MASTER_CANDIDATES: dict[str, str] = {
     col.lower(): col for col in MASTER_COLUMNS
 }
 
+# Process-wide memo: full ordered header tuple → mapping result.
+_MAPPING_MEMO: dict[tuple[str, ...], ColumnMappingResult] = {}
+_MAPPING_MEMO_MAX_ENTRIES: int = 1_024
+
+
+def _mapping_config_hash() -> str:
+    """Fingerprint the cascade version and the config tables it reads."""
+    config_source = json.dumps(
+        [
+            COLUMN_MAPPING_VERSION,
+            sorted(EXACT_MATCHES.items()),
+            sorted(KNOWN_RENAMES.items()),
+            MASTER_COLUMNS,
+        ]
+    )
+    return hashlib.sha256(config_source.encode("utf-8")).hexdigest()[:16]
+
+
+# The config tables do not change while the process runs.
+_MAPPING_CONFIG_HASH: str = _mapping_config_hash()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Public API
 # ═══════════════════════════════════════════════════════════════════════════
 
-def map_columns(raw_columns: list[str]) -> ColumnMappingResult:
+def map_columns(
+    raw_columns: list[str],
+    memo_dir: Path | None = None,
+) -> ColumnMappingResult:
     """
     Map raw Excel column names to master schema column names.
 
@@ -66,22 +109,47 @@ def map_columns(raw_columns: list[str]) -> ColumnMappingResult:
     Internal columns (starting with "_") are silently skipped and do not
     appear in the result.
 
+    A header layout seen before (same columns, same order) is answered
+    from the process-wide memo, then from the on-disk memo in *memo_dir*.
+
     Args:
         raw_columns: List of column name strings from the raw DataFrame.
+        memo_dir: On-disk memo directory.  None keeps the memo in-process.
 
     Returns:
         ColumnMappingResult with mapping dict, unmapped list, and confidence
-        scores for each mapped column.
+        scores for each mapped column.  Callers get their own copy.
     """
-    result = ColumnMappingResult()
+    header_key = tuple(raw_columns)
+
+    memoized = _MAPPING_MEMO.get(header_key)
+    if memoized is None and memo_dir is not None:
+        memoized = _load_memo_entry(header_key, memo_dir)
+        if memoized is not None:
+            _remember_mapping(header_key, memoized)
+    if memoized is not None:
+        logger.debug(f"Column mapping memo hit for {len(header_key)} columns")
+        return _copy_mapping_result(memoized)
 
-    for raw_name in raw_columns:
-        # Skip internal/placeholder columns
-        if raw_name.startswith("_"):
-            continue
+    result = _map_header(raw_columns)
+    _remember_mapping(header_key, result)
+    if memo_dir is not None and header_key:
+        _save_memo_entry(header_key, result, memo_dir)
+    return _copy_mapping_result(result)
 
-        master_name, score = _map_single_column(raw_name)
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _map_header(raw_columns: list[str]) -> ColumnMappingResult:
+    """Run the three-step cascade over one header (no memo)."""
+    result = ColumnMappingResult()
+
+    # Skip internal/placeholder columns
+    raw_names = [raw_name for raw_name in raw_columns if not raw_name.startswith("_")]
+
+    for raw_name, (master_name, score) in zip(raw_names, _map_column_names(raw_names)):
         result.mapping[raw_name] = master_name
         result.confidence[raw_name] = score
 
@@ -101,33 +169,127 @@ def map_columns(raw_columns: list[str]) -> ColumnMappingResult:
     return result
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# Internal helpers
-# ═══════════════════════════════════════════════════════════════════════════
-
-def _map_single_column(raw_name: str) -> tuple[str | None, int]:
+def _map_column_names(raw_names: list[str]) -> list[tuple[str | None, int]]:
     """
-    Map a single raw column name through the three-step cascade.
+    Map raw column names through the three-step cascade.
+
+    Names left over after the exact and known-rename lookups are fuzzy
+    matched together in one batch.
 
     Args:
-        raw_name: The raw column name from the Excel file.
+        raw_names: Raw column names from the Excel file.
 
     Returns:
-        (master_name, confidence_score) — master_name is None if no match.
+        One (master_name, confidence_score) per name — master_name is None
+        if no match.
     """
-    normalized = raw_name.strip().lower()
+    matches: list[tuple[str | None, int]] = []
+    fuzzy_positions: list[int] = []
+
+    for raw_name in raw_names:
+        normalized = raw_name.strip().lower()
+
+        # Step 1: Exact match
+        if normalized in EXACT_MATCHES:
+            matches.append((EXACT_MATCHES[normalized], 100))
+        # Step 2: Known rename
+        elif normalized in KNOWN_RENAMES:
+            matches.append((KNOWN_RENAMES[normalized], 100))
+        else:
+            fuzzy_positions.append(len(matches))
+            matches.append((None, 0))
+
+    # Step 3: Fuzzy match against master column names
+    fuzzy_matches = best_matches(
+        [raw_names[position].strip().lower() for position in fuzzy_positions],
+        _MASTER_CANDIDATES,
+        threshold=80,
+    )
+    for position, fuzzy_match in zip(fuzzy_positions, fuzzy_matches):
+        matches[position] = fuzzy_match
 
-    # Step 1: Exact match
-    if normalized in EXACT_MATCHES:
-        return EXACT_MATCHES[normalized], 100
+    return matches
 
-    # Step 2: Known rename
-    if normalized in KNOWN_RENAMES:
-        return KNOWN_RENAMES[normalized], 100
 
-    # Step 3: Fuzzy match against master column names
-    master_name, score = best_match(normalized, _MASTER_CANDIDATES, threshold=80)
-    if master_name is not None:
-        return master_name, score
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers — memo
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _copy_mapping_result(result: ColumnMappingResult) -> ColumnMappingResult:
+    """Copy a memoized result, so callers cannot change the memo."""
+    return ColumnMappingResult(
+        mapping=dict(result.mapping),
+        unmapped=list(result.unmapped),
+        confidence=dict(result.confidence),
+    )
+
+
+def _remember_mapping(header_key: tuple[str, ...], result: ColumnMappingResult) -> None:
+    """Add a result to the process-wide memo, dropping the oldest when full."""
+    if len(_MAPPING_MEMO) >= _MAPPING_MEMO_MAX_ENTRIES:
+        del _MAPPING_MEMO[next(iter(_MAPPING_MEMO))]
+    _MAPPING_MEMO[header_key] = result
 
-    return None, 0
+
+def _memo_entry_path(header_key: tuple[str, ...], memo_dir: Path) -> Path:
+    """On-disk memo file for a header under the current mapping config."""
+    signature = json.dumps([_MAPPING_CONFIG_HASH, list(header_key)])
+    digest = hashlib.sha256(signature.encode("utf-8")).hexdigest()[:32]
+    return memo_dir / f"{digest}.json"
+
+
+def _load_memo_entry(
+    header_key: tuple[str, ...],
+    memo_dir: Path,
+) -> ColumnMappingResult | None:
+    """
+    Load a header's result from the on-disk memo.
+
+    Returns:
+        The stored result, or None on a miss or an unreadable entry (logged).
+    """
+    entry_path = _memo_entry_path(header_key, memo_dir)
+    if not entry_path.exists():
+        return None
+
+    try:
+        payload = json.loads(entry_path.read_text(encoding="utf-8"))
+        if payload["raw_columns"] != list(header_key):
+            return None
+        return ColumnMappingResult(**payload["mapping"])
+    except Exception as exc:
+        logger.warning(f"Ignoring unreadable column mapping memo '{entry_path.name}': {exc}")
+        return None
+
+
+def _save_memo_entry(
+    header_key: tuple[str, ...],
+    result: ColumnMappingResult,
+    memo_dir: Path,
+) -> bool:
+    """
+    Write a header's result to the on-disk memo (atomically).
+
+    Returns:
+        True if the entry was written, False otherwise (logged).
+    """
+    entry_path = _memo_entry_path(header_key, memo_dir)
+    payload = {
+        "raw_columns": list(header_key),
+        "mapping": dataclasses.asdict(result),
+    }
+
+    try:
+        memo_dir.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_name = tempfile.mkstemp(dir=memo_dir, suffix=".json.tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as temp_file:
+                json.dump(payload, temp_file)
+            os.replace(temp_name, entry_path)
+        finally:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+    except OSError as exc:
+        logger.warning(f"Could not write column mapping memo '{entry_path.name}': {exc}")
+        return False
+    return True
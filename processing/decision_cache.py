@@ -0,0 +1,122 @@
+"""
+Decision cache — remembers LLM cleaning decisions between runs.
+
+clean_with_llm() looks up every flagged item here before building any
+batches; only items without a cached decision are sent to the API, and the
+decisions it gets back (once validated) are stored for next time.  The
+same unknown Shelf Location spelling or blank extraction method for a
+known brand therefore costs one API call ever, not one per run.
+
+Keys are opaque strings built by the caller (llm_cleaner hashes the
+column, the canonical original value, the context fields that matter for
+that column, the prompt version and the model id), so a prompt or model
+change simply stops matching old entries.
+
+Decisions live in the shared LLM result store (processing/llm_result_store.py,
+namespace "llm_decisions"), one JSON-encoded decision per key, so
+overlapping Streamlit sessions upsert their own decisions without
+overwriting each other's.  A hit records its last-used time with a point
+update; after new decisions are stored, the least recently used beyond
+max_entries are evicted.  Decisions from the old JSON cache file are
+imported once.  A store that cannot be read behaves as empty.
+
+Public API:
+    lookup_decisions(path, keys, legacy_path)       → dict[str, dict]
+    store_decisions(path, decisions, max_entries)   → bool
+"""
+
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+from processing.llm_result_store import (
+    DEFAULT_LLM_RESULT_STORE_PATH,
+    evict_least_recently_used,
+    import_legacy_json,
+    lookup_results,
+    store_results,
+    touch_results,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default location of the decisions: the shared LLM result store.
+DEFAULT_DECISION_CACHE_PATH: Path = DEFAULT_LLM_RESULT_STORE_PATH
+
+# JSON file the decision cache used to be kept in, imported once.
+LEGACY_DECISION_CACHE_PATH: Path = Path(".cache") / "llm_decision_cache.json"
+
+# Default cap on cached decisions (least recently used evicted first).
+DEFAULT_MAX_ENTRIES: int = 20_000
+
+# Namespace of the decisions in the result store.
+_STORE_NAMESPACE: str = "llm_decisions"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+def lookup_decisions(
+    path: Path | str | None,
+    keys: Iterable[str],
+    legacy_path: Path | str | None = LEGACY_DECISION_CACHE_PATH,
+) -> dict[str, dict]:
+    """
+    Return the cached decisions for *keys* and mark them as just used.
+
+    Args:
+        path: SQLite result store.  None disables the cache.
+        keys: Cache keys built by the caller.
+        legacy_path: Old JSON decision cache, imported into the store the
+            first time it is seen.  None skips the import.
+
+    Returns:
+        Key → decision dict for every key with a cached decision.
+    """
+    if path is None:
+        return {}
+
+    if legacy_path is not None:
+        import_legacy_json(path, _STORE_NAMESPACE, legacy_path, entries_key="entries")
+
+    decisions: dict[str, dict] = {}
+    for key, encoded in lookup_results(path, _STORE_NAMESPACE, keys).items():
+        try:
+            decisions[key] = json.loads(encoded)
+        except ValueError:
+            logger.warning(f"Ignoring unreadable cached decision {key[:12]}…")
+
+    touch_results(path, _STORE_NAMESPACE, decisions)
+    return decisions
+
+
+def store_decisions(
+    path: Path | str | None,
+    decisions: dict[str, dict],
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> bool:
+    """
+    Store (or replace) *decisions*, then evict beyond *max_entries*.
+
+    Args:
+        path: SQLite result store.  None disables the cache.
+        decisions: Cache key → JSON-serializable decision dict.
+        max_entries: Cap on cached decisions.
+
+    Returns:
+        True if the decisions were committed, False otherwise (logged).
+    """
+    if path is None or not decisions:
+        return False
+
+    encoded = {
+        key: json.dumps(decision, ensure_ascii=False)
+        for key, decision in decisions.items()
+    }
+    if not store_results(path, _STORE_NAMESPACE, encoded):
+        return False
+
+    evict_least_recently_used(path, _STORE_NAMESPACE, max_entries)
+    return True
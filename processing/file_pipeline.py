@@ -0,0 +1,449 @@
+"""
+Per-file pipeline — runs every stage that works on one uploaded file alone.
+
+For each file:
+    read → map columns → inject metadata → normalize → numerics → prices
+    → flavor Layer 1
+
+Reading and column mapping go through the content-addressed parse cache
+(processing/parse_cache.py), so re-uploading an unchanged file skips
+parsing entirely.
+
+Huge workbooks (consolidated national audits) can instead be run through
+the same stages chunk by chunk with process_file_chunks(), which streams
+rows from read_excel_file_chunks() and never holds the whole file.
+
+Files are independent of each other until merge_dataframes(), so these
+stages can run either one file at a time in-process, or fanned out across
+CPU cores with a process pool.  Either way, results come back in upload
+order, which keeps the cumulative row-offset remapping of each file's
+FlaggedItem.row_index and changes log rows deterministic.  Each file's
+changes are kept in a columnar ProvenanceLog (processing/provenance.py)
+tagged with the file name.
+
+Public API:
+    process_file(job, exchange_rates, known_layouts)   → FileProcessingResult
+    process_files(jobs, exchange_rates, max_workers, on_file_done, known_layouts)
+                                                       → list[FileProcessingResult]
+    process_file_chunks(job, exchange_rates, chunk_rows) → Iterator[FileProcessingResult]
+    apply_row_offsets(results)                         → None
+
+See docs/ARCHITECTURE.md — Data Flow for the stage order.
+"""
+
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from processing.column_mapper import ColumnMappingResult, map_columns
+from processing.file_reader import (
+    DEFAULT_CHUNK_ROWS,
+    SheetLayout,
+    read_excel_file_chunks,
+)
+from processing.flavor_cleaner import apply_layer1_to_dataframe
+from processing.normalizer import FlaggedItem, normalize
+from processing.numeric_converter import convert_numerics
+from processing.parse_cache import (
+    DEFAULT_CACHE_DIR,
+    mapping_memo_dir,
+    read_and_map_cached,
+)
+from processing.price_calculator import calculate_prices
+from processing.provenance import ProvenanceLog, extend_changes, offset_rows
+
+logger = logging.getLogger(__name__)
+
+# Outcome of processing one file.
+STATUS_OK: str = "ok"
+STATUS_UNREADABLE: str = "unreadable"   # reader produced no data rows
+STATUS_FAILED: str = "failed"           # a stage raised an exception
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data classes
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class FileJob:
+    """One uploaded file plus the metadata confirmed for it in the UI."""
+
+    file_path: Path
+    # Keys: File, Country, City, Retailer, Store Name, Store Format
+    metadata: dict[str, str]
+    # Parse cache directory; None disables the cache for this file
+    cache_dir: Path | None = DEFAULT_CACHE_DIR
+
+
+@dataclass
+class FileProcessingResult:
+    """Everything one file contributes to the merged dataset and its logs."""
+
+    filename: str
+    status: str = STATUS_OK
+    dataframe: pd.DataFrame = field(default_factory=pd.DataFrame)
+    # Row indices (flagged items and changes log) are local to this file
+    # until apply_row_offsets() runs
+    flagged_items: list[FlaggedItem] = field(default_factory=list)
+    changes_log: ProvenanceLog = field(default_factory=ProvenanceLog)
+    errors: list[str] = field(default_factory=list)
+    source_file_info: dict = field(default_factory=dict)
+    parse_cache_hit: bool = False
+    # Sheet layout the reader used; None if no header row was found
+    layout_fingerprint: str = ""
+    layout: SheetLayout | None = None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+def process_file(
+    job: FileJob,
+    exchange_rates: dict[str, float],
+    known_layouts: dict[str, SheetLayout] | None = None,
+) -> FileProcessingResult:
+    """
+    Run all per-file stages for one uploaded file.
+
+    Never raises: an exception in any stage is logged and reported through
+    a STATUS_FAILED result, so one bad file cannot stop the others (and
+    nothing unpicklable has to cross a process boundary).
+
+    Args:
+        job: The file path and its confirmed metadata.
+        exchange_rates: Currency code → EUR rate (e.g. {"EUR": 1.0, "GBP": 1.17}).
+        known_layouts: Layout fingerprint → SheetLayout map of layouts
+            detected earlier (see processing/layout_store.py).
+
+    Returns:
+        FileProcessingResult with the processed DataFrame, this file's
+        flagged items (row indices local to the file), changes log and
+        error messages.
+    """
+    filename = job.metadata["File"]
+    result = FileProcessingResult(filename=filename)
+
+    try:
+        _run_stages(job, exchange_rates, result, known_layouts)
+    except Exception as exc:
+        error_msg = f"Error processing {filename}: {exc}"
+        logger.error(error_msg, exc_info=True)
+        result.status = STATUS_FAILED
+        result.errors.append(error_msg)
+        # Partial output must not leak into the merge or the flagged list
+        result.dataframe = pd.DataFrame()
+        result.flagged_items = []
+        result.changes_log = ProvenanceLog()
+
+    return result
+
+
+def process_files(
+    jobs: list[FileJob],
+    exchange_rates: dict[str, float],
+    max_workers: int | None = None,
+    on_file_done: Callable[[int, int, str], None] | None = None,
+    known_layouts: dict[str, SheetLayout] | None = None,
+) -> list[FileProcessingResult]:
+    """
+    Process many files, in parallel across CPU cores when worthwhile.
+
+    With more than one worker, files are dispatched to a process pool and
+    collected as they finish; with one worker (or one file) they run
+    in-process, one after another.  Results are always returned in the
+    order of *jobs*, whatever order the workers finished in.
+
+    Args:
+        jobs: Files to process, in upload order.
+        exchange_rates: Currency code → EUR rate, shared by every file.
+        max_workers: Worker process cap.  None → one per CPU core.
+        on_file_done: Optional callback(done_count, total, filename) called
+            in the calling process as each file finishes (for progress bars).
+        known_layouts: Layout fingerprint → SheetLayout map shared by every
+            file (a snapshot — workers do not see each other's layouts).
+
+    Returns:
+        One FileProcessingResult per job, in the same order as *jobs*.
+    """
+    total = len(jobs)
+    worker_count = min(total, max_workers or os.cpu_count() or 1)
+    results: list[FileProcessingResult | None] = [None] * total
+
+    if worker_count <= 1:
+        for job_idx, job in enumerate(jobs):
+            results[job_idx] = process_file(job, exchange_rates, known_layouts)
+            if on_file_done:
+                on_file_done(job_idx + 1, total, job.metadata["File"])
+        return results
+
+    logger.info(f"Processing {total} files across {worker_count} worker processes")
+
+    # "spawn" gives every worker a clean interpreter — forking a process
+    # that runs Streamlit's server threads is not safe.
+    pool_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=worker_count, mp_context=pool_context) as pool:
+        future_to_idx = {
+            pool.submit(process_file, job, exchange_rates, known_layouts): job_idx
+            for job_idx, job in enumerate(jobs)
+        }
+        for done_count, future in enumerate(as_completed(future_to_idx), start=1):
+            job_idx = future_to_idx[future]
+            results[job_idx] = future.result()
+            if on_file_done:
+                on_file_done(done_count, total, jobs[job_idx].metadata["File"])
+
+    return results
+
+
+def process_file_chunks(
+    job: FileJob,
+    exchange_rates: dict[str, float],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    known_layouts: dict[str, SheetLayout] | None = None,
+) -> Iterator[FileProcessingResult]:
+    """
+    Run all per-file stages over one file, one chunk of rows at a time.
+
+    Rows are streamed with read_excel_file_chunks(); columns are mapped once
+    from the header, then every chunk goes through metadata → normalize →
+    numerics → prices → Layer 1 on its own.  Chunk DataFrames keep the
+    file-wide row index, so FlaggedItem.row_index and changes_log rows are
+    already local to the file (as with process_file()), and only one chunk
+    is in memory at a time.  The concatenated chunks equal process_file()'s
+    DataFrame; flagged items and changes are the same entries, ordered
+    chunk by chunk.  The parse cache is not used (the column mapping memo
+    is).
+
+    Like process_file(), never raises: a failing chunk yields one
+    STATUS_FAILED result and ends the stream.
+
+    Args:
+        job: The file path and its confirmed metadata.
+        exchange_rates: Currency code → EUR rate (e.g. {"EUR": 1.0, "GBP": 1.17}).
+        chunk_rows: Maximum number of data rows per chunk.
+        known_layouts: Layout fingerprint → SheetLayout map of layouts
+            detected earlier (see processing/layout_store.py).
+
+    Yields:
+        One FileProcessingResult per chunk.  source_file_info.row_count is
+        the number of rows processed so far.
+    """
+    filename = job.metadata["File"]
+    mapping_result: ColumnMappingResult | None = None
+    rows_processed = 0
+
+    try:
+        for read_chunk in read_excel_file_chunks(job.file_path, chunk_rows, known_layouts):
+            result = FileProcessingResult(
+                filename=filename,
+                layout_fingerprint=read_chunk.layout_fingerprint,
+            )
+            if read_chunk.header_row_index:
+                result.layout = SheetLayout(
+                    header_row=read_chunk.header_row_index,
+                    data_start_column=read_chunk.data_start_column,
+                    column_names=read_chunk.column_names,
+                )
+            for error in read_chunk.errors:
+                result.errors.append(f"{filename}: {error}")
+            if read_chunk.errors and read_chunk.raw_dataframe.empty and not rows_processed:
+                result.status = STATUS_UNREADABLE
+                yield result
+                return
+
+            if mapping_result is None:
+                mapping_result = map_columns(
+                    read_chunk.raw_dataframe.columns.tolist(),
+                    mapping_memo_dir(job.cache_dir),
+                )
+
+            dataframe = _map_to_master_columns(read_chunk.raw_dataframe, mapping_result)
+            dataframe = _run_row_stages(dataframe, job.metadata, exchange_rates, result)
+
+            rows_processed += len(dataframe)
+            result.source_file_info["row_count"] = rows_processed
+            yield result
+    except Exception as exc:
+        error_msg = f"Error processing {filename} (after {rows_processed} rows): {exc}"
+        logger.error(error_msg, exc_info=True)
+        yield FileProcessingResult(
+            filename=filename, status=STATUS_FAILED, errors=[error_msg]
+        )
+
+
+def apply_row_offsets(results: list[FileProcessingResult]) -> None:
+    """
+    Shift each file's flagged and changed row indices into the merged
+    DataFrame's index.
+
+    merge_dataframes() concatenates the successful files in order with
+    ignore_index=True, so a file's rows start after the rows of every
+    successful file before it.  Mutates the FlaggedItems and changes logs
+    in place.
+
+    Args:
+        results: Per-file results in upload order (as from process_files).
+    """
+    cumulative_row_offset = 0
+    for result in results:
+        if result.status != STATUS_OK:
+            continue
+        for item in result.flagged_items:
+            item.row_index += cumulative_row_offset
+        offset_rows(result.changes_log, cumulative_row_offset)
+        cumulative_row_offset += len(result.dataframe)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _run_stages(
+    job: FileJob,
+    exchange_rates: dict[str, float],
+    result: FileProcessingResult,
+    known_layouts: dict[str, SheetLayout] | None,
+) -> None:
+    """
+    Run read → map → metadata → normalize → numerics → prices → Layer 1.
+
+    Fills *result* in place.  Exceptions propagate to process_file().
+    """
+    filename = result.filename
+    meta = job.metadata
+
+    # ── Steps 1–2: Read Excel file + map columns (parse-cached) ───
+    parsed = read_and_map_cached(job.file_path, job.cache_dir, known_layouts)
+    read_result = parsed.read_result
+    result.parse_cache_hit = parsed.cache_hit
+    result.layout_fingerprint = read_result.layout_fingerprint
+    if read_result.header_row_index:
+        result.layout = SheetLayout(
+            header_row=read_result.header_row_index,
+            data_start_column=read_result.data_start_column,
+            column_names=read_result.column_names,
+        )
+    for error in read_result.errors:
+        result.errors.append(f"{filename}: {error}")
+    if read_result.errors and read_result.raw_dataframe.empty:
+        result.status = STATUS_UNREADABLE
+        return
+
+    dataframe = _map_to_master_columns(
+        read_result.raw_dataframe, parsed.mapping_result
+    )
+
+    # ── Steps 3–7: metadata, normalize, numerics, prices, Layer 1 ─
+    _run_row_stages(dataframe, meta, exchange_rates, result)
+
+
+def _run_row_stages(
+    dataframe: pd.DataFrame,
+    meta: dict[str, str],
+    exchange_rates: dict[str, float],
+    result: FileProcessingResult,
+) -> pd.DataFrame:
+    """
+    Run metadata → normalize → numerics → prices → Layer 1 on mapped rows.
+
+    Every stage works row by row, so this runs the same on a whole file or
+    on one chunk of it.  Fills *result* (dataframe, flagged items, changes
+    log, errors, source file info) in place.
+
+    Returns:
+        The processed DataFrame (also stored on *result*).
+    """
+    filename = result.filename
+
+    # ── Step 3: Inject per-file metadata ──────────────────────────
+    dataframe = _inject_file_metadata(dataframe, meta)
+
+    # ── Step 4: Normalize categorical values ──────────────────────
+    norm_result = normalize(dataframe)
+    dataframe = norm_result.dataframe
+    result.flagged_items = norm_result.flagged_items
+    extend_changes(result.changes_log, norm_result.changes_log, source=filename)
+
+    # ── Step 5: Convert numeric columns ───────────────────────────
+    numeric_result = convert_numerics(dataframe)
+    dataframe = numeric_result.dataframe
+    for err in numeric_result.errors:
+        result.errors.append(
+            f"{filename} row {err['row']}: {err['column']} — {err['error']}"
+        )
+
+    # ── Step 6: Calculate prices ──────────────────────────────────
+    price_result = calculate_prices(
+        dataframe,
+        exchange_rates=exchange_rates,
+        country=meta["Country"],
+    )
+    dataframe = price_result.dataframe
+    for err in price_result.errors:
+        result.errors.append(
+            f"{filename} row {err['row']}: {err['column']} — {err['error']}"
+        )
+
+    # ── Step 7: Layer 1 flavor cleaning ───────────────────────────
+    dataframe = apply_layer1_to_dataframe(dataframe)
+
+    result.dataframe = dataframe
+    result.source_file_info = {
+        "filename": filename,
+        "country": meta["Country"],
+        "retailer": meta["Retailer"],
+        "city": meta["City"],
+        "store_name": meta.get("Store Name", ""),
+        "store_format": meta.get("Store Format", ""),
+        "row_count": len(dataframe),
+        "date_processed": datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
+    return dataframe
+
+
+def _map_to_master_columns(
+    raw_dataframe: pd.DataFrame,
+    mapping_result: ColumnMappingResult,
+) -> pd.DataFrame:
+    """
+    Rename raw columns to master schema names and drop internal "_" columns.
+    """
+    rename_map = {
+        raw: master
+        for raw, master in mapping_result.mapping.items()
+        if master is not None
+    }
+    dataframe = raw_dataframe.rename(columns=rename_map)
+
+    # Drop internal columns that start with "_"
+    internal_cols = [c for c in dataframe.columns if c.startswith("_")]
+    return dataframe.drop(columns=internal_cols, errors="ignore")
+
+
+def _inject_file_metadata(
+    dataframe: pd.DataFrame,
+    meta: dict[str, str],
+) -> pd.DataFrame:
+    """
+    Add the UI-confirmed store metadata columns and ensure the columns that
+    normalize() expects exist.
+    """
+    dataframe["Retailer"] = meta["Retailer"]
+    dataframe["City"] = meta["City"]
+    dataframe["Country"] = meta["Country"]
+    dataframe["Store Name"] = meta.get("Store Name") or None
+    dataframe["Store Format"] = meta.get("Store Format") or None
+
+    for column in ("Product Name", "Flavor", "Juice Extraction Method"):
+        if column not in dataframe.columns:
+            dataframe[column] = None
+
+    return dataframe
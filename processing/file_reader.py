@@ -13,24 +13,67 @@ Also detects "context-only rows" (photo/location metadata with no SKU data)
 and carries their metadata forward to subsequent data rows, identical to how
 merged section separators work.
 
+Workbooks are read in two phases so the full openpyxl object model (styles,
+cell objects) is never built:
+  1. Pre-scan — the sheet XML is scanned for its <mergeCells> ranges, which
+     is all that structure B/C detection needs from the cell layout.
+  2. Stream — cell values are streamed through openpyxl's read_only mode.
+The sheet is walked exactly once, top to bottom, in values-only order: the
+first rows are buffered for header detection, then the same row stream
+continues into the extraction loop.  This keeps ingest time linear in the
+number of rows and peak memory low, even for multi-thousand-row audits.
+
+Files exported from the same template share a layout.  The buffered leading
+rows and the merged ranges are reduced to a layout fingerprint (which known
+header names sit where, plus the separator geometry); when the caller passes
+layouts already detected for that fingerprint, the stored header row, data
+start column and column names are reused instead of re-running header
+detection.  A reused layout is only accepted if the stored header row still
+reads back the same column names.  Collecting layouts and reporting how
+often they are reused is processing/layout_store.py's job.
+
+For very large audits, read_excel_file_chunks() runs the same single pass
+but hands data rows out in fixed-size DataFrame chunks instead of building
+one DataFrame, so memory stays bounded by the chunk size.
+
 Public API:
-    read_excel_file(file_path) → FileReadResult
+    read_excel_file(file_path, known_layouts)                     → FileReadResult
+    read_excel_file_chunks(file_path, chunk_rows, known_layouts)  → Iterator[FileReadResult]
 
 See docs/ARCHITECTURE.md for module responsibilities.
 """
 
+import bisect
+import dataclasses
+import hashlib
+import itertools
+import json
 import logging
 import re
+import zipfile
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
+from xml.etree import ElementTree
 
+import numpy as np
 import openpyxl
 import pandas as pd
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from openpyxl.worksheet.cell_range import CellRange
 
-from config.column_mapping import KNOWN_HEADER_NAMES
+from config.column_mapping import EXACT_MATCHES, KNOWN_HEADER_NAMES, KNOWN_RENAMES
+from config.schema import COLUMN_TYPES
 
 logger = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# Version of the reader's output.  Bump whenever a change to this module
+# alters what read_excel_file() returns for the same file, so cached parses
+# (processing/parse_cache.py) are invalidated.
+# ---------------------------------------------------------------------------
+READER_VERSION: int = 5
+
 # ---------------------------------------------------------------------------
 # Minimum number of non-empty cells for a row to be considered data.
 # Rows with fewer populated cells are skipped (catches empty rows and
@@ -42,6 +85,43 @@ MIN_CELLS_FOR_DATA_ROW: int = 3
 # names for the row to be classified as a header.
 HEADER_MATCH_THRESHOLD: int = 5
 
+# Default number of data rows per chunk for read_excel_file_chunks().
+DEFAULT_CHUNK_ROWS: int = 5_000
+
+# Only the first rows are scanned for the header — headers are always near
+# the top.  These rows are buffered so the sheet is still walked only once.
+HEADER_SCAN_ROWS: int = 30
+
+# A merged range spanning at least this many columns (and a single row) is a
+# section separator — separators stretch across the data width (23+ cols).
+MIN_SEPARATOR_COLUMN_SPAN: int = 10
+
+# OOXML relationship-id attribute on <sheet> elements in xl/workbook.xml.
+_RELATIONSHIP_ID_ATTR: str = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+)
+
+# Expected value type ("text" / "integer" / "float") per lowercase header
+# name, from the master schema type of the column it maps to.  Used as a
+# fast path when building the output columns (see _build_column).
+_COLUMN_TYPE_HINTS: dict[str, str] = {
+    raw_name: COLUMN_TYPES[master_name]
+    for raw_name, master_name in {
+        **{master_name.lower(): master_name for master_name in COLUMN_TYPES},
+        **EXACT_MATCHES,
+        **KNOWN_RENAMES,
+    }.items()
+}
+
+# Section metadata fields that fill blank data cells: candidate header
+# names (lowercase, first present wins) → SectionMetadata attribute.
+_SECTION_DEFAULT_FIELDS: list[tuple[list[str], str]] = [
+    (["photo file name", "photo"], "photo"),
+    (["shelf location"], "shelf_location"),
+    (["est. linear meters"], "est_linear_meters"),
+    (["shelf levels"], "shelf_levels"),
+]
+
 # Column names that indicate SKU-level product data (not just section context).
 # If a row has none of these populated, it's a context row, not a data row.
 _SKU_INDICATOR_COLUMNS: set[str] = {"brand", "flavor", "facings", "segment",
@@ -65,6 +145,15 @@ class SectionMetadata:
     end_row: int = 0     # 1-based Excel row where section data ends
 
 
+@dataclass
+class SheetLayout:
+    """Where a sheet's first header sits and what its columns are called."""
+
+    header_row: int = 0          # 1-based Excel row of the first header
+    data_start_column: int = 0   # 0-based column offset (0=A, 5=F, 6=G)
+    column_names: list[str] = field(default_factory=list)
+
+
 @dataclass
 class FileReadResult:
     """Complete result of reading one Excel file."""
@@ -73,17 +162,33 @@ class FileReadResult:
     sections: list[SectionMetadata] = field(default_factory=list)
     header_row_index: int = 0            # 1-based Excel row of the first header
     data_start_column: int = 0           # 0-based column offset (0=A, 5=F, 6=G)
+    column_names: list[str] = field(default_factory=list)  # first header row
+    layout_fingerprint: str = ""         # see _layout_fingerprint()
+    layout_reused: bool = False          # True → a stored layout was reused
     sheet_name: str = ""
     total_rows_read: int = 0
     skipped_rows: list[dict] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
 
 
+@dataclass
+class _OpenSheet:
+    """A sheet positioned just below its first header, ready for extraction."""
+
+    workbook: openpyxl.Workbook
+    rows: Iterator[tuple[int, tuple]]   # remaining (row_number, values) pairs
+    separator_index: dict[int, tuple[int, SectionMetadata]]
+    sections: list[SectionMetadata]     # merged separator sections
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Public API
 # ═══════════════════════════════════════════════════════════════════════════
 
-def read_excel_file(file_path: Path) -> FileReadResult:
+def read_excel_file(
+    file_path: Path,
+    known_layouts: dict[str, SheetLayout] | None = None,
+) -> FileReadResult:
     """
     Read a raw shelf analysis Excel file and extract structured data.
 
@@ -93,87 +198,33 @@ def read_excel_file(file_path: Path) -> FileReadResult:
 
     Args:
         file_path: Path to the .xlsx file.
+        known_layouts: Optional layout fingerprint → SheetLayout map of
+            layouts detected earlier.  A matching, still-valid layout is
+            reused instead of running header detection.
 
     Returns:
         FileReadResult containing the raw DataFrame, section metadata,
         structural info, and any errors encountered.
     """
-    result = FileReadResult()
-
-    # ------------------------------------------------------------------
-    # 1. Open workbook
-    # ------------------------------------------------------------------
-    try:
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-    except Exception as exc:
-        error_message = f"Cannot open file '{file_path.name}': {exc}"
-        logger.error(error_message)
-        result.errors.append(error_message)
-        return result
-
-    # ------------------------------------------------------------------
-    # 2. Select the right sheet (prefer "SKU Data", fall back to first)
-    # ------------------------------------------------------------------
-    worksheet, sheet_name = _select_worksheet(workbook)
-    result.sheet_name = sheet_name
-    logger.info(f"Reading sheet '{sheet_name}' from '{file_path.name}'")
-
-    # ------------------------------------------------------------------
-    # 3. Detect merged-cell section separators
-    # ------------------------------------------------------------------
-    merged_separator_rows = _detect_merged_separators(worksheet)
-    merged_row_numbers: set[int] = {row_num for row_num, _ in merged_separator_rows}
-
-    # ------------------------------------------------------------------
-    # 4. Find the first header row (and data start column)
-    # ------------------------------------------------------------------
-    header_row, data_start_col = _find_header_row(
-        worksheet, KNOWN_HEADER_NAMES, merged_row_numbers
-    )
-
-    if header_row == 0:
-        error_message = (
-            f"No header row found in '{file_path.name}'. "
-            "Could not detect columns matching the known schema."
-        )
-        logger.error(error_message)
-        result.errors.append(error_message)
-        workbook.close()
+    result, sheet = _open_sheet(file_path, known_layouts)
+    if sheet is None:
         return result
 
-    result.header_row_index = header_row
-    result.data_start_column = data_start_col
-    logger.info(
-        f"Header found at row {header_row}, data starts at column "
-        f"{'ABCDEFGHIJKLMNOPQRSTUVWXYZ'[data_start_col]} (offset={data_start_col})"
-    )
-
-    # ------------------------------------------------------------------
-    # 5. Read column names from the first header row
-    # ------------------------------------------------------------------
-    column_names = _read_header_columns(worksheet, header_row, data_start_col)
-
-    # ------------------------------------------------------------------
-    # 6. Parse section metadata from merged separators
-    # ------------------------------------------------------------------
-    sections = _build_section_list(
-        merged_separator_rows, worksheet.max_row
-    )
-
     # ------------------------------------------------------------------
-    # 7. Walk all rows: classify, extract data, carry forward metadata
+    # 7. Walk the remaining rows: classify, extract data, carry forward
+    #    metadata — continuing the same stream that step 4 started
     # ------------------------------------------------------------------
     raw_dataframe, skipped_rows, context_sections = _extract_rows_to_dataframe(
-        worksheet=worksheet,
-        column_names=column_names,
-        header_row=header_row,
-        data_start_col=data_start_col,
-        merged_row_numbers=merged_row_numbers,
-        sections=sections,
+        rows=sheet.rows,
+        column_names=result.column_names,
+        header_row=result.header_row_index,
+        data_start_col=result.data_start_column,
+        separator_index=sheet.separator_index,
+        sections=sheet.sections,
     )
 
     # Combine merged-cell sections with context-row sections
-    all_sections = sections + context_sections
+    all_sections = sheet.sections + context_sections
     all_sections.sort(key=lambda s: s.start_row)
 
     result.raw_dataframe = raw_dataframe
@@ -186,17 +237,251 @@ def read_excel_file(file_path: Path) -> FileReadResult:
         f"{len(all_sections)} sections, {len(skipped_rows)} rows skipped"
     )
 
-    workbook.close()
+    sheet.workbook.close()
     return result
 
 
+def read_excel_file_chunks(
+    file_path: Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    known_layouts: dict[str, SheetLayout] | None = None,
+) -> Iterator[FileReadResult]:
+    """
+    Read a shelf analysis Excel file as a stream of DataFrame chunks.
+
+    Same detection and row classification as read_excel_file(), but data
+    rows are handed out every *chunk_rows* rows instead of being collected
+    into one DataFrame, so memory stays bounded for very large audits.
+
+    Every chunk has the same columns in the same order (the header columns
+    plus _source_row) and a RangeIndex that continues where the previous
+    chunk stopped.  Concatenating the chunks therefore gives the rows of
+    read_excel_file(), and row-indexed results of downstream stages
+    (FlaggedItem.row_index, changes_log rows) computed per chunk line up
+    with the whole file.
+
+    Args:
+        file_path: Path to the .xlsx file.
+        chunk_rows: Maximum number of data rows per chunk.
+        known_layouts: Optional layout fingerprint → SheetLayout map (see
+            read_excel_file).
+
+    Yields:
+        One FileReadResult per chunk.  Header fields are repeated on every
+        chunk; sections and skipped_rows hold only those met while reading
+        that chunk; total_rows_read counts data rows up to and including
+        the chunk; errors appear on the first chunk.  A file that cannot
+        be read yields a single result with errors and no data.
+
+    Raises:
+        ValueError: If *chunk_rows* is less than 1.
+    """
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+
+    result, sheet = _open_sheet(file_path, known_layouts)
+    if sheet is None:
+        yield result
+        return
+
+    skipped_rows: list[dict] = []
+    context_sections: list[SectionMetadata] = []
+    # Separators above the header were parsed while opening the sheet;
+    # they are reported with the first chunk.
+    reached_separators: list[SectionMetadata] = [
+        section
+        for row_num, (_, section) in sheet.separator_index.items()
+        if row_num <= result.header_row_index
+    ]
+    data_rows = _iter_data_rows(
+        rows=sheet.rows,
+        column_names=result.column_names,
+        header_row=result.header_row_index,
+        data_start_col=result.data_start_column,
+        separator_index=sheet.separator_index,
+        sections=sheet.sections,
+        skipped_rows=skipped_rows,
+        context_sections=context_sections,
+        reached_separators=reached_separators,
+    )
+    chunk_columns = list(dict.fromkeys(result.column_names)) + ["_source_row"]
+    column_count = len(result.column_names)
+
+    rows_emitted = 0
+    chunk_count = 0
+    try:
+        while True:
+            column_values, source_rows = _collect_columns(
+                itertools.islice(data_rows, chunk_rows), column_count
+            )
+            chunk_size = len(source_rows)
+            is_last_chunk = chunk_size < chunk_rows
+            has_metadata = bool(skipped_rows or context_sections or reached_separators)
+            if is_last_chunk and not chunk_size and not has_metadata and chunk_count:
+                break
+
+            if chunk_size:
+                chunk_dataframe = _build_dataframe(column_values, source_rows, result.column_names)
+            else:
+                chunk_dataframe = pd.DataFrame(columns=chunk_columns)
+            chunk_dataframe.index = pd.RangeIndex(rows_emitted, rows_emitted + chunk_size)
+
+            chunk_sections = reached_separators + context_sections
+            chunk_sections.sort(key=lambda s: s.start_row)
+            yield dataclasses.replace(
+                result,
+                raw_dataframe=chunk_dataframe,
+                sections=chunk_sections,
+                total_rows_read=rows_emitted + chunk_size,
+                skipped_rows=list(skipped_rows),
+                errors=list(result.errors) if chunk_count == 0 else [],
+            )
+
+            rows_emitted += chunk_size
+            chunk_count += 1
+            skipped_rows.clear()
+            context_sections.clear()
+            reached_separators.clear()
+            if is_last_chunk:
+                break
+    finally:
+        sheet.workbook.close()
+
+    logger.info(
+        f"Finished reading '{file_path.name}' in {chunk_count} chunk(s): "
+        f"{rows_emitted} data rows"
+    )
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Internal helpers
 # ═══════════════════════════════════════════════════════════════════════════
 
+# ── Opening a sheet ────────────────────────────────────────────────────
+
+def _open_sheet(
+    file_path: Path,
+    known_layouts: dict[str, SheetLayout] | None,
+) -> tuple[FileReadResult, _OpenSheet | None]:
+    """
+    Open a workbook and run everything before row extraction.
+
+    Selects the sheet, pre-scans merged ranges, finds (or reuses) the
+    header layout and builds the merged separator sections.
+
+    Args:
+        file_path: Path to the .xlsx file.
+        known_layouts: Layout fingerprint → SheetLayout map (may be None).
+
+    Returns:
+        (result, sheet) — *result* holds the sheet name, header position,
+        column names, layout fingerprint and errors so far.  *sheet* is
+        None if the file could not be opened or has no header row;
+        otherwise the caller must close sheet.workbook.
+    """
+    result = FileReadResult()
+    opened = _open_worksheet(file_path, result)
+    if opened is None:
+        return result, None
+    workbook, worksheet = opened
+
+    merged_ranges = _scan_merged_ranges_or_warn(file_path, result)
+    merged_separator_rows = _detect_merged_separators(merged_ranges)
+
+    # One values-only pass over the sheet: buffer the leading rows for
+    # header detection, then hand the rest of the same stream on.
+    row_stream = _iter_row_values(worksheet)
+    leading_rows = list(itertools.islice(row_stream, HEADER_SCAN_ROWS))
+    header = _detect_header(file_path, leading_rows, merged_separator_rows, result)
+    if header is None:
+        workbook.close()
+        return result, None
+    layout = _resolve_layout(
+        file_path, leading_rows, header, merged_ranges, known_layouts, result
+    )
+
+    rows_above_header = leading_rows[:layout.header_row]
+    sections, separator_index = _index_separators(merged_separator_rows, rows_above_header)
+    rows_after_header = _close_last_section(
+        itertools.chain(leading_rows[layout.header_row:], row_stream),
+        sections,
+        last_row=max((row_idx for row_idx, values in rows_above_header if values), default=0),
+    )
+    return result, _OpenSheet(workbook=workbook, rows=rows_after_header,
+                              separator_index=separator_index, sections=sections)
+
+
+def _open_worksheet(
+    file_path: Path,
+    result: FileReadResult,
+) -> tuple[openpyxl.Workbook, ReadOnlyWorksheet] | None:
+    """
+    Open the workbook read-only and select the sheet to read.
+
+    Prefers the "SKU Data" sheet (see _select_worksheet) and records its
+    name on *result*.
+
+    Args:
+        file_path: Path to the .xlsx file.
+        result: Read result; gets the sheet name, or the error if the file
+            cannot be opened.
+
+    Returns:
+        (workbook, worksheet), or None if the file cannot be opened.
+    """
+    try:
+        # Read-only: values are streamed, no styles loaded
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    except Exception as exc:
+        error_message = f"Cannot open file '{file_path.name}': {exc}"
+        logger.error(error_message)
+        result.errors.append(error_message)
+        return None
+
+    worksheet, result.sheet_name = _select_worksheet(workbook)
+    # The <dimension> tag is written by whatever tool saved the file and
+    # can be stale; read-only iter_rows() would stop at its bounds.  Drop
+    # it so the stream runs to the last row and cell actually present.
+    worksheet.reset_dimensions()
+    logger.info(f"Reading sheet '{result.sheet_name}' from '{file_path.name}'")
+    return workbook, worksheet
+
+
+def _scan_merged_ranges_or_warn(
+    file_path: Path,
+    result: FileReadResult,
+) -> list[CellRange]:
+    """
+    Pre-scan the merged ranges of the selected sheet.
+
+    Read-only worksheets do not expose merged cells, so the ranges are
+    pulled straight from the sheet XML.  Separator text is filled in
+    later, when the row stream reaches each separator row.
+
+    Args:
+        file_path: Path to the .xlsx file.
+        result: Read result holding the sheet name; gets a warning if the
+            scan fails.
+
+    Returns:
+        The merged ranges, or an empty list if the XML could not be scanned
+        (section separators are then not detected).
+    """
+    try:
+        return _scan_merged_ranges(file_path, result.sheet_name)
+    except Exception as exc:
+        error_message = (
+            f"Could not scan merged cells in '{file_path.name}': {exc}. "
+            "Section separators will not be detected."
+        )
+        logger.warning(error_message)
+        result.errors.append(error_message)
+        return []
+
+
 def _select_worksheet(
     workbook: openpyxl.Workbook,
-) -> tuple[openpyxl.worksheet.worksheet.Worksheet, str]:
+) -> tuple[ReadOnlyWorksheet, str]:
     """
     Pick the worksheet to read.
 
@@ -217,35 +502,146 @@ def _select_worksheet(
     return workbook[first_name], first_name
 
 
+def _close_last_section(
+    rows: Iterator[tuple[int, tuple]],
+    sections: list[SectionMetadata],
+    last_row: int,
+) -> Iterator[tuple[int, tuple]]:
+    """
+    Pass the row stream through and end the last section at its final row.
+
+    The sheet's real last row is only known once the stream runs out, so
+    the last merged section's end_row is filled in then.  It is the last
+    row holding any cell: the read-only stream also returns trailing rows
+    that only carry row formatting, and those come through with no cells.
+
+    Args:
+        rows: (row_number, values) pairs, in sheet order.
+        sections: Merged-separator sections from _build_section_list.
+        last_row: Last row with cells streamed before *rows* (0 if none).
+
+    Yields:
+        The pairs of *rows*, unchanged.
+    """
+    for row_idx, row_values in rows:
+        if row_values:
+            last_row = row_idx
+        yield row_idx, row_values
+
+    if sections:
+        sections[-1].end_row = last_row
+
+
+def _iter_row_values(
+    worksheet: ReadOnlyWorksheet,
+) -> Iterator[tuple[int, tuple]]:
+    """
+    Walk the worksheet once, top to bottom, yielding plain cell values.
+
+    Every row starts at column A, so positional indexing into the values
+    matches openpyxl's 1-based columns (value at index i is column i + 1).
+    The sheet's dimensions are reset before reading, so each row only runs
+    to its own last cell; missing rows come through empty.
+
+    Yields:
+        (row_number, values) — row_number is the 1-based Excel row.
+    """
+    yield from enumerate(worksheet.iter_rows(values_only=True), start=1)
+
+
 # ── Merged separator detection ─────────────────────────────────────────
 
+def _scan_merged_ranges(file_path: Path, sheet_name: str) -> list[CellRange]:
+    """
+    Pull the merged-cell ranges of one sheet straight from the .xlsx package.
+
+    The sheet XML is parsed incrementally and each element is discarded as
+    soon as it is read, so no cell objects are built.  <mergeCells> follows
+    <sheetData>, and parsing stops once it is complete.
+
+    Args:
+        file_path: Path to the .xlsx file.
+        sheet_name: Name of the worksheet to scan.
+
+    Returns:
+        List of merged CellRange objects (1-based rows/columns).
+    """
+    merged_ranges: list[CellRange] = []
+
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_xml_path = _find_sheet_xml_path(archive, sheet_name)
+        with archive.open(sheet_xml_path) as sheet_xml:
+            for _, element in ElementTree.iterparse(sheet_xml, events=("end",)):
+                tag = element.tag.rpartition("}")[2]
+                if tag == "mergeCell" and element.get("ref"):
+                    merged_ranges.append(CellRange(element.get("ref")))
+                elif tag == "mergeCells":
+                    break
+                elif tag == "row":
+                    # Drop parsed cells — only the merge ranges are kept
+                    element.clear()
+
+    return merged_ranges
+
+
+def _find_sheet_xml_path(archive: zipfile.ZipFile, sheet_name: str) -> str:
+    """
+    Resolve a sheet name to the path of its XML part inside the package.
+
+    Follows xl/workbook.xml (sheet name → relationship id) and
+    xl/_rels/workbook.xml.rels (relationship id → target part).
+
+    Raises:
+        KeyError: If the sheet or its relationship cannot be found.
+    """
+    workbook_xml = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    relationships_xml = ElementTree.fromstring(
+        archive.read("xl/_rels/workbook.xml.rels")
+    )
+
+    relationship_id = None
+    for element in workbook_xml.iter():
+        if element.tag.rpartition("}")[2] == "sheet" and element.get("name") == sheet_name:
+            relationship_id = element.get(_RELATIONSHIP_ID_ATTR)
+            break
+
+    for relationship in relationships_xml:
+        if relationship.get("Id") == relationship_id:
+            target = relationship.get("Target", "")
+            # Targets are relative to xl/ unless given as absolute part names
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return f"xl/{target}"
+
+    raise KeyError(f"No worksheet part found for sheet '{sheet_name}'")
+
+
 def _detect_merged_separators(
-    worksheet: openpyxl.worksheet.worksheet.Worksheet,
-) -> list[tuple[int, str]]:
+    merged_ranges: list[CellRange],
+) -> list[tuple[int, int]]:
     """
     Find all rows that are wide merged cells acting as section separators.
 
-    A merged range qualifies as a separator if it spans at least 10 columns
-    (these separators stretch across the entire data width, typically 23+ cols).
+    A merged range qualifies as a separator if it spans at least
+    MIN_SEPARATOR_COLUMN_SPAN columns and exactly one row.
+
+    Args:
+        merged_ranges: Merged ranges from _scan_merged_ranges.
 
     Returns:
-        Sorted list of (row_number, cell_text) for each separator.
+        Sorted list of (row_number, text_column) for each separator, where
+        text_column is the 0-based column of the range's top-left cell —
+        the only cell in which Excel stores the merged value.
     """
-    separators: list[tuple[int, str]] = []
+    separators: list[tuple[int, int]] = []
 
-    for merged_range in worksheet.merged_cells.ranges:
+    for merged_range in merged_ranges:
         column_span = merged_range.max_col - merged_range.min_col + 1
         row_span = merged_range.max_row - merged_range.min_row + 1
 
         # Section separators span many columns but only one row
-        if column_span >= 10 and row_span == 1:
-            row_number = merged_range.min_row
-            # openpyxl stores the value only in the top-left cell
-            cell_value = worksheet.cell(
-                row=merged_range.min_row, column=merged_range.min_col
-            ).value
-            text = str(cell_value).strip() if cell_value is not None else ""
-            separators.append((row_number, text))
+        if column_span >= MIN_SEPARATOR_COLUMN_SPAN and row_span == 1:
+            separators.append((merged_range.min_row, merged_range.min_col - 1))
 
     separators.sort(key=lambda pair: pair[0])
     return separators
@@ -331,119 +727,321 @@ def _parse_segment_into_metadata(segment: str, metadata: SectionMetadata) -> Non
 
 
 def _build_section_list(
-    merged_separator_rows: list[tuple[int, str]],
-    max_row: int,
+    merged_separator_rows: list[tuple[int, int]],
 ) -> list[SectionMetadata]:
     """
-    Parse each merged separator and assign row ranges to sections.
+    Create one section per merged separator and assign its row range.
 
     Each section starts at the row after its separator (typically the header
-    row) and ends at the row before the next separator (or end of sheet).
+    row) and ends at the row before the next separator.  The last section
+    ends at the end of the sheet, which _close_last_section fills in once
+    the row stream has reached it.  The separator text is not known yet —
+    it is parsed into the section by _fill_separator_section when the row
+    stream reaches the separator row, which is always before any of the
+    section's own rows.
 
     Args:
-        merged_separator_rows: Sorted list of (row_number, text) pairs.
-        max_row: Last row in the worksheet.
+        merged_separator_rows: Sorted list of (row_number, text_column) pairs.
 
     Returns:
         List of SectionMetadata objects with row ranges filled in.
     """
     sections: list[SectionMetadata] = []
 
-    for idx, (row_num, text) in enumerate(merged_separator_rows):
-        section = _parse_section_text(text)
+    for idx, (row_num, _) in enumerate(merged_separator_rows):
+        section = SectionMetadata()
         section.start_row = row_num + 1  # Data begins after the separator
 
         if idx + 1 < len(merged_separator_rows):
             next_separator_row = merged_separator_rows[idx + 1][0]
             section.end_row = next_separator_row - 1
-        else:
-            section.end_row = max_row
 
         sections.append(section)
 
     return sections
 
 
+def _index_separators(
+    merged_separator_rows: list[tuple[int, int]],
+    rows_above_header: list[tuple[int, tuple]],
+) -> tuple[list[SectionMetadata], dict[int, tuple[int, SectionMetadata]]]:
+    """
+    Build the merged separator sections and index them by separator row.
+
+    The text of separators the header scan has already streamed past is
+    parsed straight away; the rest are parsed by the extraction loop when
+    it reaches them.
+
+    Args:
+        merged_separator_rows: Sorted list of (row_number, text_column) pairs.
+        rows_above_header: The buffered (row_number, values) pairs down to
+            and including the first header row.
+
+    Returns:
+        (sections, separator_index) — the sections from _build_section_list
+        and a separator row → (text_column, section) map.
+    """
+    sections = _build_section_list(merged_separator_rows)
+    separator_index = {
+        row_num: (text_column, section)
+        for (row_num, text_column), section in zip(merged_separator_rows, sections)
+    }
+    for row_idx, row_values in rows_above_header:
+        if row_idx in separator_index:
+            _fill_separator_section(separator_index[row_idx], row_values)
+    return sections, separator_index
+
+
+def _fill_separator_section(
+    separator: tuple[int, SectionMetadata],
+    row_values: tuple,
+) -> None:
+    """
+    Parse a separator row's merged text into its pre-built section.
+
+    Mutates the section in place, so every reference to it (e.g. the
+    active-section list of the extraction loop) sees the parsed fields.
+
+    Args:
+        separator: (text_column, section) entry from the separator index.
+        row_values: Cell values of the separator row (column A onwards).
+    """
+    text_column, section = separator
+    cell_value = row_values[text_column] if text_column < len(row_values) else None
+    text = str(cell_value).strip() if cell_value is not None else ""
+
+    parsed = _parse_section_text(text)
+    section.photo = parsed.photo
+    section.shelf_location = parsed.shelf_location
+    section.est_linear_meters = parsed.est_linear_meters
+    section.shelf_levels = parsed.shelf_levels
+    section.raw_text = parsed.raw_text
+
+
 # ── Header detection ───────────────────────────────────────────────────
 
+def _detect_header(
+    file_path: Path,
+    leading_rows: list[tuple[int, tuple]],
+    merged_separator_rows: list[tuple[int, int]],
+    result: FileReadResult,
+) -> tuple[int, int] | None:
+    """
+    Find the first header row among the leading rows.
+
+    Merged separator rows are never taken for the header.
+
+    Args:
+        file_path: Path to the .xlsx file (for the error message).
+        leading_rows: The buffered (row_number, values) pairs of the sheet.
+        merged_separator_rows: (row_number, text_column) of each separator.
+        result: Read result; gets the error if no header row is found.
+
+    Returns:
+        (header_row, data_start_column) as from _find_header_row, or None
+        if no row matches the known schema.
+    """
+    header_row, data_start_col = _find_header_row(
+        leading_rows,
+        KNOWN_HEADER_NAMES,
+        {row_num for row_num, _ in merged_separator_rows},
+    )
+    if header_row == 0:
+        error_message = (
+            f"No header row found in '{file_path.name}'. "
+            "Could not detect columns matching the known schema."
+        )
+        logger.error(error_message)
+        result.errors.append(error_message)
+        return None
+    return header_row, data_start_col
+
+
 def _find_header_row(
-    worksheet: openpyxl.worksheet.worksheet.Worksheet,
+    leading_rows: list[tuple[int, tuple]],
     known_headers: set[str],
     merged_rows: set[int],
 ) -> tuple[int, int]:
     """
-    Scan the worksheet top-down to find the first header row.
+    Scan the leading rows top-down to find the first header row.
 
     A row qualifies as a header if at least HEADER_MATCH_THRESHOLD of its
     non-empty cell values (lowercased, stripped) appear in *known_headers*.
 
     Args:
-        worksheet: The openpyxl worksheet to scan.
+        leading_rows: The first HEADER_SCAN_ROWS (row_number, values) pairs
+            of the sheet, as yielded by _iter_row_values.
         known_headers: Set of recognised header names (all lowercase).
         merged_rows: Row numbers that are merged separators (skip these).
 
     Returns:
-        (row_number, start_column) — both 1-based.  Returns (0, 0) if no
-        header row is found.
+        (row_number, start_column) — row is 1-based, column is 0-based.
+        Returns (0, 0) if no header row is found.
     """
-    # Only scan the first 30 rows — headers are always near the top
-    scan_limit = min(30, worksheet.max_row)
-
-    for row_idx in range(1, scan_limit + 1):
+    for row_idx, row_values in leading_rows:
         if row_idx in merged_rows:
             continue
 
-        row_cells = list(
-            worksheet.iter_rows(min_row=row_idx, max_row=row_idx, values_only=False)
-        )[0]
-
         matches = 0
-        first_match_col = 0
+        first_match_col = -1
 
-        for cell in row_cells:
-            if cell.value is None:
+        for col_offset, value in enumerate(row_values):
+            if value is None:
                 continue
-            cell_text = str(cell.value).strip().lower()
+            cell_text = str(value).strip().lower()
             if cell_text in known_headers:
                 matches += 1
-                if first_match_col == 0:
-                    # column_letter is 1-based in openpyxl; .column is 1-based int
-                    first_match_col = cell.column
+                if first_match_col == -1:
+                    first_match_col = col_offset
 
         if matches >= HEADER_MATCH_THRESHOLD:
-            # Convert 1-based column to 0-based offset
-            start_col_zero_based = first_match_col - 1
-            return row_idx, start_col_zero_based
+            return row_idx, first_match_col
 
     return 0, 0
 
 
+def _resolve_layout(
+    file_path: Path,
+    leading_rows: list[tuple[int, tuple]],
+    header: tuple[int, int],
+    merged_ranges: list[CellRange],
+    known_layouts: dict[str, SheetLayout] | None,
+    result: FileReadResult,
+) -> SheetLayout:
+    """
+    Reuse the known layout of this template, or read it from the header.
+
+    Args:
+        file_path: Path to the .xlsx file (for logging).
+        leading_rows: The buffered (row_number, values) pairs of the sheet.
+        header: (header_row, data_start_column) from _detect_header.
+        merged_ranges: Every merged range of the sheet.
+        known_layouts: Layout fingerprint → SheetLayout map (may be None).
+        result: Read result; gets the fingerprint, header position and
+            column names.
+
+    Returns:
+        The layout to extract rows with.
+    """
+    header_row, data_start_col = header
+    result.layout_fingerprint = _layout_fingerprint(
+        leading_rows[:header_row], merged_ranges
+    )
+    layout = _reuse_known_layout(
+        (known_layouts or {}).get(result.layout_fingerprint), leading_rows
+    )
+    if layout is not None:
+        result.layout_reused = True
+        logger.info(
+            f"Reusing known layout {result.layout_fingerprint} for '{file_path.name}'"
+        )
+    else:
+        _, header_values = leading_rows[header_row - 1]
+        column_names = _read_header_columns(header_values, data_start_col)
+        layout = SheetLayout(header_row, data_start_col, column_names)
+
+    result.header_row_index = layout.header_row
+    result.data_start_column = layout.data_start_column
+    result.column_names = layout.column_names
+    logger.info(
+        f"Header found at row {layout.header_row}, data starts at column "
+        f"{'ABCDEFGHIJKLMNOPQRSTUVWXYZ'[layout.data_start_column]} "
+        f"(offset={layout.data_start_column})"
+    )
+    return layout
+
+
+def _layout_fingerprint(
+    leading_rows: list[tuple[int, tuple]],
+    merged_ranges: list[CellRange],
+) -> str:
+    """
+    Reduce the top of a sheet to a fingerprint of its template.
+
+    Only template structure goes in: the position and text of every cell
+    down to the header row that is a known header name, and the merged
+    ranges that start within those rows.  Data values (brands, prices,
+    photo numbers) are left out, and so is everything below the header:
+    where the next section separator or repeated header falls depends on
+    how many SKUs the first section holds, not on the template.  Two store
+    files exported from the same template therefore get the same
+    fingerprint.
+
+    Args:
+        leading_rows: The (row_number, values) pairs from the top of the
+            sheet down to and including the first header row.
+        merged_ranges: Every merged range of the sheet (from the XML pre-scan).
+
+    Returns:
+        A 16-character hex fingerprint.
+    """
+    header_cells = [
+        (row_idx, col_offset, str(value).strip().lower())
+        for row_idx, row_values in leading_rows
+        for col_offset, value in enumerate(row_values)
+        if value is not None and str(value).strip().lower() in KNOWN_HEADER_NAMES
+    ]
+    header_row = leading_rows[-1][0] if leading_rows else 0
+    leading_merges = sorted(
+        cell_range.bounds
+        for cell_range in merged_ranges
+        if cell_range.min_row <= header_row
+    )
+    fingerprint_source = json.dumps([header_cells, leading_merges])
+    return hashlib.sha256(fingerprint_source.encode("utf-8")).hexdigest()[:16]
+
+
+def _reuse_known_layout(
+    layout: SheetLayout | None,
+    leading_rows: list[tuple[int, tuple]],
+) -> SheetLayout | None:
+    """
+    Check that a stored layout still fits this sheet.
+
+    The fingerprint only covers known header names, so a file with an extra
+    or renamed free-text column can share it.  The stored header row is
+    re-read and must give exactly the stored column names.
+
+    Args:
+        layout: Stored layout for this sheet's fingerprint (or None).
+        leading_rows: The buffered (row_number, values) pairs of the sheet.
+
+    Returns:
+        The layout if it still matches, otherwise None (detect from scratch).
+    """
+    if layout is None or not 0 < layout.header_row <= len(leading_rows):
+        return None
+
+    _, header_values = leading_rows[layout.header_row - 1]
+    column_names = _read_header_columns(header_values, layout.data_start_column)
+    if column_names != layout.column_names:
+        logger.info("Known layout no longer matches the header row; re-detecting")
+        return None
+    return layout
+
+
 def _read_header_columns(
-    worksheet: openpyxl.worksheet.worksheet.Worksheet,
-    header_row: int,
+    header_values: tuple,
     data_start_col: int,
 ) -> list[str]:
     """
     Read column names from the header row, starting at *data_start_col*.
 
+    Args:
+        header_values: Cell values of the header row (column A onwards).
+        data_start_col: 0-based column offset of the first data column.
+
     Returns:
         List of column name strings.  Empty cells get placeholder names
         like '_unnamed_0', '_unnamed_1', etc.
     """
-    row_cells = list(
-        worksheet.iter_rows(min_row=header_row, max_row=header_row, values_only=False)
-    )[0]
-
     column_names: list[str] = []
     unnamed_counter = 0
 
-    for cell in row_cells:
-        # Skip cells before the data start column
-        if cell.column - 1 < data_start_col:
-            continue
-
-        if cell.value is not None and str(cell.value).strip():
-            column_names.append(str(cell.value).strip())
+    # Skip cells before the data start column
+    for value in header_values[data_start_col:]:
+        if value is not None and str(value).strip():
+            column_names.append(str(value).strip())
         else:
             column_names.append(f"_unnamed_{unnamed_counter}")
             unnamed_counter += 1
@@ -579,211 +1177,511 @@ def _extract_context_metadata(
     return metadata
 
 
+def _insert_section(
+    section: SectionMetadata,
+    section_starts: list[int],
+    sections: list[SectionMetadata],
+) -> None:
+    """
+    Insert a section into the start-row index, keeping it sorted.
+
+    *section_starts* and *sections* are parallel lists ordered by start_row.
+    A section is inserted after any existing sections with the same
+    start_row, so the newest one wins a tie in _get_section_for_row().
+
+    Args:
+        section: Section to add.
+        section_starts: start_row of every indexed section, ascending.
+        sections: The indexed sections, in the same order.
+    """
+    position = bisect.bisect_right(section_starts, section.start_row)
+    section_starts.insert(position, section.start_row)
+    sections.insert(position, section)
+
+
 def _get_section_for_row(
     row_index: int,
+    section_starts: list[int],
     sections: list[SectionMetadata],
 ) -> SectionMetadata | None:
     """
     Find the section that a given row belongs to.
 
-    Sections are ordered by start_row. A row belongs to the last section
-    whose start_row is <= the row index.
+    A row belongs to the last section whose start_row is <= the row index,
+    found by binary search over the start rows.
 
     Args:
         row_index: 1-based Excel row number.
-        sections: List of sections sorted by start_row.
+        section_starts: start_row of every indexed section, ascending.
+        sections: The indexed sections, in the same order.
 
     Returns:
         The matching SectionMetadata, or None if no section covers this row.
     """
-    best: SectionMetadata | None = None
-    for section in sections:
-        if section.start_row <= row_index:
-            best = section
-        else:
-            break
-    return best
+    position = bisect.bisect_right(section_starts, row_index)
+    return sections[position - 1] if position else None
+
+
+def _section_default_positions(column_names: list[str]) -> list[tuple[int, str]]:
+    """
+    Work out, once per sheet, which cells section metadata may fill.
+
+    When a header name appears more than once, the last such column holds
+    the row's value (as a dict keyed by column name would), so that is the
+    one filled.
+
+    Args:
+        column_names: Header column names.
+
+    Returns:
+        (column_position, SectionMetadata attribute) pairs.
+    """
+    last_position: dict[str, int] = {}
+    for position, column_name in enumerate(column_names):
+        last_position[column_name] = position
+    lower_to_name: dict[str, str] = {name.lower(): name for name in last_position}
+
+    fill_positions: list[tuple[int, str]] = []
+    for candidate_names, attribute in _SECTION_DEFAULT_FIELDS:
+        for candidate in candidate_names:
+            column_name = lower_to_name.get(candidate)
+            if column_name is not None:
+                fill_positions.append((last_position[column_name], attribute))
+                break
+    return fill_positions
 
 
 def _apply_section_defaults(
-    row_dict: dict[str, object],
+    row_values: list[object],
     section: SectionMetadata | None,
-    column_names: list[str],
+    fill_positions: list[tuple[int, str]],
 ) -> None:
     """
     Fill in blank Photo, Shelf Location, Est. Linear Meters, and Shelf
     Levels from the section metadata when the row's own values are empty.
 
-    Mutates *row_dict* in place.
+    Mutates *row_values* in place.
 
     Args:
-        row_dict: Row data keyed by column name.
+        row_values: Cell values aligned with the header columns.
         section: Active section metadata (may be None).
-        column_names: Header column names (used to find the right keys).
+        fill_positions: From _section_default_positions().
     """
     if section is None:
         return
 
-    # Build a lowercase → original-key lookup for the row dict
-    lower_to_key: dict[str, str] = {k.lower(): k for k in row_dict}
-
-    fill_map: list[tuple[list[str], object]] = [
-        (["photo file name", "photo"], section.photo),
-        (["shelf location"], section.shelf_location),
-        (["est. linear meters"], section.est_linear_meters),
-        (["shelf levels"], section.shelf_levels),
-    ]
-
-    for candidate_keys, section_value in fill_map:
+    for position, attribute in fill_positions:
+        section_value = getattr(section, attribute)
         if section_value is None:
             continue
-        for candidate in candidate_keys:
-            actual_key = lower_to_key.get(candidate)
-            if actual_key is not None:
-                current = row_dict.get(actual_key)
-                if current is None or str(current).strip() == "":
-                    row_dict[actual_key] = section_value
-                break
+        current = row_values[position]
+        if current is None or str(current).strip() == "":
+            row_values[position] = section_value
+
+
+# ── Building the DataFrame ─────────────────────────────────────────────
+
+def _collect_columns(
+    data_rows: Iterator[tuple[int, list[object]]],
+    column_count: int,
+) -> tuple[list[list[object]], list[int]]:
+    """
+    Append each data row's values straight onto per-column lists.
+
+    No per-row dict is built, and each row's value list can be released as
+    soon as it has been copied into the columns.
+
+    Args:
+        data_rows: (row_number, row_values) pairs from _iter_data_rows().
+        column_count: Number of header columns.
+
+    Returns:
+        (column_values, source_rows) — one value list per header column,
+        and the Excel row number of every data row.
+    """
+    column_values: list[list[object]] = [[] for _ in range(column_count)]
+    column_appends = [values.append for values in column_values]
+    source_rows: list[int] = []
+
+    for row_idx, row_values in data_rows:
+        for append_value, value in zip(column_appends, row_values):
+            append_value(value)
+        source_rows.append(row_idx)
+
+    return column_values, source_rows
+
+
+def _build_dataframe(
+    column_values: list[list[object]],
+    source_rows: list[int],
+    column_names: list[str],
+) -> pd.DataFrame:
+    """
+    Build the output DataFrame from per-column value lists.
+
+    Produces the same frame pandas would infer from one dict per row:
+    columns in first-seen header order (a repeated name keeps the last
+    column's values), plus _source_row.
+
+    Args:
+        column_values: One value list per header column (_collect_columns).
+        source_rows: Excel row number of every data row.
+        column_names: Header column names.
+
+    Returns:
+        The DataFrame (empty, with no columns, if there are no data rows).
+    """
+    if not source_rows:
+        return pd.DataFrame()
+
+    last_position: dict[str, int] = {}
+    for position, column_name in enumerate(column_names):
+        last_position[column_name] = position
+
+    columns: dict[str, pd.Series] = {
+        column_name: _build_column(
+            column_values[position],
+            _COLUMN_TYPE_HINTS.get(column_name.strip().lower()),
+        )
+        for column_name, position in last_position.items()
+    }
+    columns["_source_row"] = pd.Series(source_rows, dtype="int64")
+    return pd.DataFrame(columns)
+
+
+def _build_column(values: list[object], type_hint: str | None) -> pd.Series:
+    """
+    Turn one column's values into a Series, using the schema type hint.
+
+    When the values are exactly what the hint expects (only ints for an
+    integer column, only ints/floats for a numeric one, only strings for a
+    text column, blanks allowed), the array is built with that dtype
+    directly.  Anything else — numbers stored as text, stray values from a
+    misaligned column — falls back to pandas' own inference, so the result
+    is always the dtype pandas would have inferred.
+
+    Args:
+        values: The column's cell values, one per data row.
+        type_hint: "text", "integer", "float", or None for unknown headers.
+
+    Returns:
+        The column as a Series.
+    """
+    value_types = set(map(type, values))
+    value_types.discard(type(None))
+
+    if type_hint in ("integer", "float") and value_types and value_types <= {int, float}:
+        try:
+            if value_types == {int} and None not in values:
+                return pd.Series(np.array(values, dtype=np.int64))
+            return pd.Series(np.array(values, dtype=np.float64))
+        except OverflowError:
+            pass
+    elif type_hint == "text" and value_types <= {str}:
+        return pd.Series(np.array(values, dtype=object))
+
+    return pd.Series(values)
 
 
 # ── Main extraction loop ───────────────────────────────────────────────
 
 def _extract_rows_to_dataframe(
-    worksheet: openpyxl.worksheet.worksheet.Worksheet,
+    rows: Iterator[tuple[int, tuple]],
     column_names: list[str],
     header_row: int,
     data_start_col: int,
-    merged_row_numbers: set[int],
+    separator_index: dict[int, tuple[int, SectionMetadata]],
     sections: list[SectionMetadata],
 ) -> tuple[pd.DataFrame, list[dict], list[SectionMetadata]]:
     """
-    Walk every row in the worksheet, classify it, and build the DataFrame.
+    Walk every row after the first header once and build the DataFrame.
 
-    For each row after the first header:
-      - Skip if it's a merged separator row.
-      - Skip if it's a repeated header row (log warning if columns differ).
-      - Skip if it has fewer than MIN_CELLS_FOR_DATA_ROW non-empty cells.
-      - Detect context-only rows → convert to section metadata.
-      - Otherwise → add to DataFrame, applying section defaults for blanks.
+    Collects everything _iter_data_rows() yields into one DataFrame, built
+    column by column.
 
     Args:
-        worksheet: The openpyxl worksheet.
+        rows: (row_number, values) pairs for the rows after the header,
+            in sheet order (see _iter_row_values).
         column_names: Column names from the first header row.
         header_row: 1-based row number of the first header.
         data_start_col: 0-based column offset.
-        merged_row_numbers: Set of rows that are merged separators.
+        separator_index: Merged separator row → (text_column, section).
         sections: SectionMetadata list from merged separators.
 
     Returns:
         (DataFrame, skipped_rows_list, context_sections_list)
     """
-    data_rows: list[dict[str, object]] = []
     skipped_rows: list[dict] = []
     context_sections: list[SectionMetadata] = []
 
-    # Keep a running pointer to the active section (from both merged and
-    # context-only sources).  All sections combined, sorted by row.
-    active_sections = list(sections)
+    data_rows = _iter_data_rows(
+        rows=rows,
+        column_names=column_names,
+        header_row=header_row,
+        data_start_col=data_start_col,
+        separator_index=separator_index,
+        sections=sections,
+        skipped_rows=skipped_rows,
+        context_sections=context_sections,
+    )
+    column_values, source_rows = _collect_columns(data_rows, len(column_names))
 
-    # Track the first header's column signature for consistency checks
-    first_header_signature = [
-        str(c).strip().lower() for c in column_names if not c.startswith("_unnamed_")
-    ]
+    raw_dataframe = _build_dataframe(column_values, source_rows, column_names)
+    return raw_dataframe, skipped_rows, context_sections
+
+
+def _iter_data_rows(
+    rows: Iterator[tuple[int, tuple]],
+    column_names: list[str],
+    header_row: int,
+    data_start_col: int,
+    separator_index: dict[int, tuple[int, SectionMetadata]],
+    sections: list[SectionMetadata],
+    skipped_rows: list[dict],
+    context_sections: list[SectionMetadata],
+    reached_separators: list[SectionMetadata] | None = None,
+) -> Iterator[tuple[int, list[object]]]:
+    """
+    Walk every row after the first header once and yield the data rows.
+
+    Other rows are recorded as skipped as the stream reaches them (see the
+    _skip_* helpers), so a lazy caller knows what preceded each data row.
+
+    Args:
+        rows: (row_number, values) pairs for the rows after the header.
+        column_names: Column names from the first header row.
+        header_row: 1-based row number of the first header.
+        data_start_col: 0-based column offset.
+        separator_index: Merged separator row → (text_column, section).
+        sections: SectionMetadata list from merged separators.
+        skipped_rows: Receives one dict per skipped row.
+        context_sections: Receives the sections built from context rows.
+        reached_separators: Optional; receives each separator's section once reached.
 
-    for row_idx in range(header_row + 1, worksheet.max_row + 1):
-        # ── Skip merged separator rows ────────────────────────────
-        if row_idx in merged_row_numbers:
-            skipped_rows.append({
-                "row": row_idx,
-                "reason": "merged section separator",
-            })
+    Yields:
+        (row_number, row_values) per data row, section defaults filled in.
+    """
+    section_starts, indexed_sections = _index_sections(sections)
+    fill_positions = _section_default_positions(column_names)
+
+    for row_idx, cell_values in rows:
+        if _skip_separator_row(row_idx, cell_values, separator_index, skipped_rows, reached_separators):
+            continue
+        row_values = _align_row_values(cell_values, data_start_col, len(column_names))
+        if (
+            _skip_sparse_row(row_idx, row_values, skipped_rows)
+            or _skip_repeated_header(row_idx, row_values, column_names, header_row, skipped_rows)
+            or _skip_context_row(row_idx, row_values, column_names, skipped_rows,
+                                 context_sections, section_starts, indexed_sections)
+        ):
             continue
 
-        # ── Read cell values starting at data_start_col ───────────
-        row_cells = list(
-            worksheet.iter_rows(
-                min_row=row_idx, max_row=row_idx, values_only=False
-            )
-        )[0]
+        # A data row; its row number becomes _source_row, for traceability
+        active_section = _get_section_for_row(row_idx, section_starts, indexed_sections)
+        _apply_section_defaults(row_values, active_section, fill_positions)
+        yield row_idx, row_values
 
-        row_values: list[object] = []
-        for cell in row_cells:
-            if cell.column - 1 < data_start_col:
-                continue
-            row_values.append(cell.value)
 
-        # Trim trailing Nones that extend past our column count
-        row_values = row_values[: len(column_names)]
+# ── Row classification ─────────────────────────────────────────────────
 
-        # Pad if the row is shorter than the header
-        while len(row_values) < len(column_names):
-            row_values.append(None)
+def _index_sections(
+    sections: list[SectionMetadata],
+) -> tuple[list[int], list[SectionMetadata]]:
+    """
+    Index sections by start row for _get_section_for_row().
 
-        # ── Count non-empty cells ─────────────────────────────────
-        non_empty_count = sum(
-            1 for v in row_values if v is not None and str(v).strip() != ""
-        )
+    Merged and context-only sections share the index, so the section for a
+    data row is a binary search rather than a scan; context sections are
+    inserted with _insert_section() as the stream reaches them.
 
-        # ── Skip rows with too few populated cells ────────────────
-        if non_empty_count < MIN_CELLS_FOR_DATA_ROW:
-            if non_empty_count > 0:
-                skipped_rows.append({
-                    "row": row_idx,
-                    "reason": f"too few non-empty cells ({non_empty_count})",
-                    "values": [v for v in row_values if v is not None],
-                })
-            # Truly empty rows are silently skipped
-            continue
+    Args:
+        sections: Sections known before extraction (merged separators).
 
-        # ── Detect repeated header rows ───────────────────────────
-        if _is_header_row(row_values, KNOWN_HEADER_NAMES):
-            # Check consistency with the first header
-            current_signature = [
-                str(v).strip().lower()
-                for v in row_values
-                if v is not None and str(v).strip().lower() in KNOWN_HEADER_NAMES
-            ]
-            if set(current_signature) != set(first_header_signature):
-                logger.warning(
-                    f"Row {row_idx}: repeated header has different columns "
-                    f"than the first header at row {header_row}. "
-                    f"Differences: "
-                    f"added={set(current_signature) - set(first_header_signature)}, "
-                    f"removed={set(first_header_signature) - set(current_signature)}"
-                )
-            skipped_rows.append({
-                "row": row_idx,
-                "reason": "repeated header row",
-            })
-            continue
+    Returns:
+        (section_starts, indexed_sections) — parallel lists ordered by
+        start_row.
+    """
+    section_starts: list[int] = []
+    indexed_sections: list[SectionMetadata] = []
+    for section in sections:
+        _insert_section(section, section_starts, indexed_sections)
+    return section_starts, indexed_sections
 
-        # ── Detect context-only rows ──────────────────────────────
-        if _is_context_only_row(row_values, column_names):
-            context_meta = _extract_context_metadata(
-                row_values, column_names, row_idx
-            )
-            context_sections.append(context_meta)
-            active_sections.append(context_meta)
-            active_sections.sort(key=lambda s: s.start_row)
-            skipped_rows.append({
-                "row": row_idx,
-                "reason": "context-only row (section metadata)",
-            })
-            continue
 
-        # ── This is a real data row ───────────────────────────────
-        row_dict: dict[str, object] = {}
-        for col_name, value in zip(column_names, row_values):
-            row_dict[col_name] = value
+def _skip_separator_row(
+    row_idx: int,
+    cell_values: tuple,
+    separator_index: dict[int, tuple[int, SectionMetadata]],
+    skipped_rows: list[dict],
+    reached_separators: list[SectionMetadata] | None,
+) -> bool:
+    """
+    Skip a merged separator row, parsing its text into its section.
 
-        # Apply section defaults for blank Photo/Location/etc.
-        active_section = _get_section_for_row(row_idx, active_sections)
-        _apply_section_defaults(row_dict, active_section, column_names)
+    Args:
+        row_idx: 1-based Excel row number.
+        cell_values: Cell values of the row (column A onwards).
+        separator_index: Merged separator row → (text_column, section).
+        skipped_rows: Receives the skipped row.
+        reached_separators: Optional; receives the separator's section.
 
-        # Tag with source row for traceability
-        row_dict["_source_row"] = row_idx
+    Returns:
+        True if the row is a merged separator (and was skipped).
+    """
+    if row_idx not in separator_index:
+        return False
 
-        data_rows.append(row_dict)
+    _fill_separator_section(separator_index[row_idx], cell_values)
+    if reached_separators is not None:
+        reached_separators.append(separator_index[row_idx][1])
+    skipped_rows.append({
+        "row": row_idx,
+        "reason": "merged section separator",
+    })
+    return True
 
-    raw_dataframe = pd.DataFrame(data_rows)
-    return raw_dataframe, skipped_rows, context_sections
+
+def _align_row_values(
+    cell_values: tuple,
+    data_start_col: int,
+    column_count: int,
+) -> list[object]:
+    """
+    Take a row's cell values from *data_start_col*, one per header column.
+
+    Cells past the last header column are dropped; a row shorter than the
+    header is padded with None.
+
+    Args:
+        cell_values: Cell values of the row (column A onwards).
+        data_start_col: 0-based column offset of the first data column.
+        column_count: Number of header columns.
+
+    Returns:
+        Exactly *column_count* values.
+    """
+    row_values: list[object] = list(
+        cell_values[data_start_col: data_start_col + column_count]
+    )
+    row_values.extend([None] * (column_count - len(row_values)))
+    return row_values
+
+
+def _skip_sparse_row(
+    row_idx: int,
+    row_values: list[object],
+    skipped_rows: list[dict],
+) -> bool:
+    """
+    Skip a row with fewer than MIN_CELLS_FOR_DATA_ROW non-empty cells.
+
+    Truly empty rows are skipped silently; rows with a few values are
+    recorded in *skipped_rows* along with those values.
+
+    Args:
+        row_idx: 1-based Excel row number.
+        row_values: The row's values, aligned with the header columns.
+        skipped_rows: Receives the skipped row (unless it is empty).
+
+    Returns:
+        True if the row has too few populated cells (and was skipped).
+    """
+    non_empty_count = sum(
+        1 for v in row_values if v is not None and str(v).strip() != ""
+    )
+    if non_empty_count >= MIN_CELLS_FOR_DATA_ROW:
+        return False
+
+    if non_empty_count > 0:
+        skipped_rows.append({
+            "row": row_idx,
+            "reason": f"too few non-empty cells ({non_empty_count})",
+            "values": [v for v in row_values if v is not None],
+        })
+    return True
+
+
+def _skip_repeated_header(
+    row_idx: int,
+    row_values: list[object],
+    column_names: list[str],
+    header_row: int,
+    skipped_rows: list[dict],
+) -> bool:
+    """
+    Skip a repeated header row, warning if its columns differ from the first.
+
+    Args:
+        row_idx: 1-based Excel row number.
+        row_values: The row's values, aligned with the header columns.
+        column_names: Column names from the first header row.
+        header_row: 1-based row number of the first header.
+        skipped_rows: Receives the skipped row.
+
+    Returns:
+        True if the row is a header row (and was skipped).
+    """
+    if not _is_header_row(row_values, KNOWN_HEADER_NAMES):
+        return False
+
+    first_header_signature = {
+        str(c).strip().lower() for c in column_names if not c.startswith("_unnamed_")
+    }
+    current_signature = {
+        str(v).strip().lower()
+        for v in row_values
+        if v is not None and str(v).strip().lower() in KNOWN_HEADER_NAMES
+    }
+    if current_signature != first_header_signature:
+        logger.warning(
+            f"Row {row_idx}: repeated header has different columns "
+            f"than the first header at row {header_row}. "
+            f"Differences: "
+            f"added={current_signature - first_header_signature}, "
+            f"removed={first_header_signature - current_signature}"
+        )
+    skipped_rows.append({
+        "row": row_idx,
+        "reason": "repeated header row",
+    })
+    return True
+
+
+def _skip_context_row(
+    row_idx: int,
+    row_values: list[object],
+    column_names: list[str],
+    skipped_rows: list[dict],
+    context_sections: list[SectionMetadata],
+    section_starts: list[int],
+    indexed_sections: list[SectionMetadata],
+) -> bool:
+    """
+    Skip a context-only row, turning it into a section.
+
+    The new section is indexed so its metadata fills the blanks of the data
+    rows that follow it.
+
+    Args:
+        row_idx: 1-based Excel row number.
+        row_values: The row's values, aligned with the header columns.
+        column_names: Column names from the first header row.
+        skipped_rows: Receives the skipped row.
+        context_sections: Receives the section built from the row.
+        section_starts: Start-row index from _index_sections (updated).
+        indexed_sections: Sections of that index (updated).
+
+    Returns:
+        True if the row is context-only (and was skipped).
+    """
+    if not _is_context_only_row(row_values, column_names):
+        return False
+
+    context_meta = _extract_context_metadata(row_values, column_names, row_idx)
+    context_sections.append(context_meta)
+    _insert_section(context_meta, section_starts, indexed_sections)
+    skipped_rows.append({
+        "row": row_idx,
+        "reason": "context-only row (section metadata)",
+    })
+    return True
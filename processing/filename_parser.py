@@ -24,7 +24,7 @@ from config.filename_config import (
     KNOWN_RETAILERS,
     SUFFIXES_TO_STRIP,
 )
-from utils.fuzzy_match import best_match
+from utils.fuzzy_match import best_match, best_matches
 
 logger = logging.getLogger(__name__)
 
@@ -228,8 +228,8 @@ def _match_city(remaining: str) -> tuple[str | None, int]:
     best_city: str | None = None
     best_city_score: int = 0
 
-    for candidate in candidates_to_try:
-        city, score = best_match(candidate, KNOWN_CITIES, threshold=80)
+    city_matches = best_matches(candidates_to_try, KNOWN_CITIES, threshold=80)
+    for city, score in city_matches:
         if city is not None and score > best_city_score:
             best_city = city
             best_city_score = score
@@ -4,18 +4,26 @@ Flavor column cleaning pipeline — two-layer approach.
 Layer 1 (deterministic, per value):
     Seven regex/lookup rules that are safe to apply to any dataset.
     Applied per-file after LLM extraction, producing Flavor_Original,
-    Flavor_Clean, and Flavor_Needs_Review columns.
+    Flavor_Clean, and Flavor_Needs_Review columns.  Flavor strings repeat
+    heavily across rows and stores, so the rule chain runs once per unique
+    value (results are broadcast back to the rows) and is memoized in a
+    bounded LRU cache for the life of the process.
 
 Layer 2 (LLM, post-merge):
-    One batch API call over all unique post-L1 values not already in the
-    persistent cache.  Results are written to flavor_clean_cache.json and
-    applied to Flavor_Clean.  Flags values containing [NEEDS_FLAVOR] in
-    Flavor_Needs_Review.
+    Unique post-L1 values not already in the persistent cache are grouped
+    by first word (so similar values are harmonized together), packed into
+    size-bounded shards and sent as concurrent API calls.  Each shard's
+    results are stored as soon as it returns, in the shared LLM result store
+    (processing/llm_result_store.py, namespace "flavor_clean") and applied
+    to Flavor_Clean.  Flags values containing [NEEDS_FLAVOR] in
+    Flavor_Needs_Review.  A failed shard only loses its own values, which
+    are asked again next run.  Entries of the old flavor_clean_cache.json
+    are imported into the store once.
 
 Public API:
     apply_layer1_rules(value)          -> str
     apply_layer1_to_dataframe(df)      -> pd.DataFrame
-    harmonize_flavors_with_llm(df, api_key, cache_path) -> pd.DataFrame
+    harmonize_flavors_with_llm(df, api_key, cache_path, legacy_cache_path) -> pd.DataFrame
 """
 
 from __future__ import annotations
@@ -23,14 +31,38 @@ from __future__ import annotations
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from config.normalization_rules import FLAVOR_MAP, FLAVOR_WORD_MAP
+from processing.llm_result_store import (
+    DEFAULT_LLM_RESULT_STORE_PATH,
+    import_legacy_json,
+    lookup_results,
+    store_results,
+)
+from utils.llm_client import complete
 
 logger = logging.getLogger(__name__)
 
+# Unique flavor strings whose Layer 1 result is kept between calls.
+_LAYER1_MEMO_SIZE: int = 50_000
+
+# Layer 2 answers' namespace in the LLM result store.
+_STORE_NAMESPACE: str = "flavor_clean"
+
+# Layer 2 shard bounds: values per prompt, and their total characters (the
+# response echoes every value, so this keeps it well under max_tokens).
+_SHARD_MAX_VALUES: int = 150
+_SHARD_MAX_CHARS: int = 6_000
+
+# Layer 2 API calls in flight at once.
+_MAX_CONCURRENT_SHARDS: int = 4
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Rule 1.2 — Title Case exceptions
@@ -94,12 +126,42 @@ _PROMO_PATTERNS: list[re.Pattern[str]] = [
     re.compile(r"\bback\s+soon\b", re.IGNORECASE),
 ]
 
+# Every Rule 1.4–1.6 pattern in one alternation.  A value it does not match
+# is left unchanged by all of those passes, so they are skipped — which is
+# the common case.  (Replacing the passes themselves with one alternation
+# would change results: an earlier pass can remove text a later one matches.)
+_REMOVAL_PATTERNS_ANY = re.compile(
+    "|".join(
+        f"(?:{pattern.pattern})"
+        for pattern in [_VOLUME_PATTERN, *_PACK_PATTERNS, *_PROMO_PATTERNS]
+    ),
+    re.IGNORECASE,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Rule 1.7 — Compound ingredient spellings
+# ═══════════════════════════════════════════════════════════════════════════
+
+_FLAVOR_WORD_PATTERNS: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(re.escape(raw_word), re.IGNORECASE), canonical)
+    for raw_word, canonical in FLAVOR_WORD_MAP.items()
+]
+
+# Any FLAVOR_WORD_MAP spelling; values without one skip the replacements.
+_FLAVOR_WORDS_ANY = re.compile(
+    "|".join(re.escape(raw_word) for raw_word in FLAVOR_WORD_MAP),
+    re.IGNORECASE,
+)
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Layer 2 LLM prompt
 # ═══════════════════════════════════════════════════════════════════════════
 
-_LAYER2_PROMPT_TEMPLATE = """\
+# Fixed instructions of the Layer 2 prompt, sent as the static prefix so the
+# provider can cache it (see utils/llm_client.py).
+_LAYER2_PROMPT_PREFIX = """\
 You are a data cleaning assistant for supermarket shelf audit data. I will give \
 you a list of unique flavor values from a product database. These have already been \
 mechanically cleaned (whitespace, case, sizes, pack formats removed).
@@ -151,14 +213,18 @@ Apply these cleaning principles:
 
 Return ONLY a JSON object where keys are the exact input values and values are the
 cleaned output. No markdown fences, no extra text. Example:
-{{
+{
   "Apple Juice": "Apple",
   "Strawberry, Banana & Apple Smoothie": "Strawberry, Banana & Apple",
   "Freshly Squeezed Orange with Bits": "Orange with Bits",
   "Mangoes, Apples & Passion Fruits": "Mango, Apple & Passion Fruit",
   "Defence": "Defence [NEEDS_FLAVOR]"
-}}
+}
 
+"""
+
+# The per-call part of the Layer 2 prompt, sent after the cached prefix.
+_LAYER2_VALUES_TEMPLATE = """\
 Here is the list of unique flavor values to clean:
 
 {flavor_list_json}
@@ -182,6 +248,8 @@ def apply_layer1_rules(value: str) -> str:
         1.6 Remove promotional/offer tags
         1.7 Standardize compound ingredient spellings
 
+    Results are memoized per string (bounded LRU, see _LAYER1_MEMO_SIZE).
+
     Args:
         value: Raw flavor string (may be None or empty).
 
@@ -191,39 +259,16 @@ def apply_layer1_rules(value: str) -> str:
     if not value or not str(value).strip():
         return value
 
-    v = str(value)
-
-    # Rule 1.1 — trim + collapse whitespace
-    v = _rule_1_1(v)
-
-    # Rule 1.2 — title case with exceptions
-    v = _rule_1_2(v)
-
-    # Rule 1.3 — connector words → &
-    v = _rule_1_3(v)
-
-    # Rule 1.4 — strip volume/size
-    v = _rule_1_4(v)
-
-    # Rule 1.5 — strip pack-count descriptors
-    v = _rule_1_5(v)
-
-    # Rule 1.6 — strip promotional tags
-    v = _rule_1_6(v)
-
-    # Rule 1.1 again after removals to clean up stray spaces
-    v = _rule_1_1(v)
-
-    # Rule 1.7 — compound ingredient spelling (FLAVOR_MAP exact + FLAVOR_WORD_MAP)
-    v = _rule_1_7(v)
-
-    return v
+    return _apply_layer1_chain(str(value))
 
 
 def apply_layer1_to_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
     Run Layer 1 over the entire Flavor column of a DataFrame.
 
+    The column is factorized and the rules run once per unique value; the
+    results are broadcast back to every row holding that value.
+
     Creates three new columns:
         Flavor_Original   — snapshot of Flavor before any Layer 1/2 cleaning
         Flavor_Clean      — result of Layer 1 (to be further refined by Layer 2)
@@ -248,9 +293,7 @@ def apply_layer1_to_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         return result
 
     result["Flavor_Original"] = result["Flavor"]
-    result["Flavor_Clean"] = result["Flavor"].apply(
-        lambda v: apply_layer1_rules(v) if pd.notna(v) and str(v).strip() else v
-    )
+    result["Flavor_Clean"] = _apply_layer1_to_unique_values(result["Flavor"])
     result["Flavor_Needs_Review"] = False
 
     changed = (result["Flavor_Clean"] != result["Flavor_Original"]).sum()
@@ -262,17 +305,20 @@ def apply_layer1_to_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 def harmonize_flavors_with_llm(
     df: pd.DataFrame,
     api_key: str | None,
-    cache_path: str = "flavor_clean_cache.json",
+    cache_path: Path | str = DEFAULT_LLM_RESULT_STORE_PATH,
+    legacy_cache_path: Path | str | None = "flavor_clean_cache.json",
 ) -> pd.DataFrame:
     """
     Run Layer 2 flavor harmonization using the LLM over unique Flavor_Clean values.
 
     Workflow:
         1. Collect unique non-blank Flavor_Clean values.
-        2. Check the cache — only send values NOT already cached to the LLM.
-        3. Call Claude Sonnet with a single batch prompt.
-        4. Merge LLM results into the cache and persist it.
-        5. Apply the full cache mapping to Flavor_Clean.
+        2. Look them up in the store — only send values NOT already cached
+           to the LLM.
+        3. Group the new values by first word into size-bounded shards and
+           send them to Claude Sonnet concurrently.
+        4. Upsert each shard's results into the store as it returns.
+        5. Apply the mapping to Flavor_Clean.
         6. Extract [NEEDS_FLAVOR] flags into Flavor_Needs_Review.
 
     If api_key is None or Flavor_Clean is absent, the step is skipped silently.
@@ -280,7 +326,9 @@ def harmonize_flavors_with_llm(
     Args:
         df: Merged DataFrame containing Flavor_Clean column.
         api_key: Anthropic API key.
-        cache_path: Path to the persistent JSON cache file.
+        cache_path: SQLite LLM result store, shared with other sessions.
+        legacy_cache_path: Old JSON cache file, imported into the store the
+            first time it is seen.  None skips the import.
 
     Returns:
         DataFrame with Flavor_Clean updated and Flavor_Needs_Review set.
@@ -309,8 +357,9 @@ def harmonize_flavors_with_llm(
         logger.info("harmonize_flavors_with_llm: no flavor values to process")
         return result
 
-    # Load cache
-    cache = _load_cache(cache_path)
+    if legacy_cache_path is not None:
+        import_legacy_json(cache_path, _STORE_NAMESPACE, legacy_cache_path)
+    cache = lookup_results(cache_path, _STORE_NAMESPACE, unique_values)
 
     # Determine which values are new (not in cache)
     new_values = [v for v in unique_values if v not in cache]
@@ -320,15 +369,13 @@ def harmonize_flavors_with_llm(
             f"Layer 2: {len(new_values)} new values to send to LLM "
             f"({len(unique_values) - len(new_values)} already cached)"
         )
-        llm_mapping = _call_llm_for_harmonization(new_values, api_key)
-        if llm_mapping:
-            cache.update(llm_mapping)
-            _save_cache(cache_path, cache)
-            logger.info(f"Layer 2: cache updated with {len(llm_mapping)} new entries")
+        llm_mapping = _harmonize_in_shards(new_values, api_key, cache_path)
+        cache.update(llm_mapping)
+        logger.info(f"Layer 2: cache updated with {len(llm_mapping)} new entries")
     else:
         logger.info(f"Layer 2: all {len(unique_values)} values already in cache — no LLM call needed")
 
-    # Apply full cache mapping to Flavor_Clean
+    # Apply the mapping to Flavor_Clean
     def _apply_cache(v: object) -> object:
         if pd.isna(v) or str(v).strip() == "":
             return v
@@ -361,6 +408,53 @@ def harmonize_flavors_with_llm(
 # Layer 1 rule implementations
 # ═══════════════════════════════════════════════════════════════════════════
 
+def _apply_layer1_to_unique_values(flavors: pd.Series) -> pd.Series:
+    """Layer 1 for every non-blank value of *flavors*, run once per unique value."""
+    codes, uniques = pd.factorize(flavors)
+    if len(uniques) == 0:
+        return flavors.copy()
+
+    cleaned_uniques = np.empty(len(uniques), dtype=object)
+    for unique_idx, value in enumerate(uniques):
+        cleaned_uniques[unique_idx] = apply_layer1_rules(value) if str(value).strip() else value
+
+    # Missing values (code -1) keep their original value
+    cleaned = flavors.to_numpy(dtype=object, copy=True)
+    present = codes >= 0
+    cleaned[present] = cleaned_uniques[codes[present]]
+    return pd.Series(cleaned, index=flavors.index, name=flavors.name)
+
+
+@lru_cache(maxsize=_LAYER1_MEMO_SIZE)
+def _apply_layer1_chain(v: str) -> str:
+    """Rules 1.1–1.7 in order on a non-blank string (memoized)."""
+    # Rule 1.1 — trim + collapse whitespace
+    v = _rule_1_1(v)
+
+    # Rule 1.2 — title case with exceptions
+    v = _rule_1_2(v)
+
+    # Rule 1.3 — connector words → &
+    v = _rule_1_3(v)
+
+    # Rules 1.4–1.6 — strip volume/size, pack-count descriptors and
+    # promotional tags (skipped when none of their patterns occur)
+    if _REMOVAL_PATTERNS_ANY.search(v):
+        v = _rule_1_4(v)
+        v = _rule_1_5(v)
+        v = _rule_1_6(v)
+    else:
+        v = v.strip()
+
+    # Rule 1.1 again after removals to clean up stray spaces
+    v = _rule_1_1(v)
+
+    # Rule 1.7 — compound ingredient spelling (FLAVOR_MAP exact + FLAVOR_WORD_MAP)
+    v = _rule_1_7(v)
+
+    return v
+
+
 def _rule_1_1(v: str) -> str:
     """Trim and collapse internal whitespace."""
     return re.sub(r" {2,}", " ", v.strip())
@@ -435,9 +529,9 @@ def _rule_1_7(v: str) -> str:
     v = re.sub(r"\s*/\s*", " & ", v)
 
     # Word-level spelling replacements
-    for raw_word, canonical in FLAVOR_WORD_MAP.items():
-        pattern = re.compile(re.escape(raw_word), re.IGNORECASE)
-        v = pattern.sub(canonical, v)
+    if _FLAVOR_WORDS_ANY.search(v):
+        for pattern, canonical in _FLAVOR_WORD_PATTERNS:
+            v = pattern.sub(canonical, v)
 
     return v
 
@@ -446,6 +540,98 @@ def _rule_1_7(v: str) -> str:
 # Layer 2 helpers
 # ═══════════════════════════════════════════════════════════════════════════
 
+def _harmonize_in_shards(
+    values: list[str],
+    api_key: str,
+    cache_path: Path | str,
+) -> dict[str, str]:
+    """
+    Harmonize *values* as concurrent per-shard LLM calls.
+
+    Each shard's mapping is stored in the result store as soon as its call
+    returns, so a later failure or interruption keeps it.  A shard whose
+    call or response fails is logged and skipped.
+
+    Returns:
+        The combined mapping of every shard that succeeded.
+    """
+    shards = _shard_values(values)
+    logger.info(f"Layer 2: {len(values)} values in {len(shards)} shards")
+
+    mapping: dict[str, str] = {}
+    failed_values = 0
+    worker_count = max(1, min(_MAX_CONCURRENT_SHARDS, len(shards)))
+    with ThreadPoolExecutor(max_workers=worker_count) as pool:
+        futures = {
+            pool.submit(_call_llm_for_harmonization, shard, api_key): shard
+            for shard in shards
+        }
+        for future in as_completed(futures):
+            shard = futures[future]
+            shard_mapping = future.result()
+            if not shard_mapping:
+                logger.error(
+                    f"Layer 2: shard of {len(shard)} values failed "
+                    f"(first: {shard[0]!r}) — they will be asked again next run"
+                )
+                failed_values += len(shard)
+                continue
+            store_results(cache_path, _STORE_NAMESPACE, shard_mapping)
+            mapping.update(shard_mapping)
+
+    if failed_values:
+        logger.warning(f"Layer 2: {failed_values} of {len(values)} values left unharmonized")
+    return mapping
+
+
+def _shard_values(values: list[str]) -> list[list[str]]:
+    """
+    Split *values* into shards of at most _SHARD_MAX_VALUES values and
+    _SHARD_MAX_CHARS characters.
+
+    Values are grouped by their first word (case-insensitive) and groups
+    are packed in alphabetical order, so variants such as "Orange with Bits"
+    and "Orange Smooth" share a shard (and a consistent answer).  A group
+    only spans shards when it alone exceeds the bounds.  The order is
+    deterministic, so the same values always give the same prompts.
+    """
+    groups: dict[str, list[str]] = {}
+    for value in values:
+        groups.setdefault(_shard_group_key(value), []).append(value)
+
+    shards: list[list[str]] = []
+    current: list[str] = []
+    current_chars = 0
+    for key in sorted(groups):
+        group = sorted(groups[key], key=str.lower)
+        group_chars = sum(len(value) for value in group)
+        # Start a new shard rather than split a group that fits in one
+        if current and (
+            len(current) + len(group) > _SHARD_MAX_VALUES
+            or current_chars + group_chars > _SHARD_MAX_CHARS
+        ):
+            shards.append(current)
+            current, current_chars = [], 0
+        for value in group:
+            if current and (
+                len(current) >= _SHARD_MAX_VALUES
+                or current_chars + len(value) > _SHARD_MAX_CHARS
+            ):
+                shards.append(current)
+                current, current_chars = [], 0
+            current.append(value)
+            current_chars += len(value)
+    if current:
+        shards.append(current)
+    return shards
+
+
+def _shard_group_key(value: str) -> str:
+    """Lower-cased first word of *value*, ignoring punctuation."""
+    words = re.findall(r"\w+", value.lower())
+    return words[0] if words else ""
+
+
 def _call_llm_for_harmonization(
     values: list[str],
     api_key: str,
@@ -455,31 +641,19 @@ def _call_llm_for_harmonization(
 
     Returns a dict mapping input value → cleaned value, or None on failure.
     """
-    import anthropic
-
     flavor_list_json = json.dumps(values, ensure_ascii=False, indent=2)
-    prompt = _LAYER2_PROMPT_TEMPLATE.format(flavor_list_json=flavor_list_json)
+    prompt = _LAYER2_VALUES_TEMPLATE.format(flavor_list_json=flavor_list_json)
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=16384,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        response_text = message.content[0].text
-        input_tokens = message.usage.input_tokens
-        output_tokens = message.usage.output_tokens
-        cost = (input_tokens * 3.0 / 1_000_000) + (output_tokens * 15.0 / 1_000_000)
-        logger.info(
-            f"Layer 2 LLM call: {input_tokens} in / {output_tokens} out tokens, "
-            f"est. cost ${cost:.4f}"
+        response = complete(
+            prompt, api_key, max_tokens=16384, caller="flavor_harmonization",
+            static_prefix=_LAYER2_PROMPT_PREFIX,
         )
     except Exception as exc:
         logger.error(f"Layer 2 LLM API call failed: {exc}")
         return None
 
-    return _parse_harmonization_response(response_text)
+    return _parse_harmonization_response(response.text)
 
 
 def _parse_harmonization_response(response_text: str) -> dict[str, str] | None:
@@ -520,30 +694,3 @@ def _parse_harmonization_response(response_text: str) -> dict[str, str] | None:
         return None
 
     return mapping
-
-
-def _load_cache(path: str) -> dict[str, str]:
-    """Load the flavor clean cache from disk. Returns empty dict if file not found."""
-    cache_path = Path(path)
-    if not cache_path.exists():
-        return {}
-    try:
-        with cache_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, dict):
-            logger.warning(f"Cache file {path} does not contain a JSON object — starting fresh")
-            return {}
-        return data
-    except Exception as exc:
-        logger.warning(f"Failed to load flavor cache from {path}: {exc} — starting fresh")
-        return {}
-
-
-def _save_cache(path: str, cache: dict[str, str]) -> None:
-    """Persist the flavor clean cache to disk as pretty-printed JSON."""
-    try:
-        cache_path = Path(path)
-        with cache_path.open("w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
-    except Exception as exc:
-        logger.error(f"Failed to save flavor cache to {path}: {exc}")
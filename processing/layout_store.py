@@ -0,0 +1,217 @@
+"""
+Layout store — remembers the sheet layouts seen in uploaded files.
+
+file_reader fingerprints the template of every sheet it reads (see
+_layout_fingerprint) and can reuse a previously detected SheetLayout for a
+matching fingerprint instead of re-reading the header columns.  This module
+keeps those layouts between runs and counts how often an upload matched a
+layout that was already known — the layout hit rate, which shows how
+standardised the incoming store files are.
+
+Layouts and counters live in the shared SQLite result store
+(processing/llm_result_store.py): layouts as JSON under namespace
+"sheet_layouts", files seen per fingerprint and lifetime hits/misses as
+counters.  Only the calling (main) process reads and writes them — pool
+workers receive the known layouts as a plain dict — but overlapping
+uploads in other sessions do too, so a save upserts this run's layouts and
+adds its counts in place instead of rewriting the whole store.  A store
+that cannot be read starts empty.
+
+Public API:
+    load_layout_store(path)                     → LayoutStore
+    record_layout(store, fingerprint, layout)   → bool
+    save_layout_store(store, path)              → bool
+    layout_hit_rate(store)                      → float
+"""
+
+import dataclasses
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from processing.file_reader import SheetLayout
+from processing.llm_result_store import (
+    DEFAULT_LLM_RESULT_STORE_PATH,
+    add_counts,
+    all_results,
+    lookup_counts,
+    store_results,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default location of the store: the shared result store.
+DEFAULT_LAYOUT_STORE_PATH: Path = DEFAULT_LLM_RESULT_STORE_PATH
+
+# Result store namespaces: layouts by fingerprint, files seen per
+# fingerprint, and the lifetime "hits" / "misses" counters.
+_LAYOUTS_NAMESPACE: str = "sheet_layouts"
+_FILES_SEEN_NAMESPACE: str = "sheet_layout_files"
+_MATCHES_NAMESPACE: str = "sheet_layout_matches"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data classes
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class LayoutStore:
+    """Known layouts keyed by fingerprint, plus hit/miss counters."""
+
+    layouts: dict[str, SheetLayout] = field(default_factory=dict)
+    # Files seen per fingerprint, over the lifetime of the store
+    files_seen: dict[str, int] = field(default_factory=dict)
+    # Lifetime counters (persisted)
+    hits: int = 0
+    misses: int = 0
+    # Counters for this run only (not persisted)
+    session_hits: int = 0
+    session_misses: int = 0
+    # Recorded since loading or the last save — what a save adds to the store
+    unsaved_layouts: dict[str, SheetLayout] = field(default_factory=dict)
+    unsaved_files_seen: dict[str, int] = field(default_factory=dict)
+    unsaved_hits: int = 0
+    unsaved_misses: int = 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+def load_layout_store(path: Path | str | None = DEFAULT_LAYOUT_STORE_PATH) -> LayoutStore:
+    """
+    Load the known layouts and counters from the result store.
+
+    Args:
+        path: SQLite result store.  None gives an empty, in-memory store.
+
+    Returns:
+        The stored LayoutStore, or an empty one if the store cannot be read
+        (logged).  Unreadable layouts are skipped (logged).
+    """
+    if path is None:
+        return LayoutStore()
+
+    layouts: dict[str, SheetLayout] = {}
+    for fingerprint, encoded in all_results(path, _LAYOUTS_NAMESPACE).items():
+        try:
+            layouts[fingerprint] = SheetLayout(**json.loads(encoded))
+        except (TypeError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable stored layout {fingerprint}: {exc}")
+
+    matches = lookup_counts(path, _MATCHES_NAMESPACE)
+    return LayoutStore(
+        layouts=layouts,
+        files_seen=lookup_counts(path, _FILES_SEEN_NAMESPACE),
+        hits=matches.get("hits", 0),
+        misses=matches.get("misses", 0),
+    )
+
+
+def record_layout(
+    store: LayoutStore,
+    fingerprint: str,
+    layout: SheetLayout,
+) -> bool:
+    """
+    Count one file against the store and remember its layout.
+
+    A hit means the fingerprint was already known with the same layout.
+    A known fingerprint whose layout changed (e.g. an extra column was
+    added to the template) counts as a miss and the stored layout is
+    replaced.
+
+    Args:
+        store: The store to update in place.
+        fingerprint: Layout fingerprint reported by the reader.
+        layout: The layout the reader used for this file.
+
+    Returns:
+        True for a hit, False for a miss.
+    """
+    is_hit = store.layouts.get(fingerprint) == layout
+    if is_hit:
+        store.hits += 1
+        store.session_hits += 1
+        store.unsaved_hits += 1
+    else:
+        store.misses += 1
+        store.session_misses += 1
+        store.unsaved_misses += 1
+        store.layouts[fingerprint] = layout
+
+    store.unsaved_layouts[fingerprint] = layout
+    store.files_seen[fingerprint] = store.files_seen.get(fingerprint, 0) + 1
+    store.unsaved_files_seen[fingerprint] = (
+        store.unsaved_files_seen.get(fingerprint, 0) + 1
+    )
+    return is_hit
+
+
+def save_layout_store(
+    store: LayoutStore,
+    path: Path | str | None = DEFAULT_LAYOUT_STORE_PATH,
+) -> bool:
+    """
+    Add this run's records to the result store.
+
+    This run's layouts replace stored ones by fingerprint, and its file
+    counts, hits and misses are added to the stored counters in place, so
+    layouts and counts saved by other sessions are kept.  On success
+    *store* is reloaded with the combined state.
+
+    Args:
+        store: The store to save.
+        path: SQLite result store.  None skips saving.
+
+    Returns:
+        True if everything was committed, False otherwise (logged; what
+        was not committed is kept for the next save).
+    """
+    if path is None:
+        return False
+
+    # Each part is cleared once committed, so a retry never adds it twice
+    if store_results(path, _LAYOUTS_NAMESPACE, {
+        fingerprint: json.dumps(dataclasses.asdict(layout))
+        for fingerprint, layout in store.unsaved_layouts.items()
+    }):
+        store.unsaved_layouts = {}
+    if add_counts(path, _FILES_SEEN_NAMESPACE, store.unsaved_files_seen):
+        store.unsaved_files_seen = {}
+    if add_counts(path, _MATCHES_NAMESPACE, {
+        "hits": store.unsaved_hits, "misses": store.unsaved_misses,
+    }):
+        store.unsaved_hits = store.unsaved_misses = 0
+
+    if store.unsaved_layouts or store.unsaved_files_seen or store.unsaved_hits \
+            or store.unsaved_misses:
+        logger.warning(f"Could not save every layout record to '{path}'")
+        return False
+
+    merged = load_layout_store(path)
+    store.layouts = merged.layouts
+    store.files_seen = merged.files_seen
+    store.hits = merged.hits
+    store.misses = merged.misses
+    return True
+
+
+def layout_hit_rate(store: LayoutStore, session_only: bool = False) -> float:
+    """
+    Share of files whose layout was already known.
+
+    Args:
+        store: The store to report on.
+        session_only: Count only files recorded in this run.
+
+    Returns:
+        Hit rate between 0.0 and 1.0 (0.0 when no files were recorded).
+    """
+    if session_only:
+        hits, misses = store.session_hits, store.session_misses
+    else:
+        hits, misses = store.hits, store.misses
+    total = hits + misses
+    return hits / total if total else 0.0
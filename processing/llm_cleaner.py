@@ -8,22 +8,68 @@ are validated against VALID_VALUES before being applied to the DataFrame.
 If no API key is provided, the LLM step is skipped entirely and flagged
 items remain unresolved (highlighted in yellow in the output Excel).
 
+Flagged items that would send the LLM identical input — same column,
+original value and row context, up to case and spacing — are sent once:
+one representative per signature goes into the batches, and its decision
+is fanned back out to every row that shares the signature.
+
+Before batching, every unique item is looked up in the persistent decision
+cache (processing/decision_cache.py); only cache misses are sent, and
+validated decisions are stored for later runs.  Cache keys include the
+prompt version and model id, so editing the prompt invalidates them.
+
+Batches are dispatched concurrently from a thread pool (at most
+_MAX_CONCURRENT_BATCHES calls in flight) through the shared client
+(utils/llm_client.py), which rate-limits them process-wide and retries API
+errors with jittered exponential backoff.  Responses are streamed and the
+JSON array is parsed object by object as it arrives
+(_DecisionStreamParser), so a response that is truncated, malformed part
+way through or cut off by a dropped connection still yields every decision
+completed before the break; only the items it did not answer are
+resubmitted.  A batch whose response yields no decision at all is split in
+half and both halves are resubmitted.  Decisions are applied in batch order
+once all calls finish, so the result does not depend on which call
+returned first.
+
+The prompt is split into a static prefix (_PROMPT_PREFIX: task, valid
+values, column instructions, output format) and the batch's items.  The
+prefix is marked for provider-side prompt caching, so every batch after
+the first reads it from the cache instead of paying full input price for
+it again; cached input tokens are reported on the result.
+
+Every applied decision is also recorded in the result's changes_log
+(a ProvenanceLog, see processing/provenance.py) with method LLM_CHANGE_METHOD.
+
 Public API:
-    clean_with_llm(dataframe, flagged_items, api_key) → LLMCleaningResult
+    clean_with_llm(dataframe, flagged_items, api_key, max_concurrent_batches,
+                   cache_path, legacy_cache_path)     → LLMCleaningResult
+    LLM_CHANGE_METHOD                                 (changes_log method)
 
 See docs/RULES.md — LLM Call Specification for the prompt template.
 """
 
+import hashlib
 import json
 import logging
 import re
-import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
 
 import pandas as pd
 
+from config.llm_config import MODEL_ID
 from config.schema import VALID_VALUES
+from processing.decision_cache import (
+    DEFAULT_DECISION_CACHE_PATH,
+    LEGACY_DECISION_CACHE_PATH,
+    lookup_decisions,
+    store_decisions,
+)
 from processing.normalizer import FlaggedItem
+from processing.provenance import ProvenanceLog, append_change
+from utils.llm_client import LLMResponse, complete
 
 logger = logging.getLogger(__name__)
 
@@ -32,18 +78,51 @@ logger = logging.getLogger(__name__)
 # Constants
 # ═══════════════════════════════════════════════════════════════════════════
 
-_MODEL_ID = "claude-sonnet-4-20250514"
+# Method recorded in the changes log for every applied LLM decision.
+LLM_CHANGE_METHOD: str = "LLM"
 
-# Maximum flagged items per API call.  Beyond this, batch into multiple calls.
-# Keep batches small so LLM output fits comfortably within max_tokens.
-_MAX_ITEMS_PER_BATCH = 50
+# Hard cap on flagged items per API call.  Batches are normally closed
+# earlier by the token budgets below.
+_MAX_ITEMS_PER_BATCH = 150
 
 # Maximum output tokens for the LLM response.  Each resolved item produces
-# ~80-120 output tokens, so 50 items need ~4000-6000 tokens.  16384 gives
-# ample headroom even for verbose reasoning.
+# ~80-120 output tokens.  16384 gives ample headroom even for verbose
+# reasoning.
 _MAX_OUTPUT_TOKENS = 16384
 
-_PROMPT_TEMPLATE = """You are a data cleaning assistant for supermarket shelf analysis data.
+# Batches are packed until their estimated output reaches half of
+# _MAX_OUTPUT_TOKENS — the rest is headroom for estimates that run low —
+# or their item JSON reaches the input budget.
+_OUTPUT_TOKEN_BUDGET = _MAX_OUTPUT_TOKENS // 2
+_INPUT_TOKEN_BUDGET = 24_000
+
+# Rough characters per token, for estimating prompt and response sizes.
+_CHARS_PER_TOKEN = 3.5
+
+# Estimated output tokens per item, besides the echoed original value,
+# until responses for that column have been seen; then the learned
+# per-column values (moving average, weight _OUTPUT_LEARNING_RATE for each
+# new response) are used.  Learned values last for the process lifetime
+# (shared by every upload), so they are kept between _MIN and _MAX, and a
+# truncated response raises a column by at most _MAX_TRUNCATION_SCALE.
+_DEFAULT_OUTPUT_OVERHEAD_TOKENS = 100.0
+_MIN_OUTPUT_OVERHEAD_TOKENS = 1.0
+_MAX_OUTPUT_OVERHEAD_TOKENS = 1000.0
+_OUTPUT_LEARNING_RATE = 0.5
+_MAX_TRUNCATION_SCALE = 2.0
+_OUTPUT_OVERHEAD_BY_COLUMN: dict[str, float] = {}
+
+# Batches that fail to parse are split in half and retried, down to this size.
+_MIN_SPLIT_SIZE = 10
+
+# API calls in flight at once (default for clean_with_llm).
+_MAX_CONCURRENT_BATCHES = 4
+
+# Everything in the cleaning prompt that is the same for every batch: the
+# task, valid values, column instructions and output format.  Sent as a
+# static prefix so the provider caches it (see utils/llm_client.py); the
+# batch's items follow in _PROMPT_ITEMS_TEMPLATE.
+_PROMPT_PREFIX = """You are a data cleaning assistant for supermarket shelf analysis data.
 
 TASK: Resolve the following ambiguous data items. For each item, return the
 normalized value from the allowed values list, or "" (blank) if you cannot
@@ -147,15 +226,31 @@ COLUMN-SPECIFIC INSTRUCTIONS:
   1.35L, 750ml), multipack counts (e.g. 7x), or pack size numbers, note this in 
   your reasoning. These should be in the Packaging Size column, not in the Product Name.
 
-ITEMS TO RESOLVE:
-{flagged_items_json}
-
 Return a JSON array where each element has:
 - "row_index": the row index from the input
 - "column": the column name
 - "original_value": the original value
 - "normalized_value": your decision (valid value or "" for blank)
-- "reasoning": brief explanation (1 sentence)"""
+- "reasoning": brief explanation (1 sentence)
+
+"""
+
+# The part of the prompt that changes per batch, sent after _PROMPT_PREFIX.
+_PROMPT_ITEMS_TEMPLATE = """ITEMS TO RESOLVE:
+{flagged_items_json}"""
+
+# Identifies the prompt in decision cache keys: editing the prompt (the
+# valid values or the column instructions) invalidates cached decisions.
+_PROMPT_VERSION = hashlib.sha256(
+    (_PROMPT_PREFIX + _PROMPT_ITEMS_TEMPLATE).encode("utf-8")
+).hexdigest()[:16]
+
+# Context fields that can change the decision for a column, for decision
+# cache keys.  Columns not listed use the whole context.  The prompt tells
+# the LLM to decide Shelf Location from the original value alone.
+_CACHE_CONTEXT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "Shelf Location": (),
+}
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -169,12 +264,27 @@ class LLMCleaningResult:
     dataframe: pd.DataFrame = field(default_factory=pd.DataFrame)
     resolved_items: list[dict] = field(default_factory=list)
     rejected_items: list[dict] = field(default_factory=list)
+    # One entry per applied decision, method LLM_CHANGE_METHOD
+    changes_log: ProvenanceLog = field(default_factory=ProvenanceLog)
     skipped: bool = False
     api_cost_estimate: float = 0.0
+    # All prompt tokens; cached_input_tokens of them were prompt-cache reads
     input_tokens: int = 0
+    cached_input_tokens: int = 0
     output_tokens: int = 0
     failed_batches: int = 0
     total_batches: int = 0
+    # Decisions kept from incomplete responses (their batch's other items
+    # were resubmitted rather than the whole batch)
+    salvaged_decisions: int = 0
+    # Flagged items received vs. unique signatures sent to the LLM
+    flagged_count: int = 0
+    unique_count: int = 0
+    # flagged_count / unique_count (e.g. 4.0 → a quarter of the items sent)
+    reduction_ratio: float = 1.0
+    # Unique items resolved from the decision cache vs. sent to the LLM
+    cache_hits: int = 0
+    cache_misses: int = 0
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -185,19 +295,41 @@ def clean_with_llm(
     dataframe: pd.DataFrame,
     flagged_items: list[FlaggedItem],
     api_key: str | None = None,
+    max_concurrent_batches: int | None = None,
+    cache_path: Path | str | None = DEFAULT_DECISION_CACHE_PATH,
+    legacy_cache_path: Path | str | None = LEGACY_DECISION_CACHE_PATH,
 ) -> LLMCleaningResult:
     """
     Resolve flagged items using Claude Sonnet.
 
-    Batches all flagged items into API calls of up to 50 items each.
-    Parses the JSON response, validates returned values against VALID_VALUES,
-    and applies valid decisions to the DataFrame.  If a batch fails to parse
-    (e.g. truncated response), it is split in half and retried.
+    Flagged items with the same signature (column, original value and
+    context, ignoring case and spacing) are sent once; the decision for
+    the representative is applied to every row in its group.  Unique
+    items with a cached decision from an earlier run are resolved from
+    the decision cache; the rest are packed into batches by estimated
+    output and input tokens (see _create_batches()).
+
+    Batches are sent concurrently from a thread pool through the shared
+    LLM client (rate limit, retries with jittered backoff), each as the
+    cached static prompt prefix plus the batch's items.  Each response is
+    streamed and parsed decision by decision; if it breaks off (truncated,
+    malformed or interrupted), the decisions received so far are kept and
+    only the unanswered items are resubmitted.  A batch whose response
+    yields no decision at all is split in half and both halves are
+    resubmitted.  The parsed decisions are validated against VALID_VALUES
+    and applied to the DataFrame in batch order once every call has
+    finished.
 
     Args:
         dataframe: The partially-cleaned DataFrame.
         flagged_items: List of FlaggedItems from the normalizer.
         api_key: Anthropic API key. If None, LLM step is skipped.
+        max_concurrent_batches: Cap on API calls in flight at once.
+            None → _MAX_CONCURRENT_BATCHES.
+        cache_path: SQLite LLM result store holding the decision cache
+            (see processing/decision_cache.py).  None disables the cache.
+        legacy_cache_path: Old JSON decision cache, imported into the store
+            the first time it is seen.  None skips the import.
 
     Returns:
         LLMCleaningResult with updated DataFrame and resolution details.
@@ -214,91 +346,54 @@ def clean_with_llm(
         logger.info("No flagged items to resolve — skipping LLM call")
         return LLMCleaningResult(dataframe=result_df, skipped=False)
 
-    # Batch items if there are too many
-    batches = _create_batches(flagged_items, _MAX_ITEMS_PER_BATCH)
-
-    all_resolved: list[dict] = []
-    all_rejected: list[dict] = []
-    total_cost: float = 0.0
-    total_input_tokens: int = 0
-    total_output_tokens: int = 0
-    failed_batch_count: int = 0
-
-    # Use a queue so failed batches can be re-split and retried
-    batch_queue: list[list[FlaggedItem]] = list(batches)
-    total_batch_count = len(batch_queue)
-    processed_idx = 0
-
-    while batch_queue:
-        batch = batch_queue.pop(0)
-        processed_idx += 1
-
-        logger.info(
-            f"Processing LLM batch {processed_idx}/{total_batch_count} "
-            f"({len(batch)} items)"
-        )
+    # Send one representative per signature; fan decisions out afterwards
+    unique_items, members_by_cell = _dedupe_flagged_items(flagged_items)
+    reduction_ratio = len(flagged_items) / len(unique_items)
+    logger.info(
+        f"Deduplicated {len(flagged_items)} flagged items to "
+        f"{len(unique_items)} unique signatures ({reduction_ratio:.1f}x reduction)"
+    )
 
-        prompt = _build_prompt(batch)
+    # Resolve what earlier runs already decided; only the rest goes out
+    cached_decisions, uncached_items, cache_key_by_cell = _lookup_cached_decisions(
+        unique_items, cache_path, legacy_cache_path
+    )
 
-        try:
-            response_text, cost, input_tokens, output_tokens = _call_sonnet_api(prompt, api_key)
-        except Exception as exc:
-            logger.error(f"LLM API call failed: {exc}")
-            # Try once more after a short delay
-            try:
-                time.sleep(2)
-                response_text, cost, input_tokens, output_tokens = _call_sonnet_api(prompt, api_key)
-            except Exception as retry_exc:
-                logger.error(f"LLM API retry also failed: {retry_exc}")
-                failed_batch_count += 1
-                continue
-
-        total_cost += cost
-        total_input_tokens += input_tokens
-        total_output_tokens += output_tokens
-
-        llm_decisions = _parse_llm_response(response_text)
-        if llm_decisions is None:
-            # If batch is large enough, split in half and retry both halves
-            _MIN_SPLIT_SIZE = 10
-            if len(batch) > _MIN_SPLIT_SIZE:
-                mid = len(batch) // 2
-                logger.warning(
-                    f"Parse failed for batch of {len(batch)} items — "
-                    f"splitting into two sub-batches of {mid} and "
-                    f"{len(batch) - mid} items for retry"
-                )
-                batch_queue.insert(0, batch[mid:])
-                batch_queue.insert(0, batch[:mid])
-                total_batch_count += 1  # one batch became two (net +1)
-            else:
-                logger.error(
-                    f"Parse failed for small batch of {len(batch)} items — "
-                    f"skipping (cannot split further)"
-                )
-                failed_batch_count += 1
-            continue
+    dispatch = _dispatch_batches(
+        _create_batches(uncached_items), api_key, max_concurrent_batches
+    )
 
-        resolved, rejected = _validate_and_apply(result_df, llm_decisions)
-        all_resolved.extend(resolved)
-        all_rejected.extend(rejected)
+    all_resolved, all_rejected = _apply_decisions(
+        result_df, cached_decisions, dispatch.decisions_by_key, members_by_cell
+    )
+    store_decisions(cache_path, _decisions_to_store(all_resolved, cache_key_by_cell))
 
     logger.info(
         f"LLM cleaning complete: {len(all_resolved)} resolved, "
-        f"{len(all_rejected)} rejected, {failed_batch_count} failed batches, "
-        f"estimated cost: ${total_cost:.4f}"
+        f"{len(all_rejected)} rejected, {dispatch.failed_batches} failed batches, "
+        f"{dispatch.salvaged_decisions} decisions salvaged from incomplete responses, "
+        f"{dispatch.cached_input_tokens} of {dispatch.input_tokens} input tokens from the "
+        f"prompt cache, estimated cost: ${dispatch.cost_usd:.4f}"
     )
 
     return LLMCleaningResult(
         dataframe=result_df,
         resolved_items=all_resolved,
         rejected_items=all_rejected,
+        changes_log=_build_changes_log(all_resolved, flagged_items),
         skipped=False,
-        api_cost_estimate=total_cost,
-        input_tokens=total_input_tokens,
-        output_tokens=total_output_tokens,
-        failed_batches=failed_batch_count,
-        total_batches=total_batch_count,
+        api_cost_estimate=dispatch.cost_usd,
+        input_tokens=dispatch.input_tokens,
+        cached_input_tokens=dispatch.cached_input_tokens,
+        output_tokens=dispatch.output_tokens,
+        failed_batches=dispatch.failed_batches,
+        total_batches=dispatch.total_batches,
+        salvaged_decisions=dispatch.salvaged_decisions,
+        flagged_count=len(flagged_items),
+        unique_count=len(unique_items),
+        reduction_ratio=reduction_ratio,
+        cache_hits=len(cached_decisions),
+        cache_misses=len(uncached_items),
     )
 
 
@@ -308,74 +403,115 @@ def clean_with_llm(
 
 def _build_prompt(flagged_items: list[FlaggedItem]) -> str:
     """
-    Assemble the LLM prompt from the template and flagged items.
+    Assemble the per-batch part of the LLM prompt from the flagged items.
 
     Each flagged item is serialized as a JSON object with full row context
     (Brand, Flavor, Claims, Processing Method, HPP Treatment, Notes) so the
-    LLM can make informed decisions.
+    LLM can make informed decisions.  The instructions are not included:
+    they are sent as the cached static prefix (_PROMPT_PREFIX).
 
     Args:
         flagged_items: List of FlaggedItems to include.
 
     Returns:
-        Complete prompt string ready for the API call.
+        Prompt string to send after _PROMPT_PREFIX.
     """
-    items_for_json: list[dict] = []
+    items_for_json = [_prompt_entry(item) for item in flagged_items]
+    flagged_json = json.dumps(items_for_json, indent=2, ensure_ascii=False)
+    return _PROMPT_ITEMS_TEMPLATE.format(flagged_items_json=flagged_json)
 
-    for item in flagged_items:
-        entry = {
-            "row_index": item.row_index,
-            "column": item.column,
-            "original_value": item.original_value,
-            "context": item.context,
-        }
-        items_for_json.append(entry)
 
-    flagged_json = json.dumps(items_for_json, indent=2, ensure_ascii=False)
-    return _PROMPT_TEMPLATE.format(flagged_items_json=flagged_json)
+def _prompt_entry(item: FlaggedItem) -> dict:
+    """The JSON object sent to the LLM for one flagged item."""
+    return {
+        "row_index": item.row_index,
+        "column": item.column,
+        "original_value": item.original_value,
+        "context": item.context,
+    }
+
+
+@dataclass
+class _BatchOutcome:
+    """What one batch call produced (see _run_batch())."""
 
+    # Decisions parsed from the response, in the order they arrived
+    decisions: list[Any]
+    # True if the whole JSON array was received and parsed
+    complete: bool
+    # None if the call raised
+    response: LLMResponse | None = None
+    error: Exception | None = None
 
-def _call_sonnet_api(prompt: str, api_key: str) -> tuple[str, float, int, int]:
+
+def _run_batch(batch: list[FlaggedItem], api_key: str) -> _BatchOutcome:
     """
-    Call the Claude Sonnet API with the given prompt.
+    Send one batch and parse its decisions as the response streams in.
 
-    Uses the anthropic Python SDK.  Returns the response text, estimated cost,
-    and token usage counts.
+    Runs in the dispatcher's worker threads and never raises: an API error
+    is returned on the outcome, together with any decisions that had
+    already arrived before it.
 
     Args:
-        prompt: The complete prompt string.
+        batch: The flagged items to resolve.
         api_key: Anthropic API key.
 
     Returns:
-        (response_text, estimated_cost_usd, input_tokens, output_tokens)
-
-    Raises:
-        Exception: On API errors (network, auth, rate limit, etc.).
+        _BatchOutcome with the parsed decisions and whether they are all
+        there.
     """
-    import anthropic
-
-    client = anthropic.Anthropic(api_key=api_key)
+    parser = _DecisionStreamParser()
+    try:
+        response = _call_sonnet_api(_build_prompt(batch), api_key, on_text=parser.feed)
+    except Exception as exc:
+        return _BatchOutcome(decisions=parser.decisions, complete=False, error=exc)
+
+    if not parser.received_text:
+        # Response was not streamed: parse it in one go
+        parser.feed(response.text)
+    if parser.complete:
+        return _BatchOutcome(decisions=parser.decisions, complete=True, response=response)
+
+    # The incremental parser stops at the first malformed object; the
+    # lenient whole-text parser may still read a finished response
+    # (e.g. trailing commas), but not one cut off at max_tokens
+    if response.stop_reason != "max_tokens":
+        decisions = _parse_llm_response(response.text)
+        if decisions is not None:
+            return _BatchOutcome(decisions=decisions, complete=True, response=response)
+    return _BatchOutcome(decisions=parser.decisions, complete=False, response=response)
+
+
+def _call_sonnet_api(
+    prompt: str,
+    api_key: str,
+    on_text: Callable[[str], None] | None = None,
+) -> LLMResponse:
+    """
+    Call Claude Sonnet with a batch prompt via the shared client.
 
-    message = client.messages.create(
-        model=_MODEL_ID,
-        max_tokens=_MAX_OUTPUT_TOKENS,
-        messages=[{"role": "user", "content": prompt}],
-    )
+    _PROMPT_PREFIX goes first as the cached static prefix.  The client
+    (utils/llm_client.py) applies the process-wide rate limit and retries
+    API errors with jittered backoff.  Runs in the dispatcher's worker
+    threads.
 
-    response_text = message.content[0].text
+    Args:
+        prompt: The batch's part of the prompt (from _build_prompt()).
+        api_key: Anthropic API key.
+        on_text: Called with each response fragment as it streams in
+            (None → no streaming).
 
-    # Estimate cost from token usage (Sonnet pricing: ~$3/M input, ~$15/M output)
-    input_tokens = message.usage.input_tokens
-    output_tokens = message.usage.output_tokens
-    estimated_cost = (input_tokens * 3.0 / 1_000_000) + (output_tokens * 15.0 / 1_000_000)
+    Returns:
+        The LLMResponse (text, token usage incl. cached input, cost).
 
-    logger.info(
-        f"Sonnet API call: {input_tokens} input tokens, "
-        f"{output_tokens} output tokens, est. cost ${estimated_cost:.4f}"
+    Raises:
+        Exception: On API errors that persisted through the client's retries.
+    """
+    return complete(
+        prompt, api_key, max_tokens=_MAX_OUTPUT_TOKENS, caller="llm_cleaner",
+        static_prefix=_PROMPT_PREFIX, on_text=on_text,
     )
 
-    return response_text, estimated_cost, input_tokens, output_tokens
-
 
 def _parse_llm_response(response_text: str) -> list[dict] | None:
     """
@@ -444,6 +580,509 @@ def _parse_llm_response(response_text: str) -> list[dict] | None:
     return decisions
 
 
+class _DecisionStreamParser:
+    """
+    Incremental parser for the LLM's JSON array of decisions.
+
+    feed() takes response text in arbitrary fragments; every array element
+    is decoded as soon as its closing brace has arrived and appended to
+    `decisions`.  Text before the opening '[' (prose, a ```json fence) is
+    skipped.  An element that cannot be decoded blocks the ones after it,
+    so a malformed or cut-off response keeps the decisions before the
+    break.  `complete` becomes True when the closing ']' is reached.
+    """
+
+    _DECODER = json.JSONDecoder()
+
+    def __init__(self) -> None:
+        self.decisions: list[Any] = []
+        self.complete = False
+        self.received_text = False
+        # Text not consumed yet (starting after the '[' once it was seen)
+        self._buffer = ""
+        self._in_array = False
+
+    def feed(self, fragment: str) -> None:
+        """Add the next piece of response text and decode what it completes."""
+        if not fragment:
+            return
+        self.received_text = True
+        if self.complete:
+            return
+        self._buffer += fragment
+
+        if self._in_array:
+            # Nothing new can be decoded until an element or the array ends
+            if "}" not in fragment and "]" not in fragment:
+                return
+        else:
+            start = self._buffer.find("[")
+            if start == -1:
+                return
+            self._buffer = self._buffer[start + 1:]
+            self._in_array = True
+
+        buffer = self._buffer
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                self.complete = True
+                break
+            try:
+                element, end = self._DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # Unfinished (or malformed) element
+            self.decisions.append(element)
+            position = end
+        self._buffer = buffer[position:]
+
+
+@dataclass
+class _DispatchResult:
+    """What _dispatch_batches() collected from every batch call."""
+
+    # Parsed decisions per batch, keyed by the batch's position in the
+    # split tree: (i,) for batches[i], key + (0,) / key + (1,) for halves
+    # (or key + (0,) alone for the unanswered rest of an incomplete response).
+    decisions_by_key: dict[tuple[int, ...], list[dict]] = field(default_factory=dict)
+    cost_usd: float = 0.0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    failed_batches: int = 0
+    total_batches: int = 0
+    salvaged_decisions: int = 0
+
+
+def _dispatch_batches(
+    batches: list[list[FlaggedItem]],
+    api_key: str,
+    max_concurrent_batches: int | None,
+) -> _DispatchResult:
+    """
+    Send every batch from a thread pool, resubmitting what went unanswered.
+
+    Each finished call is handed to _record_batch_outcome(), whose
+    resubmissions (the unanswered rest of an incomplete response, or the
+    two halves of a batch that yielded nothing) go back into the pool
+    until no call is left in flight.
+
+    Args:
+        batches: Batches from _create_batches().
+        api_key: Anthropic API key.
+        max_concurrent_batches: Cap on API calls in flight at once.
+            None → _MAX_CONCURRENT_BATCHES.
+
+    Returns:
+        _DispatchResult with the decisions per batch key and the totals.
+    """
+    dispatch = _DispatchResult(total_batches=len(batches))
+
+    worker_count = max(1, min(max_concurrent_batches or _MAX_CONCURRENT_BATCHES, len(batches)))
+    with ThreadPoolExecutor(max_workers=worker_count) as pool:
+        pending: dict[Future, tuple[tuple[int, ...], list[FlaggedItem]]] = {}
+
+        def submit(key: tuple[int, ...], batch: list[FlaggedItem]) -> None:
+            future = pool.submit(_run_batch, batch, api_key)
+            pending[future] = (key, batch)
+
+        for batch_idx, batch in enumerate(batches):
+            submit((batch_idx,), batch)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, batch = pending.pop(future)
+                resubmissions = _record_batch_outcome(
+                    dispatch, key, batch, future.result(), in_flight=len(pending)
+                )
+                for retry_key, retry_batch in resubmissions:
+                    submit(retry_key, retry_batch)
+
+    return dispatch
+
+
+def _record_batch_outcome(
+    dispatch: _DispatchResult,
+    key: tuple[int, ...],
+    batch: list[FlaggedItem],
+    outcome: _BatchOutcome,
+    in_flight: int,
+) -> list[tuple[tuple[int, ...], list[FlaggedItem]]]:
+    """
+    Add one finished call to *dispatch* and say what must be resubmitted.
+
+    Args:
+        dispatch: Totals and decisions so far, updated in place.
+        key: The batch's position in the split tree.
+        batch: The items that were sent.
+        outcome: What the call produced (see _run_batch()).
+        in_flight: Calls still pending, for progress logging.
+
+    Returns:
+        (key, items) pairs to submit again — empty once the batch is done.
+    """
+    response = outcome.response
+    if outcome.error is not None and not outcome.decisions:
+        logger.error(
+            f"LLM API call failed for batch of {len(batch)} items: {outcome.error}"
+        )
+        dispatch.failed_batches += 1
+        return []
+
+    if response is not None:
+        dispatch.cost_usd += response.cost_usd
+        dispatch.input_tokens += response.input_tokens
+        dispatch.cached_input_tokens += response.cached_input_tokens
+        dispatch.output_tokens += response.output_tokens
+
+    if outcome.complete:
+        dispatch.decisions_by_key[key] = outcome.decisions
+        _learn_output_sizes(outcome.decisions, response.output_tokens)
+        logger.info(
+            f"LLM batch done ({len(dispatch.decisions_by_key)} parsed, "
+            f"{in_flight} in flight, {dispatch.total_batches} total)"
+        )
+        return []
+
+    return _resubmit_incomplete_batch(dispatch, key, batch, outcome)
+
+
+def _resubmit_incomplete_batch(
+    dispatch: _DispatchResult,
+    key: tuple[int, ...],
+    batch: list[FlaggedItem],
+    outcome: _BatchOutcome,
+) -> list[tuple[tuple[int, ...], list[FlaggedItem]]]:
+    """
+    Keep what an incomplete response answered and plan the retry of the rest.
+
+    Decisions that arrived are kept and only the unanswered items are
+    resubmitted.  A response with no decision at all splits the batch in
+    half (down to _MIN_SPLIT_SIZE items); a smaller batch is given up.
+
+    Args:
+        dispatch: Totals and decisions so far, updated in place.
+        key: The batch's position in the split tree.
+        batch: The items that were sent.
+        outcome: The incomplete outcome (see _run_batch()).
+
+    Returns:
+        (key, items) pairs to submit again.
+    """
+    response = outcome.response
+    if response is not None and response.output_tokens >= _MAX_OUTPUT_TOKENS:
+        _learn_from_truncation(batch)
+
+    # Incomplete response: keep what arrived, resubmit the rest
+    unanswered = _unanswered_items(batch, outcome.decisions)
+    if len(unanswered) < len(batch):
+        dispatch.decisions_by_key[key] = outcome.decisions
+        dispatch.salvaged_decisions += len(batch) - len(unanswered)
+        if not unanswered:
+            return []
+        logger.warning(
+            f"Incomplete response for batch of {len(batch)} items — "
+            f"kept {len(batch) - len(unanswered)} decisions, "
+            f"resubmitting the other {len(unanswered)} items"
+        )
+        dispatch.total_batches += 1
+        return [(key + (0,), unanswered)]
+
+    # Nothing usable: split a large enough batch in half, retry both halves
+    if len(batch) > _MIN_SPLIT_SIZE:
+        mid = len(batch) // 2
+        logger.warning(
+            f"Parse failed for batch of {len(batch)} items — "
+            f"splitting into two sub-batches of {mid} and "
+            f"{len(batch) - mid} items for retry"
+        )
+        dispatch.total_batches += 1  # one batch became two (net +1)
+        return [(key + (0,), batch[:mid]), (key + (1,), batch[mid:])]
+
+    logger.error(
+        f"Parse failed for small batch of {len(batch)} items — "
+        f"skipping (cannot split further)"
+    )
+    dispatch.failed_batches += 1
+    return []
+
+
+def _unanswered_items(batch: list[FlaggedItem], decisions: list[Any]) -> list[FlaggedItem]:
+    """The items of *batch* that no decision refers to (by row_index and column)."""
+    answered: set[tuple] = set()
+    for decision in decisions:
+        try:
+            answered.add((decision["row_index"], decision["column"]))
+        except (KeyError, TypeError):
+            continue
+    return [item for item in batch if (item.row_index, item.column) not in answered]
+
+
+def _item_signature(
+    item: FlaggedItem,
+    context_columns: tuple[str, ...] | None = None,
+) -> tuple:
+    """
+    Canonical form of everything the prompt sends for *item* except its row.
+
+    Values are compared with case and runs of whitespace ignored, so
+    "Front  Chiller" and "front chiller" in otherwise identical rows share
+    one signature.
+
+    Args:
+        item: A flagged item.
+        context_columns: Only include these context fields (None → all).
+
+    Returns:
+        Hashable (column, original value, sorted context items) tuple.
+    """
+    def canonical(value: object) -> str:
+        return " ".join(str(value).split()).casefold() if value is not None else ""
+
+    return (
+        item.column,
+        canonical(item.original_value),
+        tuple(sorted(
+            (col, canonical(value))
+            for col, value in item.context.items()
+            if context_columns is None or col in context_columns
+        )),
+    )
+
+
+def _decision_cache_key(item: FlaggedItem) -> str:
+    """
+    Decision cache key for *item*: its signature over the context fields
+    that matter for its column, plus the prompt version and model id.
+
+    Args:
+        item: A flagged item.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    signature = _item_signature(item, _CACHE_CONTEXT_COLUMNS.get(item.column))
+    key_source = json.dumps([_PROMPT_VERSION, MODEL_ID, signature], ensure_ascii=False)
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+def _lookup_cached_decisions(
+    unique_items: list[FlaggedItem],
+    cache_path: Path | str | None,
+    legacy_cache_path: Path | str | None,
+) -> tuple[list[dict], list[FlaggedItem], dict[tuple, str]]:
+    """
+    Resolve the unique items that an earlier run already decided.
+
+    Args:
+        unique_items: One representative per signature.
+        cache_path: SQLite result store (None disables the cache).
+        legacy_cache_path: Old JSON decision cache to import, or None.
+
+    Returns:
+        (cached_decisions, uncached_items, cache_key_by_cell) — a decision
+        dict per cache hit, the items still to send, and (row_index,
+        column) of each item to send → its cache key.
+    """
+    item_keys = [(item, _decision_cache_key(item)) for item in unique_items]
+    cache = lookup_decisions(
+        cache_path, (cache_key for _, cache_key in item_keys), legacy_cache_path
+    )
+
+    cached_decisions: list[dict] = []
+    uncached_items: list[FlaggedItem] = []
+    cache_key_by_cell: dict[tuple, str] = {}
+    for item, cache_key in item_keys:
+        cached = cache.get(cache_key)
+        if cached is None:
+            uncached_items.append(item)
+            cache_key_by_cell[(item.row_index, item.column)] = cache_key
+        else:
+            cached_decisions.append({
+                "row_index": item.row_index,
+                "column": item.column,
+                "original_value": item.original_value,
+                "normalized_value": cached["normalized_value"],
+                "reasoning": cached.get("reasoning", ""),
+            })
+    logger.info(
+        f"Decision cache: {len(cached_decisions)} hits, {len(uncached_items)} misses"
+    )
+    return cached_decisions, uncached_items, cache_key_by_cell
+
+
+def _apply_decisions(
+    result_df: pd.DataFrame,
+    cached_decisions: list[dict],
+    decisions_by_key: dict[tuple[int, ...], list[dict]],
+    members_by_cell: dict[tuple, list[FlaggedItem]],
+) -> tuple[list[dict], list[dict]]:
+    """
+    Validate and apply every decision.
+
+    Cached decisions go first, then batches in batch-key order, whatever
+    order the calls finished in, so the result does not depend on API
+    timing.  Cached decisions are validated again in case VALID_VALUES
+    changed.
+
+    Args:
+        result_df: DataFrame to update in place.
+        cached_decisions: Decisions from _lookup_cached_decisions().
+        decisions_by_key: Parsed decisions per batch key (_DispatchResult).
+        members_by_cell: Representative cell → its group (see
+            _dedupe_flagged_items()).
+
+    Returns:
+        (resolved_items, rejected_items)
+    """
+    all_resolved, all_rejected = _validate_and_apply(
+        result_df, _fan_out_decisions(cached_decisions, members_by_cell)
+    )
+    for key in sorted(decisions_by_key):
+        resolved, rejected = _validate_and_apply(
+            result_df, _fan_out_decisions(decisions_by_key[key], members_by_cell)
+        )
+        all_resolved.extend(resolved)
+        all_rejected.extend(rejected)
+    return all_resolved, all_rejected
+
+
+def _decisions_to_store(
+    resolved_items: list[dict],
+    cache_key_by_cell: dict[tuple, str],
+) -> dict[str, dict]:
+    """
+    Pick the applied decisions for items that were sent to the LLM.
+
+    Only decisions for a sent representative's own cell are stored (their
+    fanned-out copies share its key, and cache hits are already stored).
+    Rejected decisions are never stored, so those items are asked again
+    next run.
+
+    Args:
+        resolved_items: Decisions accepted by _validate_and_apply().
+        cache_key_by_cell: (row_index, column) of each sent item → its key.
+
+    Returns:
+        Cache key → decision dict, for store_decisions().
+    """
+    to_store: dict[str, dict] = {}
+    for decision in resolved_items:
+        cache_key = cache_key_by_cell.get((decision["row_index"], decision["column"]))
+        if cache_key is None:
+            continue
+        to_store[cache_key] = {
+            "column": decision["column"],
+            "original_value": decision.get("original_value"),
+            "normalized_value": decision.get("normalized_value", ""),
+            "reasoning": decision.get("reasoning", ""),
+        }
+    return to_store
+
+
+def _dedupe_flagged_items(
+    flagged_items: list[FlaggedItem],
+) -> tuple[list[FlaggedItem], dict[tuple, list[FlaggedItem]]]:
+    """
+    Group flagged items by signature and pick one representative per group.
+
+    Args:
+        flagged_items: Non-empty list of FlaggedItems from the normalizer.
+
+    Returns:
+        (unique_items, members_by_cell) — the first item of every group, in
+        input order, and (row_index, column) of each representative → all
+        items in its group (representative first).
+    """
+    groups: dict[tuple, list[FlaggedItem]] = {}
+    for item in flagged_items:
+        groups.setdefault(_item_signature(item), []).append(item)
+
+    unique_items = [members[0] for members in groups.values()]
+    members_by_cell = {
+        (members[0].row_index, members[0].column): members
+        for members in groups.values()
+    }
+    return unique_items, members_by_cell
+
+
+def _fan_out_decisions(
+    llm_decisions: list[dict],
+    members_by_cell: dict[tuple, list[FlaggedItem]],
+) -> list[dict]:
+    """
+    Copy each decision for a representative to every row in its group.
+
+    Each copy carries its own row's row_index and original_value.
+    Decisions that do not name a representative's cell (a malformed
+    row_index, a wrong column) are passed through unchanged, so
+    _validate_and_apply() rejects or applies them exactly as before.
+
+    Args:
+        llm_decisions: Parsed decision dicts from the LLM.
+        members_by_cell: From _dedupe_flagged_items().
+
+    Returns:
+        Decision dicts, one per row.
+    """
+    fanned_out: list[dict] = []
+    for decision in llm_decisions:
+        try:
+            members = members_by_cell.get((decision.get("row_index"), decision.get("column")))
+        except TypeError:  # unhashable row_index (e.g. a list)
+            members = None
+        fanned_out.append(decision)
+        for member in (members or [])[1:]:
+            fanned_out.append({
+                **decision,
+                "row_index": member.row_index,
+                "original_value": member.original_value,
+            })
+    return fanned_out
+
+
+def _build_changes_log(
+    resolved_items: list[dict],
+    flagged_items: list[FlaggedItem],
+) -> ProvenanceLog:
+    """
+    Record every applied LLM decision as a changes log entry.
+
+    The original value is taken from the flagged item for that cell (the
+    LLM's echo of it is only a fallback); a blank decision is recorded as
+    None, which is what _validate_and_apply() writes to the cell.
+
+    Args:
+        resolved_items: Decisions applied by _validate_and_apply().
+        flagged_items: The FlaggedItems that were sent to the LLM.
+
+    Returns:
+        ProvenanceLog with one LLM_CHANGE_METHOD entry per decision.
+    """
+    original_by_cell = {
+        (item.row_index, item.column): item.original_value for item in flagged_items
+    }
+    changes_log = ProvenanceLog()
+    for decision in resolved_items:
+        row_index, column = decision["row_index"], decision["column"]
+        append_change(
+            changes_log,
+            row=row_index,
+            column=column,
+            original=original_by_cell.get(
+                (row_index, column), decision.get("original_value")
+            ),
+            normalized=decision.get("normalized_value", "") or None,
+            method=LLM_CHANGE_METHOD,
+        )
+    return changes_log
+
+
 def _validate_and_apply(
     dataframe: pd.DataFrame,
     llm_decisions: list[dict],
@@ -538,28 +1177,143 @@ def _validate_and_apply(
 
 def _create_batches(
     items: list[FlaggedItem],
-    max_per_batch: int,
+    max_per_batch: int = _MAX_ITEMS_PER_BATCH,
+    output_token_budget: float = _OUTPUT_TOKEN_BUDGET,
+    input_token_budget: float = _INPUT_TOKEN_BUDGET,
 ) -> list[list[FlaggedItem]]:
     """
-    Split flagged items into batches of at most *max_per_batch* each.
+    Pack flagged items, in order, into batches that fit the token budgets.
+
+    A batch is closed when the next item would push its estimated output
+    tokens past *output_token_budget* or its item JSON past
+    *input_token_budget*, or when it holds *max_per_batch* items.  Items
+    with long values or a column whose answers run long therefore go out
+    in smaller batches, short ones in larger batches.  An item over budget
+    on its own still gets a batch.
 
     Args:
         items: Full list of flagged items.
         max_per_batch: Maximum items per batch.
+        output_token_budget: Estimated response tokens allowed per batch.
+        input_token_budget: Estimated item-JSON prompt tokens per batch.
 
     Returns:
         List of batches (each batch is a list of FlaggedItems).
     """
-    if len(items) <= max_per_batch:
-        return [items]
-
     batches: list[list[FlaggedItem]] = []
-    for start in range(0, len(items), max_per_batch):
-        batches.append(items[start : start + max_per_batch])
-
+    batch: list[FlaggedItem] = []
+    batch_output_tokens = batch_input_tokens = 0.0
+
+    for item in items:
+        item_output_tokens = _estimate_output_tokens(item)
+        item_input_tokens = _estimate_input_tokens(item)
+        if batch and (
+            len(batch) >= max_per_batch
+            or batch_output_tokens + item_output_tokens > output_token_budget
+            or batch_input_tokens + item_input_tokens > input_token_budget
+        ):
+            batches.append(batch)
+            batch = []
+            batch_output_tokens = batch_input_tokens = 0.0
+        batch.append(item)
+        batch_output_tokens += item_output_tokens
+        batch_input_tokens += item_input_tokens
+
+    if batch:
+        batches.append(batch)
     return batches
 
 
+def _estimate_tokens(text: str) -> float:
+    """Rough token count of *text*."""
+    return len(text) / _CHARS_PER_TOKEN
+
+
+def _estimate_input_tokens(item: FlaggedItem) -> float:
+    """Estimated prompt tokens for *item*'s JSON entry (with its context)."""
+    return _estimate_tokens(json.dumps(_prompt_entry(item), indent=2, ensure_ascii=False))
+
+
+def _estimate_output_tokens(item: FlaggedItem) -> float:
+    """Estimated response tokens for *item*: column overhead + echoed value."""
+    overhead = _OUTPUT_OVERHEAD_BY_COLUMN.get(item.column, _DEFAULT_OUTPUT_OVERHEAD_TOKENS)
+    return overhead + _estimate_tokens(str(item.original_value))
+
+
+def _learn_output_sizes(llm_decisions: list[dict], output_tokens: int) -> None:
+    """
+    Update the per-column output overhead from one parsed response.
+
+    The response's output tokens are shared between its decisions in
+    proportion to their JSON length; each decision's share, minus its
+    echoed original value, is one observation of its column's overhead.
+
+    Args:
+        llm_decisions: Parsed decisions of the response.
+        output_tokens: Output tokens the API reported for it.
+    """
+    decisions = [
+        decision for decision in llm_decisions
+        if isinstance(decision, dict) and isinstance(decision.get("column"), str)
+    ]
+    decision_lengths = [len(json.dumps(decision, ensure_ascii=False)) for decision in decisions]
+    total_length = sum(decision_lengths)
+    if not output_tokens or not total_length:
+        return
+
+    overheads_by_column: dict[str, list[float]] = {}
+    for decision, length in zip(decisions, decision_lengths):
+        decision_tokens = output_tokens * length / total_length
+        echoed_tokens = _estimate_tokens(str(decision.get("original_value", "")))
+        overheads_by_column.setdefault(decision["column"], []).append(
+            decision_tokens - echoed_tokens
+        )
+
+    for column, overheads in overheads_by_column.items():
+        observed = sum(overheads) / len(overheads)
+        previous = _OUTPUT_OVERHEAD_BY_COLUMN.get(column, _DEFAULT_OUTPUT_OVERHEAD_TOKENS)
+        _set_output_overhead(column, previous + _OUTPUT_LEARNING_RATE * (observed - previous))
+
+
+def _learn_from_truncation(batch: list[FlaggedItem]) -> None:
+    """
+    Raise the output estimates of a batch whose response hit max_tokens.
+
+    The batch produced at least _MAX_OUTPUT_TOKENS while its estimate was
+    lower.  That ratio, capped at _MAX_TRUNCATION_SCALE, is applied to each
+    column in proportion to the column's share of the batch estimate, so a
+    column with a couple of items in the batch barely moves.  Repeated
+    truncations keep raising the estimate, up to
+    _MAX_OUTPUT_OVERHEAD_TOKENS.
+
+    Args:
+        batch: The items of the truncated batch.
+    """
+    estimated_by_column: dict[str, float] = {}
+    for item in batch:
+        estimated_by_column[item.column] = (
+            estimated_by_column.get(item.column, 0.0) + _estimate_output_tokens(item)
+        )
+    estimated = max(sum(estimated_by_column.values()), 1.0)
+    scale = min(max(_MAX_OUTPUT_TOKENS / estimated, 1.0), _MAX_TRUNCATION_SCALE)
+
+    for column, column_estimate in estimated_by_column.items():
+        column_scale = 1.0 + (scale - 1.0) * column_estimate / estimated
+        previous = _OUTPUT_OVERHEAD_BY_COLUMN.get(column, _DEFAULT_OUTPUT_OVERHEAD_TOKENS)
+        _set_output_overhead(column, previous * column_scale)
+    logger.warning(
+        f"Batch of {len(batch)} items hit max_tokens — output estimates for "
+        f"{sorted(estimated_by_column)} raised by up to {scale:.1f}x"
+    )
+
+
+def _set_output_overhead(column: str, overhead: float) -> None:
+    """Store a learned output overhead, kept within the allowed range."""
+    _OUTPUT_OVERHEAD_BY_COLUMN[column] = min(
+        max(overhead, _MIN_OUTPUT_OVERHEAD_TOKENS), _MAX_OUTPUT_OVERHEAD_TOKENS
+    )
+
+
 def _normalize_flavor(value: str) -> str:
     """
     No-op pass-through — Layer 1 cleaning is handled by flavor_cleaner.py
@@ -662,19 +1416,21 @@ def analyze_differences_for_root_cause(
     
     # Call API
     try:
-        response_text, cost, input_tokens, output_tokens = _call_sonnet_api(prompt, api_key)
+        response = complete(
+            prompt, api_key, max_tokens=_MAX_OUTPUT_TOKENS, caller="root_cause_analysis"
+        )
     except Exception as exc:
         logger.error(f"Root cause analysis API call failed: {exc}")
         return RootCauseAnalysisResult(error=f"API call failed: {exc}")
     
     # Parse response
-    analyses_json = _parse_llm_response(response_text)
+    analyses_json = _parse_llm_response(response.text)
     if analyses_json is None:
         logger.error("Failed to parse root cause analysis response")
         return RootCauseAnalysisResult(
-            api_cost_estimate=cost,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
+            api_cost_estimate=response.cost_usd,
+            input_tokens=response.input_tokens,
+            output_tokens=response.output_tokens,
             error="Failed to parse LLM response"
         )
     
@@ -706,13 +1462,13 @@ def analyze_differences_for_root_cause(
     
     logger.info(
         f"Root cause analysis complete: {len(analyses)} differences analyzed, "
-        f"cost: ${cost:.4f}"
+        f"cost: ${response.cost_usd:.4f}"
     )
     
     return RootCauseAnalysisResult(
         analyses=analyses,
         root_cause_summary=root_cause_counts,
-        api_cost_estimate=cost,
-        input_tokens=input_tokens,
-        output_tokens=output_tokens
+        api_cost_estimate=response.cost_usd,
+        input_tokens=response.input_tokens,
+        output_tokens=response.output_tokens
     )
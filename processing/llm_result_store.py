@@ -0,0 +1,469 @@
+"""
+LLM result store — shared, transactional cache of per-value LLM answers.
+
+flavor_cleaner (Layer 2 harmonization) and vegetable_tagger (Layer 3
+tagging) ask the LLM about each unique Flavor_Clean value once and keep the
+answer for every later run; llm_cleaner keeps its cleaning decisions the
+same way.  This module stores those answers in one embedded SQLite
+database, one namespace per caller (the layout store keeps its known sheet
+layouts here too, as the one shared, concurrency-safe store on disk):
+
+  - Lookups are point queries for just the values a run needs, so their
+    cost does not grow with the size of the store.
+  - New answers are upserted in a single write transaction; nothing else
+    in the store is rewritten.
+  - The database runs in WAL mode with a busy timeout, so any number of
+    Streamlit sessions (threads or processes) can read while one writes,
+    and concurrent writers queue instead of overwriting each other's
+    entries.
+
+Callers can also keep per-key counters (add_counts(), lookup_counts()),
+incremented in place so concurrent sessions add up rather than overwrite;
+the layout store uses them for its hit/miss statistics.
+
+A namespace that must stay bounded records when each answer was last used
+(touch_results(), one point update per hit) and drops the least recently
+used answers beyond its cap with evict_least_recently_used().
+
+Each call opens its own short-lived connection, so the functions are safe
+to call from any thread.  Answers from the old per-caller JSON cache files
+are imported once per namespace and file by import_legacy_json(); entries
+already in the store win over the imported ones.
+
+Errors never stop the pipeline: a store that cannot be opened or read
+behaves as empty (the values are asked again) and failed writes are logged.
+
+Public API:
+    lookup_results(path, namespace, keys)                         → dict[str, str]
+    store_results(path, namespace, results)                       → bool
+    all_results(path, namespace)                                  → dict[str, str]
+    add_counts(path, namespace, counts)                           → bool
+    lookup_counts(path, namespace)                                → dict[str, int]
+    touch_results(path, namespace, keys)                          → bool
+    evict_least_recently_used(path, namespace, max_entries)       → int
+    import_legacy_json(path, namespace, json_path, entries_key)   → int
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Default location of the store, relative to the working directory.
+DEFAULT_LLM_RESULT_STORE_PATH: Path = Path(".cache") / "llm_results.sqlite3"
+
+# How long a connection waits for another session's write lock.
+_BUSY_TIMEOUT_SECONDS: float = 30.0
+
+# Keys per lookup query (kept under SQLite's bound-parameter limit).
+_LOOKUP_CHUNK_SIZE: int = 500
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS results (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS counts (
+    namespace TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    count     INTEGER NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS last_used (
+    namespace TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    used_at   REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS legacy_imports (
+    namespace   TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    entries     INTEGER NOT NULL,
+    imported_at REAL NOT NULL,
+    PRIMARY KEY (namespace, source)
+);
+"""
+
+# A result's last use: its lookup hit or its store, whichever is later.
+_LEAST_RECENTLY_USED_SQL: str = (
+    "SELECT results.key FROM results LEFT JOIN last_used "
+    "ON last_used.namespace = results.namespace AND last_used.key = results.key "
+    "WHERE results.namespace = ? "
+    "ORDER BY MAX(results.updated_at, COALESCE(last_used.used_at, 0)) LIMIT ?"
+)
+
+_UPSERT_SQL: str = (
+    "INSERT INTO results (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (namespace, key) DO UPDATE "
+    "SET value = excluded.value, updated_at = excluded.updated_at"
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+def lookup_results(path: Path | str, namespace: str, keys: Iterable[str]) -> dict[str, str]:
+    """
+    Return the stored answers for *keys* in *namespace*.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Caller's namespace, e.g. "flavor_clean".
+        keys: Values to look up.
+
+    Returns:
+        Key → stored answer for every key that has one.  Empty if the store
+        cannot be read (logged).
+    """
+    unique_keys = list(dict.fromkeys(keys))
+    if not unique_keys:
+        return {}
+
+    found: dict[str, str] = {}
+    try:
+        with closing(_connect(path)) as connection:
+            for chunk in _chunks(unique_keys, _LOOKUP_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT key, value FROM results "
+                    f"WHERE namespace = ? AND key IN ({placeholders})",
+                    [namespace, *chunk],
+                )
+                found.update(rows)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Could not read LLM result store '{path}' ({namespace}): {exc}")
+        return {}
+    return found
+
+
+def store_results(path: Path | str, namespace: str, results: dict[str, str]) -> bool:
+    """
+    Insert or replace *results* in *namespace* in one transaction.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Caller's namespace.
+        results: Key → answer (None answers are skipped).
+
+    Returns:
+        True if the answers were committed, False otherwise (logged).
+    """
+    if not results:
+        return True
+
+    now = time.time()
+    rows = [
+        (namespace, str(key), str(value), now)
+        for key, value in results.items()
+        if value is not None
+    ]
+    try:
+        with closing(_connect(path)) as connection:
+            with _write_transaction(connection):
+                connection.executemany(_UPSERT_SQL, rows)
+    except (sqlite3.Error, OSError) as exc:
+        logger.error(f"Could not write LLM result store '{path}' ({namespace}): {exc}")
+        return False
+    return True
+
+
+def all_results(path: Path | str, namespace: str) -> dict[str, str]:
+    """
+    Return every stored answer in *namespace*.
+
+    Meant for small namespaces (e.g. known sheet layouts); large caches
+    should use lookup_results() for just the keys they need.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Caller's namespace.
+
+    Returns:
+        Key → stored answer.  Empty if the store cannot be read (logged).
+    """
+    try:
+        with closing(_connect(path)) as connection:
+            return dict(connection.execute(
+                "SELECT key, value FROM results WHERE namespace = ?", (namespace,)
+            ))
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Could not read LLM result store '{path}' ({namespace}): {exc}")
+        return {}
+
+
+def add_counts(path: Path | str, namespace: str, counts: dict[str, int]) -> bool:
+    """
+    Add *counts* to the stored counters in *namespace*, in one transaction.
+
+    Each counter is incremented in place, so sessions adding at the same
+    time never lose each other's counts.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Caller's namespace.
+        counts: Key → amount to add (zero amounts are skipped).
+
+    Returns:
+        True if the counts were committed, False otherwise (logged).
+    """
+    rows = [(namespace, str(key), count) for key, count in counts.items() if count]
+    if not rows:
+        return True
+
+    try:
+        with closing(_connect(path)) as connection:
+            with _write_transaction(connection):
+                connection.executemany(
+                    "INSERT INTO counts (namespace, key, count) VALUES (?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE "
+                    "SET count = count + excluded.count",
+                    rows,
+                )
+    except (sqlite3.Error, OSError) as exc:
+        logger.error(f"Could not write LLM result store '{path}' ({namespace}): {exc}")
+        return False
+    return True
+
+
+def lookup_counts(path: Path | str, namespace: str) -> dict[str, int]:
+    """
+    Return every counter in *namespace*.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Caller's namespace.
+
+    Returns:
+        Key → count.  Empty if the store cannot be read (logged).
+    """
+    try:
+        with closing(_connect(path)) as connection:
+            return dict(connection.execute(
+                "SELECT key, count FROM counts WHERE namespace = ?", (namespace,)
+            ))
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Could not read LLM result store '{path}' ({namespace}): {exc}")
+        return {}
+
+
+def touch_results(path: Path | str, namespace: str, keys: Iterable[str]) -> bool:
+    """
+    Record that the answers for *keys* in *namespace* were just used.
+
+    One point update per key, in a single transaction; nothing else in the
+    store is rewritten.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Caller's namespace.
+        keys: Keys whose answers were used.
+
+    Returns:
+        True if the times were committed, False otherwise (logged).
+    """
+    now = time.time()
+    rows = [(namespace, str(key), now) for key in dict.fromkeys(keys)]
+    if not rows:
+        return True
+
+    try:
+        with closing(_connect(path)) as connection:
+            with _write_transaction(connection):
+                connection.executemany(
+                    "INSERT INTO last_used (namespace, key, used_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET used_at = excluded.used_at",
+                    rows,
+                )
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Could not update LLM result store '{path}' ({namespace}): {exc}")
+        return False
+    return True
+
+
+def evict_least_recently_used(path: Path | str, namespace: str, max_entries: int) -> int:
+    """
+    Drop the least recently used answers in *namespace* beyond *max_entries*.
+
+    An answer's last use is its latest touch_results() or store_results(),
+    whichever is later.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Caller's namespace.
+        max_entries: Answers to keep.
+
+    Returns:
+        Number of answers evicted (0 on error, logged).
+    """
+    try:
+        with closing(_connect(path)) as connection:
+            with _write_transaction(connection):
+                (count,) = connection.execute(
+                    "SELECT COUNT(*) FROM results WHERE namespace = ?", (namespace,)
+                ).fetchone()
+                overflow = count - max_entries
+                if overflow <= 0:
+                    return 0
+                evicted = [
+                    (namespace, key)
+                    for (key,) in connection.execute(
+                        _LEAST_RECENTLY_USED_SQL, (namespace, overflow)
+                    ).fetchall()
+                ]
+                connection.executemany(
+                    "DELETE FROM results WHERE namespace = ? AND key = ?", evicted
+                )
+                connection.executemany(
+                    "DELETE FROM last_used WHERE namespace = ? AND key = ?", evicted
+                )
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Could not evict from LLM result store '{path}' ({namespace}): {exc}")
+        return 0
+
+    logger.debug(f"Evicted {len(evicted)} least recently used entries ({namespace})")
+    return len(evicted)
+
+
+def import_legacy_json(
+    path: Path | str,
+    namespace: str,
+    json_path: Path | str,
+    entries_key: str | None = None,
+) -> int:
+    """
+    Import a legacy JSON cache file into *namespace*, once.
+
+    The file (a JSON object of key → answer, as the JSON caches used to
+    write) is left in place.  Its resolved path is recorded in the store,
+    so later calls return straight away.  Keys already in the store keep
+    their stored answer.  A missing file is not recorded: it is imported
+    if it appears later.  Answers that are not strings are stored as JSON.
+
+    Args:
+        path: SQLite store file (created on first use).
+        namespace: Namespace to import into.
+        json_path: Legacy JSON cache file.
+        entries_key: If given, the key → answer object sits under this key
+            of the file's top-level object.
+
+    Returns:
+        Number of entries added to the store (0 if the file was missing,
+        unreadable or already imported).
+    """
+    legacy_path = Path(json_path)
+    if not legacy_path.exists():
+        return 0
+    source = str(legacy_path.resolve())
+
+    try:
+        with closing(_connect(path)) as connection:
+            if _already_imported(connection, namespace, source):
+                return 0
+
+            try:
+                data = json.loads(legacy_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning(f"Skipping unreadable legacy cache '{json_path}': {exc}")
+                return 0
+            if entries_key is not None and isinstance(data, dict):
+                data = data.get(entries_key)
+            if not isinstance(data, dict):
+                logger.warning(f"Skipping legacy cache '{json_path}': not a JSON object")
+                return 0
+
+            now = time.time()
+            rows = [
+                (namespace, str(key), _encode_answer(value), now)
+                for key, value in data.items()
+                if value is not None
+            ]
+            with _write_transaction(connection):
+                # Another session may have imported it while we were reading
+                if _already_imported(connection, namespace, source):
+                    return 0
+                before = connection.total_changes
+                connection.executemany(
+                    "INSERT INTO results (namespace, key, value, updated_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (namespace, key) DO NOTHING",
+                    rows,
+                )
+                added = connection.total_changes - before
+                connection.execute(
+                    "INSERT INTO legacy_imports (namespace, source, entries, imported_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (namespace, source, added, now),
+                )
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Could not import legacy cache '{json_path}' into '{path}': {exc}")
+        return 0
+
+    logger.info(
+        f"Imported {added} of {len(rows)} entries from legacy cache '{json_path}' "
+        f"into LLM result store '{path}' ({namespace})"
+    )
+    return added
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _connect(path: Path | str) -> sqlite3.Connection:
+    """Open the store in autocommit mode, WAL journaling, schema in place."""
+    store_path = Path(path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(
+        store_path, timeout=_BUSY_TIMEOUT_SECONDS, isolation_level=None
+    )
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        # Durable at every checkpoint; a crash can only lose the last commits
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+    except sqlite3.Error:
+        connection.close()
+        raise
+    return connection
+
+
+@contextmanager
+def _write_transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    """BEGIN IMMEDIATE … COMMIT, rolled back if the block raises."""
+    # Take the write lock up front, so a busy store makes us wait here
+    # rather than fail when a read transaction is upgraded to a write
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def _already_imported(connection: sqlite3.Connection, namespace: str, source: str) -> bool:
+    row = connection.execute(
+        "SELECT 1 FROM legacy_imports WHERE namespace = ? AND source = ?",
+        (namespace, source),
+    ).fetchone()
+    return row is not None
+
+
+def _encode_answer(value: object) -> str:
+    """Strings as they are, anything else (e.g. a decision dict) as JSON."""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -16,6 +16,13 @@ Special rules:
   - Flavor: rows with Product Name but no Flavor are flagged for LLM
     extraction.
 
+Columns are processed column-at-a-time rather than cell-at-a-time: each
+column's cells are turned into their string form, factorized to unique
+values, each unique value is resolved once against the lookup table, and
+the results are broadcast back to the rows.  The changes log and flagged
+items come out exactly as a row-by-row walk would produce them (same
+entries, same order, same context snapshots).
+
 Public API:
     normalize(dataframe) → NormalizationResult
 
@@ -23,16 +30,19 @@ See docs/RULES.md for the full lookup tables and decision matrix.
 """
 
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
+import numpy as np
 import pandas as pd
 
 from config.normalization_rules import (
     COLUMN_TO_RULE_MAP,
     LLM_ONLY_COLUMNS,
+    normalize_shelf_location_substring,
 )
 from config.schema import VALID_VALUES
-from config.brand_mappings import match_brand
+from config.brand_mappings import match_brands
 from processing.conflict_detector import BrandConflict, detect_conflicts
 
 logger = logging.getLogger(__name__)
@@ -80,6 +90,39 @@ _CONTEXT_COLUMNS: list[str] = [
 ]
 
 
+# Marks a unique value whose cells are left untouched by _normalize_column.
+_KEEP_VALUE = object()
+
+_PASTEURIZED_METHODS: list[str] = [
+    "pasteurized", "pasteurised", "flash pasteurized", "gently pasteurized",
+]
+
+# Juice Extraction Method rules 1–8, in priority order (first match wins).
+# Each entry: (rule input, test, inferred value, rule description), where
+# the rule input names one of the text arrays from _jem_rule_inputs() and
+# the test is a predicate over one value of it.
+_JEM_INDICATOR_RULES: list[tuple[str, Callable[[str], bool], str, str]] = [
+    ("hpp", lambda hpp: hpp == "Yes",
+     "Cold Pressed", "HPP Treatment = Yes"),
+    ("proc", lambda proc: proc == "HPP",
+     "Cold Pressed", "Processing Method = HPP"),
+    ("proc", lambda proc: proc == "Freshly Squeezed",
+     "Squeezed", "Processing Method = Freshly Squeezed"),
+    ("text", lambda text: "not from concentrate" in text,
+     "Squeezed", "Claims/Notes contain 'not from concentrate'"),
+    # Rule 4 has already claimed every "not from concentrate" row
+    ("text", lambda text: "from concentrate" in text,
+     "From Concentrate", "Claims/Notes contain 'from concentrate'"),
+    ("text", lambda text: "cold pressed" in text or "cold-pressed" in text,
+     "Cold Pressed", "Claims/Notes contain 'cold pressed'"),
+    ("text", lambda text: "squeezed" in text,
+     "Squeezed", "Claims/Notes contain 'squeezed'"),
+    # Default for pasteurized products
+    ("proc", lambda proc: proc.lower() in _PASTEURIZED_METHODS,
+     "NA/Centrifugal", "default for pasteurized products"),
+]
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Public API
 # ═══════════════════════════════════════════════════════════════════════════
@@ -195,6 +238,9 @@ def _normalize_column(
       - found in lookup → replace with canonical value (or NaN if mapped to "")
       - not found → flag for LLM review
 
+    Each distinct cell text is resolved once (_resolve_lookup_value) and
+    the outcome is broadcast to every row holding it.
+
     Args:
         dataframe: DataFrame to modify IN PLACE for this column.
         column: Master column name.
@@ -206,73 +252,107 @@ def _normalize_column(
     flagged: list[FlaggedItem] = []
     changes: list[dict] = []
 
-    for idx in dataframe.index:
-        raw_value = dataframe.at[idx, column]
+    present, cell_strings = _column_strings(dataframe[column])
+    codes, unique_strings = pd.factorize(cell_strings)
+    resolutions = [
+        _resolve_lookup_value(unique_string, column, lookup)
+        for unique_string in unique_strings
+    ]
+
+    # Per unique value: does it write, log a change, or get flagged?
+    writes_value = np.array([r[0] is not _KEEP_VALUE for r in resolutions], dtype=bool)
+    logs_change = np.array([r[1] is not None for r in resolutions], dtype=bool)
+    is_flagged = np.array([r[2] is not None for r in resolutions], dtype=bool)
+
+    write_positions = np.flatnonzero(present & writes_value[codes])
+    _write_cells(
+        dataframe, column, write_positions,
+        [resolutions[code][0] for code in codes[write_positions]],
+    )
 
-        # Blank / NaN → leave as-is, not flagged
-        if pd.isna(raw_value) or str(raw_value).strip() == "":
-            continue
+    change_positions = np.flatnonzero(present & logs_change[codes])
+    for position, row_label in zip(change_positions, dataframe.index[change_positions].tolist()):
+        original_str, normalized, method = resolutions[codes[position]][1]
+        changes.append({
+            "row": row_label,
+            "column": column,
+            "original": original_str,
+            "normalized": normalized,
+            "method": method,
+        })
+
+    # Context is read after the writes: a flagged cell itself is never
+    # written, and no other column changes while this one is processed.
+    flagged_positions = np.flatnonzero(present & is_flagged[codes])
+    contexts = _build_contexts(dataframe, flagged_positions)
+    flagged_labels = dataframe.index[flagged_positions].tolist()
+    for position, row_label, context in zip(flagged_positions, flagged_labels, contexts):
+        original_str = resolutions[codes[position]][2]
+        flagged.append(FlaggedItem(
+            row_index=row_label,
+            column=column,
+            original_value=original_str,
+            reason=f"'{original_str}' not in allowed values for {column}",
+            context=context,
+        ))
+    if flagged:
+        logger.debug(f"Flagged {len(flagged)} [{column}] values not in lookup")
 
-        original_str = str(raw_value).strip()
-        lookup_key = original_str.lower()
-
-        if lookup_key in lookup:
-            normalized = lookup[lookup_key]
-
-            # Empty string in lookup means "convert to blank"
-            if normalized == "":
-                dataframe.at[idx, column] = None
-                changes.append({
-                    "row": idx,
-                    "column": column,
-                    "original": original_str,
-                    "normalized": "(blank)",
-                    "method": "deterministic",
-                })
-            else:
-                # Always write the canonical value (also strips whitespace
-                # from the original cell, e.g. "  Shots  " → "Shots")
-                raw_cell_str = str(raw_value)
-                dataframe.at[idx, column] = normalized
-                if raw_cell_str != normalized:
-                    changes.append({
-                        "row": idx,
-                        "column": column,
-                        "original": original_str,
-                        "normalized": normalized,
-                        "method": "deterministic",
-                    })
+    return flagged, changes
 
-        else:
-            # Try substring matching for Shelf Location before flagging
-            if column == "Shelf Location":
-                from config.normalization_rules import normalize_shelf_location_substring
-                substring_match = normalize_shelf_location_substring(original_str)
-                if substring_match is not None:
-                    dataframe.at[idx, column] = substring_match
-                    changes.append({
-                        "row": idx,
-                        "column": column,
-                        "original": original_str,
-                        "normalized": substring_match,
-                        "method": "deterministic (substring match)",
-                    })
-                    continue
-            
-            # Value not in lookup and no substring match → flag for LLM review
-            context = _build_context(dataframe, idx)
-            flagged.append(FlaggedItem(
-                row_index=idx,
-                column=column,
-                original_value=original_str,
-                reason=f"'{original_str}' not in allowed values for {column}",
-                context=context,
-            ))
-            logger.debug(
-                f"Flagged [{column}] row {idx}: '{original_str}' — not in lookup"
+
+def _resolve_lookup_value(
+    cell_string: str,
+    column: str,
+    lookup: dict[str, str],
+) -> tuple[object, tuple[str, str, str] | None, str | None]:
+    """
+    Decide what happens to every non-NaN cell whose str() is *cell_string*.
+
+    Args:
+        cell_string: str() of the raw cell value.
+        column: Master column name.
+        lookup: lowercase-keyed normalization dict.
+
+    Returns:
+        (new_value, change, flagged_value):
+          - new_value: value to write, or _KEEP_VALUE to leave the cell
+          - change: (original, normalized, method) for the changes log, or None
+          - flagged_value: stripped value to flag for LLM review, or None
+    """
+    original_str = cell_string.strip()
+
+    # Blank → leave as-is, not flagged
+    if original_str == "":
+        return _KEEP_VALUE, None, None
+
+    lookup_key = original_str.lower()
+    if lookup_key in lookup:
+        normalized = lookup[lookup_key]
+
+        # Empty string in lookup means "convert to blank"
+        if normalized == "":
+            return None, (original_str, "(blank)", "deterministic"), None
+
+        # Always write the canonical value (also strips whitespace from the
+        # original cell, e.g. "  Shots  " → "Shots")
+        change = None
+        if cell_string != normalized:
+            change = (original_str, normalized, "deterministic")
+        return normalized, change, None
+
+    # Try substring matching for Shelf Location before flagging
+    if column == "Shelf Location":
+        substring_match = normalize_shelf_location_substring(original_str)
+        if substring_match is not None:
+            return (
+                substring_match,
+                (original_str, substring_match, "deterministic (substring match)"),
+                None,
             )
 
-    return flagged, changes
+    # Value not in lookup and no substring match → flag for LLM review
+    return _KEEP_VALUE, None, original_str
 
 
 def _apply_cross_column_rules(dataframe: pd.DataFrame) -> list[dict]:
@@ -295,28 +375,19 @@ def _apply_cross_column_rules(dataframe: pd.DataFrame) -> list[dict]:
     if "Processing Method" not in dataframe.columns:
         return changes
 
-    for idx in dataframe.index:
-        hpp_value = dataframe.at[idx, "HPP Treatment"]
-        proc_value = dataframe.at[idx, "Processing Method"]
+    hpp_text = _column_text(dataframe["HPP Treatment"])
+    proc_text = _column_text(dataframe["Processing Method"])
 
-        hpp_is_yes = (
-            not pd.isna(hpp_value)
-            and str(hpp_value).strip() == "Yes"
-        )
-        proc_is_blank = (
-            pd.isna(proc_value)
-            or str(proc_value).strip() == ""
-        )
-
-        if hpp_is_yes and proc_is_blank:
-            dataframe.at[idx, "Processing Method"] = "HPP"
-            changes.append({
-                "row": idx,
-                "column": "Processing Method",
-                "original": "(blank)",
-                "normalized": "HPP",
-                "method": "cross-column rule (HPP Treatment = Yes)",
-            })
+    rule_positions = np.flatnonzero((hpp_text == "Yes") & (proc_text == ""))
+    _write_cells(dataframe, "Processing Method", rule_positions, ["HPP"] * len(rule_positions))
+    for row_label in dataframe.index[rule_positions].tolist():
+        changes.append({
+            "row": row_label,
+            "column": "Processing Method",
+            "original": "(blank)",
+            "normalized": "HPP",
+            "method": "cross-column rule (HPP Treatment = Yes)",
+        })
 
     if changes:
         logger.info(
@@ -346,24 +417,22 @@ def _flag_llm_only_column(
     """
     flagged: list[FlaggedItem] = []
 
-    for idx in dataframe.index:
-        raw_value = dataframe.at[idx, column]
-
-        if pd.isna(raw_value) or str(raw_value).strip() == "":
-            continue
-
-        original_str = str(raw_value).strip()
-
-        # Check if the value is already in the valid set
-        valid_set = VALID_VALUES.get(column, set())
-        if original_str in valid_set:
-            continue
+    # Non-blank values not already in the valid set
+    column_text = _column_text(dataframe[column])
+    valid_set = VALID_VALUES.get(column, set())
+    codes, unique_text = pd.factorize(column_text)
+    needs_review = np.array(
+        [text != "" and text not in valid_set for text in unique_text], dtype=bool
+    )
 
-        context = _build_context(dataframe, idx)
+    flagged_positions = np.flatnonzero(needs_review[codes])
+    contexts = _build_contexts(dataframe, flagged_positions)
+    flagged_labels = dataframe.index[flagged_positions].tolist()
+    for position, row_label, context in zip(flagged_positions, flagged_labels, contexts):
         flagged.append(FlaggedItem(
-            row_index=idx,
+            row_index=row_label,
             column=column,
-            original_value=original_str,
+            original_value=column_text[position],
             reason=f"{column} requires review",
             context=context,
         ))
@@ -403,6 +472,12 @@ def _infer_juice_extraction_method(
       8. Processing Method == "Pasteurized"           → "NA/Centrifugal" (default)
       9. None matched AND value is blank              → flag for LLM
 
+    The rules are evaluated as boolean masks over the whole frame: each
+    rule input column is converted to text once, every brand string is
+    matched once, and each rule only claims the rows no earlier rule
+    matched.  Flagged items, changes and conflicts are then emitted row by
+    row, in the same order as a row-at-a-time walk.
+
     Args:
         dataframe: DataFrame to modify IN PLACE.
 
@@ -417,177 +492,138 @@ def _infer_juice_extraction_method(
     if col not in dataframe.columns:
         return flagged, changes, conflicts
 
-    has_brand = "Brand" in dataframe.columns
-    has_hpp = "HPP Treatment" in dataframe.columns
     has_proc = "Processing Method" in dataframe.columns
-    has_claims = "Claims" in dataframe.columns
-    has_notes = "Notes" in dataframe.columns
+    row_count = len(dataframe)
+    row_labels = dataframe.index.tolist()
 
+    # ── Current values: keep valid ones, flag invalid ones ────────
     valid_set = VALID_VALUES.get(col, set())
-    
-    # Track which rows were set by brand rules (to avoid overwriting Processing Method later)
-    brand_set_rows = set()
-
-    for idx in dataframe.index:
-        current_value = dataframe.at[idx, col]
-
-        # If a valid value is already set, strip any whitespace and skip
-        if not pd.isna(current_value) and str(current_value).strip() != "":
-            stripped = str(current_value).strip()
-            if stripped in valid_set:
-                # Write the stripped value back to fix trailing/leading spaces
-                # (e.g. "Squeezed " → "Squeezed") before skipping
-                if str(current_value) != stripped:
-                    dataframe.at[idx, col] = stripped
-                continue
-            # Non-blank, non-valid value — flag it
-            context = _build_context(dataframe, idx)
-            flagged.append(FlaggedItem(
-                row_index=idx,
-                column=col,
-                original_value=str(current_value).strip(),
-                reason=f"'{str(current_value).strip()}' not in allowed values for {col}",
-                context=context,
-            ))
-            continue
+    present, cell_strings = _column_strings(dataframe[col])
+    current_text = _column_text(dataframe[col])
+    is_blank = current_text == ""
+    is_valid = ~is_blank & _rule_mask(current_text, valid_set.__contains__)
+    is_invalid = ~is_blank & ~is_valid
+
+    # Write stripped values back to fix trailing/leading spaces
+    # (e.g. "Squeezed " → "Squeezed")
+    needs_strip = is_valid & present & (cell_strings != current_text)
+
+    # ── Rule inputs, each converted to text once ──────────────────
+    rule_inputs = _jem_rule_inputs(dataframe)
+    hpp_text = rule_inputs["hpp"]
+    proc_text = rule_inputs["proc"]
+    claims_text = rule_inputs["claims"]
+    notes_text = rule_inputs["notes"]
+
+    inferred = np.full(row_count, None, dtype=object)
+    rule_descs = np.full(row_count, "", dtype=object)
+    undecided = is_blank.copy()
 
-        # Gather row data for rules
-        brand_val = ""
-        if has_brand:
-            v = dataframe.at[idx, "Brand"]
-            brand_val = str(v).strip() if not pd.isna(v) else ""
-        
-        hpp_val = ""
-        if has_hpp:
-            v = dataframe.at[idx, "HPP Treatment"]
-            hpp_val = str(v).strip() if not pd.isna(v) else ""
-
-        proc_val = ""
-        if has_proc:
-            v = dataframe.at[idx, "Processing Method"]
-            proc_val = str(v).strip() if not pd.isna(v) else ""
-
-        claims_val = ""
-        if has_claims:
-            v = dataframe.at[idx, "Claims"]
-            claims_val = str(v).strip().lower() if not pd.isna(v) else ""
-
-        notes_val = ""
-        if has_notes:
-            v = dataframe.at[idx, "Notes"]
-            notes_val = str(v).strip().lower() if not pd.isna(v) else ""
-
-        text_combined = claims_val + " " + notes_val
-
-        inferred: str | None = None
-        rule_desc = ""
-
-        # ═══════════════════════════════════════════════════════════════
-        # Rule 0: Brand-based lookup (HIGHEST PRIORITY)
-        # ═══════════════════════════════════════════════════════════════
-        if brand_val:
-            brand_match = match_brand(brand_val)
-            if brand_match:
-                matched_brand, brand_mapping, similarity = brand_match
-                
-                # Detect conflicts with explicit indicators
-                row_conflicts = detect_conflicts(
-                    row_index=idx,
-                    brand_name=matched_brand,
-                    brand_mapping=brand_mapping,
-                    similarity_score=similarity,
-                    hpp_treatment=hpp_val,
-                    processing_method=proc_val,
-                    claims=claims_val,
-                    notes=notes_val
-                )
-                conflicts.extend(row_conflicts)
-                
-                # Apply brand values (brand wins even if conflicts exist)
-                inferred = brand_mapping["juice_extraction_method"]
-                rule_desc = f"brand: {matched_brand} ({similarity}%)"
-                
-                # Also set Processing Method if not already set
-                if has_proc:
-                    current_proc = dataframe.at[idx, "Processing Method"]
-                    if pd.isna(current_proc) or str(current_proc).strip() == "":
-                        dataframe.at[idx, "Processing Method"] = brand_mapping["processing_method"]
-                        changes.append({
-                            "row": idx,
-                            "column": "Processing Method",
-                            "original": "(blank)",
-                            "normalized": brand_mapping["processing_method"],
-                            "method": f"brand rule ({matched_brand}, {similarity}%)",
-                        })
-                        brand_set_rows.add(idx)
-        
-        # ═══════════════════════════════════════════════════════════════
-        # Explicit indicator rules (only if brand didn't match)
-        # ═══════════════════════════════════════════════════════════════
-        if inferred is None:
-            # Rule 1: HPP Treatment == "Yes"
-            if hpp_val == "Yes":
-                inferred = "Cold Pressed"
-                rule_desc = "HPP Treatment = Yes"
-            # Rule 2: Processing Method == "HPP"
-            elif proc_val == "HPP":
-                inferred = "Cold Pressed"
-                rule_desc = "Processing Method = HPP"
-            # Rule 3: Processing Method == "Freshly Squeezed"
-            elif proc_val == "Freshly Squeezed":
-                inferred = "Squeezed"
-                rule_desc = "Processing Method = Freshly Squeezed"
-            # Rule 4: Claims/Notes contain "not from concentrate" → Squeezed
-            elif "not from concentrate" in text_combined:
-                inferred = "Squeezed"
-                rule_desc = "Claims/Notes contain 'not from concentrate'"
-            # Rule 5: Claims/Notes contain "from concentrate" (excluding "not from concentrate")
-            elif "from concentrate" in text_combined:
-                inferred = "From Concentrate"
-                rule_desc = "Claims/Notes contain 'from concentrate'"
-            # Rule 6: Claims/Notes contain "cold pressed" or "cold-pressed"
-            elif "cold pressed" in text_combined or "cold-pressed" in text_combined:
-                inferred = "Cold Pressed"
-                rule_desc = "Claims/Notes contain 'cold pressed'"
-            # Rule 7: Claims/Notes contain "squeezed" or "freshly squeezed"
-            elif "squeezed" in text_combined:
-                inferred = "Squeezed"
-                rule_desc = "Claims/Notes contain 'squeezed'"
-            # Rule 8: Default to NA/Centrifugal for pasteurized products
-            elif proc_val.lower() in ["pasteurized", "pasteurised", "flash pasteurized", "gently pasteurized"]:
-                inferred = "NA/Centrifugal"
-                rule_desc = "default for pasteurized products"
-
-        if inferred is not None:
-            dataframe.at[idx, col] = inferred
+    # ═══════════════════════════════════════════════════════════════
+    # Rule 0: Brand-based lookup (HIGHEST PRIORITY)
+    # ═══════════════════════════════════════════════════════════════
+    brand_codes, brand_matches = _match_brands(rule_inputs["brand"])
+    brand_matched = is_blank & np.array(
+        [brand_matches[code] is not None for code in brand_codes], dtype=bool
+    )
+    brand_positions = np.flatnonzero(brand_matched)
+    # Processing Method is also set from the brand when it is blank
+    proc_from_brand = brand_matched & (proc_text == "")
+    if not has_proc:
+        proc_from_brand[:] = False
+    proc_values = np.full(row_count, None, dtype=object)
+
+    for position in brand_positions:
+        matched_brand, brand_mapping, similarity = brand_matches[brand_codes[position]]
+
+        # Detect conflicts with explicit indicators
+        conflicts.extend(detect_conflicts(
+            row_index=row_labels[position],
+            brand_name=matched_brand,
+            brand_mapping=brand_mapping,
+            similarity_score=similarity,
+            hpp_treatment=hpp_text[position],
+            processing_method=proc_text[position],
+            claims=claims_text[position],
+            notes=notes_text[position],
+        ))
+
+        # Apply brand values (brand wins even if conflicts exist)
+        if brand_mapping["juice_extraction_method"] is not None:
+            inferred[position] = brand_mapping["juice_extraction_method"]
+            rule_descs[position] = f"brand: {matched_brand} ({similarity}%)"
+            undecided[position] = False
+        proc_values[position] = brand_mapping["processing_method"]
+
+    # ═══════════════════════════════════════════════════════════════
+    # Explicit indicator rules 1–8 (only if brand didn't match)
+    # ═══════════════════════════════════════════════════════════════
+    for input_name, test, inferred_value, rule_desc in _JEM_INDICATOR_RULES:
+        if not undecided.any():
+            break
+        rule_hit = undecided & _rule_mask(rule_inputs[input_name], test)
+        inferred[rule_hit] = inferred_value
+        rule_descs[rule_hit] = rule_desc
+        undecided &= ~rule_hit
+
+    is_inferred = is_blank & ~undecided
+
+    # ── Write results IN PLACE ────────────────────────────────────
+    proc_positions = np.flatnonzero(proc_from_brand)
+    if has_proc:
+        _write_cells(
+            dataframe, "Processing Method", proc_positions,
+            proc_values[proc_positions].tolist(),
+        )
+    write_positions = np.flatnonzero(needs_strip | is_inferred)
+    write_values = np.where(needs_strip, current_text, inferred)[write_positions]
+    _write_cells(dataframe, col, write_positions, write_values.tolist())
+
+    # ── Changes, in row order ─────────────────────────────────────
+    for position in np.flatnonzero(proc_from_brand | is_inferred):
+        row_label = row_labels[position]
+        if proc_from_brand[position]:
+            matched_brand, brand_mapping, similarity = brand_matches[brand_codes[position]]
             changes.append({
-                "row": idx,
+                "row": row_label,
+                "column": "Processing Method",
+                "original": "(blank)",
+                "normalized": brand_mapping["processing_method"],
+                "method": f"brand rule ({matched_brand}, {similarity}%)",
+            })
+        if is_inferred[position]:
+            changes.append({
+                "row": row_label,
                 "column": col,
                 "original": "(blank)",
-                "normalized": inferred,
-                "method": f"deterministic rule ({rule_desc})",
+                "normalized": inferred[position],
+                "method": f"deterministic rule ({rule_descs[position]})",
             })
-            
-            # Flag NA/Centrifugal for manual review
-            if inferred == "NA/Centrifugal":
-                context = _build_context(dataframe, idx)
-                flagged.append(FlaggedItem(
-                    row_index=idx,
-                    column=col,
-                    original_value="",
-                    reason="Defaulted to NA/Centrifugal - please verify extraction method",
-                    context=context,
-                ))
+
+    # ── Flagged items, in row order ───────────────────────────────
+    # Flag NA/Centrifugal for manual review; Rule 9: flag the rest for LLM.
+    # Contexts are read after the writes above, so they include the
+    # Processing Method a brand rule filled in.
+    is_defaulted = is_inferred & (inferred == "NA/Centrifugal")
+    flagged_positions = np.flatnonzero(is_invalid | is_defaulted | undecided)
+    contexts = _build_contexts(dataframe, flagged_positions)
+    for position, context in zip(flagged_positions, contexts):
+        if is_invalid[position]:
+            original_value = current_text[position]
+            reason = f"'{original_value}' not in allowed values for {col}"
+        elif is_defaulted[position]:
+            original_value = ""
+            reason = "Defaulted to NA/Centrifugal - please verify extraction method"
         else:
-            # Rule 9: flag for LLM
-            context = _build_context(dataframe, idx)
-            flagged.append(FlaggedItem(
-                row_index=idx,
-                column=col,
-                original_value="",
-                reason="Could not determine Juice Extraction Method from available data",
-                context=context,
-            ))
+            original_value = ""
+            reason = "Could not determine Juice Extraction Method from available data"
+        flagged.append(FlaggedItem(
+            row_index=row_labels[position],
+            column=col,
+            original_value=original_value,
+            reason=reason,
+            context=context,
+        ))
 
     if changes:
         logger.info(
@@ -607,6 +643,75 @@ def _infer_juice_extraction_method(
     return flagged, changes, conflicts
 
 
+def _jem_rule_inputs(dataframe: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    Build the per-row text arrays the Juice Extraction Method rules read.
+
+    Missing columns read as blank.  Claims and Notes are lowercased, and
+    "text" is Claims + " " + Notes — the string the keyword rules search.
+
+    Args:
+        dataframe: The DataFrame (not modified).
+
+    Returns:
+        Dict of rule input name ("brand", "hpp", "proc", "claims",
+        "notes", "text") → object array of text, one entry per row.
+    """
+    blank = np.full(len(dataframe), "", dtype=object)
+
+    def text_of(column: str, lowercase: bool = False) -> np.ndarray:
+        if column not in dataframe.columns:
+            return blank
+        return _column_text(dataframe[column], lowercase=lowercase)
+
+    rule_inputs = {
+        "brand": text_of("Brand"),
+        "hpp": text_of("HPP Treatment"),
+        "proc": text_of("Processing Method"),
+        "claims": text_of("Claims", lowercase=True),
+        "notes": text_of("Notes", lowercase=True),
+    }
+    rule_inputs["text"] = rule_inputs["claims"] + " " + rule_inputs["notes"]
+    return rule_inputs
+
+
+def _match_brands(
+    brand_text: np.ndarray,
+) -> tuple[np.ndarray, list[tuple[str, dict, int] | None]]:
+    """
+    Match every unique brand string once, in one match_brands() batch.
+
+    Args:
+        brand_text: Stripped Brand text per row ("" for blank).
+
+    Returns:
+        (codes, matches) — the unique-brand code of every row, and the
+        match_brand() result per unique brand (None for blank or unknown
+        brands).
+    """
+    codes, unique_brands = pd.factorize(brand_text)
+    matches = match_brands(list(unique_brands))
+    return codes, matches
+
+
+def _rule_mask(rule_input: np.ndarray, test: Callable[[str], bool]) -> np.ndarray:
+    """
+    Evaluate one rule test per unique input value and broadcast to rows.
+
+    Args:
+        rule_input: Object array of text, one entry per row.
+        test: Predicate over a single text value.
+
+    Returns:
+        Bool mask, True where the rule matches.
+    """
+    codes, unique_values = pd.factorize(rule_input)
+    unique_hits = np.fromiter(
+        (test(value) for value in unique_values), dtype=bool, count=len(unique_values)
+    )
+    return unique_hits[codes] if len(codes) else np.zeros(0, dtype=bool)
+
+
 def _flag_missing_flavor(
     dataframe: pd.DataFrame,
 ) -> list[FlaggedItem]:
@@ -626,28 +731,21 @@ def _flag_missing_flavor(
     if "Product Name" not in dataframe.columns:
         return flagged
 
-    has_flavor = "Flavor" in dataframe.columns
-
-    for idx in dataframe.index:
-        product_name = dataframe.at[idx, "Product Name"]
-
-        # Skip if no Product Name
-        if pd.isna(product_name) or str(product_name).strip() == "":
-            continue
+    product_text = _column_text(dataframe["Product Name"])
+    needs_flavor = product_text != ""
+    # Skip rows whose Flavor is already populated
+    if "Flavor" in dataframe.columns:
+        needs_flavor &= _column_text(dataframe["Flavor"]) == ""
 
-        # Skip if Flavor is already populated
-        if has_flavor:
-            flavor = dataframe.at[idx, "Flavor"]
-            if not pd.isna(flavor) and str(flavor).strip() != "":
-                continue
-
-        product_name_str = str(product_name).strip()
-        context = _build_context(dataframe, idx)
+    flagged_positions = np.flatnonzero(needs_flavor)
+    contexts = _build_contexts(dataframe, flagged_positions)
+    flagged_labels = dataframe.index[flagged_positions].tolist()
+    for position, row_label, context in zip(flagged_positions, flagged_labels, contexts):
         flagged.append(FlaggedItem(
-            row_index=idx,
+            row_index=row_label,
             column="Flavor",
             original_value="",
-            reason=f"Flavor is empty — extract from Product Name '{product_name_str}'",
+            reason=f"Flavor is empty — extract from Product Name '{product_text[position]}'",
             context=context,
         ))
 
@@ -685,3 +783,122 @@ def _build_context(dataframe: pd.DataFrame, row_index: int) -> dict[str, str]:
         context[col] = str(value).strip()
 
     return context
+
+
+def _build_contexts(
+    dataframe: pd.DataFrame,
+    positions: np.ndarray,
+) -> list[dict[str, str]]:
+    """
+    Build _build_context() dicts for many rows at once.
+
+    Each context column is converted to text once, instead of reading
+    cells one at a time per flagged row.
+
+    Args:
+        dataframe: The full DataFrame.
+        positions: 0-based row positions (not index labels), ascending.
+
+    Returns:
+        One context dict per position, in the same order.
+    """
+    contexts: list[dict[str, str]] = [{} for _ in positions]
+    if len(positions) == 0:
+        return contexts
+
+    for col in _CONTEXT_COLUMNS:
+        if col not in dataframe.columns:
+            continue
+        column_text = _column_text(dataframe[col].iloc[positions])
+        for context, text in zip(contexts, column_text):
+            if text != "":
+                context[col] = text
+
+    return contexts
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers — column engine
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _column_strings(series: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return which cells are non-NaN and the str() of every cell.
+
+    The string form is what all rules compare on, so factorizing it (rather
+    than the raw values, where 1, 1.0 and True collide) groups exactly the
+    cells that a per-cell walk would treat the same way.
+
+    Args:
+        series: One DataFrame column.
+
+    Returns:
+        (present, cell_strings) — a bool mask of non-NaN cells, and an
+        object array of str(value) ("" for NaN cells).
+    """
+    values = series.to_numpy(dtype=object)
+    present = ~pd.isna(values)
+    cell_strings = np.array(
+        [str(value) if is_present else "" for value, is_present in zip(values, present)],
+        dtype=object,
+    )
+    return present, cell_strings
+
+
+def _column_text(series: pd.Series, lowercase: bool = False) -> np.ndarray:
+    """
+    Return every cell as stripped text, with "" for NaN and blank cells.
+
+    Args:
+        series: One DataFrame column.
+        lowercase: Also lowercase the text.
+
+    Returns:
+        Object array of str(value).strip() (.lower()) per cell.
+    """
+    _, cell_strings = _column_strings(series)
+    codes, unique_strings = pd.factorize(cell_strings)
+    unique_text = np.array(
+        [text.strip().lower() if lowercase else text.strip() for text in unique_strings],
+        dtype=object,
+    )
+    return unique_text[codes] if len(codes) else unique_text
+
+
+def _write_cells(
+    dataframe: pd.DataFrame,
+    column: str,
+    positions: np.ndarray,
+    new_values: list[object],
+) -> None:
+    """
+    Write values into one column at the given row positions, IN PLACE.
+
+    Object columns (the usual case for categorical text) are rewritten as
+    one array.  A numeric column receiving only text is cast to object
+    first, which is what the first per-cell write would do anyway.  Any
+    other mix is written cell by cell with .at, so pandas upcasts it
+    exactly as the per-cell normalizer always did.
+
+    Args:
+        dataframe: DataFrame to modify.
+        column: Column to write.
+        positions: 0-based row positions.
+        new_values: One value per position.
+    """
+    if len(positions) == 0:
+        return
+
+    if dataframe[column].dtype != object and all(isinstance(v, str) for v in new_values):
+        dataframe[column] = dataframe[column].astype(object)
+
+    if dataframe[column].dtype == object:
+        column_values = dataframe[column].to_numpy(dtype=object, copy=True)
+        replacement = np.empty(len(new_values), dtype=object)
+        replacement[:] = new_values
+        column_values[positions] = replacement
+        dataframe[column] = column_values
+        return
+
+    for label, value in zip(dataframe.index[positions], new_values):
+        dataframe.at[label, column] = value
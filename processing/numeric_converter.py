@@ -113,6 +113,11 @@ def _convert_column(
     """
     errors: list[dict] = []
 
+    # Column already has the target dtype (the reader types clean numeric
+    # columns up front) → every value would be left as-is below.
+    if _has_target_dtype(dataframe[column], target_type):
+        return errors
+
     for idx in dataframe.index:
         raw_value = dataframe.at[idx, column]
 
@@ -142,6 +147,23 @@ def _convert_column(
     return errors
 
 
+def _has_target_dtype(series: pd.Series, target_type: str) -> bool:
+    """
+    Check whether a column's dtype already guarantees the target type.
+
+    Args:
+        series: The column to check.
+        target_type: "integer" or "float".
+
+    Returns:
+        True for an int64-style column with an integer target, or a float
+        column with a float target.
+    """
+    if target_type == "integer":
+        return pd.api.types.is_integer_dtype(series.dtype)
+    return pd.api.types.is_float_dtype(series.dtype)
+
+
 def _safe_convert(
     value: object,
     target_type: str,
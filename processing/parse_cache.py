@@ -0,0 +1,416 @@
+"""
+Parse cache — content-addressed on-disk cache of parsed workbooks.
+
+Analysts re-upload the same store files many times.  Reading a workbook
+(file_reader) and mapping its columns (column_mapper) only depends on the
+file's bytes and on the reader/mapping logic, so the result is cached under
+the SHA-256 of the uploaded bytes plus a parser version.  On a hit the file
+is not opened with openpyxl at all.
+
+Each entry is one Parquet file:
+  - the raw DataFrame, stored column by column.  Raw Excel columns often mix
+    Python types (numbers stored as text next to real numbers), so every
+    object column is split into one typed Arrow column per Python type
+    present.  Decoding reassembles exactly the values the reader produced.
+  - everything else (sections, skipped rows, header position, column
+    mapping) as JSON in the Parquet schema metadata.
+
+Entries are written to a temp file and renamed into place, so concurrent
+sessions never see a half-written entry.  A corrupt or unreadable entry is
+logged and treated as a miss.
+
+Column mappings are also memoized per header layout (see
+column_mapper.map_columns), in a "column_mappings" directory inside the
+cache directory, so a new file with a known header skips the mapping
+cascade even on a parse cache miss.
+
+Public API:
+    read_and_map_cached(file_path, cache_dir, known_layouts) → ParsedWorkbook
+    mapping_memo_dir(cache_dir)                → Path | None
+    file_cache_key(file_bytes)                 → str
+    load_parsed_workbook(cache_key, cache_dir) → ParsedWorkbook | None
+    save_parsed_workbook(cache_key, parsed, cache_dir) → bool
+"""
+
+import dataclasses
+import datetime
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.column_mapping import EXACT_MATCHES, KNOWN_HEADER_NAMES, KNOWN_RENAMES
+from config.schema import MASTER_COLUMNS
+from processing.column_mapper import (
+    COLUMN_MAPPING_VERSION,
+    ColumnMappingResult,
+    map_columns,
+)
+from processing.file_reader import (
+    READER_VERSION,
+    FileReadResult,
+    SectionMetadata,
+    SheetLayout,
+    read_excel_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default location of the cache, relative to the working directory.
+DEFAULT_CACHE_DIR: Path = Path(".cache") / "parsed_workbooks"
+
+# Bump when the on-disk layout of an entry changes.
+_CACHE_FORMAT_VERSION: int = 1
+
+# Subdirectory of the cache directory holding the column mapping memo.
+_MAPPING_MEMO_SUBDIR: str = "column_mappings"
+
+# Key under which the JSON payload is stored in the Parquet schema metadata.
+_METADATA_KEY: bytes = b"parse_cache"
+
+# Python value type ↔ tag ↔ Arrow type used for the typed child columns of
+# object (mixed-type) DataFrame columns.  bool is listed before int because
+# values are matched on their exact type.
+_VALUE_TYPES: list[tuple[type, str, pa.DataType]] = [
+    (str, "str", pa.string()),
+    (bool, "bool", pa.bool_()),
+    (int, "int", pa.int64()),
+    (float, "float", pa.float64()),
+    (datetime.datetime, "datetime", pa.timestamp("us")),
+    (datetime.date, "date", pa.date32()),
+    (datetime.time, "time", pa.time64("us")),
+    (datetime.timedelta, "timedelta", pa.duration("us")),
+]
+_TAG_BY_TYPE: dict[type, str] = {py_type: tag for py_type, tag, _ in _VALUE_TYPES}
+_ARROW_TYPE_BY_TAG: dict[str, pa.DataType] = {tag: arrow for _, tag, arrow in _VALUE_TYPES}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data classes
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class ParsedWorkbook:
+    """A read workbook plus the column mapping of its raw columns."""
+
+    read_result: FileReadResult
+    mapping_result: ColumnMappingResult
+    cache_hit: bool = False
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+def read_and_map_cached(
+    file_path: Path,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    known_layouts: dict[str, SheetLayout] | None = None,
+) -> ParsedWorkbook:
+    """
+    Read a workbook and map its columns, reusing a cached parse if possible.
+
+    Results with read errors are never cached, so a broken upload is
+    re-read (and its errors reported) every time.
+
+    Args:
+        file_path: Path to the .xlsx file.
+        cache_dir: Cache directory.  None disables the cache.
+        known_layouts: Layout fingerprint → SheetLayout map passed on to
+            read_excel_file() on a cache miss.
+
+    Returns:
+        ParsedWorkbook with the FileReadResult and ColumnMappingResult.
+    """
+    cache_key = None
+    if cache_dir is not None:
+        try:
+            cache_key = file_cache_key(file_path.read_bytes())
+        except OSError as exc:
+            logger.warning(f"Cannot hash '{file_path.name}' for the parse cache: {exc}")
+
+    if cache_key is not None:
+        cached = load_parsed_workbook(cache_key, cache_dir)
+        if cached is not None:
+            logger.info(f"Parse cache hit for '{file_path.name}'")
+            return cached
+
+    read_result = read_excel_file(file_path, known_layouts)
+    mapping_result = map_columns(
+        read_result.raw_dataframe.columns.tolist(), mapping_memo_dir(cache_dir)
+    )
+    parsed = ParsedWorkbook(read_result=read_result, mapping_result=mapping_result)
+
+    if cache_key is not None and not read_result.errors:
+        save_parsed_workbook(cache_key, parsed, cache_dir)
+
+    return parsed
+
+
+def mapping_memo_dir(cache_dir: Path | None) -> Path | None:
+    """
+    Directory of the on-disk column mapping memo for a parse cache.
+
+    Args:
+        cache_dir: Parse cache directory.  None disables the cache.
+
+    Returns:
+        The memo directory inside *cache_dir*, or None if caching is off.
+    """
+    return cache_dir / _MAPPING_MEMO_SUBDIR if cache_dir is not None else None
+
+
+def file_cache_key(file_bytes: bytes) -> str:
+    """
+    Build the cache key for an uploaded file.
+
+    Args:
+        file_bytes: The raw bytes of the uploaded .xlsx file.
+
+    Returns:
+        "<sha256 of the bytes>-<parser version>" (hex strings).
+    """
+    return f"{hashlib.sha256(file_bytes).hexdigest()}-{_parser_version()}"
+
+
+def load_parsed_workbook(cache_key: str, cache_dir: Path) -> ParsedWorkbook | None:
+    """
+    Load a cached parse.
+
+    Returns:
+        The cached ParsedWorkbook (cache_hit=True), or None on a miss or an
+        unreadable entry.
+    """
+    entry_path = cache_dir / f"{cache_key}.parquet"
+    if not entry_path.exists():
+        return None
+
+    try:
+        table = pq.read_table(entry_path)
+        payload = json.loads(table.schema.metadata[_METADATA_KEY])
+        return _decode_entry(table, payload)
+    except Exception as exc:
+        logger.warning(f"Ignoring unreadable parse cache entry '{entry_path.name}': {exc}")
+        return None
+
+
+def save_parsed_workbook(
+    cache_key: str,
+    parsed: ParsedWorkbook,
+    cache_dir: Path,
+) -> bool:
+    """
+    Store a parse in the cache (atomically replacing any existing entry).
+
+    Returns:
+        True if the entry was written, False if it could not be encoded or
+        written (logged; the pipeline continues uncached).
+    """
+    try:
+        table = _encode_entry(parsed)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_name = tempfile.mkstemp(
+            dir=cache_dir, suffix=".parquet.tmp"
+        )
+        os.close(file_descriptor)
+        try:
+            pq.write_table(table, temp_name)
+            os.replace(temp_name, cache_dir / f"{cache_key}.parquet")
+        finally:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+    except Exception as exc:
+        logger.warning(f"Could not write parse cache entry: {exc}")
+        return False
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers — versioning
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _parser_version() -> str:
+    """
+    Fingerprint everything besides the file bytes that shapes a parse.
+
+    Covers the cache layout, the reader and mapper versions, and the config
+    tables they read, so editing config/column_mapping.py or
+    config/schema.py invalidates old entries automatically.
+    """
+    version_source = json.dumps(
+        [
+            _CACHE_FORMAT_VERSION,
+            READER_VERSION,
+            COLUMN_MAPPING_VERSION,
+            sorted(KNOWN_HEADER_NAMES),
+            sorted(EXACT_MATCHES.items()),
+            sorted(KNOWN_RENAMES.items()),
+            MASTER_COLUMNS,
+        ]
+    )
+    return hashlib.sha256(version_source.encode("utf-8")).hexdigest()[:16]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers — encoding
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _encode_entry(parsed: ParsedWorkbook) -> pa.Table:
+    """Turn a ParsedWorkbook into an Arrow table with a JSON metadata payload."""
+    read_result = parsed.read_result
+    arrow_columns, column_layout = _encode_dataframe(read_result.raw_dataframe)
+
+    payload = {
+        "columns": column_layout,
+        "row_count": len(read_result.raw_dataframe),
+        "sections": [dataclasses.asdict(s) for s in read_result.sections],
+        "header_row_index": read_result.header_row_index,
+        "data_start_column": read_result.data_start_column,
+        "column_names": read_result.column_names,
+        "layout_fingerprint": read_result.layout_fingerprint,
+        "sheet_name": read_result.sheet_name,
+        "total_rows_read": read_result.total_rows_read,
+        "skipped_rows": read_result.skipped_rows,
+        "mapping": dataclasses.asdict(parsed.mapping_result),
+    }
+
+    table = pa.table(arrow_columns)
+    return table.replace_schema_metadata(
+        {_METADATA_KEY: json.dumps(payload, default=_json_default).encode("utf-8")}
+    )
+
+
+def _encode_dataframe(
+    dataframe: pd.DataFrame,
+) -> tuple[dict[str, pa.Array], list[dict]]:
+    """
+    Encode every DataFrame column into one or more Arrow arrays.
+
+    Typed columns (int64, float64, datetime64, bool) are stored as-is.
+    Object columns get one child array per Python type they contain; each
+    row is non-null in at most one child.
+
+    Returns:
+        (arrow_columns, column_layout) — arrow arrays keyed by storage
+        name, and per DataFrame column the information to rebuild it.
+
+    Raises:
+        TypeError: If an object column holds a value type the cache cannot
+            store (the caller then skips caching this file).
+    """
+    arrow_columns: dict[str, pa.Array] = {}
+    column_layout: list[dict] = []
+
+    for position, column in enumerate(dataframe.columns):
+        series = dataframe[column]
+        storage_name = f"c{position}"
+
+        if series.dtype != object:
+            arrow_columns[storage_name] = pa.Array.from_pandas(series)
+            column_layout.append({"name": column, "storage": storage_name, "dtype": str(series.dtype)})
+            continue
+
+        values = series.tolist()
+        tags_present = {_value_tag(value) for value in values} - {None}
+        for tag in sorted(tags_present):
+            arrow_columns[f"{storage_name}.{tag}"] = pa.array(
+                [value if _value_tag(value) == tag else None for value in values],
+                type=_ARROW_TYPE_BY_TAG[tag],
+            )
+        column_layout.append({"name": column, "storage": storage_name, "tags": sorted(tags_present)})
+
+    return arrow_columns, column_layout
+
+
+def _value_tag(value: object) -> str | None:
+    """
+    Return the type tag of a cell value (None for missing values).
+
+    Raises:
+        TypeError: For a value type with no Arrow representation here.
+    """
+    if value is None:
+        return None
+    tag = _TAG_BY_TYPE.get(type(value))
+    if tag is None:
+        raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+    return tag
+
+
+def _json_default(value: object) -> dict:
+    """JSON encoder hook for date/time cell values in skipped_rows."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return {"__type__": type(value).__name__, "value": value.isoformat()}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers — decoding
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _decode_entry(table: pa.Table, payload: dict) -> ParsedWorkbook:
+    """Rebuild a ParsedWorkbook from an Arrow table and its JSON payload."""
+    read_result = FileReadResult(
+        raw_dataframe=_decode_dataframe(table, payload["columns"], payload["row_count"]),
+        sections=[SectionMetadata(**section) for section in payload["sections"]],
+        header_row_index=payload["header_row_index"],
+        data_start_column=payload["data_start_column"],
+        column_names=payload["column_names"],
+        layout_fingerprint=payload["layout_fingerprint"],
+        sheet_name=payload["sheet_name"],
+        total_rows_read=payload["total_rows_read"],
+        skipped_rows=[_decode_json_values(row) for row in payload["skipped_rows"]],
+    )
+    mapping_result = ColumnMappingResult(**payload["mapping"])
+    return ParsedWorkbook(
+        read_result=read_result, mapping_result=mapping_result, cache_hit=True
+    )
+
+
+def _decode_dataframe(
+    table: pa.Table,
+    column_layout: list[dict],
+    row_count: int,
+) -> pd.DataFrame:
+    """Reassemble the raw DataFrame from its typed Arrow columns."""
+    decoded_columns: dict[str, pd.Series] = {}
+
+    for layout in column_layout:
+        if "dtype" in layout:
+            series = table.column(layout["storage"]).to_pandas()
+            decoded_columns[layout["name"]] = series.astype(layout["dtype"])
+            continue
+
+        values: list[object] = [None] * row_count
+        for tag in layout["tags"]:
+            child_values = table.column(f"{layout['storage']}.{tag}").to_pylist()
+            for row_position, value in enumerate(child_values):
+                if value is not None:
+                    values[row_position] = value
+        decoded_columns[layout["name"]] = pd.Series(values, dtype=object)
+
+    if not decoded_columns:
+        return pd.DataFrame()
+    return pd.DataFrame(decoded_columns)
+
+
+def _decode_json_values(row: dict) -> dict:
+    """Restore date/time values tagged by _json_default inside a skipped row."""
+    if "values" in row:
+        row["values"] = [_decode_json_value(value) for value in row["values"]]
+    return row
+
+
+def _decode_json_value(value: object) -> object:
+    """Decode one JSON value, turning tagged date/time dicts back into objects."""
+    if isinstance(value, dict) and "__type__" in value:
+        value_type = getattr(datetime, value["__type__"])
+        return value_type.fromisoformat(value["value"])
+    return value
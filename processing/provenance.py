@@ -0,0 +1,343 @@
+"""
+Provenance log — compact, columnar record of every cell the pipeline changed.
+
+The normalizer, and the LLM cleaner after it, report each change as a dict
+({"row", "column", "original", "normalized", "method"}).  Kept as a list of
+dicts across a large upload, that log outgrows the data it describes: every
+entry repeats the same column names, method descriptions and values.
+
+ProvenanceLog stores the same entries column by column instead:
+  - row ids in an int64 array,
+  - column, method and source file as small integer codes into interned
+    pools (a few dozen distinct strings each),
+  - original/normalized values as codes into one shared value pool.
+
+Stages append their entries with append_change() / extend_changes(); per-
+file logs are combined with extend_log().  Filter and group queries work on
+the code arrays with numpy, and only the entries that are actually shown
+(the report sample, the UI preview) are turned back into dicts.
+
+Iterating a ProvenanceLog yields the familiar change dicts (plus "source"),
+so code that only reads entries works with either form.
+
+Public API:
+    ProvenanceLog                                        (len(), iteration)
+    append_change(log, row, column, original, normalized, method, source) → None
+    extend_changes(log, changes, source)                 → None
+    extend_log(log, other)                               → None
+    offset_rows(log, row_offset)                         → None
+    select_changes(log, column, method, method_prefix, source) → np.ndarray
+    count_changes(log, by, positions)                    → dict[str, int]
+    change_records(log, positions, limit)                → list[dict]
+    changes_to_dataframe(log, positions, limit)          → pd.DataFrame
+"""
+
+import logging
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Fields that can be grouped on with count_changes(), and the pool each uses.
+_GROUP_FIELDS: tuple[str, ...] = ("column", "method", "source")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data classes
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class _InternPool:
+    """Distinct values in first-seen order, plus value → code lookup."""
+
+    values: list = field(default_factory=list)
+    codes: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def intern(self, value: object) -> int:
+        """Return the code of *value*, adding it to the pool if new."""
+        # Key non-str values by type too, so 1, 1.0 and True stay distinct
+        key = value if type(value) is str else (type(value), value)
+        code = self.codes.get(key)
+        if code is None:
+            code = len(self.values)
+            self.codes[key] = code
+            self.values.append(value)
+        return code
+
+
+@dataclass
+class ProvenanceLog:
+    """Columnar changes log: one entry per changed cell."""
+
+    rows: array = field(default_factory=lambda: array("q"))
+    column_codes: array = field(default_factory=lambda: array("i"))
+    original_codes: array = field(default_factory=lambda: array("i"))
+    normalized_codes: array = field(default_factory=lambda: array("i"))
+    method_codes: array = field(default_factory=lambda: array("i"))
+    source_codes: array = field(default_factory=lambda: array("i"))
+    columns: _InternPool = field(default_factory=_InternPool)
+    methods: _InternPool = field(default_factory=_InternPool)
+    sources: _InternPool = field(default_factory=_InternPool)
+    # Shared by original and normalized values
+    values: _InternPool = field(default_factory=_InternPool)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(change_records(self))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API — appending
+# ═══════════════════════════════════════════════════════════════════════════
+
+def append_change(
+    log: ProvenanceLog,
+    row: int,
+    column: str,
+    original: object,
+    normalized: object,
+    method: str,
+    source: str = "",
+) -> None:
+    """
+    Append one changed cell.
+
+    Args:
+        log: The log to append to (modified IN PLACE).
+        row: Row index of the changed cell.
+        column: Column of the changed cell.
+        original: Value before the change.
+        normalized: Value after the change.
+        method: How the value was changed (e.g. "lookup table").
+        source: Source file of the row ("" if not tied to one file).
+    """
+    log.rows.append(int(row))
+    log.column_codes.append(log.columns.intern(column))
+    log.original_codes.append(log.values.intern(original))
+    log.normalized_codes.append(log.values.intern(normalized))
+    log.method_codes.append(log.methods.intern(method))
+    log.source_codes.append(log.sources.intern(source))
+
+
+def extend_changes(
+    log: ProvenanceLog,
+    changes: Iterable[dict],
+    source: str = "",
+) -> None:
+    """
+    Append a stage's changes log (dicts with row/column/original/normalized/method).
+
+    Args:
+        log: The log to append to (modified IN PLACE).
+        changes: Change dicts, as returned by normalize().  "row" and
+            "column" are required; a missing value or method is stored as
+            None / "".
+        source: Source file of the rows ("" if not tied to one file).
+    """
+    for change in changes:
+        append_change(
+            log,
+            row=change["row"],
+            column=change["column"],
+            original=change.get("original"),
+            normalized=change.get("normalized"),
+            method=change.get("method", ""),
+            source=source,
+        )
+
+
+def extend_log(log: ProvenanceLog, other: ProvenanceLog) -> None:
+    """
+    Append every entry of *other* to *log*, re-coding its pooled values.
+
+    Args:
+        log: The log to append to (modified IN PLACE).
+        other: The log to copy entries from (not modified).
+    """
+    if not len(other):
+        return
+
+    log.rows.extend(other.rows)
+    for codes_name, pool_name in (
+        ("column_codes", "columns"),
+        ("original_codes", "values"),
+        ("normalized_codes", "values"),
+        ("method_codes", "methods"),
+        ("source_codes", "sources"),
+    ):
+        target_pool: _InternPool = getattr(log, pool_name)
+        recode = np.array(
+            [target_pool.intern(value) for value in getattr(other, pool_name).values],
+            dtype=np.int32,
+        )
+        other_codes = np.frombuffer(getattr(other, codes_name), dtype=np.int32)
+        getattr(log, codes_name).frombytes(recode[other_codes].tobytes())
+
+
+def offset_rows(log: ProvenanceLog, row_offset: int) -> None:
+    """
+    Shift every row id by *row_offset* (e.g. into a merged DataFrame's index).
+
+    Args:
+        log: The log to update (modified IN PLACE).
+        row_offset: Amount added to every row id.
+    """
+    if not row_offset or not len(log):
+        return
+    shifted = np.frombuffer(log.rows, dtype=np.int64) + row_offset
+    log.rows = array("q", shifted.tobytes())
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API — queries
+# ═══════════════════════════════════════════════════════════════════════════
+
+def select_changes(
+    log: ProvenanceLog,
+    column: str | None = None,
+    method: str | None = None,
+    method_prefix: str | None = None,
+    source: str | None = None,
+) -> np.ndarray:
+    """
+    Find the entries matching every given filter.
+
+    Args:
+        log: The log to query.
+        column: Keep entries for this column.
+        method: Keep entries with exactly this method.
+        method_prefix: Keep entries whose method starts with this text
+            (e.g. "brand rule" for every brand-rule change).
+        source: Keep entries from this source file.
+
+    Returns:
+        Ascending entry positions (an int array; all entries if no filter).
+    """
+    keep = np.ones(len(log), dtype=bool)
+
+    for codes, pool, test in (
+        (log.column_codes, log.columns, None if column is None else column.__eq__),
+        (log.method_codes, log.methods, None if method is None else method.__eq__),
+        (log.method_codes, log.methods,
+         None if method_prefix is None else lambda text: text.startswith(method_prefix)),
+        (log.source_codes, log.sources, None if source is None else source.__eq__),
+    ):
+        if test is None:
+            continue
+        matching_codes = [code for code, value in enumerate(pool.values) if test(value)]
+        keep &= np.isin(np.frombuffer(codes, dtype=np.int32), matching_codes)
+
+    return np.flatnonzero(keep)
+
+
+def count_changes(
+    log: ProvenanceLog,
+    by: str = "column",
+    positions: np.ndarray | None = None,
+) -> dict[str, int]:
+    """
+    Count entries per column, method or source file.
+
+    Args:
+        log: The log to query.
+        by: "column", "method" or "source".
+        positions: Only count these entries (e.g. from select_changes()).
+
+    Returns:
+        Group value → entry count, for groups with at least one entry, in
+        first-seen order.
+    """
+    if by not in _GROUP_FIELDS:
+        raise ValueError(f"Cannot group changes by '{by}' (expected one of {_GROUP_FIELDS})")
+
+    codes = np.frombuffer(getattr(log, f"{by}_codes"), dtype=np.int32)
+    if positions is not None:
+        codes = codes[positions]
+    pool_values = getattr(log, f"{by}s").values
+    counts = np.bincount(codes, minlength=len(pool_values))
+    return {
+        value: int(count) for value, count in zip(pool_values, counts) if count
+    }
+
+
+def change_records(
+    log: ProvenanceLog,
+    positions: np.ndarray | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """
+    Turn entries back into change dicts.
+
+    Args:
+        log: The log to read.
+        positions: Entries to return, in this order (default: all).
+        limit: Return at most this many entries.
+
+    Returns:
+        Dicts with row, column, original, normalized, method and source.
+    """
+    if positions is None:
+        positions = range(len(log))
+    if limit is not None:
+        positions = positions[:limit]
+
+    columns, methods = log.columns.values, log.methods.values
+    sources, values = log.sources.values, log.values.values
+    return [
+        {
+            "row": log.rows[position],
+            "column": columns[log.column_codes[position]],
+            "original": values[log.original_codes[position]],
+            "normalized": values[log.normalized_codes[position]],
+            "method": methods[log.method_codes[position]],
+            "source": sources[log.source_codes[position]],
+        }
+        for position in positions
+    ]
+
+
+def changes_to_dataframe(
+    log: ProvenanceLog,
+    positions: np.ndarray | None = None,
+    limit: int | None = None,
+) -> pd.DataFrame:
+    """
+    Build a DataFrame of entries, with categorical column/method/source.
+
+    Args:
+        log: The log to read.
+        positions: Entries to include, in this order (default: all).
+        limit: Include at most this many entries.
+
+    Returns:
+        DataFrame with columns row, column, original, normalized, method,
+        source.
+    """
+    if positions is None:
+        positions = np.arange(len(log))
+    if limit is not None:
+        positions = positions[:limit]
+
+    def codes_of(codes: array) -> np.ndarray:
+        return np.frombuffer(codes, dtype=np.int32)[positions]
+
+    def categorical(codes: array, pool: _InternPool) -> pd.Categorical:
+        return pd.Categorical.from_codes(codes_of(codes), categories=pool.values)
+
+    value_array = np.empty(len(log.values.values), dtype=object)
+    value_array[:] = log.values.values
+
+    return pd.DataFrame({
+        "row": np.frombuffer(log.rows, dtype=np.int64)[positions],
+        "column": categorical(log.column_codes, log.columns),
+        "original": value_array[codes_of(log.original_codes)],
+        "normalized": value_array[codes_of(log.normalized_codes)],
+        "method": categorical(log.method_codes, log.methods),
+        "source": categorical(log.source_codes, log.sources),
+    })
@@ -21,6 +21,7 @@ from dataclasses import dataclass, field
 import pandas as pd
 
 from config.schema import COLUMN_TYPES, MASTER_COLUMNS, REQUIRED_COLUMNS, VALID_VALUES
+from processing.provenance import ProvenanceLog, count_changes, extend_changes
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,10 @@ class QualityReport:
     invalid_categoricals: list[dict] = field(default_factory=list)
     invalid_numerics: list[dict] = field(default_factory=list)
     missing_required: list[dict] = field(default_factory=list)
-    normalization_log: list[dict] = field(default_factory=list)
+    normalization_log: ProvenanceLog = field(default_factory=ProvenanceLog)
+    # Change counts per method / per column, from normalization_log
+    changes_by_method: dict[str, int] = field(default_factory=dict)
+    changes_by_column: dict[str, int] = field(default_factory=dict)
     flagged_items: list[dict] = field(default_factory=list)
     exchange_rate_used: dict[str, float] = field(default_factory=dict)
     files_processed: list[str] = field(default_factory=list)
@@ -53,7 +57,7 @@ class QualityReport:
 
 def check_quality(
     dataframe: pd.DataFrame,
-    normalization_log: list[dict] | None = None,
+    normalization_log: ProvenanceLog | list[dict] | None = None,
     flagged_items: list[dict] | None = None,
     exchange_rate_used: dict[str, float] | None = None,
     source_filenames: list[str] | None = None,
@@ -71,8 +75,9 @@ def check_quality(
 
     Args:
         dataframe: The final merged DataFrame to validate.
-        normalization_log: Optional list of normalization changes from the
-                          normalizer's changes_log.
+        normalization_log: Optional changes log — a ProvenanceLog, or a
+                          list of change dicts like the normalizer's
+                          changes_log.
         flagged_items: Optional list of items still flagged after LLM.
         exchange_rate_used: Optional dict of currency → rate used.
         source_filenames: Optional list of processed filenames.
@@ -83,7 +88,12 @@ def check_quality(
     """
     report = QualityReport()
     report.total_rows = len(dataframe)
-    report.normalization_log = normalization_log or []
+    if isinstance(normalization_log, ProvenanceLog):
+        report.normalization_log = normalization_log
+    elif normalization_log:
+        extend_changes(report.normalization_log, normalization_log)
+    report.changes_by_method = count_changes(report.normalization_log, by="method")
+    report.changes_by_column = count_changes(report.normalization_log, by="column")
     report.flagged_items = flagged_items or []
     report.exchange_rate_used = exchange_rate_used or {}
     report.files_processed = source_filenames or []
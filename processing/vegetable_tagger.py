@@ -14,10 +14,13 @@ Tagging layers:
                              Flavor_Clean get Yes.
     Layer 3 (LLM):           sends remaining untagged products whose Flavor_Clean
                              contains an ambiguity signal word to Claude Sonnet;
-                             results cached in vegetable_tag_cache.json.
+                             answers cached in the shared LLM result store
+                             (namespace "vegetable_tag"; entries of the old
+                             vegetable_tag_cache.json are imported once).
 
 Public API:
-    tag_contains_vegetables(df, api_key, cache_path) -> tuple[pd.DataFrame, dict]
+    tag_contains_vegetables(df, api_key, cache_path, legacy_cache_path)
+        -> tuple[pd.DataFrame, dict]
 """
 
 from __future__ import annotations
@@ -30,18 +33,29 @@ from pathlib import Path
 
 import pandas as pd
 
-from config.llm_config import MODEL_ID
 from config.flavor_profile_config import (
     VEGETABLE_AMBIGUITY_SIGNALS,
     VEGETABLE_KEYWORDS,
 )
+from processing.llm_result_store import (
+    DEFAULT_LLM_RESULT_STORE_PATH,
+    import_legacy_json,
+    lookup_results,
+    store_results,
+)
+from utils.llm_client import complete
 
 logger = logging.getLogger(__name__)
 
+# Layer 3 answers' namespace in the LLM result store.
+_STORE_NAMESPACE = "vegetable_tag"
+
 # Columns scanned for vegetable keywords in Layer 1.
 _SCAN_COLUMNS = ["Flavor_Clean", "Claims", "Notes", "Product Name"]
 
-_LAYER3_PROMPT_TEMPLATE = """\
+# Fixed instructions of the Layer 3 prompt, sent as the static prefix so the
+# provider can cache it (see utils/llm_client.py).
+_LAYER3_PROMPT_PREFIX = """\
 You are a product classifier for supermarket shelf audit data.
 
 For each product below, based on ALL available information (flavor name, claims,
@@ -51,18 +65,22 @@ wheatgrass, aloe, or similar plant-green ingredients?
 
 Answer Yes or No for each product.
 
-Products to evaluate:
-{items_json}
-
 Return a JSON object where each key is the Flavor_Clean value and each value is
 either "Yes" or "No". Example:
-{{
+{
   "Green Goodness": "Yes",
   "Green Escape": "No",
   "Wonder Green": "Yes"
-}}
+}
 
 Return ONLY the JSON object. No extra text or markdown.
+
+"""
+
+# The per-call part of the Layer 3 prompt, sent after the cached prefix.
+_LAYER3_ITEMS_TEMPLATE = """\
+Products to evaluate:
+{items_json}
 """
 
 
@@ -73,7 +91,8 @@ Return ONLY the JSON object. No extra text or markdown.
 def tag_contains_vegetables(
     df: pd.DataFrame,
     api_key: str | None,
-    cache_path: str = "vegetable_tag_cache.json",
+    cache_path: Path | str = DEFAULT_LLM_RESULT_STORE_PATH,
+    legacy_cache_path: Path | str | None = "vegetable_tag_cache.json",
 ) -> tuple[pd.DataFrame, dict[str, int]]:
     """
     Add the Contains_Vegetables column to the DataFrame.
@@ -92,7 +111,10 @@ def tag_contains_vegetables(
     Args:
         df: DataFrame after classify_flavor_profile has been applied.
         api_key: Anthropic API key for Layer 3. May be None.
-        cache_path: Path to the persistent Layer 3 JSON cache file.
+        cache_path: SQLite LLM result store for Layer 3 answers, shared
+            with other sessions.
+        legacy_cache_path: Old Layer 3 JSON cache file, imported into the
+            store the first time it is seen.  None skips the import.
 
     Returns:
         Tuple of:
@@ -119,7 +141,7 @@ def tag_contains_vegetables(
     # ── Layer 3: LLM for ambiguous untagged products ──────────────────────
     layer3_count = 0
     if api_key:
-        result, layer3_count = _apply_layer3(result, api_key, cache_path)
+        result, layer3_count = _apply_layer3(result, api_key, cache_path, legacy_cache_path)
         logger.info(
             f"Vegetable Tagger Layer 3: {layer3_count} additional SKUs tagged via LLM"
         )
@@ -256,7 +278,8 @@ def _layer2_propagate(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
 def _apply_layer3(
     df: pd.DataFrame,
     api_key: str,
-    cache_path: str,
+    cache_path: Path | str,
+    legacy_cache_path: Path | str | None,
 ) -> tuple[pd.DataFrame, int]:
     """
     Layer 3: LLM Yes/No decision for ambiguous untagged products.
@@ -266,13 +289,14 @@ def _apply_layer3(
     all distinct Claims, Notes, and Product Name values across all rows are
     aggregated to give the LLM maximum context.
 
-    Results are cached in vegetable_tag_cache.json so the LLM is called at
+    Answers are cached in the LLM result store so the LLM is called at
     most once per unique Flavor_Clean value, across all sessions.
 
     Args:
         df: DataFrame after Layers 1 and 2.
         api_key: Anthropic API key.
-        cache_path: Path to the persistent JSON cache file.
+        cache_path: SQLite LLM result store.
+        legacy_cache_path: Old JSON cache file to import once, or None.
 
     Returns:
         Tuple of (updated DataFrame, count of newly tagged rows).
@@ -304,7 +328,9 @@ def _apply_layer3(
         .tolist()
     )
 
-    cache = _load_cache(cache_path)
+    if legacy_cache_path is not None:
+        import_legacy_json(cache_path, _STORE_NAMESPACE, legacy_cache_path)
+    cache = lookup_results(cache_path, _STORE_NAMESPACE, unique_ambiguous_flavors)
 
     new_flavors = [flavor for flavor in unique_ambiguous_flavors if flavor not in cache]
     logger.info(
@@ -323,7 +349,7 @@ def _apply_layer3(
                 if answer in ("Yes", "No")
             }
             cache.update(valid_mapping)
-            _save_cache(cache_path, cache)
+            store_results(cache_path, _STORE_NAMESPACE, valid_mapping)
             logger.info(
                 f"Vegetable Tagger Layer 3: cache updated with {len(valid_mapping)} new entries"
             )
@@ -465,31 +491,19 @@ def _call_llm(
     Returns:
         Dict mapping Flavor_Clean → "Yes" or "No", or None on failure.
     """
-    import anthropic
-
     items_json = json.dumps(items, ensure_ascii=False, indent=2)
-    prompt = _LAYER3_PROMPT_TEMPLATE.format(items_json=items_json)
+    prompt = _LAYER3_ITEMS_TEMPLATE.format(items_json=items_json)
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model=MODEL_ID,
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        response_text = message.content[0].text
-        input_tokens = message.usage.input_tokens
-        output_tokens = message.usage.output_tokens
-        cost = (input_tokens * 3.0 / 1_000_000) + (output_tokens * 15.0 / 1_000_000)
-        logger.info(
-            f"Vegetable Tagger Layer 3 LLM call: "
-            f"{input_tokens} in / {output_tokens} out tokens, est. cost ${cost:.4f}"
+        response = complete(
+            prompt, api_key, max_tokens=1024, caller="vegetable_tagger",
+            static_prefix=_LAYER3_PROMPT_PREFIX,
         )
     except Exception as exc:
         logger.error(f"Vegetable Tagger Layer 3 LLM call failed: {exc}")
         return None
 
-    return _parse_llm_response(response_text)
+    return _parse_llm_response(response.text)
 
 
 def _parse_llm_response(response_text: str) -> dict[str, str] | None:
@@ -593,54 +607,3 @@ def _reorder_columns(df: pd.DataFrame) -> pd.DataFrame:
 
     cols.insert(insert_pos, "Contains_Vegetables")
     return df[cols]
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# Cache helpers
-# ═══════════════════════════════════════════════════════════════════════════
-
-def _load_cache(path: str) -> dict[str, str]:
-    """
-    Load the Layer 3 vegetable tag cache from disk.
-
-    Returns an empty dict if the file does not exist or cannot be parsed.
-
-    Args:
-        path: File path to the JSON cache.
-
-    Returns:
-        Dict mapping Flavor_Clean → "Yes" or "No".
-    """
-    cache_path = Path(path)
-    if not cache_path.exists():
-        return {}
-    try:
-        with cache_path.open("r", encoding="utf-8") as file_handle:
-            data = json.load(file_handle)
-        if not isinstance(data, dict):
-            logger.warning(
-                f"Vegetable tag cache {path} is not a JSON object — starting fresh"
-            )
-            return {}
-        return data
-    except Exception as exc:
-        logger.warning(
-            f"Failed to load vegetable tag cache from {path}: {exc} — starting fresh"
-        )
-        return {}
-
-
-def _save_cache(path: str, cache: dict[str, str]) -> None:
-    """
-    Persist the Layer 3 vegetable tag cache to disk as pretty-printed JSON.
-
-    Args:
-        path: File path to write.
-        cache: Dict mapping Flavor_Clean → "Yes" or "No".
-    """
-    try:
-        cache_path = Path(path)
-        with cache_path.open("w", encoding="utf-8") as file_handle:
-            json.dump(cache, file_handle, ensure_ascii=False, indent=2, sort_keys=True)
-    except Exception as exc:
-        logger.error(f"Failed to save vegetable tag cache to {path}: {exc}")
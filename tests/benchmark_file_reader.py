@@ -0,0 +1,80 @@
+"""
+Micro-benchmarks for processing/file_reader.py
+
+Not collected by pytest — run directly:
+
+    python -m tests.benchmark_file_reader
+
+Section lookup: builds an in-memory row stream for a heavily sectioned
+sheet (one context-only "photo" row before every few SKU rows) and times
+_extract_rows_to_dataframe() at increasing section counts.  With the
+bisect index the time per row stays flat as the number of sections grows;
+a scan over the sections would grow linearly with it.
+"""
+
+import time
+
+from processing.file_reader import _extract_rows_to_dataframe
+
+_COLUMN_NAMES: list[str] = [
+    "Photo", "Shelf Location", "Est. Linear Meters", "Shelf Levels",
+    "Brand", "Flavor", "Facings", "Price (Local Currency)",
+]
+_SKU_ROWS_PER_PHOTO: int = 3
+_SECTION_COUNTS: list[int] = [1_000, 2_000, 4_000, 8_000]
+_REPEATS: int = 3
+
+
+def build_photo_sectioned_rows(
+    photo_count: int,
+    sku_rows_per_photo: int = _SKU_ROWS_PER_PHOTO,
+) -> list[tuple[int, tuple]]:
+    """
+    Build (row_number, values) pairs for a sheet with one photo section
+    per context row, starting right after a header in row 1.
+
+    Args:
+        photo_count: Number of context-only photo rows (= sections).
+        sku_rows_per_photo: Data rows following each photo row.
+
+    Returns:
+        Rows in the shape yielded by file_reader._iter_row_values.
+    """
+    rows: list[tuple[int, tuple]] = []
+    row_number = 2
+    for photo_idx in range(photo_count):
+        rows.append((row_number, (f"IMG_{photo_idx:05d}.jpg", f"Aisle {photo_idx % 40}",
+                                  2.5, 5, None, None, None, None)))
+        row_number += 1
+        for sku_idx in range(sku_rows_per_photo):
+            rows.append((row_number, (None, None, None, None,
+                                      f"Brand {sku_idx}", "Orange", 2, 1.99)))
+            row_number += 1
+    return rows
+
+
+def benchmark_section_lookup() -> None:
+    """Time row extraction for sheets with thousands of photo sections."""
+    print(f"{'sections':>9} {'rows':>7} {'total ms':>9} {'µs/row':>7}")
+    for photo_count in _SECTION_COUNTS:
+        rows = build_photo_sectioned_rows(photo_count)
+        best_seconds = float("inf")
+        for _ in range(_REPEATS):
+            started = time.perf_counter()
+            _extract_rows_to_dataframe(
+                rows=iter(rows),
+                column_names=_COLUMN_NAMES,
+                header_row=1,
+                data_start_col=0,
+                separator_index={},
+                sections=[],
+            )
+            best_seconds = min(best_seconds, time.perf_counter() - started)
+        print(
+            f"{photo_count:>9,} {len(rows):>7,} {best_seconds * 1000:>9.1f} "
+            f"{best_seconds / len(rows) * 1e6:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_section_lookup()
@@ -0,0 +1,186 @@
+"""
+Micro-benchmarks for the clean_with_llm() batch dispatcher.
+
+Not collected by pytest — run directly:
+
+    python -m tests.benchmark_llm_dispatch
+
+Runs a 600-item clean_with_llm() against FakeSonnetAPI (no network) with a
+fixed simulated latency per call, at increasing concurrency limits, and
+reports wall time, peak calls in flight and items sent.  A second run
+truncates every full-size batch, so the items each response did not reach
+are resubmitted, to time the recovery path.  Each run gets a fresh rate limiter with the production
+settings, so the numbers include its pacing but no run starts with a
+bucket drained by the one before.
+
+Batching: a workload of short Shelf Location items followed by Flavor
+items whose answers run long, against a fake that cuts responses off at
+max_tokens.  Compares fixed 50-item batches with the token-budget batcher
+over two consecutive runs (the second run uses the output sizes learned
+in the first), counting calls and truncated responses.
+
+Prompt cache: the same 600 items through the shared client, once with the
+static prompt prefix resent as ordinary input on every call and once
+marked for caching (the fake reports later calls' prefix as cache reads),
+comparing input tokens and estimated cost.
+"""
+
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+from config.llm_config import BURST_REQUESTS, REQUESTS_PER_SECOND
+from processing.llm_cleaner import (
+    _MAX_OUTPUT_TOKENS,
+    _create_batches,
+    clean_with_llm,
+)
+from processing.normalizer import FlaggedItem
+from tests.fake_llm_api import FakeSonnetAPI
+from utils.rate_limit import TokenBucket
+
+_ITEM_COUNT: int = 600
+_LATENCY_SECONDS: float = 1.0
+_CONCURRENCY_LEVELS: list[int] = [1, 2, 4, 8]
+
+
+def build_flagged_items(count: int) -> tuple[pd.DataFrame, list[FlaggedItem]]:
+    """*count* rows, each with a distinct flagged Product Type value."""
+    dataframe = pd.DataFrame({"Product Type": [f"Drink {i}" for i in range(count)]})
+    flagged_items = [
+        FlaggedItem(
+            row_index=i,
+            column="Product Type",
+            original_value=f"Drink {i}",
+            context={"Brand": f"Brand {i % 40}"},
+        )
+        for i in range(count)
+    ]
+    return dataframe, flagged_items
+
+
+def benchmark_dispatch(truncate_over_items: int | None = None) -> None:
+    """Time one clean_with_llm() run per concurrency level."""
+    dataframe, flagged_items = build_flagged_items(_ITEM_COUNT)
+    print(
+        f"{'workers':>8} {'calls':>6} {'sent':>6} {'peak':>5} {'seconds':>8} {'resolved':>9}"
+    )
+    for concurrency in _CONCURRENCY_LEVELS:
+        fake = FakeSonnetAPI(
+            latency_seconds=_LATENCY_SECONDS, truncate_over_items=truncate_over_items
+        )
+        fresh_limiter = TokenBucket(rate=REQUESTS_PER_SECOND, capacity=BURST_REQUESTS)
+        with (
+            patch("utils.llm_client._get_client"),
+            patch("utils.llm_client._send_request", new=fake.send_request),
+            patch("utils.llm_client._RATE_LIMITER", new=fresh_limiter),
+        ):
+            started = time.perf_counter()
+            result = clean_with_llm(
+                dataframe, flagged_items, api_key="sk-fake",
+                max_concurrent_batches=concurrency, cache_path=None,
+            )
+            elapsed = time.perf_counter() - started
+        print(
+            f"{concurrency:>8} {len(fake.calls):>6} {sum(fake.calls):>6} "
+            f"{fake.max_in_flight:>5} "
+            f"{elapsed:>8.2f} {len(result.resolved_items):>9}"
+        )
+
+
+def build_mixed_items(count: int) -> tuple[pd.DataFrame, list[FlaggedItem]]:
+    """
+    Short Shelf Location items, then Flavor items — grouped by column, as
+    normalize() flags them column by column.
+    """
+    dataframe = pd.DataFrame({
+        "Shelf Location": [f"Aisle {i}" for i in range(count)],
+        "Flavor": [
+            f"Cold pressed orange, mango & passion fruit with ginger ({i})"
+            for i in range(count)
+        ],
+    })
+    flagged_items = []
+    for i in range(count):
+        column = "Shelf Location" if i < count // 2 else "Flavor"
+        flagged_items.append(FlaggedItem(
+            row_index=i, column=column, original_value=dataframe.at[i, column],
+        ))
+    return dataframe, flagged_items
+
+
+def benchmark_batching() -> None:
+    """Count calls and truncations for fixed vs token-budget batching."""
+    dataframe, flagged_items = build_mixed_items(_ITEM_COUNT)
+
+    def fixed_batches(items):
+        return _create_batches(items, 50, float("inf"), float("inf"))
+
+    print(f"{'batching':>9} {'run':>4} {'calls':>6} {'truncated':>10} {'answered':>9}")
+    for label, batcher in (("fixed-50", fixed_batches), ("budget", _create_batches)):
+        with (
+            patch("processing.llm_cleaner._create_batches", new=batcher),
+            patch("processing.llm_cleaner._OUTPUT_OVERHEAD_BY_COLUMN", new={}),
+            patch("utils.llm_client._RATE_LIMITER",
+                  new=TokenBucket(rate=1000.0, capacity=1000)),
+        ):
+            for run in (1, 2):
+                # Flavor answers come back with long reasoning
+                fake = FakeSonnetAPI(
+                    reasoning_by_column={"Flavor": "x" * 1200},
+                    max_output_tokens=_MAX_OUTPUT_TOKENS,
+                )
+                with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+                    result = clean_with_llm(
+                        dataframe, flagged_items, api_key="sk-fake", cache_path=None,
+                    )
+                print(
+                    f"{label:>9} {run:>4} {len(fake.calls):>6} "
+                    f"{fake.truncated_calls:>10} "
+                    f"{len(result.resolved_items) + len(result.rejected_items):>9}"
+                )
+
+
+def benchmark_prompt_cache() -> None:
+    """Input tokens and cost with the static prefix cached vs resent in full."""
+    dataframe, flagged_items = build_flagged_items(_ITEM_COUNT)
+
+    print(f"{'prefix':>9} {'calls':>6} {'input':>8} {'cached':>8} {'cost $':>8}")
+    for label in ("resent", "cached"):
+        fake = FakeSonnetAPI()
+
+        def send_request(api_key, model, static_prefix, prompt, max_tokens, on_text=None):
+            if label == "resent":
+                # No cache marker: the prefix is just the start of the prompt
+                static_prefix, prompt = "", static_prefix + prompt
+            return fake.send_request(
+                api_key, model, static_prefix, prompt, max_tokens, on_text=on_text,
+            )
+
+        with (
+            patch("utils.llm_client._get_client"),
+            patch("utils.llm_client._send_request", new=send_request),
+            patch("utils.llm_client._RATE_LIMITER",
+                  new=TokenBucket(rate=1000.0, capacity=1000)),
+            # Same batches for both runs: no output sizes learned in between
+            patch("processing.llm_cleaner._OUTPUT_OVERHEAD_BY_COLUMN", new={}),
+        ):
+            result = clean_with_llm(
+                dataframe, flagged_items, api_key="sk-fake", cache_path=None,
+            )
+        print(
+            f"{label:>9} {len(fake.calls):>6} {result.input_tokens:>8} "
+            f"{result.cached_input_tokens:>8} {result.api_cost_estimate:>8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    print(f"{_ITEM_COUNT} items, {_LATENCY_SECONDS}s per call")
+    benchmark_dispatch()
+    print("\nEvery full batch truncated (unanswered items resubmitted)")
+    benchmark_dispatch(truncate_over_items=30)
+    print("\nBatching: fixed 50 items vs token budget")
+    benchmark_batching()
+    print("\nStatic prompt prefix: resent in full vs provider-cached")
+    benchmark_prompt_cache()
@@ -0,0 +1,189 @@
+"""
+End-to-end pipeline benchmark over tests/fixtures, replayed from an LLM cassette.
+
+Not collected by pytest — run directly:
+
+    python -m tests.benchmark_pipeline_replay record    # live API, records the cassette
+    python -m tests.benchmark_pipeline_replay           # replay, recorded latencies
+    python -m tests.benchmark_pipeline_replay fast      # replay, no LLM latency
+    python -m tests.benchmark_pipeline_replay profile   # fast replay under cProfile
+
+Runs every fixture workbook through the same steps as the app: per-file
+stages → merge → clean_with_llm() → harmonize_flavors_with_llm() →
+tag_contains_vegetables() → generate_all_headlines(), and reports the time
+spent in each.  Recording needs ANTHROPIC_API_KEY and writes every LLM
+request and response to _CASSETTE_PATH (utils/llm_cassette.py); after
+that the run needs no network and no key, and gives the same output every
+time.  Every run starts from empty parse and decision caches and an empty
+LLM result store (flavor and vegetable answers) in a fresh process, so a
+replay sends exactly the requests that were recorded.
+
+"fast" and "profile" also lift the client's rate limit, so the timings
+show the pipeline's own cost; the default replay keeps it, like a live run.
+"""
+
+import cProfile
+import contextlib
+import os
+import pstats
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from analysis.slide_data import generate_all_slide_data
+from config.schema import COLUMN_TYPES
+from output.headline_generator import generate_all_headlines
+from processing.file_pipeline import STATUS_OK, FileJob, apply_row_offsets, process_files
+from processing.filename_parser import parse_filename
+from processing.flavor_cleaner import harmonize_flavors_with_llm
+from processing.llm_cleaner import clean_with_llm
+from processing.merger import merge_dataframes
+from processing.vegetable_tagger import tag_contains_vegetables
+from utils.llm_cassette import MODE_RECORD, MODE_REPLAY, use_cassette
+from utils.llm_client import reset_call_metrics, summarize_call_metrics
+from utils.rate_limit import TokenBucket
+
+_FIXTURES_DIR: Path = Path(__file__).parent / "fixtures"
+_CASSETTE_PATH: Path = _FIXTURES_DIR / "cassettes" / "pipeline_llm.json"
+_EXCHANGE_RATES: dict[str, float] = {"EUR": 1.0, "GBP": 1.17}
+# Replay needs some key: callers skip their LLM step without one
+_REPLAY_API_KEY: str = "sk-replay"
+_PROFILE_TOP_FUNCTIONS: int = 25
+
+
+def build_fixture_jobs() -> list[FileJob]:
+    """One FileJob per fixture store workbook, metadata parsed from its name."""
+    jobs: list[FileJob] = []
+    for file_path in sorted(_FIXTURES_DIR.glob("*.xlsx")):
+        if file_path.name == "MASTER FILE.xlsx":
+            continue
+        parsed = parse_filename(file_path.name)
+        retailer = parsed.retailer or "Unknown"
+        city = parsed.city or "London"
+        jobs.append(FileJob(
+            file_path=file_path,
+            metadata={
+                "File": file_path.name,
+                "Country": "United Kingdom",
+                "City": city,
+                "Retailer": retailer,
+                "Store Name": f"{retailer} {city}",
+                "Store Format": parsed.store_format or "",
+            },
+            cache_dir=None,
+        ))
+    return jobs
+
+
+def run_pipeline(api_key: str, work_dir: Path) -> dict[str, float]:
+    """
+    Run the fixtures through every pipeline step once.
+
+    Args:
+        api_key: Anthropic API key (any non-empty string when replaying).
+        work_dir: Empty directory for the flavor and vegetable result store.
+
+    Returns:
+        Step name → seconds spent in it.
+    """
+    timings: dict[str, float] = {}
+
+    def timed(step: str, function, *args, **kwargs):
+        started = time.perf_counter()
+        value = function(*args, **kwargs)
+        timings[step] = time.perf_counter() - started
+        return value
+
+    results = timed("per-file stages", process_files, build_fixture_jobs(), _EXCHANGE_RATES, 1)
+    apply_row_offsets(results)
+    processed = [result for result in results if result.status == STATUS_OK]
+    merge_result = timed(
+        "merge", merge_dataframes,
+        [result.dataframe for result in processed], [result.filename for result in processed],
+    )
+    flagged_items = [item for result in processed for item in result.flagged_items]
+
+    llm_result = timed(
+        "clean_with_llm", clean_with_llm,
+        merge_result.dataframe, flagged_items, api_key, cache_path=None,
+    )
+    result_store = work_dir / "llm_results.sqlite3"
+    dataframe = timed(
+        "flavor harmonization", harmonize_flavors_with_llm,
+        llm_result.dataframe, api_key, result_store, legacy_cache_path=None,
+    )
+    dataframe, _ = timed(
+        "vegetable tagging", tag_contains_vegetables,
+        dataframe, api_key, result_store, legacy_cache_path=None,
+    )
+    slide_data = timed("slide data", generate_all_slide_data, _coerce_numeric_columns(dataframe))
+    timed("headlines", generate_all_headlines, slide_data, api_key)
+    return timings
+
+
+def benchmark_pipeline(mode: str) -> None:
+    """Record, replay or profile one full pipeline run and print step timings."""
+    if mode == "record":
+        api_key = os.environ.get("ANTHROPIC_API_KEY", "")
+        if not api_key:
+            sys.exit("Recording calls the live API: set ANTHROPIC_API_KEY")
+        cassette_mode, latency_scale = MODE_RECORD, 1.0
+    else:
+        api_key = _REPLAY_API_KEY
+        cassette_mode, latency_scale = MODE_REPLAY, (1.0 if mode == "replay" else 0.0)
+
+    reset_call_metrics()
+    unlimited = TokenBucket(rate=1_000_000.0, capacity=1_000_000)
+    with (
+        tempfile.TemporaryDirectory() as work_dir,
+        use_cassette(_CASSETTE_PATH, cassette_mode, latency_scale) as cassette,
+        (
+            patch("utils.llm_client._RATE_LIMITER", new=unlimited)
+            if latency_scale == 0 else contextlib.nullcontext()
+        ),
+    ):
+        profiler = cProfile.Profile() if mode == "profile" else None
+        started = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        timings = run_pipeline(api_key, Path(work_dir))
+        if profiler:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+
+    print(f"{'step':<22} {'seconds':>8}")
+    for step, seconds in timings.items():
+        print(f"{step:<22} {seconds:>8.2f}")
+    print(f"{'total':<22} {elapsed:>8.2f}")
+    print(
+        f"\nLLM requests: {cassette.hits} replayed, {cassette.misses} missing, "
+        f"{cassette.recorded} recorded"
+    )
+    for caller, totals in summarize_call_metrics().items():
+        print(
+            f"  {caller:<20} {totals['calls']:>3} calls, {totals['input_tokens']:>7} in / "
+            f"{totals['output_tokens']:>6} out tokens, ${totals['cost_usd']:.4f}"
+        )
+    if profiler:
+        print()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(_PROFILE_TOP_FUNCTIONS)
+
+
+def _coerce_numeric_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Numeric schema columns back to numbers, as app.py does before analysis."""
+    dataframe = dataframe.copy()
+    for column, column_type in COLUMN_TYPES.items():
+        if column_type in ("integer", "float") and column in dataframe.columns:
+            dataframe[column] = pd.to_numeric(dataframe[column], errors="coerce")
+    return dataframe
+
+
+if __name__ == "__main__":
+    run_mode = sys.argv[1] if len(sys.argv) > 1 else "replay"
+    if run_mode not in ("record", "replay", "fast", "profile"):
+        sys.exit(f"Unknown mode '{run_mode}' — use record, replay, fast or profile")
+    benchmark_pipeline(run_mode)
@@ -0,0 +1,186 @@
+"""
+Offline stand-in for the Claude API.
+
+FakeSonnetAPI answers clean_with_llm() prompts without a network: it reads
+the flagged items out of the prompt's JSON and returns one decision per
+item (echoing row_index, column and original_value) after a simulated
+latency.  Failure modes can be switched on to exercise the dispatcher:
+
+  - fail_first_calls: the first N calls raise (API errors → backoff/retry)
+  - truncate_over_items: prompts with more items than this get a truncated
+    response (parse failure → split-in-half retry)
+  - max_output_tokens: responses longer than this many tokens (4 chars
+    each) are cut off there, like a real max_tokens stop
+  - drop_stream_after_chars: responses longer than this are interrupted
+    there by a ConnectionError, after the text before it was delivered
+
+Given an on_text callback (as the shared client passes when streaming), it
+delivers the response text in small fragments before returning.
+
+Through send_request() it also imitates provider prompt caching: the first
+call with a given static prefix reports it as cache-write tokens, later
+calls as cache-read tokens.
+
+It also records every call and the peak number of calls in flight, so
+tests and benchmarks can check the concurrency limit.
+
+Use it by patching llm_cleaner's API call:
+
+    fake = FakeSonnetAPI(latency_seconds=0.05)
+    with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+        clean_with_llm(dataframe, flagged_items, api_key="sk-test")
+
+or, to go through the shared client (rate limit, retries, metrics), its
+transport:
+
+    with patch("utils.llm_client._send_request", new=fake.send_request):
+        ...
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from utils.llm_client import LLMResponse, TokenUsage
+
+# Marker before the flagged-items JSON array in the cleaning prompt.
+_ITEMS_MARKER = "ITEMS TO RESOLVE:"
+
+# Characters per token the fake counts with.
+_CHARS_PER_TOKEN = 4
+
+# Characters per streamed fragment.
+_STREAM_FRAGMENT_CHARS = 16
+
+
+@dataclass
+class FakeSonnetAPI:
+    """Callable replacement for _call_sonnet_api(prompt, api_key)."""
+
+    latency_seconds: float = 0.0
+    normalized_value: str = "Other"
+    reasoning: str = "fake"
+    # Per-column reasoning overriding `reasoning` (e.g. long Flavor answers)
+    reasoning_by_column: dict[str, str] = field(default_factory=dict)
+    fail_first_calls: int = 0
+    truncate_over_items: int | None = None
+    max_output_tokens: int | None = None
+    drop_stream_after_chars: int | None = None
+    cost_per_call: float = 0.001
+    # Filled in as calls are made
+    calls: list[int] = field(default_factory=list)      # item count per call
+    truncated_calls: int = 0
+    dropped_calls: int = 0
+    max_in_flight: int = 0
+    _in_flight: int = 0
+    # Static prefixes seen so far (the simulated provider prompt cache)
+    _cached_prefixes: set[str] = field(default_factory=set, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __call__(
+        self, prompt: str, api_key: str, on_text: Callable[[str], None] | None = None,
+    ) -> LLMResponse:
+        response_text, input_tokens, output_tokens, truncated = self._respond(prompt)
+        self._stream(response_text, on_text)
+        return LLMResponse(
+            text=response_text,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=self.cost_per_call,
+            latency_seconds=self.latency_seconds,
+            attempts=1,
+            stop_reason="max_tokens" if truncated else "end_turn",
+        )
+
+    def send_request(
+        self, api_key: str, model: str, static_prefix: str, prompt: str, max_tokens: int,
+        on_text: Callable[[str], None] | None = None,
+    ) -> tuple[str, TokenUsage, str]:
+        """Replacement for utils.llm_client._send_request()."""
+        response_text, input_tokens, output_tokens, truncated = self._respond(prompt)
+        self._stream(response_text, on_text)
+        usage = TokenUsage(uncached_input_tokens=input_tokens, output_tokens=output_tokens)
+        if static_prefix:
+            prefix_tokens = len(static_prefix) // _CHARS_PER_TOKEN
+            with self._lock:
+                cached = static_prefix in self._cached_prefixes
+                self._cached_prefixes.add(static_prefix)
+            if cached:
+                usage.cache_read_tokens = prefix_tokens
+            else:
+                usage.cache_write_tokens = prefix_tokens
+        return response_text, usage, "max_tokens" if truncated else "end_turn"
+
+    def _stream(self, response_text: str, on_text: Callable[[str], None] | None) -> None:
+        """Deliver *response_text* to on_text in fragments, dropping it if configured."""
+        dropped = (
+            self.drop_stream_after_chars is not None
+            and len(response_text) > self.drop_stream_after_chars
+        )
+        if dropped:
+            response_text = response_text[: self.drop_stream_after_chars]
+        if on_text is not None:
+            for start in range(0, len(response_text), _STREAM_FRAGMENT_CHARS):
+                on_text(response_text[start : start + _STREAM_FRAGMENT_CHARS])
+        if dropped:
+            with self._lock:
+                self.dropped_calls += 1
+            raise ConnectionError("fake stream dropped")
+
+    def _respond(self, prompt: str) -> tuple[str, int, int, bool]:
+        """(response_text, input_tokens, output_tokens, truncated) for *prompt*."""
+        items = _prompt_items(prompt)
+        with self._lock:
+            call_number = len(self.calls)
+            self.calls.append(len(items))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+        try:
+            time.sleep(self.latency_seconds)
+            if call_number < self.fail_first_calls:
+                raise ConnectionError(f"fake API error on call {call_number + 1}")
+
+            decisions = [
+                {
+                    "row_index": item["row_index"],
+                    "column": item["column"],
+                    "original_value": item.get("original_value"),
+                    "normalized_value": self.normalized_value,
+                    "reasoning": self.reasoning_by_column.get(item["column"], self.reasoning),
+                }
+                for item in items
+            ]
+            response_text = json.dumps(decisions, indent=2, ensure_ascii=False)
+            output_tokens = len(response_text) // _CHARS_PER_TOKEN
+
+            truncated = False
+            if self.truncate_over_items is not None and len(items) > self.truncate_over_items:
+                response_text = response_text[: len(response_text) // 2]
+                output_tokens = len(response_text) // _CHARS_PER_TOKEN
+                truncated = True
+            if self.max_output_tokens is not None and output_tokens > self.max_output_tokens:
+                response_text = response_text[: self.max_output_tokens * _CHARS_PER_TOKEN]
+                output_tokens = self.max_output_tokens
+                truncated = True
+            if truncated:
+                with self._lock:
+                    self.truncated_calls += 1
+
+            input_tokens = len(prompt) // _CHARS_PER_TOKEN
+            return response_text, input_tokens, output_tokens, truncated
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def _prompt_items(prompt: str) -> list[dict]:
+    """The flagged-item objects embedded in a cleaning prompt."""
+    marker_idx = prompt.find(_ITEMS_MARKER)
+    if marker_idx == -1:
+        return []
+    array_start = prompt.index("[", marker_idx)
+    items, _ = json.JSONDecoder().raw_decode(prompt, array_start)
+    return items
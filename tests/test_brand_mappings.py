@@ -0,0 +1,98 @@
+"""
+Tests for config/brand_mappings.py
+
+Covers: exact and fuzzy brand matching, the per-country brand index,
+memoization of repeated inputs (and its cap), and batched matching.
+"""
+
+from config.brand_mappings import (
+    UK_BRAND_MAPPINGS,
+    get_all_brands,
+    get_brand_index,
+    match_brand,
+    match_brands,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# match_brand
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMatchBrand:
+    def test_exact_match_case_insensitive(self):
+        brand_name, mapping, score = match_brand("  INNOCENT ")
+
+        assert brand_name == "Innocent"
+        assert mapping == UK_BRAND_MAPPINGS["Innocent"]
+        assert score == 100
+
+    def test_fuzzy_match_typo(self):
+        brand_name, _, score = match_brand("Tropicanna")
+
+        assert brand_name == "Tropicana"
+        assert 85 <= score < 100
+
+    def test_word_order_ignored(self):
+        brand_name, _, score = match_brand("Wonderful POM")
+
+        assert (brand_name, score) == ("POM Wonderful", 100)
+
+    def test_unknown_and_blank_brands(self):
+        assert match_brand("Unknown Brand") is None
+        assert match_brand("   ") is None
+        assert match_brand(None) is None
+
+    def test_threshold_applied(self):
+        assert match_brand("Tropicanna", threshold=100) is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Brand index
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestBrandIndex:
+    def test_index_built_once_per_country(self):
+        assert get_brand_index("UK") is get_brand_index("UK")
+
+    def test_keys_lowercased_and_token_sorted(self):
+        brand_index = get_brand_index("UK")
+
+        assert brand_index.match_candidates["co. the turmeric"] == "The Turmeric Co."
+        assert brand_index.exact_matches["pom wonderful"] == "POM Wonderful"
+
+    def test_repeated_inputs_memoized(self):
+        match_brand("Cawston Pres")
+        memo = get_brand_index("UK").best_matches
+
+        assert "cawston pres" in memo
+        memo_size = len(memo)
+        match_brand(" CAWSTON PRES ")
+        assert len(memo) == memo_size
+
+    def test_memo_capped_oldest_dropped_first(self, monkeypatch):
+        brand_index = get_brand_index("UK")
+        monkeypatch.setattr(brand_index, "best_matches", {})
+        monkeypatch.setattr("config.brand_mappings._BEST_MATCHES_MAX_ENTRIES", 2)
+
+        results = match_brands(["Tropicanna", "Innocent", "Cawston Pres"])
+        match_brand("Moju")
+
+        assert [result[0] for result in results] == [
+            "Tropicana", "Innocent", "Cawston Press",
+        ]
+        assert list(brand_index.best_matches) == ["cawston pres", "moju"]
+
+    def test_unsupported_country_uses_uk_mappings(self):
+        assert match_brand("Innocent", country="FR")[0] == "Innocent"
+        assert get_all_brands("FR") == []
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Batched matching
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMatchBrands:
+    def test_batch_matches_single_calls(self):
+        inputs = ["Innocent", "Tropicanna", "", "Nobody Juice", "MOJU", "Tropicanna"]
+
+        assert match_brands(inputs) == [match_brand(brand) for brand in inputs]
@@ -9,10 +9,14 @@ Covers:
   - Internal columns (_unnamed_*, _source_row) silently skipped
   - Confidence scores: 100 for exact/rename, <100 for fuzzy
   - Real column sets from the 11 fixture files
+  - Header-signature memo (process-wide and on disk)
 """
 
+from pathlib import Path
+
 import pytest
 
+from processing import column_mapper
 from processing.column_mapper import (
     ColumnMappingResult,
     map_columns,
@@ -272,3 +276,66 @@ class TestRealisticColumnSets:
         result = map_columns(raw_columns)
         assert len(result.unmapped) == 0
         assert result.mapping["Est. Linear Meters"] == "Est. Linear Meters"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Header-signature memo
+# ═══════════════════════════════════════════════════════════════════════════
+
+_MEMO_HEADER: list[str] = ["Brand", "Segment", "Procesing Method", "Mystery Column"]
+
+
+@pytest.fixture
+def empty_memo(monkeypatch):
+    """Run a test against an empty process-wide memo."""
+    monkeypatch.setattr(column_mapper, "_MAPPING_MEMO", {})
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("mapping cascade should not run")
+
+
+class TestMappingMemo:
+    def test_repeated_header_skips_cascade(self, empty_memo, monkeypatch):
+        first = map_columns(_MEMO_HEADER)
+        monkeypatch.setattr(column_mapper, "_map_header", _fail)
+
+        assert map_columns(_MEMO_HEADER) == first
+
+    def test_column_order_is_part_of_key(self, empty_memo):
+        map_columns(_MEMO_HEADER)
+
+        assert list(map_columns(_MEMO_HEADER[::-1]).mapping) == _MEMO_HEADER[::-1]
+
+    def test_callers_get_independent_copies(self, empty_memo):
+        first = map_columns(_MEMO_HEADER)
+        first.mapping["Brand"] = None
+        first.unmapped.clear()
+
+        second = map_columns(_MEMO_HEADER)
+        assert second.mapping["Brand"] == "Brand"
+        assert second.unmapped == ["Mystery Column"]
+
+    def test_disk_memo_survives_process_memo(self, empty_memo, monkeypatch, tmp_path: Path):
+        first = map_columns(_MEMO_HEADER, memo_dir=tmp_path)
+        monkeypatch.setattr(column_mapper, "_MAPPING_MEMO", {})
+        monkeypatch.setattr(column_mapper, "_map_header", _fail)
+
+        assert map_columns(_MEMO_HEADER, memo_dir=tmp_path) == first
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def test_config_change_invalidates_disk_memo(self, empty_memo, monkeypatch, tmp_path: Path):
+        map_columns(_MEMO_HEADER, memo_dir=tmp_path)
+        monkeypatch.setattr(column_mapper, "_MAPPING_MEMO", {})
+        monkeypatch.setattr(column_mapper, "_MAPPING_CONFIG_HASH", "edited-config")
+
+        map_columns(_MEMO_HEADER, memo_dir=tmp_path)
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_corrupt_disk_entry_is_remapped(self, empty_memo, monkeypatch, tmp_path: Path):
+        first = map_columns(_MEMO_HEADER, memo_dir=tmp_path)
+        for entry_path in tmp_path.glob("*.json"):
+            entry_path.write_text("{not json", encoding="utf-8")
+        monkeypatch.setattr(column_mapper, "_MAPPING_MEMO", {})
+
+        assert map_columns(_MEMO_HEADER, memo_dir=tmp_path) == first
@@ -0,0 +1,116 @@
+"""
+Tests for processing/decision_cache.py
+
+Covers: store/lookup round trip through the result store, decisions from
+overlapping sessions, LRU eviction by last use, the one-time import of
+the old JSON cache file, and the disabled (None) cache.
+"""
+
+import json
+import sqlite3
+
+from processing.decision_cache import lookup_decisions, store_decisions
+from processing.llm_result_store import lookup_results
+
+
+def _decision(value: str) -> dict:
+    return {"column": "Product Type", "original_value": value,
+            "normalized_value": "Other", "reasoning": "test"}
+
+
+def _set_used_at(store, key: str, used_at: float) -> None:
+    """Backdate a decision's store and last-use times."""
+    with sqlite3.connect(store) as connection:
+        connection.execute(
+            "UPDATE results SET updated_at = ? WHERE key = ?", (used_at, key)
+        )
+        connection.execute(
+            "UPDATE last_used SET used_at = ? WHERE key = ?", (used_at, key)
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Persistence
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestPersistence:
+    def test_round_trip(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+
+        assert store_decisions(store, {"k1": _decision("a")})
+
+        assert lookup_decisions(store, ["k1", "k2"], legacy_path=None) == {
+            "k1": _decision("a"),
+        }
+
+    def test_overlapping_sessions_keep_each_others_decisions(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        lookup_decisions(store, ["k1"], legacy_path=None)
+        lookup_decisions(store, ["k2"], legacy_path=None)
+
+        store_decisions(store, {"k1": _decision("a")})
+        store_decisions(store, {"k2": _decision("b")})
+
+        assert lookup_decisions(store, ["k1", "k2"], legacy_path=None) == {
+            "k1": _decision("a"), "k2": _decision("b"),
+        }
+
+    def test_stored_in_own_namespace(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        store_decisions(store, {"k1": _decision("a")})
+
+        assert lookup_results(store, "flavor_clean", ["k1"]) == {}
+
+    def test_none_path_disables_cache(self):
+        assert lookup_decisions(None, ["k1"]) == {}
+        assert not store_decisions(None, {"k1": _decision("a")})
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LRU eviction
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestEviction:
+    def test_least_recently_used_evicted(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        store_decisions(store, {"k1": _decision("a"), "k2": _decision("b")})
+        _set_used_at(store, "k1", 100.0)
+        _set_used_at(store, "k2", 200.0)
+
+        lookup_decisions(store, ["k1"], legacy_path=None)
+        store_decisions(store, {"k3": _decision("c")}, max_entries=2)
+
+        assert set(lookup_decisions(store, ["k1", "k2", "k3"], legacy_path=None)) \
+            == {"k1", "k3"}
+
+    def test_hits_update_last_use_without_rewriting(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        store_decisions(store, {"k1": _decision("a")})
+        _set_used_at(store, "k1", 100.0)
+
+        lookup_decisions(store, ["k1"], legacy_path=None)
+
+        with sqlite3.connect(store) as connection:
+            updated_at, used_at = connection.execute(
+                "SELECT results.updated_at, last_used.used_at FROM results "
+                "JOIN last_used USING (namespace, key) WHERE key = 'k1'"
+            ).fetchone()
+        assert updated_at == 100.0
+        assert used_at > 100.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Legacy JSON cache
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLegacyImport:
+    def test_old_json_cache_imported(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        legacy = tmp_path / "llm_decision_cache.json"
+        legacy.write_text(json.dumps(
+            {"version": 1, "entries": {"k1": _decision("a")}}
+        ), encoding="utf-8")
+
+        assert lookup_decisions(store, ["k1"], legacy_path=legacy) == {
+            "k1": _decision("a"),
+        }
@@ -0,0 +1,190 @@
+"""
+Tests for processing/file_pipeline.py
+
+Covers: single-file processing, unreadable files, parallel vs sequential
+equivalence, result ordering, and deterministic row-offset remapping of flagged items
+and changes logs.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from processing.file_pipeline import (
+    STATUS_OK,
+    STATUS_UNREADABLE,
+    FileJob,
+    FileProcessingResult,
+    apply_row_offsets,
+    process_file,
+    process_file_chunks,
+    process_files,
+)
+from processing.normalizer import FlaggedItem
+from processing.provenance import append_change
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+_EXCHANGE_RATES: dict[str, float] = {"EUR": 1.0, "GBP": 1.17}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _make_job(filename: str, retailer: str = "Tesco", city: str = "London") -> FileJob:
+    """Build a FileJob for a fixture file with UI-style metadata."""
+    return FileJob(
+        file_path=FIXTURES_DIR / filename,
+        metadata={
+            "File": filename,
+            "Country": "United Kingdom",
+            "City": city,
+            "Retailer": retailer,
+            "Store Name": f"{retailer} {city}",
+            "Store Format": "",
+        },
+        cache_dir=None,
+    )
+
+
+_JOBS_FILENAMES: list[str] = [
+    "Lidl_Fulham_Juice_Analysis.xlsx",
+    "Tesco_Oval_LargeShelf_Analysis.xlsx",
+    "Sainsburys_Vauxhall_Small_Shelf_Analysis_Checked.xlsx",
+]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Single file
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestProcessFile:
+    def test_fixture_processed(self):
+        result = process_file(_make_job("Lidl_Fulham_Juice_Analysis.xlsx"), _EXCHANGE_RATES)
+
+        assert result.status == STATUS_OK
+        assert not result.dataframe.empty
+        assert result.dataframe["Retailer"].eq("Tesco").all()
+        assert "Flavor_Clean" in result.dataframe.columns
+        assert result.source_file_info["row_count"] == len(result.dataframe)
+
+    def test_internal_columns_dropped(self):
+        result = process_file(_make_job("Lidl_Fulham_Juice_Analysis.xlsx"), _EXCHANGE_RATES)
+
+        assert not any(c.startswith("_") for c in result.dataframe.columns)
+
+    def test_layout_reported(self):
+        result = process_file(_make_job("Lidl_Fulham_Juice_Analysis.xlsx"), _EXCHANGE_RATES)
+
+        assert result.layout_fingerprint
+        assert result.layout.header_row >= 1
+        assert result.layout.column_names
+
+    def test_missing_file_unreadable(self):
+        result = process_file(_make_job("does_not_exist.xlsx"), _EXCHANGE_RATES)
+
+        assert result.status == STATUS_UNREADABLE
+        assert result.dataframe.empty
+        assert result.errors
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Many files
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestProcessFiles:
+    def test_parallel_matches_sequential(self):
+        jobs = [_make_job(name) for name in _JOBS_FILENAMES]
+
+        sequential = process_files(jobs, _EXCHANGE_RATES, max_workers=1)
+        parallel = process_files(jobs, _EXCHANGE_RATES, max_workers=2)
+
+        assert [r.filename for r in parallel] == _JOBS_FILENAMES
+        for seq_result, par_result in zip(sequential, parallel):
+            pd.testing.assert_frame_equal(seq_result.dataframe, par_result.dataframe)
+            assert seq_result.flagged_items == par_result.flagged_items
+            assert seq_result.changes_log == par_result.changes_log
+
+    def test_progress_callback_called_per_file(self):
+        jobs = [_make_job(name) for name in _JOBS_FILENAMES[:2]]
+        calls: list[tuple[int, int, str]] = []
+
+        process_files(
+            jobs, _EXCHANGE_RATES, max_workers=1,
+            on_file_done=lambda done, total, name: calls.append((done, total, name)),
+        )
+
+        assert [(done, total) for done, total, _ in calls] == [(1, 2), (2, 2)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Chunked processing
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestProcessFileChunks:
+    def test_chunks_match_whole_file(self):
+        job = _make_job("Tesco_Oval_LargeShelf_Analysis.xlsx")
+        whole = process_file(job, _EXCHANGE_RATES)
+
+        chunks = list(process_file_chunks(job, _EXCHANGE_RATES, chunk_rows=20))
+
+        assert len(chunks) > 1
+        assert all(chunk.status == STATUS_OK for chunk in chunks)
+        pd.testing.assert_frame_equal(
+            pd.concat([chunk.dataframe for chunk in chunks]), whole.dataframe
+        )
+        chunk_flags = [item for chunk in chunks for item in chunk.flagged_items]
+        assert sorted(chunk_flags, key=repr) == sorted(whole.flagged_items, key=repr)
+        chunk_changes = [entry for chunk in chunks for entry in chunk.changes_log]
+        assert sorted(chunk_changes, key=repr) == sorted(whole.changes_log, key=repr)
+
+    def test_missing_file_unreadable(self):
+        chunks = list(process_file_chunks(_make_job("does_not_exist.xlsx"), _EXCHANGE_RATES))
+
+        assert [chunk.status for chunk in chunks] == [STATUS_UNREADABLE]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Row offsets
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestApplyRowOffsets:
+    def _result(self, rows: int, flagged_rows: list[int], status: str = STATUS_OK):
+        return FileProcessingResult(
+            filename="f.xlsx",
+            status=status,
+            dataframe=pd.DataFrame({"Brand": ["x"] * rows}),
+            flagged_items=[FlaggedItem(row_index=r, column="Brand", original_value="x")
+                           for r in flagged_rows],
+        )
+
+    def test_offsets_accumulate_in_order(self):
+        results = [self._result(3, [0, 2]), self._result(2, [1]), self._result(4, [0])]
+
+        apply_row_offsets(results)
+
+        assert [i.row_index for i in results[0].flagged_items] == [0, 2]
+        assert [i.row_index for i in results[1].flagged_items] == [4]
+        assert [i.row_index for i in results[2].flagged_items] == [5]
+
+    def test_failed_files_do_not_advance_offset(self):
+        results = [
+            self._result(3, [0]),
+            self._result(5, [], status=STATUS_UNREADABLE),
+            self._result(2, [1]),
+        ]
+
+        apply_row_offsets(results)
+
+        assert results[2].flagged_items[0].row_index == 4
+
+    def test_changes_log_rows_shifted(self):
+        results = [self._result(3, []), self._result(2, [])]
+        for result in results:
+            append_change(result.changes_log, 1, "Brand", "x", "X", "lookup table")
+
+        apply_row_offsets(results)
+
+        assert [entry["row"] for entry in results[0].changes_log] == [1]
+        assert [entry["row"] for entry in results[1].changes_log] == [4]
@@ -10,6 +10,8 @@ Also tests edge cases: context-only rows, annotation rows, extra columns,
 numbers stored as strings, and error handling.
 """
 
+import re
+import zipfile
 from pathlib import Path
 
 import pandas as pd
@@ -18,10 +20,26 @@ import pytest
 from processing.file_reader import (
     FileReadResult,
     SectionMetadata,
+    SheetLayout,
     read_excel_file,
+    read_excel_file_chunks,
     _parse_section_text,
     _is_context_only_row,
+    _find_header_row,
+    _read_header_columns,
+    _scan_merged_ranges,
+    _detect_merged_separators,
+    _layout_fingerprint,
+    _insert_section,
+    _get_section_for_row,
+    _align_row_values,
+    _skip_sparse_row,
+    _skip_context_row,
+    _extract_rows_to_dataframe,
+    _build_column,
+    _build_dataframe,
 )
+from tests.benchmark_file_reader import _COLUMN_NAMES, build_photo_sectioned_rows
 
 # ---------------------------------------------------------------------------
 # Fixture path helper
@@ -236,6 +254,18 @@ class TestSectionedFiles:
         )
         assert has_metadata, "Expected at least one section with parsed metadata"
 
+    @pytest.mark.parametrize("filename, last_row", [
+        # Row 115 carries row formatting only, no cells
+        ("MS_Covent Garden_Small_Shelf_Analysis_Checked.xlsx", 114),
+        # Row 140 holds blank cells, which still count
+        ("Tesco_Covent_Garden_Shelf_Analysis - Checked.xlsx", 140),
+    ])
+    def test_last_section_ends_at_last_row_with_cells(self, filename, last_row):
+        result = read_excel_file(_fixture(filename))
+
+        merged_sections = [s for s in result.sections if s.end_row]
+        assert merged_sections[-1].end_row == last_row
+
     def test_sainsburys_vauxhall_sections(self):
         """Sainsburys_Vauxhall: 3 merged sections."""
         result = read_excel_file(
@@ -503,6 +533,366 @@ class TestIsContextOnlyRow:
         assert _is_context_only_row(row_values, column_names) is False
 
 
+class TestRowClassification:
+    """Tests for the row helpers of the extraction loop."""
+
+    def test_row_values_aligned_to_header(self):
+        assert _align_row_values((None, "a", "b", "c", "d"), 1, 3) == ["a", "b", "c"]
+        assert _align_row_values((None, "a"), 1, 3) == ["a", None, None]
+
+    def test_sparse_row_recorded_but_empty_row_not(self):
+        skipped_rows: list[dict] = []
+
+        assert _skip_sparse_row(5, ["Innocent", None, None], skipped_rows)
+        assert _skip_sparse_row(6, [None, "  ", None], skipped_rows)
+
+        assert [skipped["row"] for skipped in skipped_rows] == [5]
+        assert skipped_rows[0]["values"] == ["Innocent"]
+
+    def test_context_row_becomes_indexed_section(self):
+        column_names = ["Photo File Name", "Shelf Location", "Brand", "Flavor", "Facings"]
+        skipped_rows: list[dict] = []
+        context_sections: list[SectionMetadata] = []
+        section_starts: list[int] = []
+        sections: list[SectionMetadata] = []
+
+        assert _skip_context_row(
+            7, ["photo.jpg", "Chilled Section", None, None, None], column_names,
+            skipped_rows, context_sections, section_starts, sections,
+        )
+        assert not _skip_context_row(
+            8, ["photo.jpg", "Chilled Section", "Innocent", "Orange", 3], column_names,
+            skipped_rows, context_sections, section_starts, sections,
+        )
+
+        assert _get_section_for_row(8, section_starts, sections) is context_sections[0]
+        assert context_sections[0].shelf_location == "Chilled Section"
+        assert skipped_rows == [
+            {"row": 7, "reason": "context-only row (section metadata)"}
+        ]
+
+
+class TestHeaderDetectionFromRowValues:
+    """Tests for header detection over buffered (row_number, values) pairs."""
+
+    HEADER = ("Photo File Name", "Shelf Location", "Segment", "Brand",
+              "Flavor", "Facings")
+
+    def test_offset_header_found(self):
+        """Header starting in column F → row 3, 0-based offset 5."""
+        key_row = ("Key", None, None, None, None)
+        leading_rows = [
+            (1, key_row + (None,) * 6),
+            (2, (None,) * 11),
+            (3, (None,) * 5 + self.HEADER),
+        ]
+        header_row, start_col = _find_header_row(leading_rows, {
+            h.lower() for h in self.HEADER
+        }, merged_rows=set())
+
+        assert (header_row, start_col) == (3, 5)
+
+    def test_merged_rows_skipped(self):
+        """A header-like row that is a merged separator is not the header."""
+        leading_rows = [(1, self.HEADER), (2, self.HEADER)]
+        header_row, _ = _find_header_row(
+            leading_rows, {h.lower() for h in self.HEADER}, merged_rows={1}
+        )
+
+        assert header_row == 2
+
+    def test_no_header_returns_zero(self):
+        """No qualifying row → (0, 0)."""
+        assert _find_header_row([(1, ("a", "b"))], {"brand"}, set()) == (0, 0)
+
+    def test_header_columns_from_offset(self):
+        """Cells before the data start column are dropped; blanks get placeholders."""
+        header_values = ("Key", None, "Brand", None, "Flavor")
+        assert _read_header_columns(header_values, 2) == [
+            "Brand", "_unnamed_0", "Flavor"
+        ]
+
+
+class TestMergedRangePreScan:
+    """Tests for the XML pre-scan that replaces full-mode merged-cell access."""
+
+    def test_ms_covent_garden_merged_ranges(self):
+        """MS_Covent_Garden: 13 full-width merged ranges read from the sheet XML."""
+        merged_ranges = _scan_merged_ranges(
+            _fixture("MS_Covent Garden_Small_Shelf_Analysis_Checked.xlsx"),
+            "SKU Data",
+        )
+
+        assert len(merged_ranges) == 13
+        assert "A1:W1" in {range_.coord for range_ in merged_ranges}
+
+    def test_separators_sorted_with_text_column(self):
+        """Separators come back sorted by row with a 0-based text column."""
+        merged_ranges = _scan_merged_ranges(
+            _fixture("Tesco_Oval_LargeShelf_Analysis.xlsx"), "SKU Data"
+        )
+        separators = _detect_merged_separators(merged_ranges)
+
+        separator_rows = [row for row, _ in separators]
+        assert separator_rows == sorted(separator_rows)
+        assert len(separators) >= 4
+
+    def test_flat_file_has_no_separators(self):
+        """Lidl_Fulham: flat file → no merged separators."""
+        merged_ranges = _scan_merged_ranges(
+            _fixture("Lidl_Fulham_Juice_Analysis.xlsx"), "SKU Data"
+        )
+
+        assert _detect_merged_separators(merged_ranges) == []
+
+
+def _with_dimension(source: Path, target: Path, dimension: str) -> Path:
+    """Copy an .xlsx, rewriting every sheet's <dimension> tag to *dimension*."""
+    with zipfile.ZipFile(source) as archive_in, \
+            zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as archive_out:
+        for item in archive_in.infolist():
+            data = archive_in.read(item.filename)
+            if item.filename.startswith("xl/worksheets/sheet"):
+                data = re.sub(
+                    rb'<dimension ref="[^"]*"',
+                    f'<dimension ref="{dimension}"'.encode(),
+                    data,
+                )
+            archive_out.writestr(item, data)
+    return target
+
+
+class TestStaleDimension:
+    """A wrong <dimension> tag must not bound the read-only row stream."""
+
+    @pytest.mark.parametrize("filename", [
+        "Lidl_Fulham_Juice_Analysis.xlsx",
+        "Tesco_Oval_LargeShelf_Analysis.xlsx",
+    ])
+    def test_undersized_dimension_reads_whole_sheet(self, filename, tmp_path):
+        expected = read_excel_file(_fixture(filename))
+        stale = _with_dimension(_fixture(filename), tmp_path / filename, "A1:Z20")
+
+        result = read_excel_file(stale)
+
+        pd.testing.assert_frame_equal(result.raw_dataframe, expected.raw_dataframe)
+        assert result.column_names == expected.column_names
+        assert result.sections == expected.sections
+
+    def test_last_section_ends_at_last_streamed_row(self, tmp_path):
+        stale = _with_dimension(
+            _fixture("Tesco_Oval_LargeShelf_Analysis.xlsx"),
+            tmp_path / "stale.xlsx",
+            "A1:B2",
+        )
+
+        result = read_excel_file(stale)
+
+        last_section = max(
+            (s for s in result.sections if s.end_row), key=lambda s: s.start_row
+        )
+        assert last_section.end_row == 150
+
+
+class TestSectionIndex:
+    """Bisect index mapping rows to their section."""
+
+    def _index(self, start_rows: list[int]) -> tuple[list[int], list[SectionMetadata]]:
+        section_starts: list[int] = []
+        sections: list[SectionMetadata] = []
+        for start_row in start_rows:
+            _insert_section(
+                SectionMetadata(raw_text=f"s{start_row}", start_row=start_row),
+                section_starts, sections,
+            )
+        return section_starts, sections
+
+    def test_lookup_picks_last_section_starting_at_or_before_row(self):
+        section_starts, sections = self._index([10, 3, 20])
+
+        assert _get_section_for_row(2, section_starts, sections) is None
+        assert _get_section_for_row(3, section_starts, sections).raw_text == "s3"
+        assert _get_section_for_row(19, section_starts, sections).raw_text == "s10"
+        assert _get_section_for_row(500, section_starts, sections).raw_text == "s20"
+
+    def test_newest_section_wins_tie(self):
+        section_starts, sections = self._index([5])
+        later = SectionMetadata(raw_text="later", start_row=5)
+        _insert_section(later, section_starts, sections)
+
+        assert _get_section_for_row(7, section_starts, sections) is later
+
+    def test_thousands_of_photo_sections(self):
+        """Every SKU row inherits the photo of the context row above it."""
+        rows = build_photo_sectioned_rows(3_000, sku_rows_per_photo=2)
+
+        raw_df, _, context_sections = _extract_rows_to_dataframe(
+            rows=iter(rows),
+            column_names=_COLUMN_NAMES,
+            header_row=1,
+            data_start_col=0,
+            separator_index={},
+            sections=[],
+        )
+
+        assert len(context_sections) == 3_000
+        assert len(raw_df) == 6_000
+        assert raw_df["Photo"].iloc[0] == "IMG_00000.jpg"
+        assert raw_df["Photo"].iloc[-1] == "IMG_02999.jpg"
+        assert raw_df["Photo"].nunique() == 3_000
+
+
+class TestChunkedReading:
+    """read_excel_file_chunks() streams the same rows as read_excel_file()."""
+
+    @pytest.mark.parametrize("filename", [
+        "Lidl_Fulham_Juice_Analysis.xlsx",
+        "Tesco_Oval_LargeShelf_Analysis.xlsx",
+        "Sainsburys_Pimlico_Shelf_Analysis (1).xlsx",
+    ])
+    def test_chunks_reassemble_full_read(self, filename):
+        full = read_excel_file(_fixture(filename))
+
+        chunks = list(read_excel_file_chunks(_fixture(filename), chunk_rows=10))
+
+        assert len(chunks) > 1
+        pd.testing.assert_frame_equal(
+            pd.concat([chunk.raw_dataframe for chunk in chunks]), full.raw_dataframe
+        )
+        chunk_sections = sorted(
+            (section for chunk in chunks for section in chunk.sections),
+            key=lambda s: s.start_row,
+        )
+        assert chunk_sections == full.sections
+        assert [row for chunk in chunks for row in chunk.skipped_rows] == full.skipped_rows
+
+    def test_chunks_share_columns_and_continue_index(self):
+        chunks = list(read_excel_file_chunks(
+            _fixture("Tesco_Oval_LargeShelf_Analysis.xlsx"), chunk_rows=25
+        ))
+
+        assert all(len(chunk.raw_dataframe) <= 25 for chunk in chunks)
+        assert len({tuple(chunk.raw_dataframe.columns) for chunk in chunks}) == 1
+        assert chunks[1].raw_dataframe.index[0] == 25
+        assert chunks[-1].total_rows_read == sum(len(c.raw_dataframe) for c in chunks)
+
+    def test_unreadable_file_yields_single_error_result(self):
+        chunks = list(read_excel_file_chunks(Path("tests/fixtures/does_not_exist.xlsx")))
+
+        assert len(chunks) == 1
+        assert chunks[0].errors
+        assert chunks[0].raw_dataframe.empty
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            next(read_excel_file_chunks(_fixture("Lidl_Fulham_Juice_Analysis.xlsx"), chunk_rows=0))
+
+
+class TestColumnarConstruction:
+    """Column-by-column DataFrame building matches pandas' row-dict inference."""
+
+    @pytest.mark.parametrize("values, type_hint", [
+        ([1, 2, 3], "integer"),
+        ([1, None, 3], "integer"),
+        ([1.5, 2, None], "float"),
+        (["3.99", 2.5], "float"),
+        ([None, None], "float"),
+        (["Innocent", None], "text"),
+        ([1, 2], "text"),
+        ([True, 1], "integer"),
+        ([2**70, 1], "integer"),
+    ])
+    def test_column_matches_inference(self, values, type_hint):
+        expected = pd.DataFrame([{"col": value} for value in values])["col"]
+
+        pd.testing.assert_series_equal(
+            _build_column(values, type_hint), expected, check_names=False
+        )
+
+    def test_repeated_header_keeps_last_column(self):
+        column_names = ["Brand", "Notes", "Notes"]
+        column_values = [["A", "B"], ["first", "first"], ["last", "last"]]
+
+        dataframe = _build_dataframe(column_values, [2, 3], column_names)
+
+        expected = pd.DataFrame([
+            dict(zip(column_names, row)) | {"_source_row": source_row}
+            for row, source_row in zip(zip(*column_values), [2, 3])
+        ])
+        pd.testing.assert_frame_equal(dataframe, expected)
+
+    def test_no_rows_gives_empty_frame(self):
+        assert _build_dataframe([[], []], [], ["Brand", "Flavor"]).empty
+
+
+class TestLayoutFingerprint:
+    """Template fingerprints and reuse of known layouts."""
+
+    _HEADER = ("Photo", "Brand", "Flavor", "Facings", "Segment", "Price")
+
+    def test_data_values_do_not_change_fingerprint(self):
+        rows_a = [(1, self._HEADER), (2, ("P1", "Innocent", "Orange", 3, "Juice", 2.5))]
+        rows_b = [(1, self._HEADER), (2, ("P9", "Tropicana", "Apple", 1, "Juice", 3.1))]
+
+        assert _layout_fingerprint(rows_a, []) == _layout_fingerprint(rows_b, [])
+
+    def test_header_position_changes_fingerprint(self):
+        rows_a = [(1, self._HEADER)]
+        rows_b = [(1, (None,) + self._HEADER)]
+
+        assert _layout_fingerprint(rows_a, []) != _layout_fingerprint(rows_b, [])
+
+    def test_known_layout_reused(self):
+        path = _fixture("Tesco_Oval_LargeShelf_Analysis.xlsx")
+        detected = read_excel_file(path)
+        known = {
+            detected.layout_fingerprint: SheetLayout(
+                header_row=detected.header_row_index,
+                data_start_column=detected.data_start_column,
+                column_names=detected.column_names,
+            )
+        }
+
+        reused = read_excel_file(path, known)
+
+        assert not detected.layout_reused
+        assert reused.layout_reused
+        pd.testing.assert_frame_equal(reused.raw_dataframe, detected.raw_dataframe)
+
+    def test_first_section_length_does_not_change_fingerprint(self):
+        """Same template, first separator at row 18 vs. row 7."""
+        vauxhall = read_excel_file(
+            _fixture("Sainsburys_Vauxhall_Small_Shelf_Analysis_Checked.xlsx")
+        )
+        strand_path = _fixture("Tesco_Express_Strand_Analysis_Checked.xlsx")
+        known = {
+            vauxhall.layout_fingerprint: SheetLayout(
+                header_row=vauxhall.header_row_index,
+                data_start_column=vauxhall.data_start_column,
+                column_names=vauxhall.column_names,
+            )
+        }
+
+        strand = read_excel_file(strand_path, known)
+
+        assert strand.layout_fingerprint == vauxhall.layout_fingerprint
+        assert strand.layout_reused
+
+    def test_stale_layout_falls_back_to_detection(self):
+        path = _fixture("Lidl_Fulham_Juice_Analysis.xlsx")
+        detected = read_excel_file(path)
+        stale = SheetLayout(
+            header_row=detected.header_row_index,
+            data_start_column=detected.data_start_column,
+            column_names=detected.column_names + ["Removed Column"],
+        )
+
+        result = read_excel_file(path, {detected.layout_fingerprint: stale})
+
+        assert not result.layout_reused
+        assert result.column_names == detected.column_names
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Error handling
 # ═══════════════════════════════════════════════════════════════════════════
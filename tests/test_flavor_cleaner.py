@@ -0,0 +1,171 @@
+"""
+Tests for processing/flavor_cleaner.py (Layer 1)
+
+Covers: the Layer 1 rule chain on representative values, blank/None
+handling, apply_layer1_to_dataframe() running the rules once per unique
+value and broadcasting the results back to every row, and Layer 2 asking
+the LLM only about values not already in the result store, in shards of
+similar values, keeping every shard that succeeds.
+"""
+
+import json
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from processing import flavor_cleaner
+from processing.flavor_cleaner import (
+    apply_layer1_rules,
+    apply_layer1_to_dataframe,
+    harmonize_flavors_with_llm,
+)
+from processing.llm_result_store import lookup_results
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Layer 1 rules
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLayer1Rules:
+    @pytest.mark.parametrize("raw, expected", [
+        ("  lots   of   space  ", "Lots of Space"),
+        ("oj with bits", "OJ with Bits"),
+        ("Apple and Mango (New)", "Apple & Mango"),
+        ("Orange & Mango 4x250ml", "Orange & Mango"),
+        ("Multi-pack Orange (single)", "Orange"),
+        ("Blood-orange 1.5L", "Blood Orange"),
+        # Passes run in order: the leading "3x" goes before "(7x Shots)" is seen
+        ("3x Shots (7x Shots)", "Shots (Shots)"),
+    ])
+    def test_rule_chain(self, raw, expected):
+        assert apply_layer1_rules(raw) == expected
+
+    def test_value_without_removable_parts_unchanged_apart_from_case(self):
+        assert apply_layer1_rules("strawberry & banana") == "Strawberry & Banana"
+
+    @pytest.mark.parametrize("blank", [None, "", "   "])
+    def test_blank_returned_as_is(self, blank):
+        assert apply_layer1_rules(blank) is blank
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DataFrame application
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLayer1DataFrame:
+    def test_results_broadcast_to_every_row(self):
+        df = pd.DataFrame({
+            "Flavor": ["oj with bits", None, "Apple and Mango", "oj with bits", "  ", np.nan],
+        })
+
+        result = apply_layer1_to_dataframe(df)
+
+        assert result["Flavor_Clean"].tolist()[:4] == [
+            "OJ with Bits", None, "Apple & Mango", "OJ with Bits",
+        ]
+        assert result["Flavor_Clean"].iloc[4] == "  "
+        assert pd.isna(result["Flavor_Clean"].iloc[5])
+        assert result["Flavor_Original"].equals(df["Flavor"])
+        assert not result["Flavor_Needs_Review"].any()
+
+    def test_rules_run_once_per_unique_value(self):
+        flavor_cleaner._apply_layer1_chain.cache_clear()
+        df = pd.DataFrame({"Flavor": ["Mango 250ml", "Apple x4", "Mango 250ml"] * 100})
+
+        apply_layer1_to_dataframe(df)
+        apply_layer1_to_dataframe(df)
+
+        # Two unique values, computed once; the second call is all memo hits
+        info = flavor_cleaner._apply_layer1_chain.cache_info()
+        assert info.misses == 2
+        assert info.hits == 2
+
+    def test_missing_flavor_column(self):
+        result = apply_layer1_to_dataframe(pd.DataFrame({"Brand": ["X"]}))
+
+        assert result["Flavor_Clean"].isna().all()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Layer 2 result store
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLayer2Store:
+    def test_only_new_values_sent_and_stored(self, tmp_path, monkeypatch):
+        store = tmp_path / "llm_results.sqlite3"
+        legacy = tmp_path / "flavor_clean_cache.json"
+        legacy.write_text(json.dumps({"Oj": "Orange"}), encoding="utf-8")
+        call_llm = MagicMock(return_value={"Aple": "Apple", "Mystery": "[NEEDS_FLAVOR]"})
+        monkeypatch.setattr(flavor_cleaner, "_call_llm_for_harmonization", call_llm)
+        df = pd.DataFrame({"Flavor_Clean": ["Oj", "Aple", "Mystery", "Oj"]})
+
+        result = harmonize_flavors_with_llm(df, "sk-test", store, legacy)
+
+        assert call_llm.call_args.args[0] == ["Aple", "Mystery"]
+        assert result["Flavor_Clean"].tolist() == ["Orange", "Apple", None, "Orange"]
+        assert result["Flavor_Needs_Review"].eq(True).tolist() == [False, False, True, False]
+        assert lookup_results(store, "flavor_clean", ["Oj", "Aple"]) == {
+            "Oj": "Orange", "Aple": "Apple",
+        }
+
+        # A later session finds everything in the store
+        call_llm.reset_mock()
+        harmonize_flavors_with_llm(df, "sk-test", store, legacy)
+        call_llm.assert_not_called()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Layer 2 sharding
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLayer2Sharding:
+    def test_values_grouped_by_first_word(self, monkeypatch):
+        monkeypatch.setattr(flavor_cleaner, "_SHARD_MAX_VALUES", 3)
+        values = ["Orange with Bits", "Mango", "orange smooth", "Apple & Mango", "Orange"]
+
+        shards = flavor_cleaner._shard_values(values)
+
+        assert shards == [
+            ["Apple & Mango", "Mango"],
+            ["Orange", "orange smooth", "Orange with Bits"],
+        ]
+
+    def test_shards_respect_bounds_and_keep_every_value(self, monkeypatch):
+        monkeypatch.setattr(flavor_cleaner, "_SHARD_MAX_VALUES", 4)
+        monkeypatch.setattr(flavor_cleaner, "_SHARD_MAX_CHARS", 40)
+        values = [f"Orange {i}" for i in range(9)] + ["Kiwi", "Lime & Mint"]
+
+        shards = flavor_cleaner._shard_values(values)
+
+        assert sorted(v for shard in shards for v in shard) == sorted(values)
+        for shard in shards:
+            assert len(shard) <= 4
+            assert sum(len(v) for v in shard) <= 40
+
+    def test_failed_shard_does_not_lose_the_others(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(flavor_cleaner, "_SHARD_MAX_VALUES", 2)
+        store = tmp_path / "llm_results.sqlite3"
+        # All three shards must be in flight at once to get past the barrier
+        all_in_flight = threading.Barrier(3, timeout=5)
+
+        def fake_call(values, api_key):
+            all_in_flight.wait()
+            if "Broken" in values:
+                return None
+            return {v: f"{v} Clean" for v in values}
+
+        monkeypatch.setattr(flavor_cleaner, "_call_llm_for_harmonization", fake_call)
+        df = pd.DataFrame({"Flavor_Clean": ["Apple", "Apple Mix", "Broken", "Kiwi", "Lime"]})
+
+        result = harmonize_flavors_with_llm(df, "sk-test", store, legacy_cache_path=None)
+
+        # Shards: [Apple, Apple Mix], [Broken, Kiwi], [Lime]
+        assert result["Flavor_Clean"].tolist() == [
+            "Apple Clean", "Apple Mix Clean", "Broken", "Kiwi", "Lime Clean",
+        ]
+        assert lookup_results(store, "flavor_clean", ["Apple", "Broken", "Lime"]) == {
+            "Apple": "Apple Clean", "Lime": "Lime Clean",
+        }
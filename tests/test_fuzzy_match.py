@@ -0,0 +1,69 @@
+"""
+Tests for utils/fuzzy_match.py
+
+Covers: single and batched best-match lookups, thefuzz-compatible string
+processing and integer scores, tie-breaking, and raw (unprocessed) scoring.
+"""
+
+from utils.fuzzy_match import best_match, best_matches
+
+_CITIES: dict[str, str] = {
+    "covent garden": "Covent Garden",
+    "fulham": "Fulham",
+    "oval": "Oval",
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# best_match
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestBestMatch:
+    def test_exact_match_scores_100(self):
+        assert best_match("Fulham", _CITIES) == ("Fulham", 100)
+
+    def test_word_order_and_punctuation_ignored(self):
+        assert best_match("Garden, Covent!", _CITIES) == ("Covent Garden", 100)
+
+    def test_typo_scores_integer_below_100(self):
+        city, score = best_match("Fulhem", _CITIES)
+
+        assert city == "Fulham"
+        assert isinstance(score, int)
+        assert 80 <= score < 100
+
+    def test_below_threshold_returns_none(self):
+        assert best_match("Manchester", _CITIES) == (None, 0)
+
+    def test_empty_inputs(self):
+        assert best_match("", _CITIES) == (None, 0)
+        assert best_match("Fulham", {}) == (None, 0)
+
+    def test_first_candidate_wins_ties(self):
+        candidates = {"shelf analysis": "First", "analysis shelf": "Second"}
+
+        assert best_match("Analysis Shelf", candidates) == ("First", 100)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# best_matches
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestBestMatches:
+    def test_batch_matches_single_lookups(self):
+        values = ["Fulhem", "oval", "", "Manchester", "covent  garden", "Fulhem"]
+
+        assert best_matches(values, _CITIES) == [best_match(v, _CITIES) for v in values]
+
+    def test_raw_scoring_keeps_float_scores(self):
+        [(city, score)] = best_matches(["fulhem"], _CITIES, full_process=False)
+
+        assert city == "Fulham"
+        assert isinstance(score, float)
+
+    def test_raw_scoring_keeps_punctuation(self):
+        processed = best_matches(["oval!!"], _CITIES, threshold=0)[0][1]
+        raw = best_matches(["oval!!"], _CITIES, threshold=0, full_process=False)[0][1]
+
+        assert processed == 100
+        assert raw < 100
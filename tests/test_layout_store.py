@@ -0,0 +1,109 @@
+"""
+Tests for processing/layout_store.py
+
+Covers: hit/miss counting, layout replacement on a changed template,
+hit-rate reporting, the round trip through the result store (including an
+unreadable store), and adding to records saved by other sessions.
+"""
+
+from pathlib import Path
+
+from processing.file_reader import SheetLayout
+from processing.layout_store import (
+    LayoutStore,
+    layout_hit_rate,
+    load_layout_store,
+    record_layout,
+    save_layout_store,
+)
+
+_LAYOUT = SheetLayout(header_row=2, data_start_column=6, column_names=["Photo", "Brand"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Recording
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestRecordLayout:
+    def test_first_sighting_is_miss_then_hit(self):
+        store = LayoutStore()
+
+        assert record_layout(store, "abc", _LAYOUT) is False
+        assert record_layout(store, "abc", _LAYOUT) is True
+        assert store.files_seen == {"abc": 2}
+        assert (store.hits, store.misses) == (1, 1)
+
+    def test_changed_layout_is_miss_and_replaced(self):
+        store = LayoutStore()
+        record_layout(store, "abc", _LAYOUT)
+        changed = SheetLayout(header_row=2, data_start_column=6, column_names=["Photo"])
+
+        assert record_layout(store, "abc", changed) is False
+        assert store.layouts["abc"] == changed
+
+    def test_hit_rate(self):
+        store = LayoutStore()
+        assert layout_hit_rate(store) == 0.0
+
+        for _ in range(4):
+            record_layout(store, "abc", _LAYOUT)
+
+        assert layout_hit_rate(store) == 0.75
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Persistence
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestPersistence:
+    def test_round_trip(self, tmp_path: Path):
+        path = tmp_path / "results.sqlite3"
+        store = LayoutStore()
+        record_layout(store, "abc", _LAYOUT)
+        record_layout(store, "abc", _LAYOUT)
+
+        assert save_layout_store(store, path)
+        loaded = load_layout_store(path)
+
+        assert loaded.layouts == {"abc": _LAYOUT}
+        assert loaded.files_seen == {"abc": 2}
+        assert (loaded.hits, loaded.misses) == (1, 1)
+        # Per-run counters start fresh
+        assert (loaded.session_hits, loaded.session_misses) == (0, 0)
+        assert layout_hit_rate(loaded, session_only=True) == 0.0
+
+    def test_missing_or_corrupt_file_gives_empty_store(self, tmp_path: Path):
+        corrupt = tmp_path / "results.sqlite3"
+        corrupt.write_text("{not json", encoding="utf-8")
+
+        assert load_layout_store(tmp_path / "missing.json").layouts == {}
+        assert load_layout_store(corrupt).layouts == {}
+
+    def test_overlapping_sessions_keep_each_others_records(self, tmp_path: Path):
+        path = tmp_path / "results.sqlite3"
+        other = SheetLayout(header_row=1, data_start_column=0, column_names=["Brand"])
+        first_session = load_layout_store(path)
+        second_session = load_layout_store(path)
+        record_layout(first_session, "abc", _LAYOUT)
+        record_layout(first_session, "abc", _LAYOUT)
+        record_layout(second_session, "def", other)
+
+        assert save_layout_store(first_session, path)
+        assert save_layout_store(second_session, path)
+        loaded = load_layout_store(path)
+
+        assert loaded.layouts == {"abc": _LAYOUT, "def": other}
+        assert loaded.files_seen == {"abc": 2, "def": 1}
+        assert (loaded.hits, loaded.misses) == (1, 2)
+        assert second_session.layouts == loaded.layouts
+
+    def test_repeated_save_does_not_double_count(self, tmp_path: Path):
+        path = tmp_path / "results.sqlite3"
+        store = LayoutStore()
+        record_layout(store, "abc", _LAYOUT)
+
+        save_layout_store(store, path)
+        save_layout_store(store, path)
+
+        assert load_layout_store(path).files_seen == {"abc": 1}
+        assert (store.session_hits, store.session_misses) == (0, 1)
@@ -0,0 +1,160 @@
+"""
+Tests for utils/llm_cassette.py
+
+Covers: record then replay through complete(), missing recordings,
+replay latency scaling, keeping earlier recordings, restoring the
+transport, and a full clean_with_llm() run replayed offline.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from processing.llm_cleaner import clean_with_llm
+from processing.normalizer import FlaggedItem
+from tests.fake_llm_api import FakeSonnetAPI
+from utils import llm_cassette, llm_client
+from utils.llm_cassette import (
+    MODE_RECORD,
+    MODE_REPLAY,
+    CassetteMissError,
+    use_cassette,
+)
+from utils.llm_client import TokenUsage, complete
+from utils.rate_limit import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def offline_client(monkeypatch):
+    """No real clients, no rate-limit pacing, no backoff sleeps."""
+    monkeypatch.setattr(llm_client, "_get_client", MagicMock())
+    monkeypatch.setattr(llm_client, "_RATE_LIMITER", TokenBucket(rate=1000.0, capacity=100))
+    monkeypatch.setattr(llm_client.time, "sleep", MagicMock())
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    return tmp_path / "cassettes" / "llm.json"
+
+
+def _live_transport(text: str = "[]"):
+    """A _send_request replacement that answers every request with *text*."""
+    usage = TokenUsage(uncached_input_tokens=10, output_tokens=4)
+    return MagicMock(return_value=(text, usage, "end_turn"))
+
+
+def _record(cassette_path, prompts: list[str], text: str = "[]") -> MagicMock:
+    send = _live_transport(text)
+    with patch("utils.llm_client._send_request", new=send):
+        with use_cassette(cassette_path, mode=MODE_RECORD):
+            for prompt in prompts:
+                complete(prompt, "sk-test", max_tokens=100, caller="test", static_prefix="rules")
+    return send
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Record and replay
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestRecordReplay:
+    def test_replay_returns_recorded_response_without_api(self, cassette_path):
+        _record(cassette_path, ["prompt"], text='[{"row_index": 0}]')
+
+        send = _live_transport()
+        with patch("utils.llm_client._send_request", new=send):
+            with use_cassette(cassette_path, latency_scale=0) as cassette:
+                response = complete(
+                    "prompt", "sk-test", max_tokens=100, caller="test", static_prefix="rules",
+                )
+
+        send.assert_not_called()
+        assert response.text == '[{"row_index": 0}]'
+        assert (response.input_tokens, response.output_tokens) == (10, 4)
+        assert cassette.hits == 1
+
+    def test_unrecorded_request_fails_without_retry(self, cassette_path):
+        _record(cassette_path, ["prompt"])
+
+        with use_cassette(cassette_path, latency_scale=0) as cassette:
+            with pytest.raises(CassetteMissError):
+                complete("other prompt", "sk-test", max_tokens=100, caller="test")
+
+        assert cassette.misses == 1
+
+    def test_replay_streams_recorded_text(self, cassette_path):
+        _record(cassette_path, ["prompt"], text="[]")
+        fragments = []
+
+        with use_cassette(cassette_path, latency_scale=0):
+            complete(
+                "prompt", "sk-test", max_tokens=100, caller="test", static_prefix="rules",
+                on_text=fragments.append,
+            )
+
+        assert "".join(fragments) == "[]"
+
+    def test_replay_waits_scaled_recorded_latency(self, cassette_path, monkeypatch):
+        _record(cassette_path, ["prompt"])
+        recorded = llm_cassette._load_interactions(cassette_path)
+        for interaction in recorded.values():
+            interaction["latency_seconds"] = 2.0
+        llm_cassette._save_interactions(recorded, cassette_path)
+        sleep = MagicMock()
+        monkeypatch.setattr(llm_cassette.time, "sleep", sleep)
+
+        with use_cassette(cassette_path, mode=MODE_REPLAY, latency_scale=0.5):
+            complete("prompt", "sk-test", max_tokens=100, caller="test", static_prefix="rules")
+
+        sleep.assert_called_once_with(1.0)
+
+    def test_recording_keeps_earlier_entries(self, cassette_path):
+        _record(cassette_path, ["first"])
+        _record(cassette_path, ["second"])
+
+        with use_cassette(cassette_path, latency_scale=0) as cassette:
+            for prompt in ["first", "second"]:
+                complete(prompt, "sk-test", max_tokens=100, caller="test", static_prefix="rules")
+
+        assert cassette.hits == 2
+
+    def test_transport_restored_after_block(self, cassette_path):
+        with use_cassette(cassette_path, mode=MODE_RECORD):
+            assert llm_client._TRANSPORT_OVERRIDE is not None
+
+        assert llm_client._TRANSPORT_OVERRIDE is None
+        assert not cassette_path.exists()  # nothing recorded, nothing written
+
+    def test_unknown_mode_rejected(self, cassette_path):
+        with pytest.raises(ValueError):
+            with use_cassette(cassette_path, mode="rewind"):
+                pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Pipeline replay
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestCleaningReplay:
+    def test_clean_with_llm_replays_offline(self, cassette_path):
+        dataframe = pd.DataFrame({"Product Type": [f"Drink {i}" for i in range(40)]})
+        flagged = [
+            FlaggedItem(row_index=i, column="Product Type", original_value=f"Drink {i}",
+                        context={"Brand": f"Brand {i}"})
+            for i in range(40)
+        ]
+
+        fake = FakeSonnetAPI(normalized_value="Smoothies")
+        with patch("utils.llm_client._send_request", new=fake.send_request):
+            with use_cassette(cassette_path, mode=MODE_RECORD):
+                recorded = clean_with_llm(dataframe, flagged, api_key="sk-test", cache_path=None)
+
+        offline = MagicMock(side_effect=AssertionError("API called during replay"))
+        with patch("utils.llm_client._send_request", new=offline):
+            with use_cassette(cassette_path, latency_scale=0) as cassette:
+                replayed = clean_with_llm(dataframe, flagged, api_key="sk-test", cache_path=None)
+
+        assert cassette.misses == 0
+        assert cassette.hits == len(fake.calls)
+        assert replayed.resolved_items == recorded.resolved_items
+        assert replayed.dataframe.equals(recorded.dataframe)
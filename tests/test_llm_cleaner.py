@@ -1,8 +1,10 @@
 """
 Tests for processing/llm_cleaner.py
 
-Covers: prompt building, response parsing, VALID_VALUES validation,
-no-API-key skip, empty flagged list, and mocked API calls.
+Covers: prompt building, response parsing (whole and streamed),
+VALID_VALUES validation, no-API-key skip, empty flagged list,
+deduplication of flagged items, mocked API calls, concurrent dispatch against an offline fake API, and the
+persistent decision cache.
 """
 
 import json
@@ -11,15 +13,33 @@ from unittest.mock import MagicMock, patch
 import pandas as pd
 import pytest
 
+from processing import llm_cleaner
 from processing.llm_cleaner import (
+    LLM_CHANGE_METHOD,
+    _DEFAULT_OUTPUT_OVERHEAD_TOKENS,
+    _MAX_OUTPUT_OVERHEAD_TOKENS,
+    _MAX_OUTPUT_TOKENS,
+    _PROMPT_PREFIX,
     LLMCleaningResult,
     clean_with_llm,
     _build_prompt,
     _parse_llm_response,
     _validate_and_apply,
     _create_batches,
+    _decision_cache_key,
+    _estimate_output_tokens,
+    _learn_from_truncation,
+    _learn_output_sizes,
+    _dedupe_flagged_items,
+    _fan_out_decisions,
+    _DecisionStreamParser,
+    _unanswered_items,
 )
+from config.llm_config import MAX_ATTEMPTS
 from processing.normalizer import FlaggedItem
+from tests.fake_llm_api import FakeSonnetAPI
+from utils.llm_client import LLMResponse
+from utils.rate_limit import TokenBucket
 
 
 # ---------------------------------------------------------------------------
@@ -42,6 +62,48 @@ def _make_flagged_item(
     )
 
 
+def _api_response(
+    text: str, cost: float, input_tokens: int, output_tokens: int,
+) -> LLMResponse:
+    return LLMResponse(
+        text=text,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost_usd=cost,
+        latency_seconds=0.0,
+        attempts=1,
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_decision_cache(tmp_path, monkeypatch):
+    """Run in a temp dir so the default decision cache starts empty."""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def fresh_output_estimates(monkeypatch):
+    """Start every test without learned output sizes."""
+    monkeypatch.setattr("processing.llm_cleaner._OUTPUT_OVERHEAD_BY_COLUMN", {})
+
+
+@pytest.fixture(autouse=True)
+def fast_rate_limiter(monkeypatch):
+    """Keep the shared API rate limiter from pacing the tests."""
+    monkeypatch.setattr(
+        "utils.llm_client._RATE_LIMITER", TokenBucket(rate=1000.0, capacity=100)
+    )
+
+
+def _make_distinct_flagged(count: int) -> tuple[pd.DataFrame, list[FlaggedItem]]:
+    """*count* rows, each with its own flagged Product Type value."""
+    df = pd.DataFrame({"Product Type": [f"Drink {i}" for i in range(count)]})
+    flagged = [
+        _make_flagged_item(row_index=i, original_value=f"Drink {i}") for i in range(count)
+    ]
+    return df, flagged
+
+
 def _make_df_for_llm() -> pd.DataFrame:
     return pd.DataFrame({
         "Product Type": ["Health Juice", "Weird Drink"],
@@ -104,9 +166,8 @@ class TestBuildPrompt:
         assert "Tropicana" in prompt
         assert "100% organic" in prompt
 
-    def test_prompt_contains_valid_values(self):
-        flagged = [_make_flagged_item()]
-        prompt = _build_prompt(flagged)
+    def test_prefix_contains_valid_values(self):
+        prompt = _PROMPT_PREFIX
         assert "Pure Juices" in prompt
         assert "Smoothies" in prompt
         assert "Chilled Section" in prompt
@@ -123,6 +184,30 @@ class TestBuildPrompt:
         assert "column" in prompt
         assert "original_value" in prompt
 
+    def test_batch_prompt_leaves_instructions_to_prefix(self):
+        prompt = _build_prompt([_make_flagged_item()])
+
+        assert prompt.startswith("ITEMS TO RESOLVE:")
+        assert "MASTER SCHEMA VALID VALUES" not in prompt
+        assert "Health Juice" not in _PROMPT_PREFIX
+
+    def test_prefix_cached_across_batches(self):
+        df, flagged = _make_distinct_flagged(30)
+        fake = FakeSonnetAPI()
+
+        with (
+            patch("processing.llm_cleaner._create_batches",
+                  new=lambda items: [items[:10], items[10:20], items[20:]]),
+            patch("processing.llm_cleaner._MAX_CONCURRENT_BATCHES", new=1),
+            patch("utils.llm_client._get_client"),
+            patch("utils.llm_client._send_request", new=fake.send_request),
+        ):
+            result = clean_with_llm(df, flagged, api_key="sk-test", cache_path=None)
+
+        prefix_tokens = len(_PROMPT_PREFIX) // 4
+        assert result.cached_input_tokens == 2 * prefix_tokens
+        assert result.input_tokens > result.cached_input_tokens
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Response parsing
@@ -169,6 +254,51 @@ class TestParseResponse:
         assert len(result) == 1
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Streamed response parsing
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestDecisionStreamParser:
+    _RESPONSE = (
+        'Here you go:\n```json\n[\n'
+        '  {"row_index": 0, "column": "Flavor", "reasoning": "a } inside"},\n'
+        '  {"row_index": 1, "column": "Flavor", "reasoning": "b"}\n'
+        ']\n```'
+    )
+
+    def test_decodes_each_decision_as_it_completes(self):
+        parser = _DecisionStreamParser()
+        counts = []
+        for char in self._RESPONSE:
+            parser.feed(char)
+            counts.append(len(parser.decisions))
+
+        assert [d["row_index"] for d in parser.decisions] == [0, 1]
+        assert parser.complete
+        # The first decision was available before the second one arrived
+        assert counts.index(1) < self._RESPONSE.index('"row_index": 1')
+
+    def test_truncated_response_keeps_complete_decisions(self):
+        parser = _DecisionStreamParser()
+        parser.feed(self._RESPONSE[: self._RESPONSE.index('"row_index": 1') + 5])
+
+        assert [d["row_index"] for d in parser.decisions] == [0]
+        assert not parser.complete
+
+    def test_malformed_decision_stops_parsing(self):
+        parser = _DecisionStreamParser()
+        parser.feed('[{"row_index": 0}, {"row_index": 1,, }, {"row_index": 2}]')
+
+        assert parser.decisions == [{"row_index": 0}]
+        assert not parser.complete
+
+    def test_incomplete_batch_resubmits_only_unanswered_items(self):
+        items = [_make_flagged_item(row_index=i) for i in range(3)]
+        decisions = [{"row_index": 1, "column": "Product Type"}, "not a decision"]
+
+        assert [item.row_index for item in _unanswered_items(items, decisions)] == [0, 2]
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Validation and apply
 # ═══════════════════════════════════════════════════════════════════════════
@@ -273,6 +403,88 @@ class TestBatching:
         assert len(batches[0]) == 2
         assert len(batches[2]) == 1
 
+    def test_empty_list_gives_no_batches(self):
+        assert _create_batches([]) == []
+
+    def test_output_budget_closes_batches(self):
+        items = [_make_flagged_item(row_index=i) for i in range(10)]
+        per_item = _estimate_output_tokens(items[0])
+
+        batches = _create_batches(items, output_token_budget=per_item * 4)
+
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+
+    def test_long_values_get_smaller_batches(self):
+        short = [_make_flagged_item(row_index=i, original_value="x") for i in range(100)]
+        long = [_make_flagged_item(row_index=i, original_value="x" * 2000) for i in range(100)]
+
+        assert len(_create_batches(long)) > len(_create_batches(short))
+
+    def test_oversized_item_gets_own_batch(self):
+        items = [_make_flagged_item(row_index=i) for i in range(3)]
+
+        batches = _create_batches(items, output_token_budget=1)
+
+        assert [len(batch) for batch in batches] == [1, 1, 1]
+
+    def test_learns_column_output_size(self):
+        item = _make_flagged_item()
+        before = _estimate_output_tokens(item)
+        decisions = [{"row_index": 0, "column": "Product Type", "original_value": "x",
+                      "normalized_value": "Other", "reasoning": "ok"}]
+
+        _learn_output_sizes(decisions, output_tokens=1000)
+
+        assert _estimate_output_tokens(item) > before
+        assert _estimate_output_tokens(_make_flagged_item(column="Need State")) == before
+
+    def test_truncation_raises_estimates_at_most_twofold(self):
+        batch = [_make_flagged_item(row_index=i) for i in range(10)]
+        before = _estimate_output_tokens(batch[0])
+
+        _learn_from_truncation(batch)
+
+        assert before < _estimate_output_tokens(batch[0]) <= before * 2
+
+    def test_truncation_scales_columns_by_share_of_estimate(self):
+        batch = [_make_flagged_item(row_index=i, column="Flavor") for i in range(9)]
+        batch.append(_make_flagged_item(row_index=9))
+
+        _learn_from_truncation(batch)
+
+        learned = llm_cleaner._OUTPUT_OVERHEAD_BY_COLUMN
+        flavor_scale = learned["Flavor"] / _DEFAULT_OUTPUT_OVERHEAD_TOKENS
+        type_scale = learned["Product Type"] / _DEFAULT_OUTPUT_OVERHEAD_TOKENS
+        assert 1.0 < type_scale < flavor_scale <= 2.0
+
+    def test_learned_overhead_is_bounded(self):
+        batch = [_make_flagged_item(row_index=0, original_value="x" * 5000)]
+        decisions = [{"row_index": 0, "column": "Product Type", "original_value": "x",
+                      "normalized_value": "Other", "reasoning": "ok"}]
+
+        for _ in range(50):
+            _learn_from_truncation(batch)
+            _learn_output_sizes(decisions, output_tokens=_MAX_OUTPUT_TOKENS)
+
+        assert llm_cleaner._OUTPUT_OVERHEAD_BY_COLUMN["Product Type"] \
+            == _MAX_OUTPUT_OVERHEAD_TOKENS
+
+    def test_learned_sizes_prevent_repeat_truncation(self):
+        df = pd.DataFrame({"Flavor": [f"Flavor {i}" for i in range(120)]})
+        flagged = [
+            _make_flagged_item(row_index=i, column="Flavor", original_value=f"Flavor {i}")
+            for i in range(120)
+        ]
+        runs = []
+        for _ in range(2):
+            fake = FakeSonnetAPI(reasoning="x" * 2000, max_output_tokens=_MAX_OUTPUT_TOKENS)
+            with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+                clean_with_llm(df, flagged, api_key="sk-test", cache_path=None)
+            runs.append(fake)
+
+        assert runs[0].truncated_calls > 0
+        assert runs[1].truncated_calls == 0
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Integration with mocked API
@@ -288,7 +500,7 @@ class TestMockedAPICall:
             "normalized_value": "Other",
             "reasoning": "Not a standard category.",
         }])
-        mock_api.return_value = (mock_response, 0.005, 100, 50)
+        mock_api.return_value = _api_response(mock_response, 0.005, 100, 50)
 
         df = _make_df_for_llm()
         flagged = [_make_flagged_item(row_index=0)]
@@ -317,7 +529,7 @@ class TestMockedAPICall:
                 "reasoning": "guess",
             },
         ])
-        mock_api.return_value = (mock_response, 0.005, 100, 50)
+        mock_api.return_value = _api_response(mock_response, 0.005, 100, 50)
 
         df = _make_df_for_llm()
         flagged = [
@@ -334,6 +546,46 @@ class TestMockedAPICall:
         # Row 1 Shelf Location unchanged because "The Fridge" was rejected
         assert result.dataframe.at[1, "Shelf Location"] == "Back aisle"
 
+    @patch("processing.llm_cleaner._call_sonnet_api")
+    def test_applied_decisions_logged(self, mock_api):
+        mock_response = json.dumps([
+            {
+                "row_index": 0,
+                "column": "Product Type",
+                "original_value": "echoed wrongly",
+                "normalized_value": "Other",
+                "reasoning": "ok",
+            },
+            {
+                "row_index": 1,
+                "column": "Shelf Location",
+                "original_value": "Front chiller",
+                "normalized_value": "The Fridge",  # invalid
+                "reasoning": "guess",
+            },
+        ])
+        mock_api.return_value = _api_response(mock_response, 0.005, 100, 50)
+
+        df = _make_df_for_llm()
+        flagged = [
+            _make_flagged_item(row_index=0),
+            _make_flagged_item(row_index=1, column="Shelf Location",
+                               original_value="Front chiller"),
+        ]
+
+        result = clean_with_llm(df, flagged, api_key="sk-test")
+
+        assert [
+            {key: entry[key] for key in ("row", "column", "original", "normalized", "method")}
+            for entry in result.changes_log
+        ] == [{
+            "row": 0,
+            "column": "Product Type",
+            "original": flagged[0].original_value,
+            "normalized": "Other",
+            "method": LLM_CHANGE_METHOD,
+        }]
+
     @patch("processing.llm_cleaner._call_sonnet_api")
     def test_result_tracks_batch_counts(self, mock_api):
         """LLMCleaningResult includes total_batches and failed_batches."""
@@ -344,7 +596,7 @@ class TestMockedAPICall:
             "normalized_value": "Other",
             "reasoning": "ok",
         }])
-        mock_api.return_value = (mock_response, 0.005, 100, 50)
+        mock_api.return_value = _api_response(mock_response, 0.005, 100, 50)
 
         df = _make_df_for_llm()
         flagged = [_make_flagged_item(row_index=0)]
@@ -355,6 +607,67 @@ class TestMockedAPICall:
         assert result.failed_batches == 0
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Deduplication of flagged items
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestDeduplication:
+    def test_same_signature_sent_once(self):
+        flagged = [
+            _make_flagged_item(row_index=0, original_value="Health Juice"),
+            _make_flagged_item(row_index=5, original_value="  health   JUICE"),
+            _make_flagged_item(row_index=7, original_value="Weird Drink"),
+        ]
+
+        unique_items, members_by_cell = _dedupe_flagged_items(flagged)
+
+        assert unique_items == [flagged[0], flagged[2]]
+        assert members_by_cell[(0, "Product Type")] == flagged[:2]
+
+    def test_context_and_column_part_of_signature(self):
+        flagged = [
+            _make_flagged_item(row_index=0),
+            _make_flagged_item(row_index=1, context={"Brand": "Innocent"}),
+            _make_flagged_item(row_index=2, column="Need State"),
+        ]
+
+        unique_items, _ = _dedupe_flagged_items(flagged)
+
+        assert unique_items == flagged
+
+    def test_unknown_decisions_passed_through(self):
+        _, members_by_cell = _dedupe_flagged_items([_make_flagged_item(row_index=0)])
+        decisions = [{"row_index": [0], "column": "Product Type"},
+                     {"row_index": 3, "column": "Product Type"}]
+
+        assert _fan_out_decisions(decisions, members_by_cell) == decisions
+
+    @patch("processing.llm_cleaner._call_sonnet_api")
+    def test_decision_fanned_out_to_every_row(self, mock_api):
+        mock_api.return_value = _api_response(json.dumps([{
+            "row_index": 0,
+            "column": "Product Type",
+            "original_value": "Health Juice",
+            "normalized_value": "Other",
+            "reasoning": "ok",
+        }]), 0.005, 100, 50)
+        df = _make_df_for_llm()
+        flagged = [
+            _make_flagged_item(row_index=0, original_value="Health Juice"),
+            _make_flagged_item(row_index=1, original_value="health juice"),
+        ]
+
+        result = clean_with_llm(df, flagged, api_key="sk-test")
+
+        prompt = mock_api.call_args[0][0]
+        assert '"row_index": 1' not in prompt
+        assert result.dataframe["Product Type"].tolist() == ["Other", "Other"]
+        assert [item["row_index"] for item in result.resolved_items] == [0, 1]
+        assert result.resolved_items[1]["original_value"] == "health juice"
+        assert (result.flagged_count, result.unique_count) == (2, 1)
+        assert result.reduction_ratio == 2.0
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Truncation detection in parsing
 # ═══════════════════════════════════════════════════════════════════════════
@@ -402,8 +715,10 @@ class TestRetryWithSplit:
             "Claims": [""] * 20,
             "Notes": [None] * 20,
         })
+        # Distinct values, so deduplication leaves all 20 items in the batch
         flagged = [
-            _make_flagged_item(row_index=i) for i in range(20)
+            _make_flagged_item(row_index=i, original_value=f"Unknown {i}")
+            for i in range(20)
         ]
 
         # First call returns truncated response; retries return valid JSON
@@ -422,9 +737,9 @@ class TestRetryWithSplit:
         valid_second_half = json.dumps(valid_items[:10])
 
         mock_api.side_effect = [
-            (truncated_response, 0.01, 200, 100),   # first call: truncated
-            (valid_first_half, 0.005, 100, 50),      # retry first half
-            (valid_second_half, 0.005, 100, 50),     # retry second half
+            _api_response(truncated_response, 0.01, 200, 100),  # first call: truncated
+            _api_response(valid_first_half, 0.005, 100, 50),    # retry first half
+            _api_response(valid_second_half, 0.005, 100, 50),   # retry second half
         ]
 
         result = clean_with_llm(df, flagged, api_key="sk-test")
@@ -446,7 +761,7 @@ class TestRetryWithSplit:
         flagged = [_make_flagged_item(row_index=i) for i in range(5)]
 
         truncated_response = '[{"truncated'
-        mock_api.return_value = (truncated_response, 0.01, 200, 100)
+        mock_api.return_value = _api_response(truncated_response, 0.01, 200, 100)
 
         result = clean_with_llm(df, flagged, api_key="sk-test")
 
@@ -466,9 +781,180 @@ class TestRetryWithSplit:
         })
         flagged = [_make_flagged_item(row_index=i) for i in range(5)]
 
-        mock_api.return_value = ("Not JSON at all", 0.01, 200, 100)
+        mock_api.return_value = _api_response("Not JSON at all", 0.01, 200, 100)
 
         result = clean_with_llm(df, flagged, api_key="sk-test")
 
         assert result.failed_batches == 1
         assert result.total_batches >= 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Concurrent dispatch (offline, against FakeSonnetAPI)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestConcurrentDispatch:
+    def test_concurrency_limit_respected(self):
+        df, flagged = _make_distinct_flagged(200)
+        fake = FakeSonnetAPI(latency_seconds=0.05)
+
+        with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+            result = clean_with_llm(df, flagged, api_key="sk-test", max_concurrent_batches=2)
+
+        assert len(fake.calls) >= 3
+        assert sum(fake.calls) == 200
+        assert fake.max_in_flight == 2
+        assert len(result.resolved_items) == 200
+        assert result.dataframe["Product Type"].eq("Other").all()
+
+    def test_matches_sequential_dispatch(self):
+        df, flagged = _make_distinct_flagged(230)
+
+        with patch("processing.llm_cleaner._call_sonnet_api", new=FakeSonnetAPI()):
+            sequential = clean_with_llm(
+                df, flagged, api_key="sk-test", max_concurrent_batches=1, cache_path=None
+            )
+        with patch("processing.llm_cleaner._call_sonnet_api", new=FakeSonnetAPI()):
+            concurrent = clean_with_llm(
+                df, flagged, api_key="sk-test", max_concurrent_batches=8, cache_path=None
+            )
+
+        pd.testing.assert_frame_equal(sequential.dataframe, concurrent.dataframe)
+        assert sequential.resolved_items == concurrent.resolved_items
+        assert list(sequential.changes_log) == list(concurrent.changes_log)
+
+    def test_truncated_batches_resubmit_only_unanswered_items(self):
+        df, flagged = _make_distinct_flagged(100)
+        fake = FakeSonnetAPI(truncate_over_items=30)
+
+        with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+            result = clean_with_llm(df, flagged, api_key="sk-test")
+
+        # Decisions before each cut are kept; only the rest goes out again,
+        # so far fewer items are sent than when splitting whole batches
+        assert fake.truncated_calls > 0
+        assert result.salvaged_decisions > 0
+        assert sum(fake.calls) < 2 * 100
+        assert result.total_batches == len(fake.calls)
+        assert result.failed_batches == 0
+        assert sorted(item["row_index"] for item in result.resolved_items) == list(range(100))
+
+    def test_dropped_stream_keeps_received_decisions(self):
+        df, flagged = _make_distinct_flagged(20)
+        fake = FakeSonnetAPI(drop_stream_after_chars=1500)
+
+        with (
+            patch("utils.llm_client._get_client"),
+            patch("utils.llm_client._send_request", new=fake.send_request),
+        ):
+            result = clean_with_llm(df, flagged, api_key="sk-test")
+
+        # Interrupted streams are not retried whole: each call answers
+        # the items the previous one did not reach
+        assert fake.dropped_calls > 0
+        assert sum(fake.calls) < 2 * 20
+        assert result.failed_batches == 0
+        assert sorted(item["row_index"] for item in result.resolved_items) == list(range(20))
+
+    @patch("utils.llm_client.time.sleep")
+    def test_api_error_retried_with_backoff(self, mock_sleep):
+        df, flagged = _make_distinct_flagged(3)
+        fake = FakeSonnetAPI(fail_first_calls=1)
+
+        with (
+            patch("utils.llm_client._get_client"),
+            patch("utils.llm_client._send_request", new=fake.send_request),
+        ):
+            result = clean_with_llm(df, flagged, api_key="sk-test")
+
+        assert len(fake.calls) == 2
+        assert mock_sleep.called
+        assert result.failed_batches == 0
+        assert len(result.resolved_items) == 3
+
+    @patch("utils.llm_client.time.sleep")
+    def test_batch_fails_after_max_attempts(self, mock_sleep):
+        df, flagged = _make_distinct_flagged(3)
+        fake = FakeSonnetAPI(fail_first_calls=100)
+
+        with (
+            patch("utils.llm_client._get_client"),
+            patch("utils.llm_client._send_request", new=fake.send_request),
+        ):
+            result = clean_with_llm(df, flagged, api_key="sk-test")
+
+        assert len(fake.calls) == MAX_ATTEMPTS
+        assert result.failed_batches == 1
+        assert result.resolved_items == []
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Persistent decision cache
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestDecisionCache:
+    def test_second_run_served_from_cache(self, tmp_path):
+        cache_path = tmp_path / "results.sqlite3"
+        df, flagged = _make_distinct_flagged(3)
+        fake = FakeSonnetAPI()
+
+        with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+            first = clean_with_llm(df, flagged, api_key="sk-test", cache_path=cache_path)
+            second = clean_with_llm(df, flagged, api_key="sk-test", cache_path=cache_path)
+
+        assert fake.calls == [3]
+        assert (first.cache_hits, first.cache_misses) == (0, 3)
+        assert (second.cache_hits, second.cache_misses) == (3, 0)
+        assert second.total_batches == 0
+        pd.testing.assert_frame_equal(first.dataframe, second.dataframe)
+        assert [(item["row_index"], item["normalized_value"]) for item in second.resolved_items] \
+            == [(item["row_index"], item["normalized_value"]) for item in first.resolved_items]
+
+    def test_partial_hits_only_send_misses(self, tmp_path):
+        cache_path = tmp_path / "results.sqlite3"
+        df, flagged = _make_distinct_flagged(4)
+        fake = FakeSonnetAPI()
+
+        with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+            clean_with_llm(df, flagged, api_key="sk-test", cache_path=cache_path)
+            result = clean_with_llm(
+                df, flagged + [_make_flagged_item(row_index=0, original_value="New")],
+                api_key="sk-test", cache_path=cache_path,
+            )
+
+        assert fake.calls == [4, 1]
+        assert (result.cache_hits, result.cache_misses) == (4, 1)
+
+    def test_rejected_decisions_not_cached(self, tmp_path):
+        cache_path = tmp_path / "results.sqlite3"
+        df, flagged = _make_distinct_flagged(2)
+        fake = FakeSonnetAPI(normalized_value="Not A Valid Type")
+
+        with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+            clean_with_llm(df, flagged, api_key="sk-test", cache_path=cache_path)
+            result = clean_with_llm(df, flagged, api_key="sk-test", cache_path=cache_path)
+
+        assert fake.calls == [2, 2]
+        assert result.cache_hits == 0
+
+    def test_key_ignores_irrelevant_context(self):
+        shelf_a = _make_flagged_item(column="Shelf Location", original_value="Front chiller",
+                                     context={"Brand": "Tropicana"})
+        shelf_b = _make_flagged_item(column="Shelf Location", original_value="front  CHILLER",
+                                     context={"Brand": "Innocent"})
+        type_a = _make_flagged_item(context={"Brand": "Tropicana"})
+        type_b = _make_flagged_item(context={"Brand": "Innocent"})
+
+        assert _decision_cache_key(shelf_a) == _decision_cache_key(shelf_b)
+        assert _decision_cache_key(type_a) != _decision_cache_key(type_b)
+
+    def test_disabled_with_none(self):
+        df, flagged = _make_distinct_flagged(2)
+        fake = FakeSonnetAPI()
+
+        with patch("processing.llm_cleaner._call_sonnet_api", new=fake):
+            clean_with_llm(df, flagged, api_key="sk-test", cache_path=None)
+            result = clean_with_llm(df, flagged, api_key="sk-test", cache_path=None)
+
+        assert fake.calls == [2, 2]
+        assert result.cache_hits == 0
@@ -0,0 +1,262 @@
+"""
+Tests for utils/llm_client.py
+
+Covers: response and cost, retries with backoff, non-retryable errors,
+streamed responses, static prefix caching, per-call metrics and their summary, and client
+pooling per API key.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config.llm_config import MAX_ATTEMPTS
+from utils import llm_client
+from utils.llm_client import (
+    TokenUsage,
+    call_metrics,
+    complete,
+    estimate_cost,
+    reset_call_metrics,
+    summarize_call_metrics,
+)
+from utils.rate_limit import TokenBucket
+
+# The real client factory (the autouse fixture replaces it in the module)
+_get_client = llm_client._get_client
+
+
+class _StatusError(Exception):
+    """Stand-in for an anthropic APIStatusError."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def offline_client(monkeypatch):
+    """No real clients, no rate-limit pacing, no backoff sleeps, no old metrics."""
+    monkeypatch.setattr(llm_client, "_get_client", MagicMock())
+    monkeypatch.setattr(llm_client, "_RATE_LIMITER", TokenBucket(rate=1000.0, capacity=100))
+    monkeypatch.setattr(llm_client.time, "sleep", MagicMock())
+    reset_call_metrics()
+    yield
+    reset_call_metrics()
+
+
+def _usage(input_tokens: int, output_tokens: int, **cache_tokens) -> TokenUsage:
+    return TokenUsage(
+        uncached_input_tokens=input_tokens, output_tokens=output_tokens, **cache_tokens
+    )
+
+
+def _transport(*outcomes):
+    """A _send_request replacement returning/raising *outcomes* in turn."""
+    return MagicMock(side_effect=list(outcomes))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Calls and retries
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestComplete:
+    def test_returns_text_usage_and_cost(self):
+        send = _transport(("[]", _usage(1000, 200), "end_turn"))
+        with patch("utils.llm_client._send_request", new=send):
+            response = complete("prompt", "sk-test", max_tokens=100, caller="test")
+
+        assert response.text == "[]"
+        assert (response.input_tokens, response.output_tokens) == (1000, 200)
+        assert response.cost_usd == pytest.approx(estimate_cost(_usage(1000, 200)))
+        assert response.attempts == 1
+        assert response.stop_reason == "end_turn"
+
+    def test_transient_error_retried(self):
+        send = _transport(ConnectionError("reset"), ("ok", _usage(1, 1), "end_turn"))
+        with patch("utils.llm_client._send_request", new=send):
+            response = complete("prompt", "sk-test", max_tokens=100, caller="test")
+
+        assert response.attempts == 2
+        assert llm_client.time.sleep.call_count == 1
+
+    def test_rate_limit_status_retried(self):
+        send = _transport(_StatusError(429), ("ok", _usage(1, 1), "end_turn"))
+        with patch("utils.llm_client._send_request", new=send):
+            response = complete("prompt", "sk-test", max_tokens=100, caller="test")
+
+        assert response.attempts == 2
+
+    def test_client_error_not_retried(self):
+        send = _transport(_StatusError(401))
+        with patch("utils.llm_client._send_request", new=send):
+            with pytest.raises(_StatusError):
+                complete("prompt", "sk-test", max_tokens=100, caller="test")
+
+        assert send.call_count == 1
+
+    def test_gives_up_after_max_attempts(self):
+        send = _transport(*[ConnectionError("down")] * MAX_ATTEMPTS)
+        with patch("utils.llm_client._send_request", new=send):
+            with pytest.raises(ConnectionError):
+                complete("prompt", "sk-test", max_tokens=100, caller="test")
+
+        assert send.call_count == MAX_ATTEMPTS
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Streaming
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestStreaming:
+    def test_text_delivered_as_it_arrives(self):
+        client = MagicMock()
+        stream = client.messages.stream.return_value.__enter__.return_value
+        stream.text_stream = iter(["[{", "}", "]"])
+        stream.get_final_message.return_value = MagicMock(
+            content=[MagicMock(text="[{}]")], stop_reason="end_turn",
+            usage=MagicMock(input_tokens=5, output_tokens=3,
+                            cache_creation_input_tokens=0, cache_read_input_tokens=0),
+        )
+        llm_client._get_client.return_value = client
+        fragments = []
+
+        response = complete(
+            "prompt", "sk-test", max_tokens=100, caller="test", on_text=fragments.append,
+        )
+
+        assert fragments == ["[{", "}", "]"]
+        assert response.text == "[{}]"
+        client.messages.create.assert_not_called()
+
+    def test_error_before_text_retried(self):
+        send = _transport(ConnectionError("reset"), ("ok", _usage(1, 1), "end_turn"))
+        with patch("utils.llm_client._send_request", new=send):
+            response = complete(
+                "prompt", "sk-test", max_tokens=100, caller="test", on_text=lambda _: None,
+            )
+
+        assert response.attempts == 2
+
+    def test_error_after_text_not_retried(self):
+        def dropped_stream(*args, on_text=None):
+            on_text('[{"row_index": 0}')
+            raise ConnectionError("dropped")
+
+        send = MagicMock(side_effect=dropped_stream)
+        fragments = []
+        with patch("utils.llm_client._send_request", new=send):
+            with pytest.raises(ConnectionError):
+                complete(
+                    "prompt", "sk-test", max_tokens=100, caller="test",
+                    on_text=fragments.append,
+                )
+
+        # The caller already has the partial text; a retry would repeat it
+        assert send.call_count == 1
+        assert fragments == ['[{"row_index": 0}']
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Static prefix caching
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestPromptCaching:
+    def test_prefix_sent_as_cacheable_block(self):
+        client = MagicMock()
+        client.messages.create.return_value.usage = MagicMock(
+            input_tokens=50, output_tokens=10,
+            cache_creation_input_tokens=0, cache_read_input_tokens=2000,
+        )
+        llm_client._get_client.return_value = client
+
+        response = complete(
+            "items", "sk-test", max_tokens=100, caller="test", static_prefix="rules",
+        )
+
+        content = client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert content[0] == {
+            "type": "text", "text": "rules", "cache_control": {"type": "ephemeral"},
+        }
+        assert content[1] == {"type": "text", "text": "items"}
+        assert response.input_tokens == 2050
+        assert response.cached_input_tokens == 2000
+
+    def test_no_prefix_sends_single_block(self):
+        client = MagicMock()
+        client.messages.create.return_value.usage = MagicMock(
+            input_tokens=50, output_tokens=10,
+            cache_creation_input_tokens=None, cache_read_input_tokens=None,
+        )
+        llm_client._get_client.return_value = client
+
+        response = complete("items", "sk-test", max_tokens=100, caller="test")
+
+        content = client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert content == [{"type": "text", "text": "items"}]
+        assert response.cached_input_tokens == 0
+
+    def test_cache_reads_cheaper_than_uncached_input(self):
+        uncached = estimate_cost(_usage(10_000, 100))
+        cached = estimate_cost(_usage(0, 100, cache_read_tokens=10_000))
+        written = estimate_cost(_usage(0, 100, cache_write_tokens=10_000))
+
+        assert cached < uncached < written
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Metrics
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestMetrics:
+    def test_success_and_failure_recorded(self):
+        send = _transport(
+            ConnectionError("reset"), ("ok", _usage(10, 5), "end_turn"), _StatusError(400),
+        )
+        with patch("utils.llm_client._send_request", new=send):
+            complete("prompt", "sk-test", max_tokens=100, caller="cleaner")
+            with pytest.raises(_StatusError):
+                complete("prompt", "sk-test", max_tokens=100, caller="tagger")
+
+        metrics = call_metrics()
+        assert [(m.caller, m.succeeded, m.attempts) for m in metrics] == [
+            ("cleaner", True, 2), ("tagger", False, 1),
+        ]
+        assert metrics[0].input_tokens == 10
+        assert metrics[1].error == "HTTP 400"
+
+    def test_summary_per_caller(self):
+        send = _transport(("a", _usage(10, 5), "end_turn"), ("b", _usage(30, 15), "end_turn"))
+        with patch("utils.llm_client._send_request", new=send):
+            complete("prompt", "sk-test", max_tokens=100, caller="cleaner")
+            complete("prompt", "sk-test", max_tokens=100, caller="cleaner")
+
+        summary = summarize_call_metrics()
+
+        assert list(summary) == ["cleaner"]
+        assert summary["cleaner"]["calls"] == 2
+        assert summary["cleaner"]["input_tokens"] == 40
+        assert summary["cleaner"]["cached_input_tokens"] == 0
+        assert summary["cleaner"]["cost_usd"] == pytest.approx(estimate_cost(_usage(40, 20)))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Client pooling
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestClientPool:
+    def test_one_client_per_api_key(self, monkeypatch):
+        monkeypatch.setattr(llm_client, "_CLIENTS", {})
+        created = []
+        fake_anthropic = MagicMock()
+        fake_anthropic.Anthropic.side_effect = lambda **kwargs: created.append(kwargs) or object()
+
+        with patch.dict("sys.modules", {"anthropic": fake_anthropic}):
+            first = _get_client("sk-a")
+            again = _get_client("sk-a")
+            other = _get_client("sk-b")
+
+        assert first is again
+        assert other is not first
+        assert [kwargs["api_key"] for kwargs in created] == ["sk-a", "sk-b"]
+        assert created[0]["max_retries"] == 0
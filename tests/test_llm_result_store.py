@@ -0,0 +1,184 @@
+"""
+Tests for processing/llm_result_store.py
+
+Covers: upsert and point lookup, namespaces, lookups larger than one
+query, the one-time legacy JSON import, concurrent writers and counters
+from many sessions, and degrading to an empty store on errors.
+"""
+
+import json
+import sqlite3
+import threading
+
+from processing import llm_result_store
+from processing.llm_result_store import (
+    add_counts,
+    import_legacy_json,
+    lookup_counts,
+    lookup_results,
+    store_results,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Lookups and upserts
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLookupStore:
+    def test_round_trip_and_missing_keys(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+
+        assert store_results(store, "flavor_clean", {"oj": "Orange", "aple": "Apple"})
+
+        assert lookup_results(store, "flavor_clean", ["oj", "aple", "kiwi"]) == {
+            "oj": "Orange", "aple": "Apple",
+        }
+
+    def test_upsert_replaces_only_given_keys(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        store_results(store, "flavor_clean", {"oj": "Orange", "aple": "Apple"})
+
+        store_results(store, "flavor_clean", {"oj": "Orange Juice"})
+
+        assert lookup_results(store, "flavor_clean", ["oj", "aple"]) == {
+            "oj": "Orange Juice", "aple": "Apple",
+        }
+
+    def test_namespaces_are_separate(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        store_results(store, "flavor_clean", {"Green": "Green Apple"})
+        store_results(store, "vegetable_tag", {"Green": "Yes"})
+
+        assert lookup_results(store, "flavor_clean", ["Green"]) == {"Green": "Green Apple"}
+        assert lookup_results(store, "vegetable_tag", ["Green"]) == {"Green": "Yes"}
+
+    def test_lookup_spanning_several_queries(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_result_store, "_LOOKUP_CHUNK_SIZE", 7)
+        store = tmp_path / "results.sqlite3"
+        store_results(store, "ns", {f"k{i}": f"v{i}" for i in range(30)})
+
+        found = lookup_results(store, "ns", [f"k{i}" for i in range(40)])
+
+        assert found == {f"k{i}": f"v{i}" for i in range(30)}
+
+    def test_none_answers_skipped(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+
+        assert store_results(store, "ns", {"a": None, "b": "B"})
+
+        assert lookup_results(store, "ns", ["a", "b"]) == {"b": "B"}
+
+    def test_store_uses_wal_journal(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        store_results(store, "ns", {"a": "A"})
+
+        with sqlite3.connect(store) as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_unreadable_store_behaves_as_empty(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        store.write_bytes(b"not a database" * 100)
+
+        assert lookup_results(store, "ns", ["a"]) == {}
+        assert store_results(store, "ns", {"a": "A"}) is False
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Legacy JSON import
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestLegacyImport:
+    def test_imported_once(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        legacy = tmp_path / "flavor_clean_cache.json"
+        legacy.write_text(json.dumps({"oj": "Orange", "aple": "Apple"}), encoding="utf-8")
+
+        assert import_legacy_json(store, "flavor_clean", legacy) == 2
+        store_results(store, "flavor_clean", {"oj": "Orange Juice"})
+        assert import_legacy_json(store, "flavor_clean", legacy) == 0
+
+        # The second import did not bring the old answer back
+        assert lookup_results(store, "flavor_clean", ["oj", "aple"]) == {
+            "oj": "Orange Juice", "aple": "Apple",
+        }
+
+    def test_existing_entries_win(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        legacy = tmp_path / "flavor_clean_cache.json"
+        legacy.write_text(json.dumps({"oj": "Orange", "aple": "Apple"}), encoding="utf-8")
+        store_results(store, "flavor_clean", {"oj": "Orange Juice"})
+
+        assert import_legacy_json(store, "flavor_clean", legacy) == 1
+
+        assert lookup_results(store, "flavor_clean", ["oj"]) == {"oj": "Orange Juice"}
+
+    def test_missing_file_imported_when_it_appears(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        legacy = tmp_path / "flavor_clean_cache.json"
+
+        assert import_legacy_json(store, "flavor_clean", legacy) == 0
+        legacy.write_text(json.dumps({"oj": "Orange"}), encoding="utf-8")
+
+        assert import_legacy_json(store, "flavor_clean", legacy) == 1
+
+    def test_malformed_file_skipped(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        legacy = tmp_path / "flavor_clean_cache.json"
+        legacy.write_text("[1, 2", encoding="utf-8")
+
+        assert import_legacy_json(store, "flavor_clean", legacy) == 0
+        assert lookup_results(store, "flavor_clean", ["1"]) == {}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Concurrent sessions
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestConcurrentSessions:
+    def test_concurrent_writers_keep_every_entry(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        sessions, batches, batch_size = 8, 10, 20
+        errors: list[Exception] = []
+
+        def session(session_id: int) -> None:
+            try:
+                for batch in range(batches):
+                    results = {
+                        f"s{session_id}-b{batch}-{i}": f"answer {session_id}"
+                        for i in range(batch_size)
+                    }
+                    assert store_results(store, "ns", results)
+                    assert lookup_results(store, "ns", results) == results
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=session, args=(n,)) for n in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        all_keys = [
+            f"s{s}-b{b}-{i}"
+            for s in range(sessions) for b in range(batches) for i in range(batch_size)
+        ]
+        assert len(lookup_results(store, "ns", all_keys)) == len(all_keys)
+
+    def test_concurrent_counts_add_up(self, tmp_path):
+        store = tmp_path / "results.sqlite3"
+        sessions, rounds = 8, 25
+
+        def session() -> None:
+            for _ in range(rounds):
+                assert add_counts(store, "ns", {"hits": 1, "misses": 2})
+
+        threads = [threading.Thread(target=session) for _ in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert lookup_counts(store, "ns") == {
+            "hits": sessions * rounds, "misses": 2 * sessions * rounds,
+        }
@@ -740,3 +740,103 @@ class TestNACentrifugalDefault:
         result = normalize(df)
         # Brand rule wins
         assert result.dataframe.at[0, "Juice Extraction Method"] == "Squeezed"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Column engine (factorized unique values broadcast back to rows)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestColumnEngine:
+    def test_equal_but_differently_typed_values_resolved_separately(self):
+        """1, 1.0 and "1" hash alike but their text differs: "1.0" is not in the table."""
+        df = _make_df({"Shelf Level": [1, 1.0, "1", " 1 "]}, rows=4)
+        result = normalize(df)
+
+        assert result.dataframe["Shelf Level"].tolist() == ["1st", 1.0, "1st", "1st"]
+        flagged = [f for f in result.flagged_items if f.column == "Shelf Level"]
+        assert [(f.row_index, f.original_value) for f in flagged] == [(1, "1.0")]
+
+    def test_repeated_values_logged_per_row_in_order(self):
+        df = _make_df({"HPP Treatment": ["yes", "No", "yes", "unknown"]}, rows=4)
+        result = normalize(df)
+
+        hpp_changes = [c for c in result.changes_log if c["column"] == "HPP Treatment"]
+        assert [(c["row"], c["normalized"]) for c in hpp_changes] == [
+            (0, "Yes"), (2, "Yes"), (3, "(blank)"),
+        ]
+
+    def test_index_labels_used_for_rows(self):
+        df = _make_df({"Packaging Type": ["can", "mystery"]}, rows=2)
+        df.index = pd.Index([40, 7])
+        result = normalize(df)
+
+        change = next(c for c in result.changes_log if c["column"] == "Packaging Type")
+        flag = next(f for f in result.flagged_items if f.column == "Packaging Type")
+        assert (change["row"], flag.row_index) == (40, 7)
+        assert type(change["row"]) is int
+        assert flag.context["Brand"] == "TestBrand"
+
+    def test_non_object_column_written_like_single_cells(self):
+        df = _make_df({"Shelf Level": [1, 2]}, rows=2)
+        result = normalize(df)
+
+        assert result.dataframe["Shelf Level"].tolist() == ["1st", "2nd"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Juice Extraction Method rule engine
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestJuiceExtractionRuleEngine:
+    def test_first_matching_rule_wins_per_row(self):
+        df = _make_df({
+            "Brand": ["TestBrand"] * 4,
+            "HPP Treatment": ["Yes", None, None, None],
+            "Processing Method": ["Freshly Squeezed", "Freshly Squeezed", None, "Pasteurized"],
+            "Claims": ["from concentrate", "From Concentrate", "Not from concentrate", None],
+        }, rows=4)
+        result = normalize(df)
+
+        assert result.dataframe["Juice Extraction Method"].tolist() == [
+            "Cold Pressed", "Squeezed", "Squeezed", "NA/Centrifugal",
+        ]
+
+    def test_brand_changes_logged_before_extraction_change_per_row(self):
+        df = _make_df({"Brand": ["Tropicana", "TestBrand", "Tropicana"]}, rows=3)
+        df.at[1, "Claims"] = "cold pressed"
+        result = normalize(df)
+
+        inferred = [
+            (c["row"], c["column"]) for c in result.changes_log
+            if c["method"].startswith(("brand rule", "deterministic rule"))
+        ]
+        assert inferred == [
+            (0, "Processing Method"), (0, "Juice Extraction Method"),
+            (1, "Juice Extraction Method"),
+            (2, "Processing Method"), (2, "Juice Extraction Method"),
+        ]
+
+    def test_flagged_rows_in_row_order(self):
+        df = _make_df({
+            "Brand": ["TestBrand"] * 3,
+            "Juice Extraction Method": [None, "Whizzed", None],
+            "Processing Method": ["Pasteurised", None, None],
+        }, rows=3)
+        result = normalize(df)
+
+        flagged = [f for f in result.flagged_items if f.column == "Juice Extraction Method"]
+        assert [(f.row_index, f.original_value) for f in flagged] == [
+            (0, ""), (1, "Whizzed"), (2, ""),
+        ]
+        assert flagged[0].reason.startswith("Defaulted to NA/Centrifugal")
+        assert flagged[2].reason.startswith("Could not determine")
+
+    def test_repeated_brand_conflicts_reported_per_row(self):
+        df = _make_df({"Brand": "Innocent", "HPP Treatment": "Yes"}, rows=3)
+        df.index = pd.Index([12, 3, 8])
+        result = normalize(df)
+
+        extraction_conflicts = [
+            c for c in result.conflicts_log if c.column == "Juice Extraction Method"
+        ]
+        assert [c.row_index for c in extraction_conflicts] == [12, 3, 8]
@@ -264,6 +264,22 @@ class TestAlreadyNumeric:
         result = convert_numerics(df)
         assert result.dataframe.at[0, "Price (Local Currency)"] == 3.99
 
+    def test_typed_columns_keep_dtype(self):
+        df = _make_numeric_df({
+            "Facings": [2, 3],
+            "Brand": ["A", "B"],
+            "Shelf Levels": [4, 5],
+            "Price (Local Currency)": [1.5, float("nan")],
+            "Packaging Size (ml)": [250, 330],
+            "Est. Linear Meters": [1.0, 2.0],
+            "Confidence Score": [80, 90],
+        })
+        result = convert_numerics(df)
+
+        assert result.dataframe["Facings"].dtype == "int64"
+        assert result.dataframe["Price (Local Currency)"].dtype == "float64"
+        assert result.errors == []
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Original DataFrame not mutated
@@ -0,0 +1,99 @@
+"""
+Tests for processing/parse_cache.py
+
+Covers: exact round-trip of every fixture's FileReadResult and column
+mapping, cache hits skipping the reader, key derivation, and graceful
+handling of unreadable entries and failed reads.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import processing.parse_cache as parse_cache
+from processing.parse_cache import (
+    file_cache_key,
+    load_parsed_workbook,
+    read_and_map_cached,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+_FIXTURE_FILES: list[str] = sorted(p.name for p in FIXTURES_DIR.glob("*.xlsx"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Round trip
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestRoundTrip:
+    @pytest.mark.parametrize("filename", _FIXTURE_FILES)
+    def test_cached_parse_identical(self, filename: str, tmp_path: Path):
+        """A cache hit returns exactly what a fresh parse produced."""
+        fresh = read_and_map_cached(FIXTURES_DIR / filename, tmp_path)
+        cached = read_and_map_cached(FIXTURES_DIR / filename, tmp_path)
+
+        assert not fresh.cache_hit
+        assert cached.cache_hit
+        pd.testing.assert_frame_equal(
+            fresh.read_result.raw_dataframe, cached.read_result.raw_dataframe
+        )
+        # Mixed-type columns keep each value's own Python type
+        for column in fresh.read_result.raw_dataframe.columns:
+            fresh_types = fresh.read_result.raw_dataframe[column].map(type).tolist()
+            cached_types = cached.read_result.raw_dataframe[column].map(type).tolist()
+            assert fresh_types == cached_types, column
+        assert fresh.read_result.sections == cached.read_result.sections
+        assert fresh.read_result.skipped_rows == cached.read_result.skipped_rows
+        assert fresh.read_result.header_row_index == cached.read_result.header_row_index
+        assert fresh.read_result.data_start_column == cached.read_result.data_start_column
+        assert fresh.mapping_result == cached.mapping_result
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Cache behaviour
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestCacheBehaviour:
+    def test_hit_skips_reader(self, tmp_path: Path, monkeypatch):
+        path = FIXTURES_DIR / "Lidl_Fulham_Juice_Analysis.xlsx"
+        read_and_map_cached(path, tmp_path)
+
+        def _fail(_path):
+            raise AssertionError("reader should not run on a cache hit")
+
+        monkeypatch.setattr(parse_cache, "read_excel_file", _fail)
+        assert read_and_map_cached(path, tmp_path).cache_hit
+
+    def test_cache_disabled(self, tmp_path: Path):
+        path = FIXTURES_DIR / "Lidl_Fulham_Juice_Analysis.xlsx"
+        read_and_map_cached(path, None)
+        assert not read_and_map_cached(path, None).cache_hit
+
+    def test_key_depends_on_bytes_and_version(self, monkeypatch):
+        key = file_cache_key(b"abc")
+        assert key != file_cache_key(b"abd")
+
+        monkeypatch.setattr(parse_cache, "READER_VERSION", 999)
+        assert key != file_cache_key(b"abc")
+
+    def test_failed_read_not_cached(self, tmp_path: Path):
+        bad_file = tmp_path / "not_a_workbook.xlsx"
+        bad_file.write_bytes(b"not a zip file")
+        cache_dir = tmp_path / "cache"
+
+        parsed = read_and_map_cached(bad_file, cache_dir)
+
+        assert parsed.read_result.errors
+        assert not list(cache_dir.glob("*.parquet"))
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path):
+        path = FIXTURES_DIR / "Lidl_Fulham_Juice_Analysis.xlsx"
+        key = file_cache_key(path.read_bytes())
+        (tmp_path / f"{key}.parquet").write_bytes(b"garbage")
+
+        assert load_parsed_workbook(key, tmp_path) is None
+        parsed = read_and_map_cached(path, tmp_path)
+        assert not parsed.cache_hit
+        assert read_and_map_cached(path, tmp_path).cache_hit
@@ -0,0 +1,164 @@
+"""
+Tests for processing/provenance.py
+
+Covers: appending changes, value interning, combining and offsetting logs,
+filter and group queries, and conversion back to dicts / DataFrames.
+"""
+
+import pickle
+
+import pandas as pd
+import pytest
+
+from processing.provenance import (
+    ProvenanceLog,
+    append_change,
+    change_records,
+    changes_to_dataframe,
+    count_changes,
+    extend_changes,
+    extend_log,
+    offset_rows,
+    select_changes,
+)
+
+_CHANGES: list[dict] = [
+    {"row": 0, "column": "Product Type", "original": "pure juice",
+     "normalized": "Pure Juices", "method": "lookup table"},
+    {"row": 1, "column": "Processing Method", "original": None,
+     "normalized": "HPP", "method": "brand rule (Innocent)"},
+    {"row": 1, "column": "Product Type", "original": "pure juice",
+     "normalized": "Pure Juices", "method": "lookup table"},
+    {"row": 2, "column": "HPP Treatment", "original": 1,
+     "normalized": "Yes", "method": "brand rule (Innocent)"},
+]
+
+
+def _make_log(source: str = "a.xlsx") -> ProvenanceLog:
+    log = ProvenanceLog()
+    extend_changes(log, _CHANGES, source=source)
+    return log
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Appending
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestAppend:
+    def test_round_trip(self):
+        log = _make_log()
+
+        assert len(log) == len(_CHANGES)
+        assert list(log) == [{**change, "source": "a.xlsx"} for change in _CHANGES]
+
+    def test_strings_interned(self):
+        log = _make_log()
+
+        assert log.columns.values == ["Product Type", "Processing Method", "HPP Treatment"]
+        assert log.methods.values == ["lookup table", "brand rule (Innocent)"]
+        assert log.values.values.count("Pure Juices") == 1
+
+    def test_equal_values_of_different_types_kept_apart(self):
+        log = ProvenanceLog()
+        for value in (1, 1.0, True, "1"):
+            append_change(log, 0, "Facings", value, value, "numeric")
+
+        assert [type(entry["original"]) for entry in log] == [int, float, bool, str]
+
+    def test_missing_method_defaults_to_blank(self):
+        log = ProvenanceLog()
+        extend_changes(log, [{"row": 0, "column": "Brand", "original": "x", "normalized": "X"}])
+
+        assert next(iter(log))["method"] == ""
+
+    def test_picklable(self):
+        log = _make_log()
+
+        assert pickle.loads(pickle.dumps(log)) == log
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Combining logs
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestCombine:
+    def test_extend_log_recodes_values(self):
+        combined = ProvenanceLog()
+        append_change(combined, 9, "Brand", "x", "X", "manual", source="first.xlsx")
+        other = _make_log(source="second.xlsx")
+
+        extend_log(combined, other)
+
+        assert list(combined)[1:] == list(other)
+        assert len(other) == len(_CHANGES)
+
+    def test_offset_rows(self):
+        log = _make_log()
+
+        offset_rows(log, 100)
+
+        assert [entry["row"] for entry in log] == [100, 101, 101, 102]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Queries
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestQueries:
+    def test_select_by_column_and_method(self):
+        log = _make_log()
+
+        assert select_changes(log, column="Product Type").tolist() == [0, 2]
+        assert select_changes(log, method_prefix="brand rule").tolist() == [1, 3]
+        assert select_changes(log, column="Product Type", method="manual").tolist() == []
+        assert select_changes(log).tolist() == [0, 1, 2, 3]
+
+    def test_select_by_source(self):
+        log = _make_log(source="a.xlsx")
+        extend_log(log, _make_log(source="b.xlsx"))
+
+        assert select_changes(log, source="b.xlsx").tolist() == [4, 5, 6, 7]
+
+    def test_count_changes(self):
+        log = _make_log()
+
+        assert count_changes(log, by="method") == {
+            "lookup table": 2, "brand rule (Innocent)": 2,
+        }
+        assert count_changes(
+            log, by="column", positions=select_changes(log, method="lookup table")
+        ) == {"Product Type": 2}
+
+    def test_count_changes_rejects_unknown_field(self):
+        with pytest.raises(ValueError):
+            count_changes(_make_log(), by="row")
+
+    def test_change_records_limit(self):
+        log = _make_log()
+
+        records = change_records(log, select_changes(log, method_prefix="brand"), limit=1)
+
+        assert records == [{**_CHANGES[1], "source": "a.xlsx"}]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DataFrame export
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestChangesToDataframe:
+    def test_matches_records(self):
+        log = _make_log()
+
+        frame = changes_to_dataframe(log, limit=3)
+
+        expected = pd.DataFrame(change_records(log, limit=3))
+        pd.testing.assert_frame_equal(frame.astype(object), expected.astype(object))
+        assert frame["method"].dtype == "category"
+
+    def test_empty_log(self):
+        frame = changes_to_dataframe(ProvenanceLog())
+
+        assert frame.empty
+        assert list(frame.columns) == [
+            "row", "column", "original", "normalized", "method", "source",
+        ]
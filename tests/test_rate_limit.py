@@ -0,0 +1,53 @@
+"""
+Tests for utils/rate_limit.py
+
+Covers: token bucket bursts and refill pacing, and jittered backoff bounds.
+"""
+
+import time
+
+import pytest
+
+from utils.rate_limit import TokenBucket, acquire_token, backoff_delay
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Token bucket
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestTokenBucket:
+    def test_burst_up_to_capacity_without_waiting(self):
+        bucket = TokenBucket(rate=1.0, capacity=5)
+
+        assert [acquire_token(bucket) for _ in range(5)] == [0.0] * 5
+
+    def test_waits_for_refill_when_empty(self):
+        bucket = TokenBucket(rate=50.0, capacity=1)
+        acquire_token(bucket)
+
+        started = time.monotonic()
+        waited = acquire_token(bucket)
+
+        assert waited > 0
+        assert time.monotonic() - started >= 0.015
+
+    def test_invalid_settings_rejected(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0.0, capacity=1)
+        with pytest.raises(ValueError):
+            acquire_token(TokenBucket(rate=1.0, capacity=2), tokens=3)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Backoff
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestBackoffDelay:
+    def test_upper_bound_doubles_per_attempt(self):
+        delays = [backoff_delay(3, base_delay=1.0, max_delay=30.0) for _ in range(200)]
+
+        assert all(0.0 <= delay <= 4.0 for delay in delays)
+        assert max(delays) > 2.0
+
+    def test_capped(self):
+        assert all(backoff_delay(20, base_delay=1.0, max_delay=5.0) <= 5.0 for _ in range(100))
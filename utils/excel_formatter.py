@@ -24,6 +24,7 @@ from openpyxl.utils import get_column_letter
 import pandas as pd
 
 from config.schema import COLUMN_TYPES, MASTER_COLUMNS
+from processing.provenance import change_records
 from processing.quality_checker import QualityReport
 
 logger = logging.getLogger(__name__)
@@ -261,6 +262,25 @@ def _write_quality_report_sheet(
         worksheet.cell(row=current_row, column=3, value=f"{null_pct}%").font = _NORMAL_FONT
         current_row += 1
 
+    # ── Changes per method ────────────────────────────────────────────
+    if report.changes_by_method:
+        current_row += 2
+        worksheet.cell(row=current_row, column=1, value="Changes by Method").font = Font(bold=True, size=12)
+        current_row += 1
+
+        for col_idx, header in enumerate(["Method", "Changes"], start=1):
+            cell = worksheet.cell(row=current_row, column=col_idx, value=header)
+            cell.fill = _HEADER_FILL
+            cell.font = _HEADER_FONT
+        current_row += 1
+
+        for method, change_count in sorted(
+            report.changes_by_method.items(), key=lambda item: -item[1]
+        ):
+            worksheet.cell(row=current_row, column=1, value=method).font = _NORMAL_FONT
+            worksheet.cell(row=current_row, column=2, value=change_count).font = _NORMAL_FONT
+            current_row += 1
+
     # ── Normalization log (first 100 entries) ─────────────────────────
     if report.normalization_log:
         current_row += 2
@@ -274,7 +294,7 @@ def _write_quality_report_sheet(
             cell.font = _HEADER_FONT
         current_row += 1
 
-        for entry in report.normalization_log[:100]:
+        for entry in change_records(report.normalization_log, limit=100):
             worksheet.cell(row=current_row, column=1, value=entry.get("row")).font = _NORMAL_FONT
             worksheet.cell(row=current_row, column=2, value=entry.get("column")).font = _NORMAL_FONT
             worksheet.cell(row=current_row, column=3, value=entry.get("original")).font = _NORMAL_FONT
@@ -1,16 +1,41 @@
 """
 Fuzzy string matching utilities.
 
-Wraps the thefuzz library to provide a simple best-match interface used by
-filename_parser, column_mapper, and normalizer modules.
+One matcher on one backend (rapidfuzz), used by filename_parser,
+column_mapper and config.brand_mappings.  best_matches() scores a whole
+batch of query strings against a candidate set in a single
+rapidfuzz.process.cdist() call; best_match() is the one-query form.
+
+Candidate keys are preprocessed once per candidate set and cached, so
+matching against the same table (master columns, known cities, brands)
+repeatedly only pays for the queries.
+
+Scoring is token_sort_ratio, which handles word reordering well (e.g.
+"Shelf Analysis" vs "Analysis Shelf").  With full_process=True (the
+default) strings are processed and scored exactly as thefuzz does:
+non-ASCII Latin-1 characters dropped, everything but letters and digits
+replaced by spaces, lowercased, trimmed, and scores rounded to integers.
+
+Public API:
+    best_match(value, candidates, threshold)                  → (canonical, score)
+    best_matches(values, candidates, threshold, full_process) → list[(canonical, score)]
 """
 
 import logging
+from functools import lru_cache
 
-from thefuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 
 logger = logging.getLogger(__name__)
 
+# Latin-1 supplement characters removed by thefuzz's force_ascii step.
+_NON_ASCII_LATIN1 = {code_point: None for code_point in range(128, 256)}
+
+# Candidate sets whose preprocessed keys are kept.
+_CANDIDATE_CACHE_SIZE: int = 32
+
 
 def best_match(
     value: str,
@@ -32,28 +57,90 @@ def best_match(
         (canonical_value, score) if a match is found at or above threshold,
         or (None, 0) if no match qualifies.
     """
-    if not value or not candidates:
-        return None, 0
+    return best_matches([value], candidates, threshold)[0]
 
-    value_lower = value.strip().lower()
 
-    best_canonical: str | None = None
-    best_score: int = 0
+def best_matches(
+    values: list[str],
+    candidates: dict[str, str],
+    threshold: int = 80,
+    full_process: bool = True,
+) -> list[tuple[str | None, int | float]]:
+    """
+    Find the best fuzzy match for every value in one vectorized call.
 
-    for candidate_key, canonical_value in candidates.items():
-        score = fuzz.token_sort_ratio(value_lower, candidate_key)
-        if score > best_score:
-            best_score = score
-            best_canonical = canonical_value
+    Each distinct value is scored against every candidate key once; when
+    several keys share the best score, the first key (in dict order) wins.
 
-    if best_score >= threshold:
-        logger.debug(
-            f"Fuzzy matched '{value}' → '{best_canonical}' (score={best_score})"
-        )
-        return best_canonical, best_score
+    Args:
+        values: Strings to match (stripped and lowercased internally).
+        candidates: Dict of candidate_key (lowercase) → canonical_value.
+        threshold: Minimum score (0-100) to accept a match.
+        full_process: Process strings and round scores like thefuzz.
+            False compares the stripped, lowercased strings as they are
+            and returns float scores.
 
-    logger.debug(
-        f"No fuzzy match for '{value}' above threshold {threshold} "
-        f"(best was '{best_canonical}' at {best_score})"
+    Returns:
+        One (canonical_value, score) per value, in the same order — or
+        (None, 0) where no match qualifies.
+    """
+    # None marks an empty value, which matches nothing
+    queries = [value.strip().lower() if value else None for value in values]
+    distinct_queries = [query for query in dict.fromkeys(queries) if query is not None]
+    if not distinct_queries or not candidates:
+        return [(None, 0)] * len(values)
+
+    candidate_keys = tuple(candidates)
+    processed_keys = _preprocess_candidates(candidate_keys, full_process)
+    processed_queries = [
+        _preprocess(query) if full_process else query for query in distinct_queries
+    ]
+
+    scores = process.cdist(
+        processed_queries, processed_keys,
+        scorer=fuzz.token_sort_ratio, dtype=np.float64,
     )
-    return None, 0
+    if full_process:
+        scores = np.round(scores)
+    best_positions = scores.argmax(axis=1)
+
+    matches: dict[str, tuple[str | None, int | float]] = {}
+    for query, row_scores, best_position in zip(distinct_queries, scores, best_positions):
+        best_score = row_scores[best_position]
+        best_score = int(best_score) if full_process else float(best_score)
+        # A best score of 0 matches nothing (as in a scan keeping only improvements)
+        best_canonical = candidates[candidate_keys[best_position]] if best_score > 0 else None
+
+        if best_canonical is not None and best_score >= threshold:
+            logger.debug(
+                f"Fuzzy matched '{query}' → '{best_canonical}' (score={best_score})"
+            )
+            matches[query] = (best_canonical, best_score)
+        else:
+            logger.debug(
+                f"No fuzzy match for '{query}' above threshold {threshold} "
+                f"(best was '{best_canonical}' at {best_score})"
+            )
+            matches[query] = (None, 0)
+
+    return [matches.get(query, (None, 0)) for query in queries]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _preprocess(text: str) -> str:
+    """thefuzz's full_process with force_ascii: drop Latin-1, keep alphanumerics."""
+    return default_process(text.translate(_NON_ASCII_LATIN1))
+
+
+@lru_cache(maxsize=_CANDIDATE_CACHE_SIZE)
+def _preprocess_candidates(
+    candidate_keys: tuple[str, ...],
+    full_process: bool,
+) -> list[str]:
+    """Preprocess one candidate set's keys (cached per set)."""
+    if not full_process:
+        return list(candidate_keys)
+    return [_preprocess(key) for key in candidate_keys]
@@ -0,0 +1,247 @@
+"""
+LLM cassettes — record every LLM request once, replay it offline.
+
+While use_cassette() is active, every request the shared client
+(utils/llm_client.py) makes goes through a cassette file instead of
+straight to the API:
+
+  - "record": requests are sent to the API as usual and each response
+    (text, token usage, stop reason, latency) is stored under a hash of
+    the request — model, max_tokens, static prefix and prompt.  Entries
+    already in the file are kept; the file is written when the block exits.
+  - "replay": responses are looked up by the same hash and returned
+    without any network call, after the recorded latency multiplied by
+    latency_scale (1.0 → original timing, 0 → instant).  A request that
+    was never recorded raises CassetteMissError, which the client does not
+    retry.
+
+Only the transport is swapped: rate limiting, retries, metrics and every
+caller's prompt building, parsing and caching run exactly as in a live
+run, so a replayed pipeline run can be timed and profiled offline and
+gives the same result every time.  Replay never creates an API client
+(no SDK or network needed), but callers still need a non-empty API key
+(any string), since they skip their LLM step without one.
+
+Public API:
+    Cassette, CassetteMissError
+    use_cassette(path, mode, latency_scale)   → context manager yielding Cassette
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from utils import llm_client
+from utils.llm_client import TokenUsage
+
+logger = logging.getLogger(__name__)
+
+MODE_RECORD: str = "record"
+MODE_REPLAY: str = "replay"
+
+# Bump when the file layout changes; older files are ignored.
+_CASSETTE_FORMAT_VERSION: int = 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data classes
+# ═══════════════════════════════════════════════════════════════════════════
+
+class CassetteMissError(LookupError):
+    """A replayed request has no recorded response."""
+
+
+@dataclass
+class Cassette:
+    """Recorded responses by request hash, plus counts for this session."""
+
+    mode: str
+    latency_scale: float = 1.0
+    # request hash → {"model", "text", "usage", "stop_reason", "latency_seconds"}
+    interactions: dict[str, dict] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+    recorded: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+@contextmanager
+def use_cassette(
+    path: Path,
+    mode: str = MODE_REPLAY,
+    latency_scale: float = 1.0,
+) -> Iterator[Cassette]:
+    """
+    Record or replay every LLM request made inside the block.
+
+    Args:
+        path: Cassette JSON file.
+        mode: MODE_RECORD (call the API, store responses) or MODE_REPLAY
+            (answer from the file only).
+        latency_scale: Replay delay as a multiple of the recorded latency
+            (0 → no delay).  Ignored when recording.
+
+    Yields:
+        The Cassette, whose hits / misses / recorded counts are filled in
+        as requests are made.
+
+    Raises:
+        ValueError: For an unknown mode.
+    """
+    if mode not in (MODE_RECORD, MODE_REPLAY):
+        raise ValueError(f"Unknown cassette mode '{mode}'")
+
+    cassette = Cassette(
+        mode=mode,
+        latency_scale=latency_scale,
+        interactions=_load_interactions(path),
+    )
+    logger.info(
+        f"LLM cassette '{path}' ({mode}): {len(cassette.interactions)} recorded requests"
+    )
+
+    previous = llm_client.set_transport(_make_transport(cassette))
+    try:
+        yield cassette
+    finally:
+        llm_client.set_transport(previous)
+        if cassette.recorded:
+            _save_interactions(cassette.interactions, path)
+        logger.info(
+            f"LLM cassette '{path}': {cassette.hits} replayed, {cassette.misses} missing, "
+            f"{cassette.recorded} recorded"
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _request_key(model: str, static_prefix: str, prompt: str, max_tokens: int) -> str:
+    """Stable hash of everything that determines a request's response."""
+    payload = json.dumps([model, max_tokens, static_prefix, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _make_transport(cassette: Cassette) -> Callable[..., tuple[str, TokenUsage, str | None]]:
+    """A replacement for llm_client._send_request() backed by *cassette*."""
+
+    def transport(
+        api_key: str,
+        model: str,
+        static_prefix: str,
+        prompt: str,
+        max_tokens: int,
+        on_text: Callable[[str], None] | None = None,
+    ) -> tuple[str, TokenUsage, str | None]:
+        key = _request_key(model, static_prefix, prompt, max_tokens)
+        if cassette.mode == MODE_RECORD:
+            return _record(
+                cassette, key, api_key, model, static_prefix, prompt, max_tokens, on_text
+            )
+        return _replay(cassette, key, on_text)
+
+    return transport
+
+
+def _record(
+    cassette: Cassette,
+    key: str,
+    api_key: str,
+    model: str,
+    static_prefix: str,
+    prompt: str,
+    max_tokens: int,
+    on_text: Callable[[str], None] | None,
+) -> tuple[str, TokenUsage, str | None]:
+    """Send the request for real and store its response under *key*."""
+    started = time.perf_counter()
+    text, usage, stop_reason = llm_client._send_request(
+        api_key, model, static_prefix, prompt, max_tokens, on_text=on_text
+    )
+    interaction = {
+        "model": model,
+        "text": text,
+        "usage": {
+            "uncached_input_tokens": usage.uncached_input_tokens,
+            "cache_write_tokens": usage.cache_write_tokens,
+            "cache_read_tokens": usage.cache_read_tokens,
+            "output_tokens": usage.output_tokens,
+        },
+        "stop_reason": stop_reason,
+        "latency_seconds": time.perf_counter() - started,
+    }
+    with cassette._lock:
+        cassette.interactions[key] = interaction
+        cassette.recorded += 1
+    return text, usage, stop_reason
+
+
+def _replay(
+    cassette: Cassette,
+    key: str,
+    on_text: Callable[[str], None] | None,
+) -> tuple[str, TokenUsage, str | None]:
+    """Return the response recorded under *key*, after its scaled latency."""
+    with cassette._lock:
+        interaction = cassette.interactions.get(key)
+        if interaction is None:
+            cassette.misses += 1
+        else:
+            cassette.hits += 1
+    if interaction is None:
+        raise CassetteMissError(f"No recorded LLM response for request {key[:12]}")
+
+    delay = interaction["latency_seconds"] * cassette.latency_scale
+    if delay > 0:
+        time.sleep(delay)
+    text = interaction["text"]
+    if on_text is not None and text:
+        on_text(text)
+    return text, TokenUsage(**interaction["usage"]), interaction["stop_reason"]
+
+
+def _load_interactions(path: Path) -> dict[str, dict]:
+    """Recorded interactions from *path*; empty if missing or unreadable (logged)."""
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("version") != _CASSETTE_FORMAT_VERSION:
+            logger.warning(f"Ignoring LLM cassette '{path}' from another format version")
+            return {}
+        return dict(payload["interactions"])
+    except Exception as exc:
+        logger.warning(f"Ignoring unreadable LLM cassette '{path}': {exc}")
+        return {}
+
+
+def _save_interactions(interactions: dict[str, dict], path: Path) -> bool:
+    """Write *interactions* to *path* atomically; False on failure (logged)."""
+    payload = {"version": _CASSETTE_FORMAT_VERSION, "interactions": interactions}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".json.tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as temp_file:
+                json.dump(payload, temp_file, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(temp_name, path)
+        finally:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.warning(f"Could not write LLM cassette '{path}': {exc}")
+        return False
+    return True
@@ -0,0 +1,404 @@
+"""
+Shared Claude client — every LLM call in the project goes through here.
+
+complete() sends one prompt and returns the response text with its token
+usage and cost.  A caller whose prompts share a long fixed part (schema,
+instructions, examples) passes it as static_prefix: it is sent as its own
+content block marked for provider-side prompt caching, so after the first
+call the prefix is read from the cache (about a tenth of the input price,
+and a shorter time to first token) and only the variable part is billed
+in full.  The provider only caches prefixes of roughly 1024+ tokens;
+shorter ones are simply billed uncached.
+
+A caller that can use a partial answer passes on_text: the response is then
+streamed and on_text receives each piece of text as it arrives, so a
+response cut off by max_tokens or a dropped connection still leaves the
+caller whatever it had already received.
+
+Around the request it handles what each caller used to do on its own:
+  - one pooled anthropic client per API key for the whole process, so
+    repeated calls reuse open HTTPS connections instead of paying the
+    TLS handshake again,
+  - the model id, request timeout and retry policy from config/llm_config.py,
+  - a process-wide token-bucket rate limit (utils/rate_limit.py),
+  - jittered exponential backoff between attempts; client errors such as
+    a bad key or an invalid request (4xx other than 408/409/429) fail at once,
+  - per-call metrics (caller, latency, tokens incl. cached input, cost,
+    attempts), kept in a bounded in-memory list for the UI and benchmarks.
+
+set_transport() swaps the function that actually sends a request, so every
+call can be recorded to or replayed from disk (utils/llm_cassette.py).
+
+Public API:
+    TokenUsage, LLMResponse, LLMCallMetric
+    complete(prompt, api_key, max_tokens, caller, model, static_prefix, on_text)
+                                                         → LLMResponse
+    estimate_cost(usage)                                 → float (USD)
+    call_metrics()                                       → list[LLMCallMetric]
+    summarize_call_metrics(metrics)                      → dict[str, dict]
+    reset_call_metrics()                                 → None
+    set_transport(transport)                             → previous transport
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from config.llm_config import (
+    BACKOFF_BASE_SECONDS,
+    BACKOFF_MAX_SECONDS,
+    BURST_REQUESTS,
+    CACHE_READ_COST_PER_MTOK,
+    CACHE_WRITE_COST_PER_MTOK,
+    INPUT_COST_PER_MTOK,
+    MAX_ATTEMPTS,
+    MODEL_ID,
+    OUTPUT_COST_PER_MTOK,
+    REQUEST_TIMEOUT_SECONDS,
+    REQUESTS_PER_SECOND,
+)
+from utils.rate_limit import TokenBucket, acquire_token, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+# Most recent calls kept in the metrics list (older ones are dropped).
+_MAX_METRICS = 10_000
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit (plus any 5xx).
+_RETRYABLE_CLIENT_STATUSES: frozenset[int] = frozenset({408, 409, 429})
+
+_RATE_LIMITER = TokenBucket(rate=REQUESTS_PER_SECOND, capacity=BURST_REQUESTS)
+
+# API key → anthropic.Anthropic, created on first use
+_CLIENTS: dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+_METRICS: deque = deque(maxlen=_MAX_METRICS)
+_METRICS_LOCK = threading.Lock()
+
+# Replaces _send_request() while set (see set_transport())
+_TRANSPORT_OVERRIDE: Callable[..., tuple] | None = None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data classes
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class TokenUsage:
+    """Token counts of one response, split the way they are billed."""
+
+    uncached_input_tokens: int = 0
+    # Static prefix tokens written to / read from the provider's prompt cache
+    cache_write_tokens: int = 0
+    cache_read_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def input_tokens(self) -> int:
+        """All prompt tokens, cached or not."""
+        return self.uncached_input_tokens + self.cache_write_tokens + self.cache_read_tokens
+
+
+@dataclass
+class LLMResponse:
+    """One successful completion."""
+
+    text: str
+    # All prompt tokens; cached_input_tokens of them were cache reads
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+    # Duration of the request that succeeded (excludes waits and retries)
+    latency_seconds: float
+    attempts: int
+    stop_reason: str | None = None
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+@dataclass
+class LLMCallMetric:
+    """Metrics for one complete() call, successful or not."""
+
+    caller: str
+    model: str
+    succeeded: bool
+    attempts: int
+    latency_seconds: float
+    # Rate-limit waits plus backoff sleeps
+    waited_seconds: float
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    error: str = ""
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+def complete(
+    prompt: str,
+    api_key: str,
+    max_tokens: int,
+    caller: str,
+    model: str = MODEL_ID,
+    static_prefix: str = "",
+    on_text: Callable[[str], None] | None = None,
+) -> LLMResponse:
+    """
+    Send *static_prefix* + *prompt* as a single user message and return the response.
+
+    Safe to call from several threads at once.
+
+    Args:
+        prompt: The prompt (the variable part, if static_prefix is given).
+        api_key: Anthropic API key.
+        max_tokens: Cap on response tokens.
+        caller: Short name of the calling module, for logs and metrics.
+        model: Model id (default: config MODEL_ID).
+        static_prefix: Fixed text sent before *prompt* and marked for
+            prompt caching; must be identical across calls to hit the cache.
+        on_text: If given, the response is streamed and on_text is called
+            with each text fragment as it arrives.  An error after the first
+            fragment is raised without retrying, since the caller has already
+            consumed part of the response.
+
+    Returns:
+        LLMResponse with the text, token usage and estimated cost.
+
+    Raises:
+        Exception: The last error once MAX_ATTEMPTS attempts failed, the
+            first non-retryable error (e.g. authentication), or an error
+            that interrupted a stream already passed to on_text.
+    """
+    waited = 0.0
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        waited += acquire_token(_RATE_LIMITER)
+        started = time.perf_counter()
+        received = False
+
+        def deliver(fragment: str) -> None:
+            nonlocal received
+            received = True
+            on_text(fragment)
+
+        try:
+            text, usage, stop_reason = (_TRANSPORT_OVERRIDE or _send_request)(
+                api_key, model, static_prefix, prompt, max_tokens,
+                on_text=deliver if on_text is not None else None,
+            )
+        except Exception as exc:
+            latency = time.perf_counter() - started
+            if attempt == MAX_ATTEMPTS or not _is_retryable(exc) or received:
+                _record_metric(LLMCallMetric(
+                    caller=caller, model=model, succeeded=False, attempts=attempt,
+                    latency_seconds=latency, waited_seconds=waited, error=str(exc),
+                ))
+                raise
+            delay = backoff_delay(attempt, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS)
+            logger.warning(
+                f"{caller}: LLM call failed (attempt {attempt}/{MAX_ATTEMPTS}): {exc} "
+                f"— retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            waited += delay
+            continue
+
+        latency = time.perf_counter() - started
+        cost = estimate_cost(usage)
+        _record_metric(LLMCallMetric(
+            caller=caller, model=model, succeeded=True, attempts=attempt,
+            latency_seconds=latency, waited_seconds=waited,
+            input_tokens=usage.input_tokens, cached_input_tokens=usage.cache_read_tokens,
+            output_tokens=usage.output_tokens, cost_usd=cost,
+        ))
+        logger.info(
+            f"{caller}: LLM call {usage.input_tokens} in "
+            f"({usage.cache_read_tokens} cached) / {usage.output_tokens} out tokens, "
+            f"{latency:.1f}s, est. cost ${cost:.4f}"
+        )
+        return LLMResponse(
+            text=text,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cost_usd=cost,
+            latency_seconds=latency,
+            attempts=attempt,
+            stop_reason=stop_reason,
+            cached_input_tokens=usage.cache_read_tokens,
+            cache_write_tokens=usage.cache_write_tokens,
+        )
+
+
+def estimate_cost(usage: TokenUsage) -> float:
+    """Estimated USD cost of a call from its token usage (config pricing)."""
+    return (
+        usage.uncached_input_tokens * INPUT_COST_PER_MTOK
+        + usage.cache_write_tokens * CACHE_WRITE_COST_PER_MTOK
+        + usage.cache_read_tokens * CACHE_READ_COST_PER_MTOK
+        + usage.output_tokens * OUTPUT_COST_PER_MTOK
+    ) / 1_000_000
+
+
+def call_metrics() -> list[LLMCallMetric]:
+    """Metrics of the most recent calls in this process, oldest first."""
+    with _METRICS_LOCK:
+        return list(_METRICS)
+
+
+def summarize_call_metrics(
+    metrics: list[LLMCallMetric] | None = None,
+) -> dict[str, dict]:
+    """
+    Aggregate call metrics per caller.
+
+    Args:
+        metrics: Metrics to summarize (default: call_metrics()).
+
+    Returns:
+        caller → {"calls", "failures", "retries", "input_tokens",
+        "cached_input_tokens", "output_tokens", "cost_usd",
+        "mean_latency_seconds"}.
+    """
+    if metrics is None:
+        metrics = call_metrics()
+
+    summary: dict[str, dict] = {}
+    for metric in metrics:
+        totals = summary.setdefault(metric.caller, {
+            "calls": 0, "failures": 0, "retries": 0,
+            "input_tokens": 0, "cached_input_tokens": 0, "output_tokens": 0,
+            "cost_usd": 0.0,
+            "mean_latency_seconds": 0.0,
+        })
+        totals["calls"] += 1
+        totals["failures"] += not metric.succeeded
+        totals["retries"] += metric.attempts - 1
+        totals["input_tokens"] += metric.input_tokens
+        totals["cached_input_tokens"] += metric.cached_input_tokens
+        totals["output_tokens"] += metric.output_tokens
+        totals["cost_usd"] += metric.cost_usd
+        # Running mean over all calls of this caller
+        totals["mean_latency_seconds"] += (
+            metric.latency_seconds - totals["mean_latency_seconds"]
+        ) / totals["calls"]
+    return summary
+
+
+def reset_call_metrics() -> None:
+    """Forget all recorded call metrics."""
+    with _METRICS_LOCK:
+        _METRICS.clear()
+
+
+def set_transport(
+    transport: Callable[..., tuple] | None,
+) -> Callable[..., tuple] | None:
+    """
+    Send every request through *transport* instead of the Messages API.
+
+    Args:
+        transport: Function with the signature of _send_request(), or None
+            to go back to the API.
+
+    Returns:
+        The transport set before (None for the API), to restore later.
+    """
+    global _TRANSPORT_OVERRIDE
+    previous = _TRANSPORT_OVERRIDE
+    _TRANSPORT_OVERRIDE = transport
+    return previous
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Internal helpers
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _get_client(api_key: str) -> Any:
+    """The process-wide anthropic client for *api_key*, created on first use."""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(api_key)
+        if client is None:
+            import anthropic
+
+            # Retries are ours (with the shared rate limit), not the SDK's
+            client = anthropic.Anthropic(
+                api_key=api_key,
+                timeout=REQUEST_TIMEOUT_SECONDS,
+                max_retries=0,
+            )
+            _CLIENTS[api_key] = client
+        return client
+
+
+def _send_request(
+    api_key: str,
+    model: str,
+    static_prefix: str,
+    prompt: str,
+    max_tokens: int,
+    on_text: Callable[[str], None] | None = None,
+) -> tuple[str, TokenUsage, str | None]:
+    """
+    One Messages API request; a non-empty static_prefix is its own cacheable block.
+
+    With on_text the request is streamed and on_text gets each text delta.
+
+    Returns:
+        (response_text, token_usage, stop_reason)
+    """
+    client = _get_client(api_key)
+    content: list[dict] = []
+    if static_prefix:
+        content.append({
+            "type": "text",
+            "text": static_prefix,
+            "cache_control": {"type": "ephemeral"},
+        })
+    content.append({"type": "text", "text": prompt})
+
+    request = {
+        "model": model,
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": content}],
+    }
+    if on_text is None:
+        message = client.messages.create(**request)
+    else:
+        with client.messages.stream(**request) as stream:
+            for fragment in stream.text_stream:
+                on_text(fragment)
+            message = stream.get_final_message()
+    usage = message.usage
+    return (
+        message.content[0].text,
+        TokenUsage(
+            uncached_input_tokens=usage.input_tokens,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+            output_tokens=usage.output_tokens,
+        ),
+        message.stop_reason,
+    )
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """False for errors another attempt cannot fix (missing SDK or recording, 4xx)."""
+    if isinstance(exc, (ImportError, LookupError)):
+        return False
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500:
+        return status in _RETRYABLE_CLIENT_STATUSES
+    return True
+
+
+def _record_metric(metric: LLMCallMetric) -> None:
+    """Append *metric* to the bounded metrics list."""
+    with _METRICS_LOCK:
+        _METRICS.append(metric)
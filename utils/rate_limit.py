@@ -0,0 +1,108 @@
+"""
+Rate limiting and retry backoff for outbound API calls.
+
+A TokenBucket caps the request rate across every thread that shares it:
+the bucket holds up to `capacity` tokens, refills at `rate` tokens per
+second, and acquire_token() blocks until a token is free.  A full bucket
+lets a short burst through immediately, then calls are spaced out at the
+refill rate.
+
+backoff_delay() gives the wait before a retry: exponential in the attempt
+number, capped, with "full jitter" (a uniform draw between zero and the
+exponential value) so concurrent callers that failed together do not all
+retry at the same instant.
+
+Public API:
+    TokenBucket(rate, capacity)
+    acquire_token(bucket, tokens)                       → float (seconds waited)
+    backoff_delay(attempt, base_delay, max_delay)       → float (seconds)
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Data classes
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, bursts up to `capacity`."""
+
+    rate: float
+    capacity: float
+    # Starts full; set to the capacity in __post_init__
+    tokens: float = field(init=False)
+    updated_at: float = field(init=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.capacity < 1:
+            raise ValueError(
+                f"TokenBucket needs rate > 0 and capacity >= 1 "
+                f"(got rate={self.rate}, capacity={self.capacity})"
+            )
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Public API
+# ═══════════════════════════════════════════════════════════════════════════
+
+def acquire_token(bucket: TokenBucket, tokens: float = 1.0) -> float:
+    """
+    Take *tokens* from the bucket, blocking until enough have refilled.
+
+    Args:
+        bucket: The shared bucket.
+        tokens: Tokens to take (at most bucket.capacity).
+
+    Returns:
+        Seconds spent waiting (0.0 if the tokens were available).
+    """
+    if tokens > bucket.capacity:
+        raise ValueError(f"Cannot take {tokens} tokens from a bucket of {bucket.capacity}")
+
+    waited = 0.0
+    while True:
+        with bucket.lock:
+            now = time.monotonic()
+            bucket.tokens = min(
+                bucket.capacity,
+                bucket.tokens + (now - bucket.updated_at) * bucket.rate,
+            )
+            bucket.updated_at = now
+            if bucket.tokens >= tokens:
+                bucket.tokens -= tokens
+                return waited
+            wait_seconds = (tokens - bucket.tokens) / bucket.rate
+
+        # Sleep outside the lock so other threads can refill-check meanwhile
+        time.sleep(wait_seconds)
+        waited += wait_seconds
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> float:
+    """
+    Jittered exponential backoff before retry number *attempt*.
+
+    Args:
+        attempt: 1 for the first retry, 2 for the second, ...
+        base_delay: Upper bound of the first retry's delay, in seconds.
+        max_delay: Cap on the exponential upper bound, in seconds.
+
+    Returns:
+        A delay drawn uniformly from [0, min(max_delay, base_delay * 2^(attempt-1))].
+    """
+    return random.uniform(0.0, min(max_delay, base_delay * 2 ** (attempt - 1)))